@@ -1,5 +1,4 @@
 # ruff: noqa: E402
-import gc
 from asyncio import create_task, gather
 
 from pyrogram.types import BotCommand
@@ -77,10 +76,11 @@ async def set_commands():
 
 # Main Function
 async def main():
-    # Initialize garbage collection
-    LOGGER.info("Configuring garbage collection...")
-    gc.enable()
-    gc.set_threshold(700, 10, 10)  # Adjust GC thresholds for better performance
+    # Sample system metrics off the event loop for status, stats and queueing
+    from . import DOWNLOAD_DIR
+    from .helper.ext_utils.system_metrics import start_sampler
+
+    start_sampler(disk_paths=(DOWNLOAD_DIR, "/"))
 
     from .core.startup import (
         load_configurations,
@@ -109,11 +109,12 @@ async def main():
     await start_bot()
     from .core.jdownloader_booter import jdownloader
     from .helper.ext_utils.files_utils import clean_all
-    from .helper.ext_utils.gc_utils import (
-        log_memory_usage,
-        smart_garbage_collection,
-    )
+    from .helper.ext_utils.gc_utils import MemoryGovernor
+    from .helper.ext_utils.loop_diagnostics import LoopDiagnostics
+    from .helper.ext_utils.metrics import metrics_server_booter
+    from .helper.ext_utils.stream_utils import stream_server_booter
     from .helper.ext_utils.telegraph_helper import telegraph
+    from .helper.mirror_leech_utils.rclone_utils.rcd import RcloneDaemon
     from .helper.mirror_leech_utils.rclone_utils.serve import rclone_serve_booter
     from .modules import (
         get_packages_version,
@@ -135,6 +136,9 @@ async def main():
         restart_notification(),
         telegraph.create_account(),
         rclone_serve_booter(),
+        RcloneDaemon.start(),
+        stream_server_booter(),
+        metrics_server_booter(),
     )
 
     # Start task monitoring system
@@ -151,12 +155,9 @@ async def main():
     LOGGER.info("Loading user data for limits tracking...")
     await _load_user_data()
 
-    # Initial garbage collection and memory usage logging
-    LOGGER.info("Performing initial garbage collection...")
-    smart_garbage_collection(
-        aggressive=True
-    )  # Use aggressive mode for initial cleanup
-    log_memory_usage()
+    # Freeze startup objects and hand collections to the memory governor
+    MemoryGovernor.start()
+    LoopDiagnostics.start()
 
 
 bot_loop.run_until_complete(main())
@@ -180,6 +181,41 @@ async def cleanup():
     """Clean up resources before shutdown"""
     LOGGER.info("Performing cleanup before shutdown...")
 
+    # Stop the local stream server
+    from .helper.ext_utils.stream_utils import stop_stream_server
+
+    await stop_stream_server()
+
+    # Stop the metrics server and loop lag heartbeat
+    from .helper.ext_utils.metrics import stop_metrics_server
+
+    await stop_metrics_server()
+
+    # Stop the loop diagnostics watchdog
+    from .helper.ext_utils.loop_diagnostics import LoopDiagnostics
+
+    LoopDiagnostics.stop()
+
+    # Stop the memory governor
+    from .helper.ext_utils.gc_utils import MemoryGovernor
+
+    MemoryGovernor.stop()
+
+    # Stop the system metrics sampler
+    from .helper.ext_utils.system_metrics import stop_sampler
+
+    stop_sampler()
+
+    # Stop pooled HyperDL media sessions
+    from .helper.ext_utils.hyperdl_utils import MediaSessionPool
+
+    await MediaSessionPool.stop()
+
+    # Stop the rclone rc daemon
+    from .helper.mirror_leech_utils.rclone_utils.rcd import RcloneDaemon
+
+    await RcloneDaemon.stop()
+
     # Stop database heartbeat task
     await database.stop_heartbeat()
 
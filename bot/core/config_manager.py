@@ -7,8 +7,27 @@ from typing import Any, ClassVar
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+_MISSING = object()
+
+
+class _ConfigMeta(type):
+    """Bumps the config version whenever a setting is assigned.
+
+    bot_settings assigns Config attributes directly as well as through
+    Config.set, so the version is tracked on the class itself. Assigning
+    the value a setting already has keeps the version.
+    """
+
+    def __setattr__(cls, key, value):
+        changed = key.isupper() and getattr(cls, key, _MISSING) != value
+        super().__setattr__(key, value)
+        if changed:
+            super().__setattr__("_version", cls._version + 1)
+
+
+class Config(metaclass=_ConfigMeta):
+    _version = 0
 
-class Config:
     AS_DOCUMENT: bool = False
     AUTHORIZED_CHATS: str = ""
     BASE_URL: str = ""
@@ -21,8 +40,10 @@ class Config:
     FFMPEG_CMDS: ClassVar[dict[str, list[str]]] = {}
     FILELION_API: str = ""
     GDRIVE_ID: str = ""
+    GDRIVE_LIST_WORKERS: int = 8  # Folders listed in parallel by the tree walker
     HELPER_TOKENS: str = ""
     HYPER_THREADS: int = 0
+    HYPER_PIPELINE_DEPTH: int = 4
     INCOMPLETE_TASK_NOTIFIER: bool = False
     INDEX_URL: str = ""
     IMDB_TEMPLATE: str = ""
@@ -36,6 +57,19 @@ class Config:
     LEECH_FILENAME: str = ""
     LEECH_SPLIT_SIZE: int = 2097152000
     EQUAL_SPLITS: bool = False
+    LEECH_SPLIT_PIPELINE: bool = False
+    LEECH_SPLIT_PIPELINE_DEPTH: int = 2
+    SEGMENT_SPLIT: bool = False
+    STREAMING_EXTRACT: bool = False
+    MEDIA_FILE_WORKERS: int = 1
+    MEDIA_CPU_BUDGET: int = 0
+    INCREMENTAL_LEECH: bool = False
+    STREAMING_ZIP: bool = False
+    CONTENT_INDEX: bool = False
+    CONTENT_INDEX_TTL: int = 7 * 86400  # Seconds a task result is reused
+    DIRECT_HOST_PROFILES: bool = False
+    DIRECT_MAX_CONNECTIONS: int = 16
+    DIRECT_MAX_FILES: int = 8
     LOGIN_PASS: str = ""
     MEDIA_GROUP: bool = False
     HYBRID_LEECH: bool = False
@@ -53,6 +87,8 @@ class Config:
     RCLONE_SERVE_USER: str = ""
     RCLONE_SERVE_PASS: str = ""
     RCLONE_SERVE_PORT: int = 8080
+    RCLONE_RCD_ENABLED: bool = False  # Drive rclone through a long-lived rc daemon
+    RCLONE_RCD_PORT: int = 5572
     RSS_CHAT: str = ""
     RSS_DELAY: int = 600
     RSS_SIZE_LIMIT: int = 0
@@ -661,6 +697,8 @@ class Config:
 
     # YT-DLP Settings
     YTDLP_ENABLED: bool = True
+    YTDLP_CONCURRENT_FRAGMENTS: int = 4  # Fragments fetched in parallel (HLS/DASH)
+    YTDLP_PLAYLIST_WORKERS: int = 2  # Playlist entries downloaded in parallel
 
     # Torrent Settings
     TORRENT_ENABLED: bool = True
@@ -676,6 +714,17 @@ class Config:
     # Hyper Download Settings
     HYPERDL_ENABLED: bool = True
 
+    # Stream Settings
+    STREAM_ENABLED: bool = False
+    STREAM_CACHE_SIZE: int = 256  # MB of fetched chunks kept in memory
+    STREAM_READ_AHEAD: int = 4  # Chunks prefetched ahead of the player
+
+    # Metrics Settings
+    METRICS_ENABLED: bool = False  # Serve hot-path metrics at BASE_URL/metrics
+    LOOP_DIAGNOSTICS: bool = False  # Profile work that blocks the event loop
+    LOOP_LAG_THRESHOLD: float = 0.25  # Seconds of loop lag before stacks are sampled
+    SLOW_CALLBACK_THRESHOLD: float = 0.1  # Seconds before a callback is logged slow
+
     # Media Search Settings
     MEDIA_SEARCH_ENABLED: bool = True
 
@@ -706,6 +755,7 @@ class Config:
     VT_API_TIMEOUT: int = 500
     VT_ENABLED: bool = False
     VT_MAX_FILE_SIZE: int = 32 * 1024 * 1024  # 32MB default limit
+    VT_CACHE_TTL: int = 7 * 86400  # Seconds a file verdict is reused
 
     HEROKU_APP_NAME: str = ""
     HEROKU_API_KEY: str = ""
@@ -896,6 +946,10 @@ class Config:
     def get(cls, key: str) -> Any:
         return getattr(cls, key, None)
 
+    @classmethod
+    def get_version(cls) -> int:
+        return cls._version
+
     @classmethod
     def set(cls, key: str, value: Any):
         if not hasattr(cls, key):
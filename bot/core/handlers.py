@@ -58,6 +58,7 @@ from bot.modules import (
     leech,
     log,
     login,
+    loop_stats,
     media_cancel_callback,
     media_get_callback,
     media_search,
@@ -234,6 +235,11 @@ def add_handlers():
             BotCommands.StatsCommand,
             CustomFilters.authorized,
         ),
+        "loop_stats": (
+            loop_stats,
+            BotCommands.LoopStatsCommand,
+            CustomFilters.owner,
+        ),
         "check_scheduled_deletions": (
             check_scheduled_deletions,
             BotCommands.CheckDeletionsCommand,
@@ -483,7 +489,7 @@ def add_handlers():
         MessageHandler(
             handle_no_suffix_commands,
             filters=regex(
-                r"^/(mirror|m|leech|l|jdmirror|jm|jdleech|jl|nzbmirror|nm|nzbleech|nl|ytdl|y|ytdlleech|yl|streamripmirror|srmirror|streamripleech|srleech|streamripsearch|srsearch|streamripquality|srquality|clone|count|del|cancelall|forcestart|fs|list|search|nzbsearch|status|s|statusall|sall|users|auth|unauth|addsudo|rmsudo|ping|restart|restartall|stats|help|log|shell|aexec|exec|clearlocals|botsettings|speedtest|broadcast|broadcastall|sel|rss|check_deletions|cd|imdb|login|mediasearch|mds|truecaller|ask|mediainfo|mi|spectrum|sox|paste|virustotal)([a-zA-Z0-9_]*)($| )"
+                r"^/(mirror|m|leech|l|jdmirror|jm|jdleech|jl|nzbmirror|nm|nzbleech|nl|ytdl|y|ytdlleech|yl|streamripmirror|srmirror|streamripleech|srleech|streamripsearch|srsearch|streamripquality|srquality|clone|count|del|cancelall|forcestart|fs|list|search|nzbsearch|status|s|statusall|sall|users|auth|unauth|addsudo|rmsudo|ping|restart|restartall|stats|loopstats|help|log|shell|aexec|exec|clearlocals|botsettings|speedtest|broadcast|broadcastall|sel|rss|check_deletions|cd|imdb|login|mediasearch|mds|truecaller|ask|mediainfo|mi|spectrum|sox|paste|virustotal)([a-zA-Z0-9_]*)($| )"
             )
             & CustomFilters.pm_or_authorized,
         ),
@@ -10,6 +10,20 @@ from bot import LOGGER, cpu_no
 from bot.helper.ext_utils.bot_utils import cmd_exec
 from bot.helper.ext_utils.media_utils import get_streams
 
+# ffprobe runs at once while planning a merge
+MERGE_PROBE_WORKERS = max(4, cpu_no)
+MERGE_IMAGE_EXTENSIONS = (
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".gif",
+    ".bmp",
+    ".webp",
+    ".tiff",
+    ".tif",
+)
+MERGE_DOCUMENT_EXTENSIONS = (".pdf", ".doc", ".docx", ".odt", ".txt", ".rtf")
+
 
 async def download_google_font(font_name):
     """Download a font from Google Fonts API.
@@ -2602,7 +2616,18 @@ async def get_media_type_internal(file_path):
     Returns:
         str: 'video', 'audio', 'subtitle', or None if can't determine
     """
-    streams = await get_streams(file_path)
+    return media_type_from_streams(await get_streams(file_path))
+
+
+def media_type_from_streams(streams):
+    """Determine the media type of a file from its ffprobe streams.
+
+    Args:
+        streams: Stream dictionaries as returned by get_streams
+
+    Returns:
+        str: 'video', 'audio', 'subtitle', or None if can't determine
+    """
     if not streams:
         return None
 
@@ -2629,7 +2654,103 @@ async def get_media_type_internal(file_path):
     return None
 
 
-async def get_merge_concat_demuxer_cmd(files, output_format="mkv", media_type=None):
+async def probe_merge_inputs(files, probes=None):
+    """Probe the streams of every merge input concurrently.
+
+    Args:
+        files: List of file paths
+        probes: Streams already probed by path, reused as they are
+
+    Returns:
+        dict: Streams by path, None for files ffprobe can't read
+    """
+    probes = dict(probes or {})
+    slots = asyncio.Semaphore(MERGE_PROBE_WORKERS)
+
+    async def probe(file_path):
+        async with slots:
+            probes[file_path] = await get_streams(file_path)
+
+    missing = [f for f in dict.fromkeys(files) if f not in probes]
+    await asyncio.gather(*(probe(file_path) for file_path in missing))
+    return probes
+
+
+def merge_signature(streams):
+    """Stream parameters that must match for a stream copy concat.
+
+    Args:
+        streams: Stream dictionaries as returned by get_streams
+
+    Returns:
+        tuple: One entry per video, audio and subtitle stream, in order
+    """
+    signature = []
+    for stream in streams or []:
+        codec_type = stream.get("codec_type")
+        if codec_type == "video":
+            if stream.get("disposition", {}).get("attached_pic"):
+                continue
+            signature.append(
+                (
+                    codec_type,
+                    stream.get("codec_name"),
+                    stream.get("profile"),
+                    stream.get("width"),
+                    stream.get("height"),
+                    stream.get("pix_fmt"),
+                    stream.get("r_frame_rate"),
+                )
+            )
+        elif codec_type == "audio":
+            signature.append(
+                (
+                    codec_type,
+                    stream.get("codec_name"),
+                    stream.get("sample_rate"),
+                    stream.get("channels"),
+                )
+            )
+        elif codec_type == "subtitle":
+            signature.append((codec_type, stream.get("codec_name")))
+    return tuple(signature)
+
+
+def log_merge_media_info(files, media_type, probes):
+    """Log the first `media_type` stream of every merge input for debugging.
+
+    Args:
+        files: List of file paths
+        media_type: "video" or "audio"
+        probes: Streams by path as returned by probe_merge_inputs
+    """
+    media_info = []
+    for file_path in files:
+        info = {}
+        stream = next(
+            (
+                stream
+                for stream in probes.get(file_path) or []
+                if stream.get("codec_type") == media_type
+            ),
+            None,
+        )
+        if stream:
+            info["codec"] = stream.get("codec_name", "")
+            if media_type == "video":
+                info["width"] = int(stream.get("width", 0))
+                info["height"] = int(stream.get("height", 0))
+            else:  # audio
+                info["sample_rate"] = int(stream.get("sample_rate", 0))
+                info["channels"] = int(stream.get("channels", 0))
+        media_info.append(info)
+
+    LOGGER.info(f"Media info for {media_type} files: {media_info}")
+
+
+async def get_merge_concat_demuxer_cmd(
+    files, output_format="mkv", media_type=None, probes=None
+):
     """Generate FFmpeg command for merging files using concat demuxer.
 
     Args:
@@ -2637,6 +2758,7 @@ async def get_merge_concat_demuxer_cmd(files, output_format="mkv", media_type=No
         output_format: Output file format (default: mkv)
                       If "none", will use the format of the first input file
         media_type: Type of media ('video', 'audio', 'subtitle', 'image') for specialized handling
+        probes: Streams by path from the merge analysis, missing files are probed
 
     Returns:
         tuple: FFmpeg command and output file path
@@ -2715,47 +2837,9 @@ async def get_merge_concat_demuxer_cmd(files, output_format="mkv", media_type=No
             else:
                 output_format = "mkv"
 
-    # Check if all files have the same codec for video and audio
-    # This is important for concat demuxer to work properly
+    # Probe all inputs at once, the stream copy checks below reuse them
     if media_type in ["video", "audio"]:
-        try:
-            import json
-            import subprocess
-
-            # Get codec information for all files
-            codecs = []
-            for file_path in files:
-                cmd = [
-                    "ffprobe",  # Keep as ffprobe, not xtra
-                    "-v",
-                    "error",
-                    "-select_streams",
-                    "v" if media_type == "video" else "a",
-                    "-show_entries",
-                    "stream=codec_name",
-                    "-of",
-                    "json",
-                    file_path,
-                ]
-                result = subprocess.run(
-                    cmd, capture_output=True, text=True, check=False
-                )
-                if result.returncode == 0:
-                    data = json.loads(result.stdout)
-                    if data.get("streams"):
-                        codecs.append(data["streams"][0].get("codec_name", ""))
-                    else:
-                        # If we can't determine codec, assume it's different
-                        codecs.append(f"unknown_{len(codecs)}")
-                else:
-                    # If ffprobe fails, assume it's a different codec
-                    codecs.append(f"unknown_{len(codecs)}")
-
-            # Check if all codecs are the same
-            if len(set(codecs)) > 1:
-                pass
-        except Exception:
-            pass
+        probes = await probe_merge_inputs(files, probes)
 
     # Create a temporary file list for concat demuxer
     concat_list_path = "concat_list.txt"
@@ -2797,11 +2881,7 @@ async def get_merge_concat_demuxer_cmd(files, output_format="mkv", media_type=No
     if media_type == "video":
         # For video files, we need to handle potential codec issues
         # Check if all files have the same codec
-        streams_list = []
-        for file_path in files:
-            streams = await get_streams(file_path)
-            if streams:
-                streams_list.append(streams)
+        streams_list = [probes[f] for f in files if probes.get(f)]
 
         # Check if all files have the same codecs
         same_codecs = True
@@ -2823,9 +2903,10 @@ async def get_merge_concat_demuxer_cmd(files, output_format="mkv", media_type=No
                     reference_height = stream.get("height")
                     break
 
-            # Compare codecs and dimensions with other files
+            # Compare stream parameters and dimensions with other files
+            reference_signature = merge_signature(reference_streams)
             for streams in streams_list[1:]:
-                if len(streams) != len(reference_streams):
+                if merge_signature(streams) != reference_signature:
                     same_codecs = False
 
                 # Check for resolution differences
@@ -2840,18 +2921,6 @@ async def get_merge_concat_demuxer_cmd(files, output_format="mkv", media_type=No
                             same_resolution = False
                         break
 
-                # Check for codec differences
-                for i, stream in enumerate(streams):
-                    if i >= len(reference_streams):
-                        break
-                    if stream.get("codec_name") != reference_streams[i].get(
-                        "codec_name"
-                    ) or stream.get("codec_type") != reference_streams[i].get(
-                        "codec_type"
-                    ):
-                        same_codecs = False
-                        break
-
         LOGGER.info(
             f"Video merge analysis: same_codecs={same_codecs}, same_resolution={same_resolution}"
         )
@@ -2943,23 +3012,22 @@ async def get_merge_concat_demuxer_cmd(files, output_format="mkv", media_type=No
                 )
     elif media_type == "audio":
         # For audio files, check if we need to transcode
-        streams_list = []
-        for file_path in files:
-            streams = await get_streams(file_path)
-            if streams:
-                streams_list.append(streams)
+        streams_list = [probes[f] for f in files if probes.get(f)]
 
-        # Check if all files have the same audio codec
+        # Check if all files have the same audio parameters
         same_codec = True
         audio_codec = None
+        audio_signature = None
         for streams in streams_list:
-            for stream in streams:
-                if stream.get("codec_type") == "audio":
-                    if audio_codec is None:
-                        audio_codec = stream.get("codec_name")
-                    elif audio_codec != stream.get("codec_name"):
-                        same_codec = False
-                        break
+            signature = tuple(
+                entry for entry in merge_signature(streams) if entry[0] == "audio"
+            )
+            if audio_signature is None:
+                audio_signature = signature
+                audio_codec = signature[0][1] if signature else None
+            elif signature != audio_signature:
+                same_codec = False
+                break
 
         LOGGER.info(
             f"Audio merge analysis: same_codec={same_codec}, codec={audio_codec}"
@@ -3035,7 +3103,9 @@ async def get_merge_concat_demuxer_cmd(files, output_format="mkv", media_type=No
     return cmd, output_file
 
 
-async def get_merge_filter_complex_cmd(files, media_type, output_format=None):
+async def get_merge_filter_complex_cmd(
+    files, media_type, output_format=None, probes=None
+):
     """Generate FFmpeg command for merging files using filter_complex.
 
     Args:
@@ -3043,6 +3113,7 @@ async def get_merge_filter_complex_cmd(files, media_type, output_format=None):
         media_type: Type of media ('video', 'audio', 'subtitle')
         output_format: Output file format (default: based on media_type)
                       If "none", will use the format of the first input file
+        probes: Streams by path from the merge analysis, missing files are probed
 
     Returns:
         tuple: FFmpeg command and output file path
@@ -3123,47 +3194,9 @@ async def get_merge_filter_complex_cmd(files, media_type, output_format=None):
 
     # For video and audio, check if we need to handle different resolutions or sample rates
     if media_type in ["video", "audio"]:
-        try:
-            import json
-            import subprocess
-
-            # Get media information for all files
-            media_info = []
-            for file_path in files:
-                info = {}
-                # Get codec information
-                cmd = [
-                    "ffprobe",  # Keep as ffprobe, not xtra
-                    "-v",
-                    "error",
-                    "-select_streams",
-                    "v" if media_type == "video" else "a",
-                    "-show_entries",
-                    "stream=codec_name,width,height,sample_rate,channels",
-                    "-of",
-                    "json",
-                    file_path,
-                ]
-                result = subprocess.run(
-                    cmd, capture_output=True, text=True, check=False
-                )
-                if result.returncode == 0:
-                    data = json.loads(result.stdout)
-                    if data.get("streams"):
-                        stream = data["streams"][0]
-                        info["codec"] = stream.get("codec_name", "")
-                        if media_type == "video":
-                            info["width"] = int(stream.get("width", 0))
-                            info["height"] = int(stream.get("height", 0))
-                        else:  # audio
-                            info["sample_rate"] = int(stream.get("sample_rate", 0))
-                            info["channels"] = int(stream.get("channels", 0))
-                media_info.append(info)
-
-            # Log the media information for debugging
-            LOGGER.info(f"Media info for {media_type} files: {media_info}")
-        except Exception:
-            media_info = []
+        # Probe all inputs at once, building the command below reuses them
+        probes = await probe_merge_inputs(files, probes)
+        log_merge_media_info(files, media_type, probes)
 
     # Determine output path based on first file and media type
     base_dir = os.path.dirname(files[0])
@@ -3191,7 +3224,7 @@ async def get_merge_filter_complex_cmd(files, media_type, output_format=None):
 
         # First, identify which files have video and audio streams
         for i, file_path in enumerate(files):
-            streams = await get_streams(file_path)
+            streams = probes.get(file_path)
             if not streams:
                 continue
 
@@ -3232,7 +3265,7 @@ async def get_merge_filter_complex_cmd(files, media_type, output_format=None):
             # Get dimensions of all videos and check for audio streams
             video_dimensions = []
             for i, file_path in enumerate(files):
-                streams = await get_streams(file_path)
+                streams = probes.get(file_path)
                 if not streams:
                     continue
 
@@ -3355,7 +3388,7 @@ async def get_merge_filter_complex_cmd(files, media_type, output_format=None):
             # First check if the audio stream exists in each file
             valid_audio_inputs = []
             for i, file_path in enumerate(files):
-                streams = await get_streams(file_path)
+                streams = probes.get(file_path)
                 if not streams:
                     continue
 
@@ -3458,7 +3491,7 @@ async def get_merge_filter_complex_cmd(files, media_type, output_format=None):
             # Map available audio streams with optional flag
             audio_track_count = 0
             for i, file_path in enumerate(files):
-                streams = await get_streams(file_path)
+                streams = probes.get(file_path)
                 if not streams:
                     continue
 
@@ -3478,7 +3511,7 @@ async def get_merge_filter_complex_cmd(files, media_type, output_format=None):
             # Otherwise, map all audio streams from all input files directly
             audio_track_count = 0
             for i, file_path in enumerate(files):
-                streams = await get_streams(file_path)
+                streams = probes.get(file_path)
                 if not streams:
                     continue
 
@@ -3506,7 +3539,7 @@ async def get_merge_filter_complex_cmd(files, media_type, output_format=None):
         # Now map all subtitle streams from all input files
         # This preserves all subtitle tracks in the merged output
         for i, file_path in enumerate(files):
-            streams = await get_streams(file_path)
+            streams = probes.get(file_path)
             if not streams:
                 continue
 
@@ -4569,6 +4602,11 @@ async def analyze_media_for_merge(files):
     Args:
         files: List of file paths
 
+    Every file but images and documents is probed once, concurrently, and
+    the streams are returned under "probes" for the merge command builders.
+    Videos whose stream parameters all match exactly are merged with the
+    concat demuxer, which stream copies them.
+
     Returns:
         dict: Dictionary with categorized files and recommended merge approach
     """
@@ -4586,22 +4624,23 @@ async def analyze_media_for_merge(files):
     image_info = []
     document_info = []
 
+    # Probe every file that isn't an image or document at once
+    probes = await probe_merge_inputs(
+        [
+            file_path
+            for file_path in files
+            if os.path.splitext(file_path)[1].lower()
+            not in MERGE_IMAGE_EXTENSIONS + MERGE_DOCUMENT_EXTENSIONS
+        ]
+    )
+
     # Categorize files by media type with detailed info
     for file_path in files:
         # Check file extension first for faster categorization
         ext = os.path.splitext(file_path)[1].lower()
 
         # Categorize images by extension
-        if ext in [
-            ".jpg",
-            ".jpeg",
-            ".png",
-            ".gif",
-            ".bmp",
-            ".webp",
-            ".tiff",
-            ".tif",
-        ]:
+        if ext in MERGE_IMAGE_EXTENSIONS:
             image_files.append(file_path)
             image_info.append(
                 {
@@ -4613,7 +4652,7 @@ async def analyze_media_for_merge(files):
             continue
 
         # Categorize documents by extension
-        if ext in [".pdf", ".doc", ".docx", ".odt", ".txt", ".rtf"]:
+        if ext in MERGE_DOCUMENT_EXTENSIONS:
             document_files.append(file_path)
             document_info.append(
                 {
@@ -4624,12 +4663,12 @@ async def analyze_media_for_merge(files):
             )
             continue
 
-        # For other files, use FFprobe to determine media type
-        media_type = await get_media_type_internal(file_path)
+        # For other files, use the FFprobe streams to determine media type
+        streams = probes.get(file_path)
+        media_type = media_type_from_streams(streams)
         if media_type == "video":
             video_files.append(file_path)
-            # Get detailed video info
-            streams = await get_streams(file_path)
+            # Keep detailed video info
             if streams:
                 video_info.append(
                     {
@@ -4641,8 +4680,7 @@ async def analyze_media_for_merge(files):
                 )
         elif media_type == "audio":
             audio_files.append(file_path)
-            # Get detailed audio info
-            streams = await get_streams(file_path)
+            # Keep detailed audio info
             if streams:
                 audio_info.append(
                     {
@@ -4668,8 +4706,11 @@ async def analyze_media_for_merge(files):
     # Check for codec compatibility in video files
     video_codec_groups = {}
     video_resolution_groups = {}
+    # Stream parameters of the videos, a single one can be stream copied
+    video_signatures = set()
 
     for info in video_info:
+        video_signatures.add(merge_signature(info["streams"]))
         video_codec = None
         audio_codec = None
         width = None
@@ -4762,7 +4803,9 @@ async def analyze_media_for_merge(files):
         and len(document_files) == 0
     ):
         # All videos - check if we can use concat demuxer (same codec and resolution)
-        if len(video_codec_groups) == 1 and len(video_resolution_groups) == 1:
+        if len(video_signatures) == 1 or (
+            len(video_codec_groups) == 1 and len(video_resolution_groups) == 1
+        ):
             # All videos have same codec and resolution - can use concat demuxer
             recommended_approach = "concat_demuxer"
         elif len(video_resolution_groups) > 1:
@@ -4841,6 +4884,7 @@ async def analyze_media_for_merge(files):
         "image_format_groups": image_format_groups,
         "document_format_groups": document_format_groups,
         "recommended_approach": recommended_approach,
+        "probes": probes,
     }
 
 
@@ -42,6 +42,8 @@ from bot.helper.ext_utils.aiofiles_compat import aiopath, listdir, makedirs, rem
 
 from .ext_utils.bot_utils import get_size_bytes, new_task, sync_to_async
 from .ext_utils.bulk_links import extract_bulk_links
+from .ext_utils.effective_settings import get_effective_settings
+from .ext_utils.file_executor import FileExecutor
 from .ext_utils.files_utils import (
     SevenZ,
     get_base_name,
@@ -285,6 +287,9 @@ class TaskConfig:
         self.thumb = None
         self.excluded_extensions = []
         self.files_to_proceed = []
+        self.split_pipeline = None
+        self.incremental_leech = None
+        self.content_key = None
         self.is_super_chat = self.message.chat.type.name in ["SUPERGROUP", "CHANNEL"]
         # Set client attribute for Telegram operations
         self.client = TgClient.bot
@@ -324,15 +329,9 @@ class TaskConfig:
                 raise ValueError(f"NO TOKEN! {token_path} not Exists!")
 
     async def before_start(self):
-        self.name_sub = (
-            self.name_sub
-            or self.user_dict.get("NAME_SUBSTITUTE", False)
-            or (
-                hasattr(Config, "NAME_SUBSTITUTE") and Config.NAME_SUBSTITUTE
-                if "NAME_SUBSTITUTE" not in self.user_dict
-                else ""
-            )
-        )
+        # Resolved once per (user, config version) and shared by all tasks
+        self.settings = get_effective_settings(self.user_id)
+        self.name_sub = self.name_sub or self.settings.NAME_SUBSTITUTE or ""
 
         # Initialize image watermark settings
         self.image_watermark_enabled = False
@@ -342,138 +341,47 @@ class TaskConfig:
         self.image_watermark_position = "bottom_right"
         # Get metadata settings with priority
         # Command line arguments take highest priority
-        self.metadata = (
-            self.metadata
-            or self.user_dict.get("METADATA_KEY", False)
-            or (
-                (hasattr(Config, "METADATA_KEY") and Config.METADATA_KEY)
-                if "METADATA_KEY" not in self.user_dict
-                else ""
-            )
-        )
+        self.metadata = self.metadata or self.settings.METADATA_KEY or ""
 
         # Get enhanced metadata settings with priority: command line > user settings > owner settings
         # Command line arguments take highest priority
 
         # Global metadata settings
-        self.metadata_all = (
-            self.metadata_all
-            or self.user_dict.get("METADATA_ALL", False)
-            or (
-                (hasattr(Config, "METADATA_ALL") and Config.METADATA_ALL)
-                if "METADATA_ALL" not in self.user_dict
-                else ""
-            )
-        )
+        self.metadata_all = self.metadata_all or self.settings.METADATA_ALL or ""
 
         self.metadata_title = (
-            self.metadata_title
-            or self.user_dict.get("METADATA_TITLE", False)
-            or (
-                hasattr(Config, "METADATA_TITLE") and Config.METADATA_TITLE
-                if "METADATA_TITLE" not in self.user_dict
-                else ""
-            )
+            self.metadata_title or self.settings.METADATA_TITLE or ""
         )
 
         self.metadata_author = (
-            self.metadata_author
-            or self.user_dict.get("METADATA_AUTHOR", False)
-            or (
-                hasattr(Config, "METADATA_AUTHOR") and Config.METADATA_AUTHOR
-                if "METADATA_AUTHOR" not in self.user_dict
-                else ""
-            )
+            self.metadata_author or self.settings.METADATA_AUTHOR or ""
         )
 
         self.metadata_comment = (
-            self.metadata_comment
-            or self.user_dict.get("METADATA_COMMENT", False)
-            or (
-                hasattr(Config, "METADATA_COMMENT") and Config.METADATA_COMMENT
-                if "METADATA_COMMENT" not in self.user_dict
-                else ""
-            )
+            self.metadata_comment or self.settings.METADATA_COMMENT or ""
         )
 
         # Video track metadata settings
-        self.metadata_video_title = self.user_dict.get(
-            "METADATA_VIDEO_TITLE", False
-        ) or (
-            hasattr(Config, "METADATA_VIDEO_TITLE") and Config.METADATA_VIDEO_TITLE
-            if "METADATA_VIDEO_TITLE" not in self.user_dict
-            else ""
-        )
+        self.metadata_video_title = self.settings.METADATA_VIDEO_TITLE or ""
 
-        self.metadata_video_author = self.user_dict.get(
-            "METADATA_VIDEO_AUTHOR", False
-        ) or (
-            hasattr(Config, "METADATA_VIDEO_AUTHOR") and Config.METADATA_VIDEO_AUTHOR
-            if "METADATA_VIDEO_AUTHOR" not in self.user_dict
-            else ""
-        )
+        self.metadata_video_author = self.settings.METADATA_VIDEO_AUTHOR or ""
 
-        self.metadata_video_comment = self.user_dict.get(
-            "METADATA_VIDEO_COMMENT", False
-        ) or (
-            hasattr(Config, "METADATA_VIDEO_COMMENT")
-            and Config.METADATA_VIDEO_COMMENT
-            if "METADATA_VIDEO_COMMENT" not in self.user_dict
-            else ""
-        )
+        self.metadata_video_comment = self.settings.METADATA_VIDEO_COMMENT or ""
 
         # Audio track metadata settings
-        self.metadata_audio_title = self.user_dict.get(
-            "METADATA_AUDIO_TITLE", False
-        ) or (
-            hasattr(Config, "METADATA_AUDIO_TITLE") and Config.METADATA_AUDIO_TITLE
-            if "METADATA_AUDIO_TITLE" not in self.user_dict
-            else ""
-        )
+        self.metadata_audio_title = self.settings.METADATA_AUDIO_TITLE or ""
 
-        self.metadata_audio_author = self.user_dict.get(
-            "METADATA_AUDIO_AUTHOR", False
-        ) or (
-            hasattr(Config, "METADATA_AUDIO_AUTHOR") and Config.METADATA_AUDIO_AUTHOR
-            if "METADATA_AUDIO_AUTHOR" not in self.user_dict
-            else ""
-        )
+        self.metadata_audio_author = self.settings.METADATA_AUDIO_AUTHOR or ""
 
-        self.metadata_audio_comment = self.user_dict.get(
-            "METADATA_AUDIO_COMMENT", False
-        ) or (
-            hasattr(Config, "METADATA_AUDIO_COMMENT")
-            and Config.METADATA_AUDIO_COMMENT
-            if "METADATA_AUDIO_COMMENT" not in self.user_dict
-            else ""
-        )
+        self.metadata_audio_comment = self.settings.METADATA_AUDIO_COMMENT or ""
 
         # Subtitle track metadata settings
-        self.metadata_subtitle_title = self.user_dict.get(
-            "METADATA_SUBTITLE_TITLE", False
-        ) or (
-            hasattr(Config, "METADATA_SUBTITLE_TITLE")
-            and Config.METADATA_SUBTITLE_TITLE
-            if "METADATA_SUBTITLE_TITLE" not in self.user_dict
-            else ""
-        )
+        self.metadata_subtitle_title = self.settings.METADATA_SUBTITLE_TITLE or ""
 
-        self.metadata_subtitle_author = self.user_dict.get(
-            "METADATA_SUBTITLE_AUTHOR", False
-        ) or (
-            hasattr(Config, "METADATA_SUBTITLE_AUTHOR")
-            and Config.METADATA_SUBTITLE_AUTHOR
-            if "METADATA_SUBTITLE_AUTHOR" not in self.user_dict
-            else ""
-        )
+        self.metadata_subtitle_author = self.settings.METADATA_SUBTITLE_AUTHOR or ""
 
-        self.metadata_subtitle_comment = self.user_dict.get(
-            "METADATA_SUBTITLE_COMMENT", False
-        ) or (
-            hasattr(Config, "METADATA_SUBTITLE_COMMENT")
-            and Config.METADATA_SUBTITLE_COMMENT
-            if "METADATA_SUBTITLE_COMMENT" not in self.user_dict
-            else ""
+        self.metadata_subtitle_comment = (
+            self.settings.METADATA_SUBTITLE_COMMENT or ""
         )
         # Initialize media tools settings with the correct priority
         # Use the get_watermark_settings function to get all watermark settings
@@ -512,7 +420,7 @@ class TaskConfig:
             self.watermark_enabled = True
 
         # Set audio watermark interval
-        self.audio_watermark_interval = self.user_dict.get(
+        self.audio_watermark_interval = self.settings.user(
             "AUDIO_WATERMARK_INTERVAL", 30
         )
         if not self.audio_watermark_interval and hasattr(
@@ -521,7 +429,7 @@ class TaskConfig:
             self.audio_watermark_interval = Config.AUDIO_WATERMARK_INTERVAL
 
         # Set subtitle watermark interval
-        self.subtitle_watermark_interval = self.user_dict.get(
+        self.subtitle_watermark_interval = self.settings.user(
             "SUBTITLE_WATERMARK_INTERVAL", 10
         )
         if not self.subtitle_watermark_interval and hasattr(
@@ -538,61 +446,61 @@ class TaskConfig:
         self.watermark_maintain_quality = True
 
         # Set watermark priority
-        self.watermark_priority = self.user_dict.get("WATERMARK_PRIORITY", 2)
+        self.watermark_priority = self.settings.user("WATERMARK_PRIORITY", 2)
         if not self.watermark_priority and hasattr(Config, "WATERMARK_PRIORITY"):
             self.watermark_priority = Config.WATERMARK_PRIORITY
 
         # Initialize add settings
-        self.add_enabled = self.user_dict.get("ADD_ENABLED", False)
+        self.add_enabled = self.settings.user("ADD_ENABLED", False)
         if not self.add_enabled and hasattr(Config, "ADD_ENABLED"):
             self.add_enabled = Config.ADD_ENABLED
 
         # Set add priority
-        self.add_priority = self.user_dict.get("ADD_PRIORITY", 7)
+        self.add_priority = self.settings.user("ADD_PRIORITY", 7)
         if not self.add_priority and hasattr(Config, "ADD_PRIORITY"):
             self.add_priority = Config.ADD_PRIORITY
 
         # Initialize add track settings
-        self.add_video_enabled = self.user_dict.get("ADD_VIDEO_ENABLED", False)
-        self.add_audio_enabled = self.user_dict.get("ADD_AUDIO_ENABLED", False)
-        self.add_subtitle_enabled = self.user_dict.get("ADD_SUBTITLE_ENABLED", False)
-        self.add_attachment_enabled = self.user_dict.get(
+        self.add_video_enabled = self.settings.user("ADD_VIDEO_ENABLED", False)
+        self.add_audio_enabled = self.settings.user("ADD_AUDIO_ENABLED", False)
+        self.add_subtitle_enabled = self.settings.user("ADD_SUBTITLE_ENABLED", False)
+        self.add_attachment_enabled = self.settings.user(
             "ADD_ATTACHMENT_ENABLED", False
         )
 
         # Initialize add path settings
 
         # Initialize add index settings
-        self.add_video_index = self.user_dict.get("ADD_VIDEO_INDEX", None)
+        self.add_video_index = self.settings.user("ADD_VIDEO_INDEX", None)
         if self.add_video_index is None and hasattr(Config, "ADD_VIDEO_INDEX"):
             self.add_video_index = Config.ADD_VIDEO_INDEX
 
-        self.add_audio_index = self.user_dict.get("ADD_AUDIO_INDEX", None)
+        self.add_audio_index = self.settings.user("ADD_AUDIO_INDEX", None)
         if self.add_audio_index is None and hasattr(Config, "ADD_AUDIO_INDEX"):
             self.add_audio_index = Config.ADD_AUDIO_INDEX
 
-        self.add_subtitle_index = self.user_dict.get("ADD_SUBTITLE_INDEX", None)
+        self.add_subtitle_index = self.settings.user("ADD_SUBTITLE_INDEX", None)
         if self.add_subtitle_index is None and hasattr(Config, "ADD_SUBTITLE_INDEX"):
             self.add_subtitle_index = Config.ADD_SUBTITLE_INDEX
 
-        self.add_attachment_index = self.user_dict.get("ADD_ATTACHMENT_INDEX", None)
+        self.add_attachment_index = self.settings.user("ADD_ATTACHMENT_INDEX", None)
         if self.add_attachment_index is None and hasattr(
             Config, "ADD_ATTACHMENT_INDEX"
         ):
             self.add_attachment_index = Config.ADD_ATTACHMENT_INDEX
 
         # Initialize add delete original setting
-        self.add_delete_original = self.user_dict.get("ADD_DELETE_ORIGINAL", True)
+        self.add_delete_original = self.settings.user("ADD_DELETE_ORIGINAL", True)
         if not self.add_delete_original and hasattr(Config, "ADD_DELETE_ORIGINAL"):
             self.add_delete_original = Config.ADD_DELETE_ORIGINAL
 
         # Initialize merge settings with the same priority logic
-        user_merge_enabled = self.user_dict.get("MERGE_ENABLED", False)
+        user_merge_enabled = self.settings.user("MERGE_ENABLED", False)
         owner_merge_enabled = (
             hasattr(Config, "MERGE_ENABLED") and Config.MERGE_ENABLED
         )
 
-        if "MERGE_ENABLED" in self.user_dict:
+        if self.settings.user_has("MERGE_ENABLED"):
             if user_merge_enabled:
                 self.merge_enabled = True
             else:
@@ -622,8 +530,10 @@ class TaskConfig:
 
         # Initialize merge settings with the same priority logic
         # Concat Demuxer
-        if user_merge_enabled and "CONCAT_DEMUXER_ENABLED" in self.user_dict:
-            self.concat_demuxer_enabled = self.user_dict["CONCAT_DEMUXER_ENABLED"]
+        if user_merge_enabled and self.settings.user_has("CONCAT_DEMUXER_ENABLED"):
+            self.concat_demuxer_enabled = self.settings.user(
+                "CONCAT_DEMUXER_ENABLED"
+            )
         elif (
             self.merge_enabled
             and hasattr(Config, "CONCAT_DEMUXER_ENABLED")
@@ -634,8 +544,10 @@ class TaskConfig:
             self.concat_demuxer_enabled = True
 
         # Filter Complex
-        if user_merge_enabled and "FILTER_COMPLEX_ENABLED" in self.user_dict:
-            self.filter_complex_enabled = self.user_dict["FILTER_COMPLEX_ENABLED"]
+        if user_merge_enabled and self.settings.user_has("FILTER_COMPLEX_ENABLED"):
+            self.filter_complex_enabled = self.settings.user(
+                "FILTER_COMPLEX_ENABLED"
+            )
         elif (
             self.merge_enabled
             and hasattr(Config, "FILTER_COMPLEX_ENABLED")
@@ -648,13 +560,13 @@ class TaskConfig:
         # Merge Output Format Video
         if (
             user_merge_enabled
-            and "MERGE_OUTPUT_FORMAT_VIDEO" in self.user_dict
-            and self.user_dict["MERGE_OUTPUT_FORMAT_VIDEO"]
-            and self.user_dict["MERGE_OUTPUT_FORMAT_VIDEO"] != "none"
+            and self.settings.user_has("MERGE_OUTPUT_FORMAT_VIDEO")
+            and self.settings.user("MERGE_OUTPUT_FORMAT_VIDEO")
+            and self.settings.user("MERGE_OUTPUT_FORMAT_VIDEO") != "none"
         ):
-            self.merge_output_format_video = self.user_dict[
+            self.merge_output_format_video = self.settings.user(
                 "MERGE_OUTPUT_FORMAT_VIDEO"
-            ]
+            )
         elif (
             self.merge_enabled
             and hasattr(Config, "MERGE_OUTPUT_FORMAT_VIDEO")
@@ -669,13 +581,13 @@ class TaskConfig:
         # Merge Output Format Audio
         if (
             user_merge_enabled
-            and "MERGE_OUTPUT_FORMAT_AUDIO" in self.user_dict
-            and self.user_dict["MERGE_OUTPUT_FORMAT_AUDIO"]
-            and self.user_dict["MERGE_OUTPUT_FORMAT_AUDIO"] != "none"
+            and self.settings.user_has("MERGE_OUTPUT_FORMAT_AUDIO")
+            and self.settings.user("MERGE_OUTPUT_FORMAT_AUDIO")
+            and self.settings.user("MERGE_OUTPUT_FORMAT_AUDIO") != "none"
         ):
-            self.merge_output_format_audio = self.user_dict[
+            self.merge_output_format_audio = self.settings.user(
                 "MERGE_OUTPUT_FORMAT_AUDIO"
-            ]
+            )
         elif (
             self.merge_enabled
             and hasattr(Config, "MERGE_OUTPUT_FORMAT_AUDIO")
@@ -690,10 +602,10 @@ class TaskConfig:
         # Merge Priority
         if (
             user_merge_enabled
-            and "MERGE_PRIORITY" in self.user_dict
-            and self.user_dict["MERGE_PRIORITY"]
+            and self.settings.user_has("MERGE_PRIORITY")
+            and self.settings.user("MERGE_PRIORITY")
         ):
-            self.merge_priority = self.user_dict["MERGE_PRIORITY"]
+            self.merge_priority = self.settings.user("MERGE_PRIORITY")
         elif (
             self.merge_enabled
             and hasattr(Config, "MERGE_PRIORITY")
@@ -704,8 +616,8 @@ class TaskConfig:
             self.merge_priority = 1
 
         # Merge Threading
-        if user_merge_enabled and "MERGE_THREADING" in self.user_dict:
-            self.merge_threading = self.user_dict["MERGE_THREADING"]
+        if user_merge_enabled and self.settings.user_has("MERGE_THREADING"):
+            self.merge_threading = self.settings.user("MERGE_THREADING")
         elif (
             self.merge_enabled
             and hasattr(Config, "MERGE_THREADING")
@@ -716,8 +628,8 @@ class TaskConfig:
             self.merge_threading = True
 
         # Merge Remove Original
-        if user_merge_enabled and "MERGE_REMOVE_ORIGINAL" in self.user_dict:
-            self.merge_remove_original = self.user_dict["MERGE_REMOVE_ORIGINAL"]
+        if user_merge_enabled and self.settings.user_has("MERGE_REMOVE_ORIGINAL"):
+            self.merge_remove_original = self.settings.user("MERGE_REMOVE_ORIGINAL")
         elif self.merge_enabled and hasattr(Config, "MERGE_REMOVE_ORIGINAL"):
             self.merge_remove_original = Config.MERGE_REMOVE_ORIGINAL
         else:
@@ -744,16 +656,16 @@ class TaskConfig:
                 )
 
         # Initialize convert settings with the same priority logic
-        self.user_convert_enabled = self.user_dict.get("CONVERT_ENABLED", False)
+        self.user_convert_enabled = self.settings.user("CONVERT_ENABLED", False)
         self.owner_convert_enabled = (
             hasattr(Config, "CONVERT_ENABLED") and Config.CONVERT_ENABLED
         )
 
         # Initialize trim settings with the same priority logic
-        user_trim_enabled = self.user_dict.get("TRIM_ENABLED", False)
+        user_trim_enabled = self.settings.user("TRIM_ENABLED", False)
         owner_trim_enabled = hasattr(Config, "TRIM_ENABLED") and Config.TRIM_ENABLED
 
-        if "TRIM_ENABLED" in self.user_dict:
+        if self.settings.user_has("TRIM_ENABLED"):
             if user_trim_enabled:
                 self.trim_enabled = True
             else:
@@ -774,11 +686,11 @@ class TaskConfig:
             self.trim_start_time = self.trim_start_time
         elif (
             user_trim_enabled
-            and "TRIM_START_TIME" in self.user_dict
-            and self.user_dict["TRIM_START_TIME"]
+            and self.settings.user_has("TRIM_START_TIME")
+            and self.settings.user("TRIM_START_TIME")
         ):
             # User has enabled trim and set start time - use user's start time
-            self.trim_start_time = self.user_dict["TRIM_START_TIME"]
+            self.trim_start_time = self.settings.user("TRIM_START_TIME")
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_START_TIME")
@@ -797,11 +709,11 @@ class TaskConfig:
             self.trim_end_time = self.trim_end_time
         elif (
             user_trim_enabled
-            and "TRIM_END_TIME" in self.user_dict
-            and self.user_dict["TRIM_END_TIME"]
+            and self.settings.user_has("TRIM_END_TIME")
+            and self.settings.user("TRIM_END_TIME")
         ):
             # User has enabled trim and set end time - use user's end time
-            self.trim_end_time = self.user_dict["TRIM_END_TIME"]
+            self.trim_end_time = self.settings.user("TRIM_END_TIME")
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_END_TIME")
@@ -817,18 +729,18 @@ class TaskConfig:
         # Initialize trim priority
         if (
             user_trim_enabled
-            and "TRIM_PRIORITY" in self.user_dict
-            and self.user_dict["TRIM_PRIORITY"]
+            and self.settings.user_has("TRIM_PRIORITY")
+            and self.settings.user("TRIM_PRIORITY")
         ):
-            self.trim_priority = self.user_dict["TRIM_PRIORITY"]
+            self.trim_priority = self.settings.user("TRIM_PRIORITY")
         elif self.trim_enabled and Config.TRIM_PRIORITY:
             self.trim_priority = Config.TRIM_PRIORITY
         else:
             self.trim_priority = 5
 
         # Initialize video trim settings
-        if user_trim_enabled and "TRIM_VIDEO_ENABLED" in self.user_dict:
-            self.trim_video_enabled = self.user_dict["TRIM_VIDEO_ENABLED"]
+        if user_trim_enabled and self.settings.user_has("TRIM_VIDEO_ENABLED"):
+            self.trim_video_enabled = self.settings.user("TRIM_VIDEO_ENABLED")
         elif self.trim_enabled and hasattr(Config, "TRIM_VIDEO_ENABLED"):
             self.trim_video_enabled = Config.TRIM_VIDEO_ENABLED
         else:
@@ -836,10 +748,10 @@ class TaskConfig:
 
         if (
             user_trim_enabled
-            and "TRIM_VIDEO_CODEC" in self.user_dict
-            and self.user_dict["TRIM_VIDEO_CODEC"]
+            and self.settings.user_has("TRIM_VIDEO_CODEC")
+            and self.settings.user("TRIM_VIDEO_CODEC")
         ):
-            self.trim_video_codec = self.user_dict["TRIM_VIDEO_CODEC"]
+            self.trim_video_codec = self.settings.user("TRIM_VIDEO_CODEC")
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_VIDEO_CODEC")
@@ -851,10 +763,10 @@ class TaskConfig:
 
         if (
             user_trim_enabled
-            and "TRIM_VIDEO_PRESET" in self.user_dict
-            and self.user_dict["TRIM_VIDEO_PRESET"]
+            and self.settings.user_has("TRIM_VIDEO_PRESET")
+            and self.settings.user("TRIM_VIDEO_PRESET")
         ):
-            self.trim_video_preset = self.user_dict["TRIM_VIDEO_PRESET"]
+            self.trim_video_preset = self.settings.user("TRIM_VIDEO_PRESET")
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_VIDEO_PRESET")
@@ -865,8 +777,8 @@ class TaskConfig:
             self.trim_video_preset = "medium"
 
         # Initialize audio trim settings
-        if user_trim_enabled and "TRIM_AUDIO_ENABLED" in self.user_dict:
-            self.trim_audio_enabled = self.user_dict["TRIM_AUDIO_ENABLED"]
+        if user_trim_enabled and self.settings.user_has("TRIM_AUDIO_ENABLED"):
+            self.trim_audio_enabled = self.settings.user("TRIM_AUDIO_ENABLED")
         elif self.trim_enabled and hasattr(Config, "TRIM_AUDIO_ENABLED"):
             self.trim_audio_enabled = Config.TRIM_AUDIO_ENABLED
         else:
@@ -874,10 +786,10 @@ class TaskConfig:
 
         if (
             user_trim_enabled
-            and "TRIM_AUDIO_CODEC" in self.user_dict
-            and self.user_dict["TRIM_AUDIO_CODEC"]
+            and self.settings.user_has("TRIM_AUDIO_CODEC")
+            and self.settings.user("TRIM_AUDIO_CODEC")
         ):
-            self.trim_audio_codec = self.user_dict["TRIM_AUDIO_CODEC"]
+            self.trim_audio_codec = self.settings.user("TRIM_AUDIO_CODEC")
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_AUDIO_CODEC")
@@ -889,10 +801,10 @@ class TaskConfig:
 
         if (
             user_trim_enabled
-            and "TRIM_AUDIO_PRESET" in self.user_dict
-            and self.user_dict["TRIM_AUDIO_PRESET"]
+            and self.settings.user_has("TRIM_AUDIO_PRESET")
+            and self.settings.user("TRIM_AUDIO_PRESET")
         ):
-            self.trim_audio_preset = self.user_dict["TRIM_AUDIO_PRESET"]
+            self.trim_audio_preset = self.settings.user("TRIM_AUDIO_PRESET")
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_AUDIO_PRESET")
@@ -903,8 +815,8 @@ class TaskConfig:
             self.trim_audio_preset = "medium"
 
         # Initialize image trim settings
-        if user_trim_enabled and "TRIM_IMAGE_ENABLED" in self.user_dict:
-            self.trim_image_enabled = self.user_dict["TRIM_IMAGE_ENABLED"]
+        if user_trim_enabled and self.settings.user_has("TRIM_IMAGE_ENABLED"):
+            self.trim_image_enabled = self.settings.user("TRIM_IMAGE_ENABLED")
         elif self.trim_enabled and hasattr(Config, "TRIM_IMAGE_ENABLED"):
             self.trim_image_enabled = Config.TRIM_IMAGE_ENABLED
         else:
@@ -912,10 +824,10 @@ class TaskConfig:
 
         if (
             user_trim_enabled
-            and "TRIM_IMAGE_QUALITY" in self.user_dict
-            and self.user_dict["TRIM_IMAGE_QUALITY"]
+            and self.settings.user_has("TRIM_IMAGE_QUALITY")
+            and self.settings.user("TRIM_IMAGE_QUALITY")
         ):
-            self.trim_image_quality = self.user_dict["TRIM_IMAGE_QUALITY"]
+            self.trim_image_quality = self.settings.user("TRIM_IMAGE_QUALITY")
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_IMAGE_QUALITY")
@@ -926,8 +838,8 @@ class TaskConfig:
             self.trim_image_quality = "none"
 
         # Initialize document trim settings
-        if user_trim_enabled and "TRIM_DOCUMENT_ENABLED" in self.user_dict:
-            self.trim_document_enabled = self.user_dict["TRIM_DOCUMENT_ENABLED"]
+        if user_trim_enabled and self.settings.user_has("TRIM_DOCUMENT_ENABLED"):
+            self.trim_document_enabled = self.settings.user("TRIM_DOCUMENT_ENABLED")
         elif self.trim_enabled and hasattr(Config, "TRIM_DOCUMENT_ENABLED"):
             self.trim_document_enabled = Config.TRIM_DOCUMENT_ENABLED
         else:
@@ -935,10 +847,10 @@ class TaskConfig:
 
         if (
             user_trim_enabled
-            and "TRIM_DOCUMENT_QUALITY" in self.user_dict
-            and self.user_dict["TRIM_DOCUMENT_QUALITY"]
+            and self.settings.user_has("TRIM_DOCUMENT_QUALITY")
+            and self.settings.user("TRIM_DOCUMENT_QUALITY")
         ):
-            self.trim_document_quality = self.user_dict["TRIM_DOCUMENT_QUALITY"]
+            self.trim_document_quality = self.settings.user("TRIM_DOCUMENT_QUALITY")
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_DOCUMENT_QUALITY")
@@ -949,8 +861,8 @@ class TaskConfig:
             self.trim_document_quality = "none"
 
         # Initialize subtitle trim settings
-        if user_trim_enabled and "TRIM_SUBTITLE_ENABLED" in self.user_dict:
-            self.trim_subtitle_enabled = self.user_dict["TRIM_SUBTITLE_ENABLED"]
+        if user_trim_enabled and self.settings.user_has("TRIM_SUBTITLE_ENABLED"):
+            self.trim_subtitle_enabled = self.settings.user("TRIM_SUBTITLE_ENABLED")
         elif self.trim_enabled and hasattr(Config, "TRIM_SUBTITLE_ENABLED"):
             self.trim_subtitle_enabled = Config.TRIM_SUBTITLE_ENABLED
         else:
@@ -958,10 +870,12 @@ class TaskConfig:
 
         if (
             user_trim_enabled
-            and "TRIM_SUBTITLE_ENCODING" in self.user_dict
-            and self.user_dict["TRIM_SUBTITLE_ENCODING"]
+            and self.settings.user_has("TRIM_SUBTITLE_ENCODING")
+            and self.settings.user("TRIM_SUBTITLE_ENCODING")
         ):
-            self.trim_subtitle_encoding = self.user_dict["TRIM_SUBTITLE_ENCODING"]
+            self.trim_subtitle_encoding = self.settings.user(
+                "TRIM_SUBTITLE_ENCODING"
+            )
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_SUBTITLE_ENCODING")
@@ -972,16 +886,16 @@ class TaskConfig:
             self.trim_subtitle_encoding = "utf-8"
 
         # Initialize archive trim settings
-        if user_trim_enabled and "TRIM_ARCHIVE_ENABLED" in self.user_dict:
-            self.trim_archive_enabled = self.user_dict["TRIM_ARCHIVE_ENABLED"]
+        if user_trim_enabled and self.settings.user_has("TRIM_ARCHIVE_ENABLED"):
+            self.trim_archive_enabled = self.settings.user("TRIM_ARCHIVE_ENABLED")
         elif self.trim_enabled and hasattr(Config, "TRIM_ARCHIVE_ENABLED"):
             self.trim_archive_enabled = Config.TRIM_ARCHIVE_ENABLED
         else:
             self.trim_archive_enabled = False
 
         # Initialize trim delete original setting
-        if user_trim_enabled and "TRIM_DELETE_ORIGINAL" in self.user_dict:
-            self.trim_delete_original = self.user_dict["TRIM_DELETE_ORIGINAL"]
+        if user_trim_enabled and self.settings.user_has("TRIM_DELETE_ORIGINAL"):
+            self.trim_delete_original = self.settings.user("TRIM_DELETE_ORIGINAL")
         elif self.trim_enabled and hasattr(Config, "TRIM_DELETE_ORIGINAL"):
             self.trim_delete_original = Config.TRIM_DELETE_ORIGINAL
         else:
@@ -1020,11 +934,11 @@ class TaskConfig:
         # Initialize video format setting
         if (
             user_trim_enabled
-            and "TRIM_VIDEO_FORMAT" in self.user_dict
-            and self.user_dict["TRIM_VIDEO_FORMAT"]
-            and self.user_dict["TRIM_VIDEO_FORMAT"].lower() != "none"
+            and self.settings.user_has("TRIM_VIDEO_FORMAT")
+            and self.settings.user("TRIM_VIDEO_FORMAT")
+            and self.settings.user("TRIM_VIDEO_FORMAT").lower() != "none"
         ):
-            self.trim_video_format = self.user_dict["TRIM_VIDEO_FORMAT"]
+            self.trim_video_format = self.settings.user("TRIM_VIDEO_FORMAT")
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_VIDEO_FORMAT")
@@ -1038,11 +952,11 @@ class TaskConfig:
         # Initialize audio format setting
         if (
             user_trim_enabled
-            and "TRIM_AUDIO_FORMAT" in self.user_dict
-            and self.user_dict["TRIM_AUDIO_FORMAT"]
-            and self.user_dict["TRIM_AUDIO_FORMAT"].lower() != "none"
+            and self.settings.user_has("TRIM_AUDIO_FORMAT")
+            and self.settings.user("TRIM_AUDIO_FORMAT")
+            and self.settings.user("TRIM_AUDIO_FORMAT").lower() != "none"
         ):
-            self.trim_audio_format = self.user_dict["TRIM_AUDIO_FORMAT"]
+            self.trim_audio_format = self.settings.user("TRIM_AUDIO_FORMAT")
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_AUDIO_FORMAT")
@@ -1056,11 +970,11 @@ class TaskConfig:
         # Initialize image format setting
         if (
             user_trim_enabled
-            and "TRIM_IMAGE_FORMAT" in self.user_dict
-            and self.user_dict["TRIM_IMAGE_FORMAT"]
-            and self.user_dict["TRIM_IMAGE_FORMAT"].lower() != "none"
+            and self.settings.user_has("TRIM_IMAGE_FORMAT")
+            and self.settings.user("TRIM_IMAGE_FORMAT")
+            and self.settings.user("TRIM_IMAGE_FORMAT").lower() != "none"
         ):
-            self.trim_image_format = self.user_dict["TRIM_IMAGE_FORMAT"]
+            self.trim_image_format = self.settings.user("TRIM_IMAGE_FORMAT")
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_IMAGE_FORMAT")
@@ -1074,11 +988,11 @@ class TaskConfig:
         # Initialize document format setting
         if (
             user_trim_enabled
-            and "TRIM_DOCUMENT_FORMAT" in self.user_dict
-            and self.user_dict["TRIM_DOCUMENT_FORMAT"]
-            and self.user_dict["TRIM_DOCUMENT_FORMAT"].lower() != "none"
+            and self.settings.user_has("TRIM_DOCUMENT_FORMAT")
+            and self.settings.user("TRIM_DOCUMENT_FORMAT")
+            and self.settings.user("TRIM_DOCUMENT_FORMAT").lower() != "none"
         ):
-            self.trim_document_format = self.user_dict["TRIM_DOCUMENT_FORMAT"]
+            self.trim_document_format = self.settings.user("TRIM_DOCUMENT_FORMAT")
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_DOCUMENT_FORMAT")
@@ -1092,11 +1006,11 @@ class TaskConfig:
         # Initialize subtitle format setting
         if (
             user_trim_enabled
-            and "TRIM_SUBTITLE_FORMAT" in self.user_dict
-            and self.user_dict["TRIM_SUBTITLE_FORMAT"]
-            and self.user_dict["TRIM_SUBTITLE_FORMAT"].lower() != "none"
+            and self.settings.user_has("TRIM_SUBTITLE_FORMAT")
+            and self.settings.user("TRIM_SUBTITLE_FORMAT")
+            and self.settings.user("TRIM_SUBTITLE_FORMAT").lower() != "none"
         ):
-            self.trim_subtitle_format = self.user_dict["TRIM_SUBTITLE_FORMAT"]
+            self.trim_subtitle_format = self.settings.user("TRIM_SUBTITLE_FORMAT")
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_SUBTITLE_FORMAT")
@@ -1110,11 +1024,11 @@ class TaskConfig:
         # Initialize archive format setting
         if (
             user_trim_enabled
-            and "TRIM_ARCHIVE_FORMAT" in self.user_dict
-            and self.user_dict["TRIM_ARCHIVE_FORMAT"]
-            and self.user_dict["TRIM_ARCHIVE_FORMAT"].lower() != "none"
+            and self.settings.user_has("TRIM_ARCHIVE_FORMAT")
+            and self.settings.user("TRIM_ARCHIVE_FORMAT")
+            and self.settings.user("TRIM_ARCHIVE_FORMAT").lower() != "none"
         ):
-            self.trim_archive_format = self.user_dict["TRIM_ARCHIVE_FORMAT"]
+            self.trim_archive_format = self.settings.user("TRIM_ARCHIVE_FORMAT")
         elif (
             self.trim_enabled
             and hasattr(Config, "TRIM_ARCHIVE_FORMAT")
@@ -1134,25 +1048,13 @@ class TaskConfig:
     async def initialize_add_settings(self):
         """Initialize add settings with priority logic."""
         # Get user settings
-        user_add_enabled = self.user_dict.get("ADD_ENABLED", False)
-
-        # Get owner settings from database
-        owner_add_enabled = False
-        try:
-            from bot.helper.ext_utils.db_handler import database
+        user_add_enabled = self.settings.user("ADD_ENABLED", False)
 
-            if database.db is not None:
-                db_config = await database.db.settings.config.find_one(
-                    {"_id": TgClient.ID},
-                    {"ADD_ENABLED": 1, "_id": 0},
-                )
-                if db_config and "ADD_ENABLED" in db_config:
-                    owner_add_enabled = db_config["ADD_ENABLED"]
-        except Exception as e:
-            LOGGER.error(f"Error getting ADD_ENABLED from database: {e}")
+        # Owner settings come from Config, which mirrors the DB config document
+        owner_add_enabled = self.settings.owner("ADD_ENABLED", False)
 
         # Set add_enabled based on user and owner settings
-        if "ADD_ENABLED" in self.user_dict:
+        if self.settings.user_has("ADD_ENABLED"):
             if user_add_enabled:
                 self.add_enabled = True
             else:
@@ -1160,97 +1062,47 @@ class TaskConfig:
         else:
             self.add_enabled = owner_add_enabled
 
-        # Get all ADD_ settings from database
-        db_add_settings = {}
-        try:
-            from bot.helper.ext_utils.db_handler import database
-
-            if database.db is not None:
-                # Create a projection that includes all ADD_ settings
-                projection = {"_id": 0}
-                for key in [
-                    "ADD_PRIORITY",
-                    "ADD_DELETE_ORIGINAL",
-                    "ADD_VIDEO_ENABLED",
-                    "ADD_VIDEO_PATH",
-                    "ADD_VIDEO_CODEC",
-                    "ADD_VIDEO_INDEX",
-                    "ADD_VIDEO_QUALITY",
-                    "ADD_VIDEO_PRESET",
-                    "ADD_VIDEO_BITRATE",
-                    "ADD_VIDEO_RESOLUTION",
-                    "ADD_VIDEO_FPS",
-                    "ADD_AUDIO_ENABLED",
-                    "ADD_AUDIO_PATH",
-                    "ADD_AUDIO_CODEC",
-                    "ADD_AUDIO_INDEX",
-                    "ADD_AUDIO_BITRATE",
-                    "ADD_AUDIO_CHANNELS",
-                    "ADD_AUDIO_SAMPLING",
-                    "ADD_AUDIO_VOLUME",
-                    "ADD_SUBTITLE_ENABLED",
-                    "ADD_SUBTITLE_PATH",
-                    "ADD_SUBTITLE_CODEC",
-                    "ADD_SUBTITLE_INDEX",
-                    "ADD_SUBTITLE_LANGUAGE",
-                    "ADD_SUBTITLE_ENCODING",
-                    "ADD_SUBTITLE_FONT",
-                    "ADD_SUBTITLE_FONT_SIZE",
-                    "ADD_ATTACHMENT_ENABLED",
-                    "ADD_ATTACHMENT_PATH",
-                    "ADD_ATTACHMENT_INDEX",
-                    "ADD_ATTACHMENT_MIMETYPE",
-                ]:
-                    projection[key] = 1
-
-                db_config = await database.db.settings.config.find_one(
-                    {"_id": TgClient.ID},
-                    projection,
-                )
-                if db_config:
-                    db_add_settings = db_config
-        except Exception as e:
-            LOGGER.error(f"Error getting ADD_ settings from database: {e}")
+        db_add_settings = self.settings.owner_values
 
         # Initialize add priority
         if (
             user_add_enabled
-            and "ADD_PRIORITY" in self.user_dict
-            and self.user_dict["ADD_PRIORITY"]
+            and self.settings.user_has("ADD_PRIORITY")
+            and self.settings.user("ADD_PRIORITY")
         ):
-            self.add_priority = self.user_dict["ADD_PRIORITY"]
+            self.add_priority = self.settings.user("ADD_PRIORITY")
         elif self.add_enabled and "ADD_PRIORITY" in db_add_settings:
             self.add_priority = db_add_settings["ADD_PRIORITY"]
         else:
             self.add_priority = 7
 
         # Initialize delete original setting
-        if user_add_enabled and "ADD_DELETE_ORIGINAL" in self.user_dict:
-            self.add_delete_original = self.user_dict["ADD_DELETE_ORIGINAL"]
+        if user_add_enabled and self.settings.user_has("ADD_DELETE_ORIGINAL"):
+            self.add_delete_original = self.settings.user("ADD_DELETE_ORIGINAL")
         elif self.add_enabled and "ADD_DELETE_ORIGINAL" in db_add_settings:
             self.add_delete_original = db_add_settings["ADD_DELETE_ORIGINAL"]
         else:
             self.add_delete_original = True
 
         # Initialize preserve tracks setting
-        if user_add_enabled and "ADD_PRESERVE_TRACKS" in self.user_dict:
-            self.add_preserve_tracks = self.user_dict["ADD_PRESERVE_TRACKS"]
+        if user_add_enabled and self.settings.user_has("ADD_PRESERVE_TRACKS"):
+            self.add_preserve_tracks = self.settings.user("ADD_PRESERVE_TRACKS")
         elif self.add_enabled and "ADD_PRESERVE_TRACKS" in db_add_settings:
             self.add_preserve_tracks = db_add_settings["ADD_PRESERVE_TRACKS"]
         else:
             self.add_preserve_tracks = False
 
         # Initialize replace tracks setting
-        if user_add_enabled and "ADD_REPLACE_TRACKS" in self.user_dict:
-            self.add_replace_tracks = self.user_dict["ADD_REPLACE_TRACKS"]
+        if user_add_enabled and self.settings.user_has("ADD_REPLACE_TRACKS"):
+            self.add_replace_tracks = self.settings.user("ADD_REPLACE_TRACKS")
         elif self.add_enabled and "ADD_REPLACE_TRACKS" in db_add_settings:
             self.add_replace_tracks = db_add_settings["ADD_REPLACE_TRACKS"]
         else:
             self.add_replace_tracks = False
 
         # Initialize video add settings
-        if user_add_enabled and "ADD_VIDEO_ENABLED" in self.user_dict:
-            self.add_video_enabled = self.user_dict["ADD_VIDEO_ENABLED"]
+        if user_add_enabled and self.settings.user_has("ADD_VIDEO_ENABLED"):
+            self.add_video_enabled = self.settings.user("ADD_VIDEO_ENABLED")
         elif self.add_enabled and "ADD_VIDEO_ENABLED" in db_add_settings:
             self.add_video_enabled = db_add_settings["ADD_VIDEO_ENABLED"]
         else:
@@ -1261,10 +1113,10 @@ class TaskConfig:
         # Initialize video index
         if (
             user_add_enabled
-            and "ADD_VIDEO_INDEX" in self.user_dict
-            and self.user_dict["ADD_VIDEO_INDEX"] is not None
+            and self.settings.user_has("ADD_VIDEO_INDEX")
+            and self.settings.user("ADD_VIDEO_INDEX") is not None
         ):
-            self.add_video_index = self.user_dict["ADD_VIDEO_INDEX"]
+            self.add_video_index = self.settings.user("ADD_VIDEO_INDEX")
         elif (
             self.add_enabled
             and "ADD_VIDEO_INDEX" in db_add_settings
@@ -1277,10 +1129,10 @@ class TaskConfig:
         # Initialize video codec
         if (
             user_add_enabled
-            and "ADD_VIDEO_CODEC" in self.user_dict
-            and self.user_dict["ADD_VIDEO_CODEC"] != "none"
+            and self.settings.user_has("ADD_VIDEO_CODEC")
+            and self.settings.user("ADD_VIDEO_CODEC") != "none"
         ):
-            self.add_video_codec = self.user_dict["ADD_VIDEO_CODEC"]
+            self.add_video_codec = self.settings.user("ADD_VIDEO_CODEC")
         elif (
             self.add_enabled
             and "ADD_VIDEO_CODEC" in db_add_settings
@@ -1293,10 +1145,10 @@ class TaskConfig:
         # Initialize video quality
         if (
             user_add_enabled
-            and "ADD_VIDEO_QUALITY" in self.user_dict
-            and self.user_dict["ADD_VIDEO_QUALITY"] != "none"
+            and self.settings.user_has("ADD_VIDEO_QUALITY")
+            and self.settings.user("ADD_VIDEO_QUALITY") != "none"
         ):
-            self.add_video_quality = self.user_dict["ADD_VIDEO_QUALITY"]
+            self.add_video_quality = self.settings.user("ADD_VIDEO_QUALITY")
         elif (
             self.add_enabled
             and "ADD_VIDEO_QUALITY" in db_add_settings
@@ -1309,10 +1161,10 @@ class TaskConfig:
         # Initialize video preset
         if (
             user_add_enabled
-            and "ADD_VIDEO_PRESET" in self.user_dict
-            and self.user_dict["ADD_VIDEO_PRESET"] != "none"
+            and self.settings.user_has("ADD_VIDEO_PRESET")
+            and self.settings.user("ADD_VIDEO_PRESET") != "none"
         ):
-            self.add_video_preset = self.user_dict["ADD_VIDEO_PRESET"]
+            self.add_video_preset = self.settings.user("ADD_VIDEO_PRESET")
         elif (
             self.add_enabled
             and "ADD_VIDEO_PRESET" in db_add_settings
@@ -1325,10 +1177,10 @@ class TaskConfig:
         # Initialize video bitrate
         if (
             user_add_enabled
-            and "ADD_VIDEO_BITRATE" in self.user_dict
-            and self.user_dict["ADD_VIDEO_BITRATE"] != "none"
+            and self.settings.user_has("ADD_VIDEO_BITRATE")
+            and self.settings.user("ADD_VIDEO_BITRATE") != "none"
         ):
-            self.add_video_bitrate = self.user_dict["ADD_VIDEO_BITRATE"]
+            self.add_video_bitrate = self.settings.user("ADD_VIDEO_BITRATE")
         elif (
             self.add_enabled
             and "ADD_VIDEO_BITRATE" in db_add_settings
@@ -1341,10 +1193,10 @@ class TaskConfig:
         # Initialize video resolution
         if (
             user_add_enabled
-            and "ADD_VIDEO_RESOLUTION" in self.user_dict
-            and self.user_dict["ADD_VIDEO_RESOLUTION"] != "none"
+            and self.settings.user_has("ADD_VIDEO_RESOLUTION")
+            and self.settings.user("ADD_VIDEO_RESOLUTION") != "none"
         ):
-            self.add_video_resolution = self.user_dict["ADD_VIDEO_RESOLUTION"]
+            self.add_video_resolution = self.settings.user("ADD_VIDEO_RESOLUTION")
         elif (
             self.add_enabled
             and "ADD_VIDEO_RESOLUTION" in db_add_settings
@@ -1357,10 +1209,10 @@ class TaskConfig:
         # Initialize video fps
         if (
             user_add_enabled
-            and "ADD_VIDEO_FPS" in self.user_dict
-            and self.user_dict["ADD_VIDEO_FPS"] != "none"
+            and self.settings.user_has("ADD_VIDEO_FPS")
+            and self.settings.user("ADD_VIDEO_FPS") != "none"
         ):
-            self.add_video_fps = self.user_dict["ADD_VIDEO_FPS"]
+            self.add_video_fps = self.settings.user("ADD_VIDEO_FPS")
         elif (
             self.add_enabled
             and "ADD_VIDEO_FPS" in db_add_settings
@@ -1371,8 +1223,8 @@ class TaskConfig:
             self.add_video_fps = "none"
 
         # Initialize audio add settings
-        if user_add_enabled and "ADD_AUDIO_ENABLED" in self.user_dict:
-            self.add_audio_enabled = self.user_dict["ADD_AUDIO_ENABLED"]
+        if user_add_enabled and self.settings.user_has("ADD_AUDIO_ENABLED"):
+            self.add_audio_enabled = self.settings.user("ADD_AUDIO_ENABLED")
         elif self.add_enabled and "ADD_AUDIO_ENABLED" in db_add_settings:
             self.add_audio_enabled = db_add_settings["ADD_AUDIO_ENABLED"]
         else:
@@ -1383,10 +1235,10 @@ class TaskConfig:
         # Initialize audio index
         if (
             user_add_enabled
-            and "ADD_AUDIO_INDEX" in self.user_dict
-            and self.user_dict["ADD_AUDIO_INDEX"] is not None
+            and self.settings.user_has("ADD_AUDIO_INDEX")
+            and self.settings.user("ADD_AUDIO_INDEX") is not None
         ):
-            self.add_audio_index = self.user_dict["ADD_AUDIO_INDEX"]
+            self.add_audio_index = self.settings.user("ADD_AUDIO_INDEX")
         elif (
             self.add_enabled
             and "ADD_AUDIO_INDEX" in db_add_settings
@@ -1399,10 +1251,10 @@ class TaskConfig:
         # Initialize audio codec
         if (
             user_add_enabled
-            and "ADD_AUDIO_CODEC" in self.user_dict
-            and self.user_dict["ADD_AUDIO_CODEC"] != "none"
+            and self.settings.user_has("ADD_AUDIO_CODEC")
+            and self.settings.user("ADD_AUDIO_CODEC") != "none"
         ):
-            self.add_audio_codec = self.user_dict["ADD_AUDIO_CODEC"]
+            self.add_audio_codec = self.settings.user("ADD_AUDIO_CODEC")
         elif (
             self.add_enabled
             and "ADD_AUDIO_CODEC" in db_add_settings
@@ -1415,10 +1267,10 @@ class TaskConfig:
         # Initialize audio bitrate
         if (
             user_add_enabled
-            and "ADD_AUDIO_BITRATE" in self.user_dict
-            and self.user_dict["ADD_AUDIO_BITRATE"] != "none"
+            and self.settings.user_has("ADD_AUDIO_BITRATE")
+            and self.settings.user("ADD_AUDIO_BITRATE") != "none"
         ):
-            self.add_audio_bitrate = self.user_dict["ADD_AUDIO_BITRATE"]
+            self.add_audio_bitrate = self.settings.user("ADD_AUDIO_BITRATE")
         elif (
             self.add_enabled
             and "ADD_AUDIO_BITRATE" in db_add_settings
@@ -1431,10 +1283,10 @@ class TaskConfig:
         # Initialize audio channels
         if (
             user_add_enabled
-            and "ADD_AUDIO_CHANNELS" in self.user_dict
-            and self.user_dict["ADD_AUDIO_CHANNELS"] != "none"
+            and self.settings.user_has("ADD_AUDIO_CHANNELS")
+            and self.settings.user("ADD_AUDIO_CHANNELS") != "none"
         ):
-            self.add_audio_channels = self.user_dict["ADD_AUDIO_CHANNELS"]
+            self.add_audio_channels = self.settings.user("ADD_AUDIO_CHANNELS")
         elif (
             self.add_enabled
             and "ADD_AUDIO_CHANNELS" in db_add_settings
@@ -1447,10 +1299,10 @@ class TaskConfig:
         # Initialize audio sampling
         if (
             user_add_enabled
-            and "ADD_AUDIO_SAMPLING" in self.user_dict
-            and self.user_dict["ADD_AUDIO_SAMPLING"] != "none"
+            and self.settings.user_has("ADD_AUDIO_SAMPLING")
+            and self.settings.user("ADD_AUDIO_SAMPLING") != "none"
         ):
-            self.add_audio_sampling = self.user_dict["ADD_AUDIO_SAMPLING"]
+            self.add_audio_sampling = self.settings.user("ADD_AUDIO_SAMPLING")
         elif (
             self.add_enabled
             and "ADD_AUDIO_SAMPLING" in db_add_settings
@@ -1463,10 +1315,10 @@ class TaskConfig:
         # Initialize audio volume
         if (
             user_add_enabled
-            and "ADD_AUDIO_VOLUME" in self.user_dict
-            and self.user_dict["ADD_AUDIO_VOLUME"] != "none"
+            and self.settings.user_has("ADD_AUDIO_VOLUME")
+            and self.settings.user("ADD_AUDIO_VOLUME") != "none"
         ):
-            self.add_audio_volume = self.user_dict["ADD_AUDIO_VOLUME"]
+            self.add_audio_volume = self.settings.user("ADD_AUDIO_VOLUME")
         elif (
             self.add_enabled
             and "ADD_AUDIO_VOLUME" in db_add_settings
@@ -1477,8 +1329,8 @@ class TaskConfig:
             self.add_audio_volume = "none"
 
         # Initialize subtitle add settings
-        if user_add_enabled and "ADD_SUBTITLE_ENABLED" in self.user_dict:
-            self.add_subtitle_enabled = self.user_dict["ADD_SUBTITLE_ENABLED"]
+        if user_add_enabled and self.settings.user_has("ADD_SUBTITLE_ENABLED"):
+            self.add_subtitle_enabled = self.settings.user("ADD_SUBTITLE_ENABLED")
         elif self.add_enabled and "ADD_SUBTITLE_ENABLED" in db_add_settings:
             self.add_subtitle_enabled = db_add_settings["ADD_SUBTITLE_ENABLED"]
         else:
@@ -1489,10 +1341,10 @@ class TaskConfig:
         # Initialize subtitle index
         if (
             user_add_enabled
-            and "ADD_SUBTITLE_INDEX" in self.user_dict
-            and self.user_dict["ADD_SUBTITLE_INDEX"] is not None
+            and self.settings.user_has("ADD_SUBTITLE_INDEX")
+            and self.settings.user("ADD_SUBTITLE_INDEX") is not None
         ):
-            self.add_subtitle_index = self.user_dict["ADD_SUBTITLE_INDEX"]
+            self.add_subtitle_index = self.settings.user("ADD_SUBTITLE_INDEX")
         elif (
             self.add_enabled
             and "ADD_SUBTITLE_INDEX" in db_add_settings
@@ -1505,10 +1357,10 @@ class TaskConfig:
         # Initialize subtitle codec
         if (
             user_add_enabled
-            and "ADD_SUBTITLE_CODEC" in self.user_dict
-            and self.user_dict["ADD_SUBTITLE_CODEC"] != "none"
+            and self.settings.user_has("ADD_SUBTITLE_CODEC")
+            and self.settings.user("ADD_SUBTITLE_CODEC") != "none"
         ):
-            self.add_subtitle_codec = self.user_dict["ADD_SUBTITLE_CODEC"]
+            self.add_subtitle_codec = self.settings.user("ADD_SUBTITLE_CODEC")
         elif (
             self.add_enabled
             and "ADD_SUBTITLE_CODEC" in db_add_settings
@@ -1521,10 +1373,10 @@ class TaskConfig:
         # Initialize subtitle language
         if (
             user_add_enabled
-            and "ADD_SUBTITLE_LANGUAGE" in self.user_dict
-            and self.user_dict["ADD_SUBTITLE_LANGUAGE"] != "none"
+            and self.settings.user_has("ADD_SUBTITLE_LANGUAGE")
+            and self.settings.user("ADD_SUBTITLE_LANGUAGE") != "none"
         ):
-            self.add_subtitle_language = self.user_dict["ADD_SUBTITLE_LANGUAGE"]
+            self.add_subtitle_language = self.settings.user("ADD_SUBTITLE_LANGUAGE")
         elif (
             self.add_enabled
             and "ADD_SUBTITLE_LANGUAGE" in db_add_settings
@@ -1537,10 +1389,10 @@ class TaskConfig:
         # Initialize subtitle encoding
         if (
             user_add_enabled
-            and "ADD_SUBTITLE_ENCODING" in self.user_dict
-            and self.user_dict["ADD_SUBTITLE_ENCODING"] != "none"
+            and self.settings.user_has("ADD_SUBTITLE_ENCODING")
+            and self.settings.user("ADD_SUBTITLE_ENCODING") != "none"
         ):
-            self.add_subtitle_encoding = self.user_dict["ADD_SUBTITLE_ENCODING"]
+            self.add_subtitle_encoding = self.settings.user("ADD_SUBTITLE_ENCODING")
         elif (
             self.add_enabled
             and "ADD_SUBTITLE_ENCODING" in db_add_settings
@@ -1553,10 +1405,10 @@ class TaskConfig:
         # Initialize subtitle font
         if (
             user_add_enabled
-            and "ADD_SUBTITLE_FONT" in self.user_dict
-            and self.user_dict["ADD_SUBTITLE_FONT"] != "none"
+            and self.settings.user_has("ADD_SUBTITLE_FONT")
+            and self.settings.user("ADD_SUBTITLE_FONT") != "none"
         ):
-            self.add_subtitle_font = self.user_dict["ADD_SUBTITLE_FONT"]
+            self.add_subtitle_font = self.settings.user("ADD_SUBTITLE_FONT")
         elif (
             self.add_enabled
             and "ADD_SUBTITLE_FONT" in db_add_settings
@@ -1569,10 +1421,12 @@ class TaskConfig:
         # Initialize subtitle font size
         if (
             user_add_enabled
-            and "ADD_SUBTITLE_FONT_SIZE" in self.user_dict
-            and self.user_dict["ADD_SUBTITLE_FONT_SIZE"] != "none"
+            and self.settings.user_has("ADD_SUBTITLE_FONT_SIZE")
+            and self.settings.user("ADD_SUBTITLE_FONT_SIZE") != "none"
         ):
-            self.add_subtitle_font_size = self.user_dict["ADD_SUBTITLE_FONT_SIZE"]
+            self.add_subtitle_font_size = self.settings.user(
+                "ADD_SUBTITLE_FONT_SIZE"
+            )
         elif (
             self.add_enabled
             and "ADD_SUBTITLE_FONT_SIZE" in db_add_settings
@@ -1583,8 +1437,10 @@ class TaskConfig:
             self.add_subtitle_font_size = "none"
 
         # Initialize attachment add settings
-        if user_add_enabled and "ADD_ATTACHMENT_ENABLED" in self.user_dict:
-            self.add_attachment_enabled = self.user_dict["ADD_ATTACHMENT_ENABLED"]
+        if user_add_enabled and self.settings.user_has("ADD_ATTACHMENT_ENABLED"):
+            self.add_attachment_enabled = self.settings.user(
+                "ADD_ATTACHMENT_ENABLED"
+            )
         elif self.add_enabled and "ADD_ATTACHMENT_ENABLED" in db_add_settings:
             self.add_attachment_enabled = db_add_settings["ADD_ATTACHMENT_ENABLED"]
         else:
@@ -1595,10 +1451,10 @@ class TaskConfig:
         # Initialize attachment index
         if (
             user_add_enabled
-            and "ADD_ATTACHMENT_INDEX" in self.user_dict
-            and self.user_dict["ADD_ATTACHMENT_INDEX"] is not None
+            and self.settings.user_has("ADD_ATTACHMENT_INDEX")
+            and self.settings.user("ADD_ATTACHMENT_INDEX") is not None
         ):
-            self.add_attachment_index = self.user_dict["ADD_ATTACHMENT_INDEX"]
+            self.add_attachment_index = self.settings.user("ADD_ATTACHMENT_INDEX")
         elif (
             self.add_enabled
             and "ADD_ATTACHMENT_INDEX" in db_add_settings
@@ -1611,10 +1467,12 @@ class TaskConfig:
         # Initialize attachment mimetype
         if (
             user_add_enabled
-            and "ADD_ATTACHMENT_MIMETYPE" in self.user_dict
-            and self.user_dict["ADD_ATTACHMENT_MIMETYPE"] != "none"
+            and self.settings.user_has("ADD_ATTACHMENT_MIMETYPE")
+            and self.settings.user("ADD_ATTACHMENT_MIMETYPE") != "none"
         ):
-            self.add_attachment_mimetype = self.user_dict["ADD_ATTACHMENT_MIMETYPE"]
+            self.add_attachment_mimetype = self.settings.user(
+                "ADD_ATTACHMENT_MIMETYPE"
+            )
         elif (
             self.add_enabled
             and "ADD_ATTACHMENT_MIMETYPE" in db_add_settings
@@ -1627,12 +1485,12 @@ class TaskConfig:
     async def initialize_extract_settings(self):
         """Initialize extract settings with priority logic."""
         # Get user and owner settings
-        user_extract_enabled = self.user_dict.get("EXTRACT_ENABLED", False)
+        user_extract_enabled = self.settings.user("EXTRACT_ENABLED", False)
         owner_extract_enabled = (
             hasattr(Config, "EXTRACT_ENABLED") and Config.EXTRACT_ENABLED
         )
 
-        if "EXTRACT_ENABLED" in self.user_dict:
+        if self.settings.user_has("EXTRACT_ENABLED"):
             if user_extract_enabled:
                 self.extract_enabled = True
             else:
@@ -1651,10 +1509,10 @@ class TaskConfig:
         # Initialize extract priority
         if (
             user_extract_enabled
-            and "EXTRACT_PRIORITY" in self.user_dict
-            and self.user_dict["EXTRACT_PRIORITY"]
+            and self.settings.user_has("EXTRACT_PRIORITY")
+            and self.settings.user("EXTRACT_PRIORITY")
         ):
-            self.extract_priority = self.user_dict["EXTRACT_PRIORITY"]
+            self.extract_priority = self.settings.user("EXTRACT_PRIORITY")
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_PRIORITY")
@@ -1665,8 +1523,8 @@ class TaskConfig:
             self.extract_priority = 6
 
         # Initialize video extract settings
-        if user_extract_enabled and "EXTRACT_VIDEO_ENABLED" in self.user_dict:
-            self.extract_video_enabled = self.user_dict["EXTRACT_VIDEO_ENABLED"]
+        if user_extract_enabled and self.settings.user_has("EXTRACT_VIDEO_ENABLED"):
+            self.extract_video_enabled = self.settings.user("EXTRACT_VIDEO_ENABLED")
         elif self.extract_enabled and hasattr(Config, "EXTRACT_VIDEO_ENABLED"):
             self.extract_video_enabled = Config.EXTRACT_VIDEO_ENABLED
         else:
@@ -1675,10 +1533,10 @@ class TaskConfig:
         # Initialize video index from user settings
         if (
             user_extract_enabled
-            and "EXTRACT_VIDEO_INDEX" in self.user_dict
-            and self.user_dict["EXTRACT_VIDEO_INDEX"] is not None
+            and self.settings.user_has("EXTRACT_VIDEO_INDEX")
+            and self.settings.user("EXTRACT_VIDEO_INDEX") is not None
         ):
-            self.extract_video_index = self.user_dict["EXTRACT_VIDEO_INDEX"]
+            self.extract_video_index = self.settings.user("EXTRACT_VIDEO_INDEX")
             # Convert to list format for extract_video_indices
             if isinstance(self.extract_video_index, str):
                 if self.extract_video_index.lower() == "all":
@@ -1742,11 +1600,11 @@ class TaskConfig:
         # Video codec
         if (
             user_extract_enabled
-            and "EXTRACT_VIDEO_CODEC" in self.user_dict
-            and self.user_dict["EXTRACT_VIDEO_CODEC"]
-            and self.user_dict["EXTRACT_VIDEO_CODEC"].lower() != "none"
+            and self.settings.user_has("EXTRACT_VIDEO_CODEC")
+            and self.settings.user("EXTRACT_VIDEO_CODEC")
+            and self.settings.user("EXTRACT_VIDEO_CODEC").lower() != "none"
         ):
-            self.extract_video_codec = self.user_dict["EXTRACT_VIDEO_CODEC"]
+            self.extract_video_codec = self.settings.user("EXTRACT_VIDEO_CODEC")
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_VIDEO_CODEC")
@@ -1760,11 +1618,11 @@ class TaskConfig:
         # Video format
         if (
             user_extract_enabled
-            and "EXTRACT_VIDEO_FORMAT" in self.user_dict
-            and self.user_dict["EXTRACT_VIDEO_FORMAT"]
-            and self.user_dict["EXTRACT_VIDEO_FORMAT"].lower() != "none"
+            and self.settings.user_has("EXTRACT_VIDEO_FORMAT")
+            and self.settings.user("EXTRACT_VIDEO_FORMAT")
+            and self.settings.user("EXTRACT_VIDEO_FORMAT").lower() != "none"
         ):
-            self.extract_video_format = self.user_dict["EXTRACT_VIDEO_FORMAT"]
+            self.extract_video_format = self.settings.user("EXTRACT_VIDEO_FORMAT")
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_VIDEO_FORMAT")
@@ -1778,11 +1636,11 @@ class TaskConfig:
         # Video quality
         if (
             user_extract_enabled
-            and "EXTRACT_VIDEO_QUALITY" in self.user_dict
-            and self.user_dict["EXTRACT_VIDEO_QUALITY"]
-            and self.user_dict["EXTRACT_VIDEO_QUALITY"].lower() != "none"
+            and self.settings.user_has("EXTRACT_VIDEO_QUALITY")
+            and self.settings.user("EXTRACT_VIDEO_QUALITY")
+            and self.settings.user("EXTRACT_VIDEO_QUALITY").lower() != "none"
         ):
-            self.extract_video_quality = self.user_dict["EXTRACT_VIDEO_QUALITY"]
+            self.extract_video_quality = self.settings.user("EXTRACT_VIDEO_QUALITY")
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_VIDEO_QUALITY")
@@ -1796,11 +1654,11 @@ class TaskConfig:
         # Video preset
         if (
             user_extract_enabled
-            and "EXTRACT_VIDEO_PRESET" in self.user_dict
-            and self.user_dict["EXTRACT_VIDEO_PRESET"]
-            and self.user_dict["EXTRACT_VIDEO_PRESET"].lower() != "none"
+            and self.settings.user_has("EXTRACT_VIDEO_PRESET")
+            and self.settings.user("EXTRACT_VIDEO_PRESET")
+            and self.settings.user("EXTRACT_VIDEO_PRESET").lower() != "none"
         ):
-            self.extract_video_preset = self.user_dict["EXTRACT_VIDEO_PRESET"]
+            self.extract_video_preset = self.settings.user("EXTRACT_VIDEO_PRESET")
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_VIDEO_PRESET")
@@ -1814,11 +1672,11 @@ class TaskConfig:
         # Video bitrate
         if (
             user_extract_enabled
-            and "EXTRACT_VIDEO_BITRATE" in self.user_dict
-            and self.user_dict["EXTRACT_VIDEO_BITRATE"]
-            and self.user_dict["EXTRACT_VIDEO_BITRATE"].lower() != "none"
+            and self.settings.user_has("EXTRACT_VIDEO_BITRATE")
+            and self.settings.user("EXTRACT_VIDEO_BITRATE")
+            and self.settings.user("EXTRACT_VIDEO_BITRATE").lower() != "none"
         ):
-            self.extract_video_bitrate = self.user_dict["EXTRACT_VIDEO_BITRATE"]
+            self.extract_video_bitrate = self.settings.user("EXTRACT_VIDEO_BITRATE")
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_VIDEO_BITRATE")
@@ -1832,13 +1690,13 @@ class TaskConfig:
         # Video resolution
         if (
             user_extract_enabled
-            and "EXTRACT_VIDEO_RESOLUTION" in self.user_dict
-            and self.user_dict["EXTRACT_VIDEO_RESOLUTION"]
-            and self.user_dict["EXTRACT_VIDEO_RESOLUTION"].lower() != "none"
+            and self.settings.user_has("EXTRACT_VIDEO_RESOLUTION")
+            and self.settings.user("EXTRACT_VIDEO_RESOLUTION")
+            and self.settings.user("EXTRACT_VIDEO_RESOLUTION").lower() != "none"
         ):
-            self.extract_video_resolution = self.user_dict[
+            self.extract_video_resolution = self.settings.user(
                 "EXTRACT_VIDEO_RESOLUTION"
-            ]
+            )
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_VIDEO_RESOLUTION")
@@ -1852,11 +1710,11 @@ class TaskConfig:
         # Video FPS
         if (
             user_extract_enabled
-            and "EXTRACT_VIDEO_FPS" in self.user_dict
-            and self.user_dict["EXTRACT_VIDEO_FPS"]
-            and self.user_dict["EXTRACT_VIDEO_FPS"].lower() != "none"
+            and self.settings.user_has("EXTRACT_VIDEO_FPS")
+            and self.settings.user("EXTRACT_VIDEO_FPS")
+            and self.settings.user("EXTRACT_VIDEO_FPS").lower() != "none"
         ):
-            self.extract_video_fps = self.user_dict["EXTRACT_VIDEO_FPS"]
+            self.extract_video_fps = self.settings.user("EXTRACT_VIDEO_FPS")
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_VIDEO_FPS")
@@ -1868,8 +1726,8 @@ class TaskConfig:
             self.extract_video_fps = "none"
 
         # Initialize audio extract settings
-        if user_extract_enabled and "EXTRACT_AUDIO_ENABLED" in self.user_dict:
-            self.extract_audio_enabled = self.user_dict["EXTRACT_AUDIO_ENABLED"]
+        if user_extract_enabled and self.settings.user_has("EXTRACT_AUDIO_ENABLED"):
+            self.extract_audio_enabled = self.settings.user("EXTRACT_AUDIO_ENABLED")
         elif self.extract_enabled and hasattr(Config, "EXTRACT_AUDIO_ENABLED"):
             self.extract_audio_enabled = Config.EXTRACT_AUDIO_ENABLED
         else:
@@ -1878,10 +1736,10 @@ class TaskConfig:
         # Initialize audio index from user settings
         if (
             user_extract_enabled
-            and "EXTRACT_AUDIO_INDEX" in self.user_dict
-            and self.user_dict["EXTRACT_AUDIO_INDEX"] is not None
+            and self.settings.user_has("EXTRACT_AUDIO_INDEX")
+            and self.settings.user("EXTRACT_AUDIO_INDEX") is not None
         ):
-            self.extract_audio_index = self.user_dict["EXTRACT_AUDIO_INDEX"]
+            self.extract_audio_index = self.settings.user("EXTRACT_AUDIO_INDEX")
             # Convert to list format for extract_audio_indices
             if isinstance(self.extract_audio_index, str):
                 if self.extract_audio_index.lower() == "all":
@@ -1954,11 +1812,11 @@ class TaskConfig:
         # Audio codec
         if (
             user_extract_enabled
-            and "EXTRACT_AUDIO_CODEC" in self.user_dict
-            and self.user_dict["EXTRACT_AUDIO_CODEC"]
-            and self.user_dict["EXTRACT_AUDIO_CODEC"].lower() != "none"
+            and self.settings.user_has("EXTRACT_AUDIO_CODEC")
+            and self.settings.user("EXTRACT_AUDIO_CODEC")
+            and self.settings.user("EXTRACT_AUDIO_CODEC").lower() != "none"
         ):
-            self.extract_audio_codec = self.user_dict["EXTRACT_AUDIO_CODEC"]
+            self.extract_audio_codec = self.settings.user("EXTRACT_AUDIO_CODEC")
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_AUDIO_CODEC")
@@ -1972,11 +1830,11 @@ class TaskConfig:
         # Audio format
         if (
             user_extract_enabled
-            and "EXTRACT_AUDIO_FORMAT" in self.user_dict
-            and self.user_dict["EXTRACT_AUDIO_FORMAT"]
-            and self.user_dict["EXTRACT_AUDIO_FORMAT"].lower() != "none"
+            and self.settings.user_has("EXTRACT_AUDIO_FORMAT")
+            and self.settings.user("EXTRACT_AUDIO_FORMAT")
+            and self.settings.user("EXTRACT_AUDIO_FORMAT").lower() != "none"
         ):
-            self.extract_audio_format = self.user_dict["EXTRACT_AUDIO_FORMAT"]
+            self.extract_audio_format = self.settings.user("EXTRACT_AUDIO_FORMAT")
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_AUDIO_FORMAT")
@@ -1990,11 +1848,11 @@ class TaskConfig:
         # Audio bitrate
         if (
             user_extract_enabled
-            and "EXTRACT_AUDIO_BITRATE" in self.user_dict
-            and self.user_dict["EXTRACT_AUDIO_BITRATE"]
-            and self.user_dict["EXTRACT_AUDIO_BITRATE"].lower() != "none"
+            and self.settings.user_has("EXTRACT_AUDIO_BITRATE")
+            and self.settings.user("EXTRACT_AUDIO_BITRATE")
+            and self.settings.user("EXTRACT_AUDIO_BITRATE").lower() != "none"
         ):
-            self.extract_audio_bitrate = self.user_dict["EXTRACT_AUDIO_BITRATE"]
+            self.extract_audio_bitrate = self.settings.user("EXTRACT_AUDIO_BITRATE")
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_AUDIO_BITRATE")
@@ -2008,11 +1866,13 @@ class TaskConfig:
         # Audio channels
         if (
             user_extract_enabled
-            and "EXTRACT_AUDIO_CHANNELS" in self.user_dict
-            and self.user_dict["EXTRACT_AUDIO_CHANNELS"]
-            and self.user_dict["EXTRACT_AUDIO_CHANNELS"].lower() != "none"
+            and self.settings.user_has("EXTRACT_AUDIO_CHANNELS")
+            and self.settings.user("EXTRACT_AUDIO_CHANNELS")
+            and self.settings.user("EXTRACT_AUDIO_CHANNELS").lower() != "none"
         ):
-            self.extract_audio_channels = self.user_dict["EXTRACT_AUDIO_CHANNELS"]
+            self.extract_audio_channels = self.settings.user(
+                "EXTRACT_AUDIO_CHANNELS"
+            )
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_AUDIO_CHANNELS")
@@ -2026,11 +1886,13 @@ class TaskConfig:
         # Audio sampling
         if (
             user_extract_enabled
-            and "EXTRACT_AUDIO_SAMPLING" in self.user_dict
-            and self.user_dict["EXTRACT_AUDIO_SAMPLING"]
-            and self.user_dict["EXTRACT_AUDIO_SAMPLING"].lower() != "none"
+            and self.settings.user_has("EXTRACT_AUDIO_SAMPLING")
+            and self.settings.user("EXTRACT_AUDIO_SAMPLING")
+            and self.settings.user("EXTRACT_AUDIO_SAMPLING").lower() != "none"
         ):
-            self.extract_audio_sampling = self.user_dict["EXTRACT_AUDIO_SAMPLING"]
+            self.extract_audio_sampling = self.settings.user(
+                "EXTRACT_AUDIO_SAMPLING"
+            )
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_AUDIO_SAMPLING")
@@ -2044,11 +1906,11 @@ class TaskConfig:
         # Audio volume
         if (
             user_extract_enabled
-            and "EXTRACT_AUDIO_VOLUME" in self.user_dict
-            and self.user_dict["EXTRACT_AUDIO_VOLUME"]
-            and self.user_dict["EXTRACT_AUDIO_VOLUME"].lower() != "none"
+            and self.settings.user_has("EXTRACT_AUDIO_VOLUME")
+            and self.settings.user("EXTRACT_AUDIO_VOLUME")
+            and self.settings.user("EXTRACT_AUDIO_VOLUME").lower() != "none"
         ):
-            self.extract_audio_volume = self.user_dict["EXTRACT_AUDIO_VOLUME"]
+            self.extract_audio_volume = self.settings.user("EXTRACT_AUDIO_VOLUME")
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_AUDIO_VOLUME")
@@ -2060,10 +1922,12 @@ class TaskConfig:
             self.extract_audio_volume = "none"
 
         # Initialize subtitle extract settings
-        if user_extract_enabled and "EXTRACT_SUBTITLE_ENABLED" in self.user_dict:
-            self.extract_subtitle_enabled = self.user_dict[
+        if user_extract_enabled and self.settings.user_has(
+            "EXTRACT_SUBTITLE_ENABLED"
+        ):
+            self.extract_subtitle_enabled = self.settings.user(
                 "EXTRACT_SUBTITLE_ENABLED"
-            ]
+            )
         elif self.extract_enabled and hasattr(Config, "EXTRACT_SUBTITLE_ENABLED"):
             self.extract_subtitle_enabled = Config.EXTRACT_SUBTITLE_ENABLED
         else:
@@ -2072,10 +1936,12 @@ class TaskConfig:
         # Initialize subtitle index from user settings
         if (
             user_extract_enabled
-            and "EXTRACT_SUBTITLE_INDEX" in self.user_dict
-            and self.user_dict["EXTRACT_SUBTITLE_INDEX"] is not None
+            and self.settings.user_has("EXTRACT_SUBTITLE_INDEX")
+            and self.settings.user("EXTRACT_SUBTITLE_INDEX") is not None
         ):
-            self.extract_subtitle_index = self.user_dict["EXTRACT_SUBTITLE_INDEX"]
+            self.extract_subtitle_index = self.settings.user(
+                "EXTRACT_SUBTITLE_INDEX"
+            )
             # Convert to list format for extract_subtitle_indices
             if isinstance(self.extract_subtitle_index, str):
                 if self.extract_subtitle_index.lower() == "all":
@@ -2158,11 +2024,13 @@ class TaskConfig:
         # Subtitle codec
         if (
             user_extract_enabled
-            and "EXTRACT_SUBTITLE_CODEC" in self.user_dict
-            and self.user_dict["EXTRACT_SUBTITLE_CODEC"]
-            and self.user_dict["EXTRACT_SUBTITLE_CODEC"].lower() != "none"
+            and self.settings.user_has("EXTRACT_SUBTITLE_CODEC")
+            and self.settings.user("EXTRACT_SUBTITLE_CODEC")
+            and self.settings.user("EXTRACT_SUBTITLE_CODEC").lower() != "none"
         ):
-            self.extract_subtitle_codec = self.user_dict["EXTRACT_SUBTITLE_CODEC"]
+            self.extract_subtitle_codec = self.settings.user(
+                "EXTRACT_SUBTITLE_CODEC"
+            )
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_SUBTITLE_CODEC")
@@ -2176,11 +2044,13 @@ class TaskConfig:
         # Subtitle format
         if (
             user_extract_enabled
-            and "EXTRACT_SUBTITLE_FORMAT" in self.user_dict
-            and self.user_dict["EXTRACT_SUBTITLE_FORMAT"]
-            and self.user_dict["EXTRACT_SUBTITLE_FORMAT"].lower() != "none"
+            and self.settings.user_has("EXTRACT_SUBTITLE_FORMAT")
+            and self.settings.user("EXTRACT_SUBTITLE_FORMAT")
+            and self.settings.user("EXTRACT_SUBTITLE_FORMAT").lower() != "none"
         ):
-            self.extract_subtitle_format = self.user_dict["EXTRACT_SUBTITLE_FORMAT"]
+            self.extract_subtitle_format = self.settings.user(
+                "EXTRACT_SUBTITLE_FORMAT"
+            )
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_SUBTITLE_FORMAT")
@@ -2194,13 +2064,13 @@ class TaskConfig:
         # Subtitle language
         if (
             user_extract_enabled
-            and "EXTRACT_SUBTITLE_LANGUAGE" in self.user_dict
-            and self.user_dict["EXTRACT_SUBTITLE_LANGUAGE"]
-            and self.user_dict["EXTRACT_SUBTITLE_LANGUAGE"].lower() != "none"
+            and self.settings.user_has("EXTRACT_SUBTITLE_LANGUAGE")
+            and self.settings.user("EXTRACT_SUBTITLE_LANGUAGE")
+            and self.settings.user("EXTRACT_SUBTITLE_LANGUAGE").lower() != "none"
         ):
-            self.extract_subtitle_language = self.user_dict[
+            self.extract_subtitle_language = self.settings.user(
                 "EXTRACT_SUBTITLE_LANGUAGE"
-            ]
+            )
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_SUBTITLE_LANGUAGE")
@@ -2214,13 +2084,13 @@ class TaskConfig:
         # Subtitle encoding
         if (
             user_extract_enabled
-            and "EXTRACT_SUBTITLE_ENCODING" in self.user_dict
-            and self.user_dict["EXTRACT_SUBTITLE_ENCODING"]
-            and self.user_dict["EXTRACT_SUBTITLE_ENCODING"].lower() != "none"
+            and self.settings.user_has("EXTRACT_SUBTITLE_ENCODING")
+            and self.settings.user("EXTRACT_SUBTITLE_ENCODING")
+            and self.settings.user("EXTRACT_SUBTITLE_ENCODING").lower() != "none"
         ):
-            self.extract_subtitle_encoding = self.user_dict[
+            self.extract_subtitle_encoding = self.settings.user(
                 "EXTRACT_SUBTITLE_ENCODING"
-            ]
+            )
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_SUBTITLE_ENCODING")
@@ -2234,11 +2104,11 @@ class TaskConfig:
         # Subtitle font
         if (
             user_extract_enabled
-            and "EXTRACT_SUBTITLE_FONT" in self.user_dict
-            and self.user_dict["EXTRACT_SUBTITLE_FONT"]
-            and self.user_dict["EXTRACT_SUBTITLE_FONT"].lower() != "none"
+            and self.settings.user_has("EXTRACT_SUBTITLE_FONT")
+            and self.settings.user("EXTRACT_SUBTITLE_FONT")
+            and self.settings.user("EXTRACT_SUBTITLE_FONT").lower() != "none"
         ):
-            self.extract_subtitle_font = self.user_dict["EXTRACT_SUBTITLE_FONT"]
+            self.extract_subtitle_font = self.settings.user("EXTRACT_SUBTITLE_FONT")
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_SUBTITLE_FONT")
@@ -2252,13 +2122,13 @@ class TaskConfig:
         # Subtitle font size
         if (
             user_extract_enabled
-            and "EXTRACT_SUBTITLE_FONT_SIZE" in self.user_dict
-            and self.user_dict["EXTRACT_SUBTITLE_FONT_SIZE"]
-            and self.user_dict["EXTRACT_SUBTITLE_FONT_SIZE"].lower() != "none"
+            and self.settings.user_has("EXTRACT_SUBTITLE_FONT_SIZE")
+            and self.settings.user("EXTRACT_SUBTITLE_FONT_SIZE")
+            and self.settings.user("EXTRACT_SUBTITLE_FONT_SIZE").lower() != "none"
         ):
-            self.extract_subtitle_font_size = self.user_dict[
+            self.extract_subtitle_font_size = self.settings.user(
                 "EXTRACT_SUBTITLE_FONT_SIZE"
-            ]
+            )
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_SUBTITLE_FONT_SIZE")
@@ -2270,10 +2140,12 @@ class TaskConfig:
             self.extract_subtitle_font_size = "none"
 
         # Initialize attachment extract settings
-        if user_extract_enabled and "EXTRACT_ATTACHMENT_ENABLED" in self.user_dict:
-            self.extract_attachment_enabled = self.user_dict[
+        if user_extract_enabled and self.settings.user_has(
+            "EXTRACT_ATTACHMENT_ENABLED"
+        ):
+            self.extract_attachment_enabled = self.settings.user(
                 "EXTRACT_ATTACHMENT_ENABLED"
-            ]
+            )
         elif self.extract_enabled and hasattr(Config, "EXTRACT_ATTACHMENT_ENABLED"):
             self.extract_attachment_enabled = Config.EXTRACT_ATTACHMENT_ENABLED
         else:
@@ -2282,12 +2154,12 @@ class TaskConfig:
         # Initialize attachment index from user settings
         if (
             user_extract_enabled
-            and "EXTRACT_ATTACHMENT_INDEX" in self.user_dict
-            and self.user_dict["EXTRACT_ATTACHMENT_INDEX"] is not None
+            and self.settings.user_has("EXTRACT_ATTACHMENT_INDEX")
+            and self.settings.user("EXTRACT_ATTACHMENT_INDEX") is not None
         ):
-            self.extract_attachment_index = self.user_dict[
+            self.extract_attachment_index = self.settings.user(
                 "EXTRACT_ATTACHMENT_INDEX"
-            ]
+            )
             # Convert to list format for extract_attachment_indices
             if isinstance(self.extract_attachment_index, str):
                 if self.extract_attachment_index.lower() == "all":
@@ -2370,13 +2242,13 @@ class TaskConfig:
         # Attachment format
         if (
             user_extract_enabled
-            and "EXTRACT_ATTACHMENT_FORMAT" in self.user_dict
-            and self.user_dict["EXTRACT_ATTACHMENT_FORMAT"]
-            and self.user_dict["EXTRACT_ATTACHMENT_FORMAT"].lower() != "none"
+            and self.settings.user_has("EXTRACT_ATTACHMENT_FORMAT")
+            and self.settings.user("EXTRACT_ATTACHMENT_FORMAT")
+            and self.settings.user("EXTRACT_ATTACHMENT_FORMAT").lower() != "none"
         ):
-            self.extract_attachment_format = self.user_dict[
+            self.extract_attachment_format = self.settings.user(
                 "EXTRACT_ATTACHMENT_FORMAT"
-            ]
+            )
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_ATTACHMENT_FORMAT")
@@ -2390,13 +2262,13 @@ class TaskConfig:
         # Attachment filter
         if (
             user_extract_enabled
-            and "EXTRACT_ATTACHMENT_FILTER" in self.user_dict
-            and self.user_dict["EXTRACT_ATTACHMENT_FILTER"]
-            and self.user_dict["EXTRACT_ATTACHMENT_FILTER"].lower() != "none"
+            and self.settings.user_has("EXTRACT_ATTACHMENT_FILTER")
+            and self.settings.user("EXTRACT_ATTACHMENT_FILTER")
+            and self.settings.user("EXTRACT_ATTACHMENT_FILTER").lower() != "none"
         ):
-            self.extract_attachment_filter = self.user_dict[
+            self.extract_attachment_filter = self.settings.user(
                 "EXTRACT_ATTACHMENT_FILTER"
-            ]
+            )
         elif (
             self.extract_enabled
             and hasattr(Config, "EXTRACT_ATTACHMENT_FILTER")
@@ -2408,10 +2280,12 @@ class TaskConfig:
             self.extract_attachment_filter = "none"
 
         # Initialize extract maintain quality setting
-        if user_extract_enabled and "EXTRACT_MAINTAIN_QUALITY" in self.user_dict:
-            self.extract_maintain_quality = self.user_dict[
+        if user_extract_enabled and self.settings.user_has(
+            "EXTRACT_MAINTAIN_QUALITY"
+        ):
+            self.extract_maintain_quality = self.settings.user(
                 "EXTRACT_MAINTAIN_QUALITY"
-            ]
+            )
         elif self.extract_enabled and hasattr(Config, "EXTRACT_MAINTAIN_QUALITY"):
             self.extract_maintain_quality = Config.EXTRACT_MAINTAIN_QUALITY
         else:
@@ -2419,8 +2293,12 @@ class TaskConfig:
 
         # Initialize extract delete original setting
         # First check if it's set in user or owner settings
-        if user_extract_enabled and "EXTRACT_DELETE_ORIGINAL" in self.user_dict:
-            self.extract_delete_original = self.user_dict["EXTRACT_DELETE_ORIGINAL"]
+        if user_extract_enabled and self.settings.user_has(
+            "EXTRACT_DELETE_ORIGINAL"
+        ):
+            self.extract_delete_original = self.settings.user(
+                "EXTRACT_DELETE_ORIGINAL"
+            )
         elif self.extract_enabled and hasattr(Config, "EXTRACT_DELETE_ORIGINAL"):
             self.extract_delete_original = Config.EXTRACT_DELETE_ORIGINAL
         else:
@@ -2773,7 +2651,7 @@ class TaskConfig:
                     self.extract_maintain_quality = bool(maintain_quality)
 
         # Initialize compression settings with the same priority logic
-        user_compression_enabled = self.user_dict.get("COMPRESSION_ENABLED", False)
+        user_compression_enabled = self.settings.user("COMPRESSION_ENABLED", False)
         owner_compression_enabled = (
             hasattr(Config, "COMPRESSION_ENABLED") and Config.COMPRESSION_ENABLED
         )
@@ -2798,7 +2676,8 @@ class TaskConfig:
             self.compression_enabled = True
             self.compression_archive_enabled = True
         elif user_compression_enabled or (
-            owner_compression_enabled and "COMPRESSION_ENABLED" not in self.user_dict
+            owner_compression_enabled
+            and not self.settings.user_has("COMPRESSION_ENABLED")
         ):
             self.compression_enabled = True
         else:
@@ -2808,7 +2687,7 @@ class TaskConfig:
         if self.compression_enabled:
             # Video compression
             if not hasattr(self, "compression_video_enabled"):
-                user_compression_video_enabled = self.user_dict.get(
+                user_compression_video_enabled = self.settings.user(
                     "COMPRESSION_VIDEO_ENABLED", False
                 )
                 owner_compression_video_enabled = (
@@ -2817,7 +2696,7 @@ class TaskConfig:
                 )
                 if user_compression_video_enabled or (
                     owner_compression_video_enabled
-                    and "COMPRESSION_VIDEO_ENABLED" not in self.user_dict
+                    and not self.settings.user_has("COMPRESSION_VIDEO_ENABLED")
                 ):
                     self.compression_video_enabled = True
                 else:
@@ -2825,7 +2704,7 @@ class TaskConfig:
 
             # Audio compression
             if not hasattr(self, "compression_audio_enabled"):
-                user_compression_audio_enabled = self.user_dict.get(
+                user_compression_audio_enabled = self.settings.user(
                     "COMPRESSION_AUDIO_ENABLED", False
                 )
                 owner_compression_audio_enabled = (
@@ -2834,7 +2713,7 @@ class TaskConfig:
                 )
                 if user_compression_audio_enabled or (
                     owner_compression_audio_enabled
-                    and "COMPRESSION_AUDIO_ENABLED" not in self.user_dict
+                    and not self.settings.user_has("COMPRESSION_AUDIO_ENABLED")
                 ):
                     self.compression_audio_enabled = True
                 else:
@@ -2842,7 +2721,7 @@ class TaskConfig:
 
             # Image compression
             if not hasattr(self, "compression_image_enabled"):
-                user_compression_image_enabled = self.user_dict.get(
+                user_compression_image_enabled = self.settings.user(
                     "COMPRESSION_IMAGE_ENABLED", False
                 )
                 owner_compression_image_enabled = (
@@ -2851,7 +2730,7 @@ class TaskConfig:
                 )
                 if user_compression_image_enabled or (
                     owner_compression_image_enabled
-                    and "COMPRESSION_IMAGE_ENABLED" not in self.user_dict
+                    and not self.settings.user_has("COMPRESSION_IMAGE_ENABLED")
                 ):
                     self.compression_image_enabled = True
                 else:
@@ -2859,7 +2738,7 @@ class TaskConfig:
 
             # Document compression
             if not hasattr(self, "compression_document_enabled"):
-                user_compression_document_enabled = self.user_dict.get(
+                user_compression_document_enabled = self.settings.user(
                     "COMPRESSION_DOCUMENT_ENABLED", False
                 )
                 owner_compression_document_enabled = (
@@ -2868,7 +2747,7 @@ class TaskConfig:
                 )
                 if user_compression_document_enabled or (
                     owner_compression_document_enabled
-                    and "COMPRESSION_DOCUMENT_ENABLED" not in self.user_dict
+                    and not self.settings.user_has("COMPRESSION_DOCUMENT_ENABLED")
                 ):
                     self.compression_document_enabled = True
                 else:
@@ -2876,7 +2755,7 @@ class TaskConfig:
 
             # Subtitle compression
             if not hasattr(self, "compression_subtitle_enabled"):
-                user_compression_subtitle_enabled = self.user_dict.get(
+                user_compression_subtitle_enabled = self.settings.user(
                     "COMPRESSION_SUBTITLE_ENABLED", False
                 )
                 owner_compression_subtitle_enabled = (
@@ -2885,7 +2764,7 @@ class TaskConfig:
                 )
                 if user_compression_subtitle_enabled or (
                     owner_compression_subtitle_enabled
-                    and "COMPRESSION_SUBTITLE_ENABLED" not in self.user_dict
+                    and not self.settings.user_has("COMPRESSION_SUBTITLE_ENABLED")
                 ):
                     self.compression_subtitle_enabled = True
                 else:
@@ -2893,7 +2772,7 @@ class TaskConfig:
 
             # Archive compression
             if not hasattr(self, "compression_archive_enabled"):
-                user_compression_archive_enabled = self.user_dict.get(
+                user_compression_archive_enabled = self.settings.user(
                     "COMPRESSION_ARCHIVE_ENABLED", False
                 )
                 owner_compression_archive_enabled = (
@@ -2902,7 +2781,7 @@ class TaskConfig:
                 )
                 if user_compression_archive_enabled or (
                     owner_compression_archive_enabled
-                    and "COMPRESSION_ARCHIVE_ENABLED" not in self.user_dict
+                    and not self.settings.user_has("COMPRESSION_ARCHIVE_ENABLED")
                 ):
                     self.compression_archive_enabled = True
                 else:
@@ -2911,10 +2790,10 @@ class TaskConfig:
         # Compression Priority
         if (
             user_compression_enabled
-            and "COMPRESSION_PRIORITY" in self.user_dict
-            and self.user_dict["COMPRESSION_PRIORITY"]
+            and self.settings.user_has("COMPRESSION_PRIORITY")
+            and self.settings.user("COMPRESSION_PRIORITY")
         ):
-            self.compression_priority = self.user_dict["COMPRESSION_PRIORITY"]
+            self.compression_priority = self.settings.user("COMPRESSION_PRIORITY")
         elif (
             self.compression_enabled
             and hasattr(Config, "COMPRESSION_PRIORITY")
@@ -2926,7 +2805,7 @@ class TaskConfig:
 
         # Compression Delete Original
         # Check for user setting first, then global setting, then default to True
-        user_compression_delete_original = self.user_dict.get(
+        user_compression_delete_original = self.settings.user(
             "COMPRESSION_DELETE_ORIGINAL", None
         )
 
@@ -2942,7 +2821,7 @@ class TaskConfig:
 
         # Initialize compression format attributes
         # Video format
-        user_video_format = self.user_dict.get("COMPRESSION_VIDEO_FORMAT")
+        user_video_format = self.settings.user("COMPRESSION_VIDEO_FORMAT")
         owner_video_format = getattr(Config, "COMPRESSION_VIDEO_FORMAT", None)
 
         if (
@@ -2959,7 +2838,7 @@ class TaskConfig:
             self.compression_video_format = "none"  # Default format (keep original)
 
         # Audio format
-        user_audio_format = self.user_dict.get("COMPRESSION_AUDIO_FORMAT")
+        user_audio_format = self.settings.user("COMPRESSION_AUDIO_FORMAT")
         owner_audio_format = getattr(Config, "COMPRESSION_AUDIO_FORMAT", None)
 
         if (
@@ -2976,7 +2855,7 @@ class TaskConfig:
             self.compression_audio_format = "none"  # Default format (keep original)
 
         # Image format
-        user_image_format = self.user_dict.get("COMPRESSION_IMAGE_FORMAT")
+        user_image_format = self.settings.user("COMPRESSION_IMAGE_FORMAT")
         owner_image_format = getattr(Config, "COMPRESSION_IMAGE_FORMAT", None)
 
         if (
@@ -2993,7 +2872,7 @@ class TaskConfig:
             self.compression_image_format = "none"  # Default format (keep original)
 
         # Document format
-        user_document_format = self.user_dict.get("COMPRESSION_DOCUMENT_FORMAT")
+        user_document_format = self.settings.user("COMPRESSION_DOCUMENT_FORMAT")
         owner_document_format = getattr(Config, "COMPRESSION_DOCUMENT_FORMAT", None)
 
         if (
@@ -3012,7 +2891,7 @@ class TaskConfig:
             )
 
         # Subtitle format
-        user_subtitle_format = self.user_dict.get("COMPRESSION_SUBTITLE_FORMAT")
+        user_subtitle_format = self.settings.user("COMPRESSION_SUBTITLE_FORMAT")
         owner_subtitle_format = getattr(Config, "COMPRESSION_SUBTITLE_FORMAT", None)
 
         if (
@@ -3031,7 +2910,7 @@ class TaskConfig:
             )
 
         # Archive format
-        user_archive_format = self.user_dict.get("COMPRESSION_ARCHIVE_FORMAT")
+        user_archive_format = self.settings.user("COMPRESSION_ARCHIVE_FORMAT")
         owner_archive_format = getattr(Config, "COMPRESSION_ARCHIVE_FORMAT", None)
 
         if (
@@ -3054,14 +2933,14 @@ class TaskConfig:
             self.compression_video_preset = self.video_preset
         elif (
             user_compression_enabled
-            and "COMPRESSION_VIDEO_PRESET" in self.user_dict
-            and self.user_dict["COMPRESSION_VIDEO_PRESET"] is not None
-            and self.user_dict["COMPRESSION_VIDEO_PRESET"] != "none"
-            and self.user_dict["COMPRESSION_VIDEO_PRESET"].lower() != "none"
+            and self.settings.user_has("COMPRESSION_VIDEO_PRESET")
+            and self.settings.user("COMPRESSION_VIDEO_PRESET") is not None
+            and self.settings.user("COMPRESSION_VIDEO_PRESET") != "none"
+            and self.settings.user("COMPRESSION_VIDEO_PRESET").lower() != "none"
         ):
-            self.compression_video_preset = self.user_dict[
+            self.compression_video_preset = self.settings.user(
                 "COMPRESSION_VIDEO_PRESET"
-            ]
+            )
         elif (
             self.compression_enabled
             and hasattr(Config, "COMPRESSION_VIDEO_PRESET")
@@ -3077,14 +2956,14 @@ class TaskConfig:
             self.compression_audio_preset = self.audio_preset
         elif (
             user_compression_enabled
-            and "COMPRESSION_AUDIO_PRESET" in self.user_dict
-            and self.user_dict["COMPRESSION_AUDIO_PRESET"] is not None
-            and self.user_dict["COMPRESSION_AUDIO_PRESET"] != "none"
-            and self.user_dict["COMPRESSION_AUDIO_PRESET"].lower() != "none"
+            and self.settings.user_has("COMPRESSION_AUDIO_PRESET")
+            and self.settings.user("COMPRESSION_AUDIO_PRESET") is not None
+            and self.settings.user("COMPRESSION_AUDIO_PRESET") != "none"
+            and self.settings.user("COMPRESSION_AUDIO_PRESET").lower() != "none"
         ):
-            self.compression_audio_preset = self.user_dict[
+            self.compression_audio_preset = self.settings.user(
                 "COMPRESSION_AUDIO_PRESET"
-            ]
+            )
         elif (
             self.compression_enabled
             and hasattr(Config, "COMPRESSION_AUDIO_PRESET")
@@ -3100,14 +2979,14 @@ class TaskConfig:
             self.compression_image_preset = self.image_preset
         elif (
             user_compression_enabled
-            and "COMPRESSION_IMAGE_PRESET" in self.user_dict
-            and self.user_dict["COMPRESSION_IMAGE_PRESET"] is not None
-            and self.user_dict["COMPRESSION_IMAGE_PRESET"] != "none"
-            and self.user_dict["COMPRESSION_IMAGE_PRESET"].lower() != "none"
+            and self.settings.user_has("COMPRESSION_IMAGE_PRESET")
+            and self.settings.user("COMPRESSION_IMAGE_PRESET") is not None
+            and self.settings.user("COMPRESSION_IMAGE_PRESET") != "none"
+            and self.settings.user("COMPRESSION_IMAGE_PRESET").lower() != "none"
         ):
-            self.compression_image_preset = self.user_dict[
+            self.compression_image_preset = self.settings.user(
                 "COMPRESSION_IMAGE_PRESET"
-            ]
+            )
         elif (
             self.compression_enabled
             and hasattr(Config, "COMPRESSION_IMAGE_PRESET")
@@ -3123,14 +3002,14 @@ class TaskConfig:
             self.compression_document_preset = self.document_preset
         elif (
             user_compression_enabled
-            and "COMPRESSION_DOCUMENT_PRESET" in self.user_dict
-            and self.user_dict["COMPRESSION_DOCUMENT_PRESET"] is not None
-            and self.user_dict["COMPRESSION_DOCUMENT_PRESET"] != "none"
-            and self.user_dict["COMPRESSION_DOCUMENT_PRESET"].lower() != "none"
+            and self.settings.user_has("COMPRESSION_DOCUMENT_PRESET")
+            and self.settings.user("COMPRESSION_DOCUMENT_PRESET") is not None
+            and self.settings.user("COMPRESSION_DOCUMENT_PRESET") != "none"
+            and self.settings.user("COMPRESSION_DOCUMENT_PRESET").lower() != "none"
         ):
-            self.compression_document_preset = self.user_dict[
+            self.compression_document_preset = self.settings.user(
                 "COMPRESSION_DOCUMENT_PRESET"
-            ]
+            )
         elif (
             self.compression_enabled
             and hasattr(Config, "COMPRESSION_DOCUMENT_PRESET")
@@ -3146,14 +3025,14 @@ class TaskConfig:
             self.compression_subtitle_preset = self.subtitle_preset
         elif (
             user_compression_enabled
-            and "COMPRESSION_SUBTITLE_PRESET" in self.user_dict
-            and self.user_dict["COMPRESSION_SUBTITLE_PRESET"] is not None
-            and self.user_dict["COMPRESSION_SUBTITLE_PRESET"] != "none"
-            and self.user_dict["COMPRESSION_SUBTITLE_PRESET"].lower() != "none"
+            and self.settings.user_has("COMPRESSION_SUBTITLE_PRESET")
+            and self.settings.user("COMPRESSION_SUBTITLE_PRESET") is not None
+            and self.settings.user("COMPRESSION_SUBTITLE_PRESET") != "none"
+            and self.settings.user("COMPRESSION_SUBTITLE_PRESET").lower() != "none"
         ):
-            self.compression_subtitle_preset = self.user_dict[
+            self.compression_subtitle_preset = self.settings.user(
                 "COMPRESSION_SUBTITLE_PRESET"
-            ]
+            )
         elif (
             self.compression_enabled
             and hasattr(Config, "COMPRESSION_SUBTITLE_PRESET")
@@ -3169,14 +3048,14 @@ class TaskConfig:
             self.compression_archive_preset = self.archive_preset
         elif (
             user_compression_enabled
-            and "COMPRESSION_ARCHIVE_PRESET" in self.user_dict
-            and self.user_dict["COMPRESSION_ARCHIVE_PRESET"] is not None
-            and self.user_dict["COMPRESSION_ARCHIVE_PRESET"] != "none"
-            and self.user_dict["COMPRESSION_ARCHIVE_PRESET"].lower() != "none"
+            and self.settings.user_has("COMPRESSION_ARCHIVE_PRESET")
+            and self.settings.user("COMPRESSION_ARCHIVE_PRESET") is not None
+            and self.settings.user("COMPRESSION_ARCHIVE_PRESET") != "none"
+            and self.settings.user("COMPRESSION_ARCHIVE_PRESET").lower() != "none"
         ):
-            self.compression_archive_preset = self.user_dict[
+            self.compression_archive_preset = self.settings.user(
                 "COMPRESSION_ARCHIVE_PRESET"
-            ]
+            )
         elif (
             self.compression_enabled
             and hasattr(Config, "COMPRESSION_ARCHIVE_PRESET")
@@ -3188,7 +3067,7 @@ class TaskConfig:
         else:
             self.compression_archive_preset = "medium"
 
-        if "CONVERT_ENABLED" in self.user_dict:
+        if self.settings.user_has("CONVERT_ENABLED"):
             if self.user_convert_enabled:
                 # User has enabled convert - apply user settings
                 convert_enabled = True
@@ -3210,14 +3089,14 @@ class TaskConfig:
         # Only apply convert settings if not explicitly set via command line
         if convert_enabled and not self.convert_video and not self.convert_audio:
             # Check for video convert settings
-            user_video_format = self.user_dict.get("CONVERT_VIDEO_FORMAT", "")
+            user_video_format = self.settings.user("CONVERT_VIDEO_FORMAT", "")
             owner_video_format = (
                 hasattr(Config, "CONVERT_VIDEO_FORMAT")
                 and Config.CONVERT_VIDEO_FORMAT
             )
 
             # Check if user has video convert enabled
-            user_video_enabled = self.user_dict.get("CONVERT_VIDEO_ENABLED", False)
+            user_video_enabled = self.settings.user("CONVERT_VIDEO_ENABLED", False)
             owner_video_enabled = (
                 hasattr(Config, "CONVERT_VIDEO_ENABLED")
                 and Config.CONVERT_VIDEO_ENABLED
@@ -3225,7 +3104,7 @@ class TaskConfig:
 
             # Determine if video convert should be enabled
             video_convert_enabled = False
-            if "CONVERT_VIDEO_ENABLED" in self.user_dict:
+            if self.settings.user_has("CONVERT_VIDEO_ENABLED"):
                 video_convert_enabled = user_video_enabled
             else:
                 video_convert_enabled = owner_video_enabled
@@ -3240,14 +3119,14 @@ class TaskConfig:
                     self.convert_video = None
 
             # Check for audio convert settings
-            user_audio_format = self.user_dict.get("CONVERT_AUDIO_FORMAT", "")
+            user_audio_format = self.settings.user("CONVERT_AUDIO_FORMAT", "")
             owner_audio_format = (
                 hasattr(Config, "CONVERT_AUDIO_FORMAT")
                 and Config.CONVERT_AUDIO_FORMAT
             )
 
             # Check if user has audio convert enabled
-            user_audio_enabled = self.user_dict.get("CONVERT_AUDIO_ENABLED", False)
+            user_audio_enabled = self.settings.user("CONVERT_AUDIO_ENABLED", False)
             owner_audio_enabled = (
                 hasattr(Config, "CONVERT_AUDIO_ENABLED")
                 and Config.CONVERT_AUDIO_ENABLED
@@ -3255,7 +3134,7 @@ class TaskConfig:
 
             # Determine if audio convert should be enabled
             audio_convert_enabled = False
-            if "CONVERT_AUDIO_ENABLED" in self.user_dict:
+            if self.settings.user_has("CONVERT_AUDIO_ENABLED"):
                 audio_convert_enabled = user_audio_enabled
             else:
                 audio_convert_enabled = owner_audio_enabled
@@ -3271,21 +3150,22 @@ class TaskConfig:
 
         if self.name_sub:
             self.name_sub = [x.split("/") for x in self.name_sub.split(" | ")]
-        self.excluded_extensions = self.user_dict.get("EXCLUDED_EXTENSIONS") or (
+        self.excluded_extensions = self.settings.user("EXCLUDED_EXTENSIONS") or (
             excluded_extensions
-            if "EXCLUDED_EXTENSIONS" not in self.user_dict
+            if not self.settings.user_has("EXCLUDED_EXTENSIONS")
             else ["aria2", "!qB"]
         )
         # Only set rc_flags if RCLONE_ENABLED is true
-        if not self.rc_flags and Config.RCLONE_ENABLED:
-            if self.user_dict.get("RCLONE_FLAGS"):
-                self.rc_flags = self.user_dict["RCLONE_FLAGS"]
-            elif "RCLONE_FLAGS" not in self.user_dict and Config.RCLONE_FLAGS:
-                self.rc_flags = Config.RCLONE_FLAGS
+        if (
+            not self.rc_flags
+            and Config.RCLONE_ENABLED
+            and self.settings.RCLONE_FLAGS
+        ):
+            self.rc_flags = self.settings.RCLONE_FLAGS
         if self.link not in ["rcl", "gdl"]:
             if not self.is_jd:
                 if is_rclone_path(self.link):
-                    if not self.link.startswith("mrcc:") and self.user_dict.get(
+                    if not self.link.startswith("mrcc:") and self.settings.user(
                         "USER_TOKENS",
                         False,
                     ):
@@ -3294,7 +3174,7 @@ class TaskConfig:
             elif is_gdrive_link(self.link):
                 if not self.link.startswith(
                     ("mtp:", "tp:", "sa:"),
-                ) and self.user_dict.get("USER_TOKENS", False):
+                ) and self.settings.user("USER_TOKENS", False):
                     self.link = f"mtp:{self.link}"
                 await self.is_token_exists(self.link, "dl")
         elif self.link == "rcl":
@@ -3313,28 +3193,17 @@ class TaskConfig:
                 raise ValueError(self.link)
 
         self.user_transmission = TgClient.IS_PREMIUM_USER and (
-            self.user_dict.get("USER_TRANSMISSION")
-            or (
-                Config.USER_TRANSMISSION
-                and "USER_TRANSMISSION" not in self.user_dict
-            )
+            self.settings.USER_TRANSMISSION
         )
 
-        if self.user_dict.get("UPLOAD_PATHS", False):
-            if self.up_dest in self.user_dict["UPLOAD_PATHS"]:
-                self.up_dest = self.user_dict["UPLOAD_PATHS"][self.up_dest]
-        elif (
-            "UPLOAD_PATHS" not in self.user_dict
-            and Config.UPLOAD_PATHS
-            and self.up_dest in Config.UPLOAD_PATHS
-        ):
-            self.up_dest = Config.UPLOAD_PATHS[self.up_dest]
+        if (
+            upload_paths := self.settings.UPLOAD_PATHS
+        ) and self.up_dest in upload_paths:
+            self.up_dest = upload_paths[self.up_dest]
 
         if self.ffmpeg_cmds and not isinstance(self.ffmpeg_cmds, list):
-            if self.user_dict.get("FFMPEG_CMDS", None):
-                ffmpeg_dict = deepcopy(self.user_dict["FFMPEG_CMDS"])
-            elif "FFMPEG_CMDS" not in self.user_dict and Config.FFMPEG_CMDS:
-                ffmpeg_dict = deepcopy(Config.FFMPEG_CMDS)
+            if self.settings.FFMPEG_CMDS:
+                ffmpeg_dict = deepcopy(self.settings.FFMPEG_CMDS)
             else:
                 ffmpeg_dict = None
             if ffmpeg_dict is None:
@@ -3348,7 +3217,7 @@ class TaskConfig:
                         for ind, vl in enumerate(ffmpeg_dict[key]):
                             if variables := set(findall(r"\{(.*?)\}", vl)):
                                 ff_values = (
-                                    self.user_dict.get("FFMPEG_VARIABLES", {})
+                                    self.settings.user("FFMPEG_VARIABLES", {})
                                     .get(key, {})
                                     .get(str(ind), {})
                                 )
@@ -3360,45 +3229,42 @@ class TaskConfig:
                                 cmds.append(vl)
                 self.ffmpeg_cmds = cmds
         if not self.is_leech:
-            self.stop_duplicate = self.user_dict.get("STOP_DUPLICATE") or (
-                "STOP_DUPLICATE" not in self.user_dict and Config.STOP_DUPLICATE
-            )
-            default_upload = (
-                self.user_dict.get("DEFAULT_UPLOAD", "") or Config.DEFAULT_UPLOAD
-            )
+            self.stop_duplicate = self.settings.STOP_DUPLICATE
+            default_upload = self.settings.user(
+                "DEFAULT_UPLOAD"
+            ) or self.settings.owner("DEFAULT_UPLOAD")
             # Check if Rclone is enabled before using Rclone upload destinations
             if (
                 (not self.up_dest and default_upload == "rc") or self.up_dest == "rc"
             ) and Config.RCLONE_ENABLED:
                 # User's RCLONE_PATH has higher priority than owner's
-                if "RCLONE_PATH" in self.user_dict:
-                    self.up_dest = self.user_dict["RCLONE_PATH"]
-                elif Config.RCLONE_PATH:
-                    self.up_dest = Config.RCLONE_PATH
-                else:
-                    self.up_dest = ""
+                self.up_dest = self.settings.RCLONE_PATH or ""
             # If Rclone is disabled but Rclone destination is selected, use GDrive instead
             elif (
                 (not self.up_dest and default_upload == "rc") or self.up_dest == "rc"
             ) and not Config.RCLONE_ENABLED:
                 # Fall back to GDrive if Rclone is disabled
-                self.up_dest = self.user_dict.get("GDRIVE_ID") or Config.GDRIVE_ID
+                self.up_dest = self.settings.user(
+                    "GDRIVE_ID"
+                ) or self.settings.owner("GDRIVE_ID")
                 LOGGER.info(
                     "Rclone is disabled. Using GDrive as upload destination instead."
                 )
             elif (
                 not self.up_dest and default_upload == "gd"
             ) or self.up_dest == "gd":
-                self.up_dest = self.user_dict.get("GDRIVE_ID") or Config.GDRIVE_ID
+                self.up_dest = self.settings.user(
+                    "GDRIVE_ID"
+                ) or self.settings.owner("GDRIVE_ID")
             if not self.up_dest:
                 raise ValueError("No Upload Destination!")
             if is_gdrive_id(self.up_dest):
                 if not self.up_dest.startswith(
                     ("mtp:", "tp:", "sa:"),
-                ) and self.user_dict.get("USER_TOKENS", False):
+                ) and self.settings.user("USER_TOKENS", False):
                     self.up_dest = f"mtp:{self.up_dest}"
             elif is_rclone_path(self.up_dest):
-                if not self.up_dest.startswith("mrcc:") and self.user_dict.get(
+                if not self.up_dest.startswith("mrcc:") and self.settings.user(
                     "USER_TOKENS",
                     False,
                 ):
@@ -3414,9 +3280,9 @@ class TaskConfig:
                 # Check if Rclone operations are enabled
                 if not Config.RCLONE_ENABLED:
                     # Fall back to GDrive if Rclone is disabled
-                    self.up_dest = (
-                        self.user_dict.get("GDRIVE_ID") or Config.GDRIVE_ID
-                    )
+                    self.up_dest = self.settings.user(
+                        "GDRIVE_ID"
+                    ) or self.settings.owner("GDRIVE_ID")
                     LOGGER.info(
                         "Rclone is disabled. Using GDrive as upload destination instead."
                     )
@@ -3467,8 +3333,7 @@ class TaskConfig:
                 else ""
             )
             self.hybrid_leech = TgClient.IS_PREMIUM_USER and (
-                self.user_dict.get("HYBRID_LEECH")
-                or (Config.HYBRID_LEECH and "HYBRID_LEECH" not in self.user_dict)
+                self.settings.HYBRID_LEECH
             )
             if self.bot_trans:
                 self.user_transmission = False
@@ -3578,14 +3443,12 @@ class TaskConfig:
             # This ensures custom split sizes set by user or owner get priority
             if not self.split_size:
                 # User settings have second priority
-                if self.user_dict.get("LEECH_SPLIT_SIZE"):
-                    self.split_size = self.user_dict.get("LEECH_SPLIT_SIZE")
-                # Owner settings have third priority
-                elif Config.LEECH_SPLIT_SIZE:
-                    self.split_size = Config.LEECH_SPLIT_SIZE
-                # Default to max split size if no custom size is set
-                else:
-                    self.split_size = self.max_split_size
+                # and owner settings third, max split size by default
+                self.split_size = (
+                    self.settings.user("LEECH_SPLIT_SIZE")
+                    or self.settings.owner("LEECH_SPLIT_SIZE")
+                    or self.max_split_size
+                )
 
             # Ensure split size never exceeds Telegram's limit (based on premium status)
             # Add a safety margin to ensure we never exceed Telegram's limit
@@ -3608,25 +3471,11 @@ class TaskConfig:
 
             if not self.as_doc:
                 self.as_doc = (
-                    not self.as_med
-                    if self.as_med
-                    else (
-                        self.user_dict.get("AS_DOCUMENT", False)
-                        or (
-                            Config.AS_DOCUMENT
-                            and "AS_DOCUMENT" not in self.user_dict
-                        )
-                    )
+                    not self.as_med if self.as_med else (self.settings.AS_DOCUMENT)
                 )
 
             self.thumbnail_layout = (
-                self.thumbnail_layout
-                or self.user_dict.get("THUMBNAIL_LAYOUT", False)
-                or (
-                    Config.THUMBNAIL_LAYOUT
-                    if "THUMBNAIL_LAYOUT" not in self.user_dict
-                    else ""
-                )
+                self.thumbnail_layout or self.settings.THUMBNAIL_LAYOUT or ""
             )
 
             if self.thumb != "none" and is_telegram_link(self.thumb):
@@ -3935,8 +3784,13 @@ class TaskConfig:
         t_path = dl_path
         sevenz = SevenZ(self)
         LOGGER.info(f"Extracting: {self.name}")
-        async with task_dict_lock:
-            task_dict[self.mid] = SevenZStatus(self, sevenz, gid, "Extract")
+        # Streamed extractions run under the upload status
+        on_file = None
+        if self.split_pipeline is not None:
+            on_file = self._hand_over_extracted
+        else:
+            async with task_dict_lock:
+                task_dict[self.mid] = SevenZStatus(self, sevenz, gid, "Extract")
         for dirpath, _, files in await sync_to_async(
             walk,
             self.up_dir or self.dir,
@@ -3953,7 +3807,7 @@ class TaskConfig:
                     t_path = get_base_name(f_path) if self.is_file else dirpath
                     if not self.is_file:
                         self.subname = file_
-                    code = await sevenz.extract(f_path, t_path, pswd)
+                    code = await sevenz.extract(f_path, t_path, pswd, on_file)
                 else:
                     code = 0
             if self.is_cancelled:
@@ -3978,8 +3832,32 @@ class TaskConfig:
             code = int(code) if code is not None else 1
         except (ValueError, TypeError):
             code = 1  # Set to non-zero to indicate failure
+        if on_file is not None and code != 0 and self.split_pipeline.parts:
+            # Files handed over while 7z ran are uploaded already, the
+            # archive must not be uploaded after them
+            return None
         return t_path if self.is_file and code == 0 else dl_path
 
+    async def _hand_over_extracted(self, f_path):
+        """Queue an extracted file for upload unless it still needs work.
+
+        Excluded files, nested archives and files over the split size are
+        left in place for the steps that run once the extraction is done.
+        """
+        dirpath, file_ = ospath.split(f_path)
+        if file_.strip().lower().endswith(tuple(self.excluded_extensions)):
+            return
+        if is_archive(file_) or is_archive_split(file_):
+            return
+        if self.is_leech and await get_path_size(f_path) > self.split_size:
+            return
+        if (new_name := self.clean_www_prefix(file_)) != file_:
+            new_path = ospath.join(dirpath, new_name)
+            with contextlib.suppress(Exception):
+                await move(f_path, new_path)
+                f_path = new_path
+        await self.split_pipeline.hand_over(f_path, self.subproc)
+
     async def proceed_ffmpeg(
         self, dl_path, gid
     ):  # Method name kept as ffmpeg for compatibility
@@ -4603,18 +4481,23 @@ class TaskConfig:
                     await move(f_path, ospath.join(dirpath, new_name))
         return dl_path
 
-    async def remove_www_prefix(self, dl_path):
-        def clean_filename(name):
-            return sub(
-                r"^www\.[^ ]+\s*-\s*|\s*^www\.[^ ]+\s*",
-                "",
-                name,
-                flags=IGNORECASE,
-            ).lstrip()
+    async def set_task_status(self, status):
+        async with task_dict_lock:
+            task_dict[self.mid] = status
+
+    @staticmethod
+    def clean_www_prefix(name):
+        return sub(
+            r"^www\.[^ ]+\s*-\s*|\s*^www\.[^ ]+\s*",
+            "",
+            name,
+            flags=IGNORECASE,
+        ).lstrip()
 
+    async def remove_www_prefix(self, dl_path):
         if self.is_file:
             up_dir, name = dl_path.rsplit("/", 1)
-            new_name = clean_filename(name)
+            new_name = self.clean_www_prefix(name)
             if new_name == name:
                 return dl_path
             new_path = ospath.join(up_dir, new_name)
@@ -4625,7 +4508,7 @@ class TaskConfig:
         for dirpath, _, files in await sync_to_async(walk, dl_path, topdown=False):
             for file_ in files:
                 f_path = ospath.join(dirpath, file_)
-                new_name = clean_filename(file_)
+                new_name = self.clean_www_prefix(file_)
                 if new_name == file_:
                     continue
                 with contextlib.suppress(Exception):
@@ -5443,107 +5326,107 @@ class TaskConfig:
         del all_files
 
         if self.files_to_proceed:
-            ffmpeg = FFMpeg(self)
+            executor = FileExecutor(self)
             async with task_dict_lock:
-                task_dict[self.mid] = FFmpegStatus(self, ffmpeg, gid, "Convert")
-            self.progress = False
-            async with cpu_eater_lock:
-                self.progress = True
-                for f_path, f_type in self.files_to_proceed.items():
-                    self.proceed_count += 1
-                    LOGGER.info(f"Converting: {f_path}")
-                    if self.is_file:
-                        self.subsize = self.size
-                    else:
-                        self.subsize = await get_path_size(f_path)
-                        self.subname = ospath.basename(f_path)
-                    # delete_original is now set at the beginning of the function
-                    # based on command line flags or settings
-                    # We'll pass it directly to the conversion methods
+                task_dict[self.mid] = FFmpegStatus(self, executor, gid, "Convert")
 
-                    # First check the global settings-based conversion flag
-                    if self.is_settings_based_conversion:
-                        delete_original = True
+            async def convert_file(job, f_path, f_type):
+                # delete_original is now set at the beginning of the function
+                # based on command line flags or settings
+                # We'll pass it directly to the conversion methods
 
-                    # Check if this is a settings-based conversion
-                    if f_type == "video":
-                        is_settings_based = self.is_settings_based_video_conversion
-                        LOGGER.info(f"Converting video: {f_path} to {vext}")
+                # First check the global settings-based conversion flag
+                delete = delete_original or self.is_settings_based_conversion
 
-                        # For settings-based conversion, always force delete_original=True
-                        if is_settings_based:
-                            delete_original = True
+                # Check if this is a settings-based conversion
+                if f_type == "video":
+                    is_settings_based = self.is_settings_based_video_conversion
+                    LOGGER.info(f"Converting video: {f_path} to {vext}")
 
-                        # Use the final delete_original value for conversion
-                        res = await ffmpeg.convert_video(
-                            f_path, vext, delete_original=delete_original
-                        )
+                    # For settings-based conversion, always force delete_original=True
+                    if is_settings_based:
+                        delete = True
+
+                    # Use the final delete_original value for conversion
+                    res = await job.ffmpeg.convert_video(
+                        f_path, vext, delete_original=delete
+                    )
 
-                        # If conversion was successful but original file still exists, delete it
-                        if res and delete_original and await aiopath.exists(f_path):
+                    # If conversion was successful but original file still exists, delete it
+                    if res and delete and await aiopath.exists(f_path):
+                        try:
+                            await remove(f_path)
+                        except Exception as e:
+                            LOGGER.error(f"Error deleting original file: {e}")
+                            # Try again with a different approach
                             try:
-                                await remove(f_path)
-                            except Exception as e:
-                                LOGGER.error(f"Error deleting original file: {e}")
-                                # Try again with a different approach
-                                try:
-                                    import os
+                                import os
 
-                                    os.remove(f_path)
-                                except Exception:
-                                    # Try one more time with a delay
-                                    try:
-                                        from asyncio import sleep
+                                os.remove(f_path)
+                            except Exception:
+                                # Try one more time with a delay
+                                try:
+                                    from asyncio import sleep
 
-                                        await sleep(2)  # Wait 2 seconds
-                                        if await aiopath.exists(f_path):
-                                            await remove(f_path)
-                                    except Exception as e3:
-                                        LOGGER.error(
-                                            f"All attempts to delete file failed: {e3}"
-                                        )
-                    else:
-                        is_settings_based = self.is_settings_based_audio_conversion
-                        LOGGER.info(f"Converting audio: {f_path} to {aext}")
+                                    await sleep(2)  # Wait 2 seconds
+                                    if await aiopath.exists(f_path):
+                                        await remove(f_path)
+                                except Exception as e3:
+                                    LOGGER.error(
+                                        f"All attempts to delete file failed: {e3}"
+                                    )
+                else:
+                    is_settings_based = self.is_settings_based_audio_conversion
+                    LOGGER.info(f"Converting audio: {f_path} to {aext}")
 
-                        # For settings-based conversion, always force delete_original=True
-                        if is_settings_based:
-                            delete_original = True
+                    # For settings-based conversion, always force delete_original=True
+                    if is_settings_based:
+                        delete = True
 
-                        # Use the final delete_original value for conversion
-                        res = await ffmpeg.convert_audio(
-                            f_path, aext, delete_original=delete_original
-                        )
+                    # Use the final delete_original value for conversion
+                    res = await job.ffmpeg.convert_audio(
+                        f_path, aext, delete_original=delete
+                    )
 
-                        # If conversion was successful but original file still exists, delete it
-                        if res and delete_original and await aiopath.exists(f_path):
+                    # If conversion was successful but original file still exists, delete it
+                    if res and delete and await aiopath.exists(f_path):
+                        try:
+                            await remove(f_path)
+                        except Exception as e:
+                            LOGGER.error(f"Error deleting original file: {e}")
+                            # Try again with a different approach
                             try:
-                                await remove(f_path)
-                            except Exception as e:
-                                LOGGER.error(f"Error deleting original file: {e}")
-                                # Try again with a different approach
-                                try:
-                                    import os
+                                import os
 
-                                    os.remove(f_path)
-                                except Exception:
-                                    # Try one more time with a delay
-                                    try:
-                                        from asyncio import sleep
+                                os.remove(f_path)
+                            except Exception:
+                                # Try one more time with a delay
+                                try:
+                                    from asyncio import sleep
 
-                                        await sleep(2)  # Wait 2 seconds
-                                        if await aiopath.exists(f_path):
-                                            await remove(f_path)
-                                    except Exception as e3:
-                                        LOGGER.error(
-                                            f"All attempts to delete file failed: {e3}"
-                                        )
+                                    await sleep(2)  # Wait 2 seconds
+                                    if await aiopath.exists(f_path):
+                                        await remove(f_path)
+                                except Exception as e3:
+                                    LOGGER.error(
+                                        f"All attempts to delete file failed: {e3}"
+                                    )
+                return res
 
-                    # Return the result if successful and this is a file operation
-                    if res and self.is_file:
-                        # The original file is now deleted inside the conversion methods if delete_original is True
-                        # We don't need to delete it here anymore
-                        return res
+            self.progress = False
+            async with cpu_eater_lock:
+                self.progress = True
+                for f_path, f_type in self.files_to_proceed.items():
+                    if self.is_cancelled:
+                        break
+                    self.proceed_count += 1
+                    LOGGER.info(f"Converting: {f_path}")
+                    await executor.submit(f_path, convert_file, f_path, f_type)
+                results = await executor.join()
+            # Return the result if successful and this is a file operation
+            if self.is_file and results and results[0]:
+                # The original file is now deleted inside the conversion methods if delete_original is True
+                return results[0]
         return dl_path
 
     async def generate_sample_video(self, dl_path, gid):
@@ -5630,19 +5513,26 @@ class TaskConfig:
         if await aiopath.isdir(dl_path):
             LOGGER.info(f"Compressing directory: {dl_path}")
 
-            # Process all files in the directory recursively
-            processed_files = 0
+            # Process all files in the directory recursively, several at once
+            executor = FileExecutor(self)
+            await self.set_task_status(FFmpegStatus(self, executor, gid, "Compress"))
             for dirpath, _, files in await sync_to_async(
                 walk, dl_path, topdown=False
             ):
                 for file_ in files:
                     if self.is_cancelled:
+                        await executor.cancel()
                         return dl_path
 
                     f_path = ospath.join(dirpath, file_)
-                    # Process this individual file with compression
-                    await self._compress_single_file(f_path, gid)
-                    processed_files += 1
+                    # Each file is compressed on its own view of the task
+                    await executor.submit(
+                        f_path,
+                        TaskConfig._compress_single_file,
+                        f_path,
+                        gid,
+                    )
+            processed_files = len(await executor.join())
 
             LOGGER.info(f"Compressed {processed_files} files in directory")
             return dl_path
@@ -6200,8 +6090,7 @@ class TaskConfig:
 
         # Execute FFmpeg command
         ffmpeg = FFMpeg(self)
-        async with task_dict_lock:
-            task_dict[self.mid] = FFmpegStatus(self, ffmpeg, gid, "Compress")
+        await self.set_task_status(FFmpegStatus(self, ffmpeg, gid, "Compress"))
 
         # Make sure the is_cancelled attribute exists
         if not hasattr(self, "is_cancelled"):
@@ -6808,8 +6697,7 @@ class TaskConfig:
 
         # Execute FFmpeg command
         ffmpeg = FFMpeg(self)
-        async with task_dict_lock:
-            task_dict[self.mid] = FFmpegStatus(self, ffmpeg, gid, "Compress")
+        await self.set_task_status(FFmpegStatus(self, ffmpeg, gid, "Compress"))
 
         # Make sure the is_cancelled attribute exists
         if not hasattr(self, "is_cancelled"):
@@ -7299,8 +7187,7 @@ class TaskConfig:
 
         # Execute FFmpeg command
         ffmpeg = FFMpeg(self)
-        async with task_dict_lock:
-            task_dict[self.mid] = FFmpegStatus(self, ffmpeg, gid, "Compress")
+        await self.set_task_status(FFmpegStatus(self, ffmpeg, gid, "Compress"))
 
         # Make sure the is_cancelled attribute exists
         if not hasattr(self, "is_cancelled"):
@@ -7723,8 +7610,7 @@ class TaskConfig:
 
         # Create a simple FFmpeg object for status tracking
         ffmpeg = FFMpeg(self)
-        async with task_dict_lock:
-            task_dict[self.mid] = FFmpegStatus(self, ffmpeg, gid, "Compress")
+        await self.set_task_status(FFmpegStatus(self, ffmpeg, gid, "Compress"))
 
         # Build FFmpeg command
         ffmpeg_cmd = [
@@ -7868,8 +7754,7 @@ class TaskConfig:
 
             # Create a simple SevenZ object for status tracking
             sevenz = SevenZ(self)
-            async with task_dict_lock:
-                task_dict[self.mid] = SevenZStatus(self, sevenz, gid, "Compress")
+            await self.set_task_status(SevenZStatus(self, sevenz, gid, "Compress"))
 
             # Make sure the is_cancelled attribute exists
             if not hasattr(self, "is_cancelled"):
@@ -7979,8 +7864,7 @@ class TaskConfig:
 
         # Create a simple FFmpeg object for status tracking
         ffmpeg = FFMpeg(self)
-        async with task_dict_lock:
-            task_dict[self.mid] = FFmpegStatus(self, ffmpeg, gid, "Compress")
+        await self.set_task_status(FFmpegStatus(self, ffmpeg, gid, "Compress"))
 
         # Make sure the is_cancelled attribute exists
         if not hasattr(self, "is_cancelled"):
@@ -8421,8 +8305,7 @@ class TaskConfig:
 
         # Use SevenZ for extraction with status tracking
         sevenz = SevenZ(self)
-        async with task_dict_lock:
-            task_dict[self.mid] = SevenZStatus(self, sevenz, gid, "Extract")
+        await self.set_task_status(SevenZStatus(self, sevenz, gid, "Extract"))
 
         # Make sure the is_cancelled attribute exists
         if not hasattr(self, "is_cancelled"):
@@ -8536,8 +8419,7 @@ class TaskConfig:
 
         # Use SevenZ for compression with status tracking
         sevenz = SevenZ(self)
-        async with task_dict_lock:
-            task_dict[self.mid] = SevenZStatus(self, sevenz, gid, "Compress")
+        await self.set_task_status(SevenZStatus(self, sevenz, gid, "Compress"))
 
         # Make sure the is_cancelled attribute exists
         if not hasattr(self, "is_cancelled"):
@@ -8639,8 +8521,7 @@ class TaskConfig:
 
         # Use SevenZ for compression with status tracking
         sevenz = SevenZ(self)
-        async with task_dict_lock:
-            task_dict[self.mid] = SevenZStatus(self, sevenz, gid, "Compress")
+        await self.set_task_status(SevenZStatus(self, sevenz, gid, "Compress"))
 
         # Make sure the is_cancelled attribute exists
         if not hasattr(self, "is_cancelled"):
@@ -8735,10 +8616,14 @@ class TaskConfig:
                     f_size = await get_path_size(f_path)
                     if f_size > self.split_size:
                         self.files_to_proceed[f_path] = [f_size, file_]
+        if (pipeline := self.split_pipeline) is not None:
+            await pipeline.plan(self.files_to_proceed)
         if self.files_to_proceed:
             ffmpeg = FFMpeg(self)
-            async with task_dict_lock:
-                task_dict[self.mid] = FFmpegStatus(self, ffmpeg, gid, "Split")
+            # Pipelined splits run under the upload status
+            if pipeline is None:
+                async with task_dict_lock:
+                    task_dict[self.mid] = FFmpegStatus(self, ffmpeg, gid, "Split")
             LOGGER.info(f"Splitting: {self.name}")
             for f_path, (f_size, file_) in self.files_to_proceed.items():
                 self.proceed_count += 1
@@ -9117,6 +9002,59 @@ class TaskConfig:
 
         # Process all files in the directory if it's not a single file
         if not self.is_file:
+            executor = FileExecutor(self)
+
+            async def apply_metadata(job, file_path, cmd, temp_file):
+                res = await job.ffmpeg.metadata_watermark_cmds(
+                    cmd,
+                    file_path,
+                )
+
+                if res:
+                    try:
+                        # Check if both source and destination files exist
+                        if await aiopath.exists(temp_file):
+                            # Make sure the destination directory exists
+                            dest_dir = os.path.dirname(file_path)
+                            if not await aiopath.exists(dest_dir):
+                                await makedirs(dest_dir, exist_ok=True)
+
+                            # Replace the file
+                            os.replace(temp_file, file_path)
+                            LOGGER.info(
+                                f"Successfully applied metadata to {file_path}"
+                            )
+                        else:
+                            LOGGER.error(f"Temp file not found: {temp_file}")
+                    except FileNotFoundError as e:
+                        LOGGER.error(
+                            f"File not found error during metadata replacement: {e}"
+                        )
+                        # Try to copy the file instead of replacing it
+                        try:
+                            if await aiopath.exists(temp_file):
+                                import shutil
+
+                                shutil.copy2(temp_file, file_path)
+                                os.remove(temp_file)
+                                LOGGER.info(
+                                    f"Successfully copied metadata to {file_path} (fallback method)"
+                                )
+                        except Exception as copy_error:
+                            LOGGER.error(
+                                f"Failed to copy metadata file as fallback: {copy_error}"
+                            )
+                    except Exception as e:
+                        LOGGER.error(
+                            f"Error replacing file during metadata application: {e}"
+                        )
+                        # Don't delete the temp file in case we need it for debugging
+                elif await aiopath.exists(temp_file):
+                    try:
+                        os.remove(temp_file)
+                    except Exception as e:
+                        LOGGER.error(f"Error removing temp file: {e}")
+
             for dirpath, _, files in await sync_to_async(
                 walk,
                 dl_path,
@@ -9125,6 +9063,7 @@ class TaskConfig:
                 for file_ in files:
                     file_path = ospath.join(dirpath, file_)
                     if self.is_cancelled:
+                        await executor.cancel()
                         if checked:
                             cpu_eater_lock.release()
                         return ""
@@ -9163,7 +9102,7 @@ class TaskConfig:
                             async with task_dict_lock:
                                 task_dict[self.mid] = FFmpegStatus(
                                     self,
-                                    ffmpeg,
+                                    executor,
                                     gid,
                                     "Metadata",
                                 )
@@ -9171,60 +9110,14 @@ class TaskConfig:
                             await cpu_eater_lock.acquire()
                             self.progress = True
 
-                        self.subsize = await aiopath.getsize(file_path)
-                        self.subname = file_
-
-                        res = await ffmpeg.metadata_watermark_cmds(
-                            cmd,
+                        await executor.submit(
+                            file_path,
+                            apply_metadata,
                             file_path,
+                            cmd,
+                            temp_file,
                         )
-
-                        if res:
-                            try:
-                                # Check if both source and destination files exist
-                                if await aiopath.exists(temp_file):
-                                    # Make sure the destination directory exists
-                                    dest_dir = os.path.dirname(file_path)
-                                    if not await aiopath.exists(dest_dir):
-                                        await makedirs(dest_dir, exist_ok=True)
-
-                                    # Replace the file
-                                    os.replace(temp_file, file_path)
-                                    LOGGER.info(
-                                        f"Successfully applied metadata to {file_path}"
-                                    )
-                                else:
-                                    LOGGER.error(f"Temp file not found: {temp_file}")
-                            except FileNotFoundError as e:
-                                LOGGER.error(
-                                    f"File not found error during metadata replacement: {e}"
-                                )
-                                # Try to copy the file instead of replacing it
-                                try:
-                                    if await aiopath.exists(temp_file):
-                                        import shutil
-
-                                        shutil.copy2(temp_file, file_path)
-                                        os.remove(temp_file)
-                                        LOGGER.info(
-                                            f"Successfully copied metadata to {file_path} (fallback method)"
-                                        )
-                                except Exception as copy_error:
-                                    LOGGER.error(
-                                        f"Failed to copy metadata file as fallback: {copy_error}"
-                                    )
-                            except Exception as e:
-                                LOGGER.error(
-                                    f"Error replacing file during metadata application: {e}"
-                                )
-                                # Don't delete the temp file in case we need it for debugging
-                        elif await aiopath.exists(temp_file):
-                            try:
-                                os.remove(temp_file)
-                            except Exception as e:
-                                LOGGER.error(f"Error removing temp file: {e}")
-                    else:
-                        pass
+            await executor.join()
 
         if checked:
             cpu_eater_lock.release()
@@ -9466,6 +9359,7 @@ class TaskConfig:
                         analysis["video_files"],
                         self.merge_output_format_video,
                         "video",
+                        probes=analysis["probes"],
                     )
 
                     if cmd:
@@ -9501,6 +9395,7 @@ class TaskConfig:
                         analysis["video_files"],
                         "video",
                         self.merge_output_format_video,
+                        probes=analysis["probes"],
                     )
 
                     if cmd:
@@ -9651,6 +9546,7 @@ class TaskConfig:
                             analysis["audio_files"],
                             "audio",
                             self.merge_output_format_audio,
+                            probes=analysis["probes"],
                         )
                     elif self.merge_subtitle and analysis["subtitle_files"]:
                         cmd, output_file = await get_merge_filter_complex_cmd(
@@ -9688,6 +9584,7 @@ class TaskConfig:
                             analysis["audio_files"],
                             self.merge_output_format_audio,
                             "audio",
+                            probes=analysis["probes"],
                         )
                     elif self.merge_subtitle and analysis["subtitle_files"]:
                         cmd, output_file = await get_merge_concat_demuxer_cmd(
@@ -9728,12 +9625,14 @@ class TaskConfig:
                             analysis["video_files"],
                             self.merge_output_format_video,
                             "video",
+                            probes=analysis["probes"],
                         )
                     elif analysis["audio_files"]:
                         cmd, output_file = await get_merge_concat_demuxer_cmd(
                             analysis["audio_files"],
                             self.merge_output_format_audio,
                             "audio",
+                            probes=analysis["probes"],
                         )
                     elif analysis["subtitle_files"]:
                         cmd, output_file = await get_merge_concat_demuxer_cmd(
@@ -9858,12 +9757,14 @@ class TaskConfig:
                             analysis["video_files"],
                             "video",
                             self.merge_output_format_video,
+                            probes=analysis["probes"],
                         )
                     elif analysis["audio_files"]:
                         cmd, output_file = await get_merge_filter_complex_cmd(
                             analysis["audio_files"],
                             "audio",
                             self.merge_output_format_audio,
+                            probes=analysis["probes"],
                         )
                     elif analysis["subtitle_files"]:
                         cmd, output_file = await get_merge_filter_complex_cmd(
@@ -9976,10 +9877,10 @@ class TaskConfig:
         font = self.watermark_font
 
         # Fast mode has been removed, use speed parameter instead
-        speed = self.user_dict.get("WATERMARK_SPEED", Config.WATERMARK_SPEED)
+        speed = self.settings.WATERMARK_SPEED
         # Quality is now controlled by WATERMARK_QUALITY parameter
         maintain_quality = True
-        opacity = self.user_dict.get("WATERMARK_OPACITY", Config.WATERMARK_OPACITY)
+        opacity = self.settings.WATERMARK_OPACITY
 
         # Determine the source of the watermark settings
         user_enabled = "WATERMARK_ENABLED" in self.user_dict and self.user_dict.get(
@@ -10122,7 +10023,30 @@ class TaskConfig:
                 else:
                     pass
         else:
-            # Process all files in the directory
+            # Process all files in the directory, several at once
+            executor = FileExecutor(self)
+
+            async def apply_watermark(job, file_path, cmd, temp_file):
+                res = await job.ffmpeg.metadata_watermark_cmds(
+                    cmd,
+                    file_path,
+                )
+                if res:
+                    # Create a new path for the watermarked file if we need to keep the original
+                    if not self.watermark_remove_original:
+                        watermarked_path = f"{ospath.splitext(file_path)[0]}_watermarked{ospath.splitext(file_path)[1]}"
+                        os.replace(temp_file, watermarked_path)
+                        LOGGER.info(
+                            f"Successfully applied watermark to: {watermarked_path} (original kept)"
+                        )
+                    else:
+                        os.replace(temp_file, file_path)
+                        LOGGER.info(
+                            f"Successfully applied watermark to: {file_path} (original replaced)"
+                        )
+                elif await aiopath.exists(temp_file):
+                    os.remove(temp_file)
+
             for dirpath, _, files in await sync_to_async(
                 walk,
                 dl_path,
@@ -10131,6 +10055,7 @@ class TaskConfig:
                 for file_ in files:
                     file_path = ospath.join(dirpath, file_)
                     if self.is_cancelled:
+                        await executor.cancel()
                         if checked:
                             cpu_eater_lock.release()
                         return ""
@@ -10216,36 +10141,21 @@ class TaskConfig:
                                 async with task_dict_lock:
                                     task_dict[self.mid] = FFmpegStatus(
                                         self,
-                                        ffmpeg,
+                                        executor,
                                         gid,
                                         "Watermark",
                                     )
                                 self.progress = False
                                 await cpu_eater_lock.acquire()
                                 self.progress = True
-                            self.subsize = await aiopath.getsize(file_path)
-                            self.subname = file_
-                            res = await ffmpeg.metadata_watermark_cmds(
-                                cmd,
+                            await executor.submit(
+                                file_path,
+                                apply_watermark,
                                 file_path,
+                                cmd,
+                                temp_file,
                             )
-                            if res:
-                                # Create a new path for the watermarked file if we need to keep the original
-                                if not self.watermark_remove_original:
-                                    watermarked_path = f"{ospath.splitext(file_path)[0]}_watermarked{ospath.splitext(file_path)[1]}"
-                                    os.replace(temp_file, watermarked_path)
-                                    LOGGER.info(
-                                        f"Successfully applied watermark to: {watermarked_path} (original kept)"
-                                    )
-                                else:
-                                    os.replace(temp_file, file_path)
-                                    LOGGER.info(
-                                        f"Successfully applied watermark to: {file_path} (original replaced)"
-                                    )
-                            elif await aiopath.exists(temp_file):
-                                os.remove(temp_file)
-                        else:
-                            pass
+            await executor.join()
         if checked:
             cpu_eater_lock.release()
         return dl_path
@@ -10564,7 +10474,99 @@ class TaskConfig:
             else:
                 pass
         else:
-            # Process all files in the directory
+            # Process all files in the directory, several at once
+            executor = FileExecutor(self)
+
+            async def extract_tracks(job, file_path, output_dir):
+
+                # Get format settings - ensure they're properly normalized
+                video_format = (
+                    self.extract_video_format
+                    if hasattr(self, "extract_video_format")
+                    and self.extract_video_format
+                    and self.extract_video_format.lower() != "none"
+                    else None
+                )
+                audio_format = (
+                    self.extract_audio_format
+                    if hasattr(self, "extract_audio_format")
+                    and self.extract_audio_format
+                    and self.extract_audio_format.lower() != "none"
+                    else None
+                )
+                subtitle_format = (
+                    self.extract_subtitle_format
+                    if hasattr(self, "extract_subtitle_format")
+                    and self.extract_subtitle_format
+                    and self.extract_subtitle_format.lower() != "none"
+                    else None
+                )
+                attachment_format = (
+                    self.extract_attachment_format
+                    if hasattr(self, "extract_attachment_format")
+                    and self.extract_attachment_format
+                    and self.extract_attachment_format.lower() != "none"
+                    else None
+                )
+
+                extracted_files = await proceed_extract(
+                    file_path,
+                    output_dir,
+                    self.extract_video_enabled,
+                    self.extract_audio_enabled,
+                    self.extract_subtitle_enabled,
+                    self.extract_attachment_enabled,
+                    video_codec,
+                    audio_codec,
+                    subtitle_codec,
+                    self.extract_video_index,
+                    self.extract_audio_index,
+                    self.extract_subtitle_index,
+                    self.extract_attachment_index,
+                    maintain_quality,
+                    "xtra",
+                    self.extract_delete_original,
+                    # Pass the indices lists as well
+                    video_indices=self.extract_video_indices,
+                    audio_indices=self.extract_audio_indices,
+                    subtitle_indices=self.extract_subtitle_indices,
+                    attachment_indices=self.extract_attachment_indices,
+                    # Pass format settings
+                    video_format=video_format,
+                    audio_format=audio_format,
+                    subtitle_format=subtitle_format,
+                    attachment_format=attachment_format,
+                    # Pass additional video settings
+                    video_quality=video_quality,
+                    video_preset=video_preset,
+                    video_bitrate=video_bitrate,
+                    video_resolution=video_resolution,
+                    video_fps=video_fps,
+                    # Pass additional audio settings
+                    audio_bitrate=audio_bitrate,
+                    audio_channels=audio_channels,
+                    audio_sampling=audio_sampling,
+                    audio_volume=audio_volume,
+                    # Pass additional subtitle settings
+                    subtitle_language=subtitle_language,
+                    subtitle_encoding=subtitle_encoding,
+                    subtitle_font=subtitle_font,
+                    subtitle_font_size=subtitle_font_size,
+                    # Pass attachment settings
+                    attachment_filter=attachment_filter,
+                    listener=job,
+                )
+
+                # Check if extraction was successful
+                if extracted_files:
+                    LOGGER.info(
+                        f"Successfully extracted {len(extracted_files)} tracks from: {file_path}"
+                    )
+                    for _file in extracted_files:
+                        pass
+                else:
+                    pass
+
             for dirpath, _, files in await sync_to_async(
                 walk,
                 dl_path,
@@ -10573,6 +10575,7 @@ class TaskConfig:
                 for file_ in files:
                     file_path = ospath.join(dirpath, file_)
                     if self.is_cancelled:
+                        await executor.cancel()
                         if checked:
                             cpu_eater_lock.release()
                         return ""
@@ -10583,7 +10586,7 @@ class TaskConfig:
                         async with task_dict_lock:
                             task_dict[self.mid] = FFmpegStatus(
                                 self,
-                                ffmpeg,
+                                executor,
                                 gid,
                                 "Extract",
                             )
@@ -10592,98 +10595,13 @@ class TaskConfig:
                         self.progress = True
 
                     LOGGER.info(f"Extracting tracks from file: {file_path}")
-                    self.subsize = await aiopath.getsize(file_path)
-                    self.subname = file_
-
-                    # Use the proceed_extract function
-                    output_dir = dirpath
-
-                    # Get format settings - ensure they're properly normalized
-                    video_format = (
-                        self.extract_video_format
-                        if hasattr(self, "extract_video_format")
-                        and self.extract_video_format
-                        and self.extract_video_format.lower() != "none"
-                        else None
-                    )
-                    audio_format = (
-                        self.extract_audio_format
-                        if hasattr(self, "extract_audio_format")
-                        and self.extract_audio_format
-                        and self.extract_audio_format.lower() != "none"
-                        else None
-                    )
-                    subtitle_format = (
-                        self.extract_subtitle_format
-                        if hasattr(self, "extract_subtitle_format")
-                        and self.extract_subtitle_format
-                        and self.extract_subtitle_format.lower() != "none"
-                        else None
-                    )
-                    attachment_format = (
-                        self.extract_attachment_format
-                        if hasattr(self, "extract_attachment_format")
-                        and self.extract_attachment_format
-                        and self.extract_attachment_format.lower() != "none"
-                        else None
-                    )
-
-                    extracted_files = await proceed_extract(
+                    await executor.submit(
                         file_path,
-                        output_dir,
-                        self.extract_video_enabled,
-                        self.extract_audio_enabled,
-                        self.extract_subtitle_enabled,
-                        self.extract_attachment_enabled,
-                        video_codec,
-                        audio_codec,
-                        subtitle_codec,
-                        self.extract_video_index,
-                        self.extract_audio_index,
-                        self.extract_subtitle_index,
-                        self.extract_attachment_index,
-                        maintain_quality,
-                        "xtra",
-                        self.extract_delete_original,
-                        # Pass the indices lists as well
-                        video_indices=self.extract_video_indices,
-                        audio_indices=self.extract_audio_indices,
-                        subtitle_indices=self.extract_subtitle_indices,
-                        attachment_indices=self.extract_attachment_indices,
-                        # Pass format settings
-                        video_format=video_format,
-                        audio_format=audio_format,
-                        subtitle_format=subtitle_format,
-                        attachment_format=attachment_format,
-                        # Pass additional video settings
-                        video_quality=video_quality,
-                        video_preset=video_preset,
-                        video_bitrate=video_bitrate,
-                        video_resolution=video_resolution,
-                        video_fps=video_fps,
-                        # Pass additional audio settings
-                        audio_bitrate=audio_bitrate,
-                        audio_channels=audio_channels,
-                        audio_sampling=audio_sampling,
-                        audio_volume=audio_volume,
-                        # Pass additional subtitle settings
-                        subtitle_language=subtitle_language,
-                        subtitle_encoding=subtitle_encoding,
-                        subtitle_font=subtitle_font,
-                        subtitle_font_size=subtitle_font_size,
-                        # Pass attachment settings
-                        attachment_filter=attachment_filter,
+                        extract_tracks,
+                        file_path,
+                        dirpath,
                     )
-
-                    # Check if extraction was successful
-                    if extracted_files:
-                        LOGGER.info(
-                            f"Successfully extracted {len(extracted_files)} tracks from: {file_path}"
-                        )
-                        for _file in extracted_files:
-                            pass
-                    else:
-                        pass
+            await executor.join()
 
         if checked:
             cpu_eater_lock.release()
@@ -11380,7 +11298,131 @@ class TaskConfig:
             else:
                 pass
         else:
-            # Process all files in the directory
+            # Process all files in the directory, several at once
+            executor = FileExecutor(self)
+
+            async def trim_file(job, file_path, cmd, temp_file):
+                # Check if this is a special trim command
+                if cmd[0] == "srt_trim":
+                    # Handle SRT trimming manually
+                    res = await job.trim_srt_file(cmd[1], cmd[2], cmd[3], cmd[4])
+                elif cmd[0] == "pdf_trim":
+                    # Handle PDF trimming manually
+                    res = await job.trim_pdf_file(cmd[1], cmd[2], cmd[3], cmd[4])
+                elif cmd[0] == "gif_trim":
+                    # Handle GIF trimming manually
+                    res = await job.trim_gif_file(cmd[1], cmd[2], cmd[3])
+                else:
+                    # Get user-provided files from bulk or multi feature
+                    user_provided_files = None
+                    if hasattr(self, "bulk") and self.bulk:
+                        # For bulk feature, use the remaining files in the bulk list
+                        user_provided_files = self.bulk.copy()
+                        # Add the current file at the beginning
+                        user_provided_files.insert(0, file_path)
+                    elif hasattr(self, "multi") and self.multi > 1:
+                        # For multi feature, try to find other files in the same directory
+                        user_provided_files = []
+                        # Add the current file first
+                        user_provided_files.append(file_path)
+                        # Get the directory of the current file
+                        dir_path = os.path.dirname(file_path)
+                        if os.path.exists(dir_path) and os.path.isdir(dir_path):
+                            # Get all files in the directory
+                            dir_files = [
+                                os.path.join(dir_path, f)
+                                for f in os.listdir(dir_path)
+                                if os.path.isfile(os.path.join(dir_path, f))
+                            ]
+                            # Add other files to the list
+                            for f in dir_files:
+                                if f != file_path and f not in user_provided_files:
+                                    user_provided_files.append(f)
+
+                    # Use FFmpeg for other files with user-provided files
+                    res = await job.ffmpeg.ffmpeg_cmds(
+                        cmd, file_path, user_provided_files
+                    )
+
+                # Check if the temp file exists after the command completes
+                temp_file_exists = await aiopath.exists(temp_file)
+
+                # Check if the temp file has valid content
+                if temp_file_exists:
+                    try:
+                        temp_file_size = await aiopath.getsize(temp_file)
+                        temp_file_valid = temp_file_size > 0
+                    except Exception as e:
+                        LOGGER.error(f"Error checking temp file size: {e}")
+                        temp_file_valid = False
+                else:
+                    temp_file_valid = False
+
+                # Handle the result based on the command output and temp file status
+                if isinstance(res, list) and res:
+                    # xtra_cmds returns a list of output files on success
+                    if temp_file_exists and temp_file_valid:
+                        if delete_original:
+                            # Replace the original file with the trimmed file
+                            os.replace(temp_file, file_path)
+                            LOGGER.info(
+                                f"Successfully trimmed file and replaced original: {file_path}"
+                            )
+                        else:
+                            # Keep both files
+                            trimmed_path = f"{os.path.splitext(file_path)[0]}.trimmed{os.path.splitext(temp_file)[1]}"
+                            os.replace(temp_file, trimmed_path)
+                            LOGGER.info(
+                                f"Successfully trimmed file (keeping original): {trimmed_path}"
+                            )
+                    else:
+                        LOGGER.error(
+                            f"FFmpeg command succeeded but temp file is not valid: {temp_file}"
+                        )
+                elif res is True:
+                    # Direct boolean success
+                    if temp_file_exists and temp_file_valid:
+                        if delete_original:
+                            # Replace the original file with the trimmed file
+                            os.replace(temp_file, file_path)
+                            LOGGER.info(
+                                f"Successfully trimmed file and replaced original: {file_path}"
+                            )
+                        else:
+                            # Keep both files
+                            trimmed_path = f"{os.path.splitext(file_path)[0]}.trimmed{os.path.splitext(temp_file)[1]}"
+                            os.replace(temp_file, trimmed_path)
+                            LOGGER.info(
+                                f"Successfully trimmed file (keeping original): {trimmed_path}"
+                            )
+                    else:
+                        LOGGER.error(
+                            f"Command reported success but temp file is not valid: {temp_file}"
+                        )
+                elif await aiopath.exists(temp_file):
+                    # Command failed but temp file exists
+                    if temp_file_valid:
+                        if delete_original:
+                            # Replace the original file with the trimmed file
+                            os.replace(temp_file, file_path)
+                            LOGGER.info(
+                                f"Replaced original file with temp file despite command failure: {file_path}"
+                            )
+                        else:
+                            # Keep both files
+                            trimmed_path = f"{os.path.splitext(file_path)[0]}.trimmed{os.path.splitext(temp_file)[1]}"
+                            os.replace(temp_file, trimmed_path)
+                            LOGGER.info(
+                                f"Kept temp file despite command failure: {trimmed_path}"
+                            )
+                    else:
+                        # Temp file exists but is not valid
+                        os.remove(temp_file)
+                else:
+                    LOGGER.error(
+                        f"Trim failed and no temp file was created for: {file_path}"
+                    )
+
             for dirpath, _, files in await sync_to_async(
                 walk,
                 dl_path,
@@ -11389,6 +11431,7 @@ class TaskConfig:
                 for file_ in files:
                     file_path = ospath.join(dirpath, file_)
                     if self.is_cancelled:
+                        await executor.cancel()
                         if checked:
                             cpu_eater_lock.release()
                         return ""
@@ -11421,7 +11464,7 @@ class TaskConfig:
                             async with task_dict_lock:
                                 task_dict[self.mid] = FFmpegStatus(
                                     self,
-                                    ffmpeg,
+                                    executor,
                                     gid,
                                     "Trim",
                                 )
@@ -11430,140 +11473,14 @@ class TaskConfig:
                             self.progress = True
 
                         LOGGER.info(f"Trimming file: {file_path}")
-                        self.subsize = await aiopath.getsize(file_path)
-                        self.subname = file_
-
-                        # Check if this is a special trim command
-                        if cmd[0] == "srt_trim":
-                            # Handle SRT trimming manually
-                            res = await self.trim_srt_file(
-                                cmd[1], cmd[2], cmd[3], cmd[4]
-                            )
-                        elif cmd[0] == "pdf_trim":
-                            # Handle PDF trimming manually
-                            res = await self.trim_pdf_file(
-                                cmd[1], cmd[2], cmd[3], cmd[4]
-                            )
-                        elif cmd[0] == "gif_trim":
-                            # Handle GIF trimming manually
-                            res = await self.trim_gif_file(cmd[1], cmd[2], cmd[3])
-                        else:
-                            # Get user-provided files from bulk or multi feature
-                            user_provided_files = None
-                            if hasattr(self, "bulk") and self.bulk:
-                                # For bulk feature, use the remaining files in the bulk list
-                                user_provided_files = self.bulk.copy()
-                                # Add the current file at the beginning
-                                user_provided_files.insert(0, file_path)
-                            elif hasattr(self, "multi") and self.multi > 1:
-                                # For multi feature, try to find other files in the same directory
-                                user_provided_files = []
-                                # Add the current file first
-                                user_provided_files.append(file_path)
-                                # Get the directory of the current file
-                                dir_path = os.path.dirname(file_path)
-                                if os.path.exists(dir_path) and os.path.isdir(
-                                    dir_path
-                                ):
-                                    # Get all files in the directory
-                                    dir_files = [
-                                        os.path.join(dir_path, f)
-                                        for f in os.listdir(dir_path)
-                                        if os.path.isfile(os.path.join(dir_path, f))
-                                    ]
-                                    # Add other files to the list
-                                    for f in dir_files:
-                                        if (
-                                            f != file_path
-                                            and f not in user_provided_files
-                                        ):
-                                            user_provided_files.append(f)
-
-                            # Use FFmpeg for other files with user-provided files
-                            res = await ffmpeg.ffmpeg_cmds(
-                                cmd, file_path, user_provided_files
-                            )
-
-                        # Check if the temp file exists after the command completes
-                        temp_file_exists = await aiopath.exists(temp_file)
-
-                        # Check if the temp file has valid content
-                        if temp_file_exists:
-                            try:
-                                temp_file_size = await aiopath.getsize(temp_file)
-                                temp_file_valid = temp_file_size > 0
-                            except Exception as e:
-                                LOGGER.error(f"Error checking temp file size: {e}")
-                                temp_file_valid = False
-                        else:
-                            temp_file_valid = False
-
-                        # Handle the result based on the command output and temp file status
-                        if isinstance(res, list) and res:
-                            # xtra_cmds returns a list of output files on success
-                            if temp_file_exists and temp_file_valid:
-                                if delete_original:
-                                    # Replace the original file with the trimmed file
-                                    os.replace(temp_file, file_path)
-                                    LOGGER.info(
-                                        f"Successfully trimmed file and replaced original: {file_path}"
-                                    )
-                                else:
-                                    # Keep both files
-                                    trimmed_path = f"{os.path.splitext(file_path)[0]}.trimmed{os.path.splitext(temp_file)[1]}"
-                                    os.replace(temp_file, trimmed_path)
-                                    LOGGER.info(
-                                        f"Successfully trimmed file (keeping original): {trimmed_path}"
-                                    )
-                            else:
-                                LOGGER.error(
-                                    f"FFmpeg command succeeded but temp file is not valid: {temp_file}"
-                                )
-                        elif res is True:
-                            # Direct boolean success
-                            if temp_file_exists and temp_file_valid:
-                                if delete_original:
-                                    # Replace the original file with the trimmed file
-                                    os.replace(temp_file, file_path)
-                                    LOGGER.info(
-                                        f"Successfully trimmed file and replaced original: {file_path}"
-                                    )
-                                else:
-                                    # Keep both files
-                                    trimmed_path = f"{os.path.splitext(file_path)[0]}.trimmed{os.path.splitext(temp_file)[1]}"
-                                    os.replace(temp_file, trimmed_path)
-                                    LOGGER.info(
-                                        f"Successfully trimmed file (keeping original): {trimmed_path}"
-                                    )
-                            else:
-                                LOGGER.error(
-                                    f"Command reported success but temp file is not valid: {temp_file}"
-                                )
-                        elif await aiopath.exists(temp_file):
-                            # Command failed but temp file exists
-                            if temp_file_valid:
-                                if delete_original:
-                                    # Replace the original file with the trimmed file
-                                    os.replace(temp_file, file_path)
-                                    LOGGER.info(
-                                        f"Replaced original file with temp file despite command failure: {file_path}"
-                                    )
-                                else:
-                                    # Keep both files
-                                    trimmed_path = f"{os.path.splitext(file_path)[0]}.trimmed{os.path.splitext(temp_file)[1]}"
-                                    os.replace(temp_file, trimmed_path)
-                                    LOGGER.info(
-                                        f"Kept temp file despite command failure: {trimmed_path}"
-                                    )
-                            else:
-                                # Temp file exists but is not valid
-                                os.remove(temp_file)
-                        else:
-                            LOGGER.error(
-                                f"Trim failed and no temp file was created for: {file_path}"
-                            )
-                    else:
-                        pass
+                        await executor.submit(
+                            file_path,
+                            trim_file,
+                            file_path,
+                            cmd,
+                            temp_file,
+                        )
+            await executor.join()
 
         if checked:
             cpu_eater_lock.release()
@@ -15,6 +15,7 @@ from httpx import AsyncClient
 
 from bot import LOGGER, bot_loop, user_data
 from bot.core.config_manager import Config
+from bot.helper.ext_utils.effective_settings import invalidate_user
 from bot.helper.telegram_helper.button_build import ButtonMaker
 
 try:
@@ -440,6 +441,7 @@ def update_user_ldata(id_, key, value):
     if id_ == Config.OWNER_ID and key == "AUTH":
         # Always ensure owner is authorized
         user_data[id_]["AUTH"] = True
+    invalidate_user(id_)
 
 
 async def getdailytasks(
@@ -830,117 +832,18 @@ def is_media_tool_enabled(tool_name):
     Returns:
         bool: True if the tool is enabled, False otherwise
     """
-    from bot import LOGGER
-    from bot.core.config_manager import Config
-
-    # If ENABLE_EXTRA_MODULES is False, all extra modules are disabled
-    if not Config.ENABLE_EXTRA_MODULES:
-        return False
-
-    # If media tools are completely disabled (boolean False), return False
-    if Config.MEDIA_TOOLS_ENABLED is False:
-        return False
-
-    # List of all available tools
-    all_tools = [
-        "watermark",
-        "merge",
-        "convert",
-        "compression",
-        "trim",
-        "extract",
-        "add",
-        "metadata",
-        "xtra",
-        "sample",
-        "screenshot",
-        "archive",
-    ]
-
-    # This is a synchronous function, so we can't directly access the database
-    # We'll use the current value from Config and rely on the UI to refresh it
-
-    # Parse enabled tools from the configuration
-    enabled_tools = []
-
-    # If MEDIA_TOOLS_ENABLED is a string
-    if isinstance(Config.MEDIA_TOOLS_ENABLED, str):
-        # Handle both comma-separated and single values
-        if "," in Config.MEDIA_TOOLS_ENABLED:
-            # Split by comma and strip whitespace
-            enabled_tools = [
-                t.strip().lower()
-                for t in Config.MEDIA_TOOLS_ENABLED.split(",")
-                if t.strip()
-            ]
-        elif Config.MEDIA_TOOLS_ENABLED.strip():  # Single non-empty value
-            # Make sure to properly handle a single tool name
-            single_tool = Config.MEDIA_TOOLS_ENABLED.strip().lower()
-            if single_tool in all_tools:
-                enabled_tools = [single_tool]
-            # If the single tool is not in all_tools, it might be a comma-separated string without spaces
-            elif any(t in single_tool for t in all_tools):
-                # Try to split by comma without spaces
-                potential_tools = single_tool.split(",")
-                enabled_tools = [t for t in potential_tools if t in all_tools]
-
-                # If we couldn't find any valid tools, try the original value again
-                if not enabled_tools and single_tool:
-                    # Log for debugging
-                    LOGGER.debug(f"Checking if '{single_tool}' is a valid tool")
-                    # Check if it's a valid tool name (might be misspelled or have extra characters)
-                    for tool in all_tools:
-                        if tool in single_tool:
-                            enabled_tools = [tool]
-                            break
+    from bot.helper.ext_utils.effective_settings import enabled_media_tools
 
-    # If MEDIA_TOOLS_ENABLED is True (boolean), all tools are enabled
-    elif Config.MEDIA_TOOLS_ENABLED is True:
-        enabled_tools = all_tools.copy()
-
-    # If MEDIA_TOOLS_ENABLED is some other truthy value
-    elif Config.MEDIA_TOOLS_ENABLED:
-        if isinstance(Config.MEDIA_TOOLS_ENABLED, list | tuple | set):
-            enabled_tools = [
-                str(t).strip().lower() for t in Config.MEDIA_TOOLS_ENABLED if t
-            ]
-        else:
-            # Try to convert to string and use as a single value
-            try:
-                val = str(Config.MEDIA_TOOLS_ENABLED).strip().lower()
-                if val:
-                    if val in all_tools:
-                        enabled_tools = [val]
-                    else:
-                        # Check if it contains a valid tool name
-                        for tool in all_tools:
-                            if tool in val:
-                                enabled_tools = [tool]
-                                break
-            except Exception as e:
-                LOGGER.error(f"Error parsing MEDIA_TOOLS_ENABLED value: {e}")
-
-    # Debug log the enabled tools and the raw MEDIA_TOOLS_ENABLED value
-    LOGGER.debug(f"Raw MEDIA_TOOLS_ENABLED value: {Config.MEDIA_TOOLS_ENABLED}")
-    LOGGER.debug(f"Parsed enabled tools: {enabled_tools}")
-    LOGGER.debug(f"Checking if tool '{tool_name}' is enabled")
+    # MEDIA_TOOLS_ENABLED is parsed once per config version
+    enabled_tools = enabled_media_tools()
 
     # If checking for 'mediatools' (general media tools status), return True if any tool is enabled
     if tool_name.lower() == "mediatools":
-        result = len(enabled_tools) > 0
-        LOGGER.debug(f"'mediatools' check result: {result}")
-        return result
+        return bool(enabled_tools)
+    return tool_name.lower() in enabled_tools
 
-    # Check if the specific tool is in the enabled list
-    # If MEDIA_TOOLS_ENABLED is False or empty, no tools are enabled
-    if not enabled_tools:
-        LOGGER.debug(f"No tools enabled, '{tool_name}' is disabled")
-        return False
 
-    # Otherwise, check if the specific tool is in the enabled list
-    result = tool_name.lower() in enabled_tools
-    LOGGER.debug(f"Tool '{tool_name}' enabled: {result}")
-    return result
+_flag_cache = [-1, {}]  # [config version, {flag: enabled}]
 
 
 def is_flag_enabled(flag_name):
@@ -954,6 +857,19 @@ def is_flag_enabled(flag_name):
     """
     from bot.core.config_manager import Config
 
+    # Results only change with the config, cache them per config version
+    version = Config.get_version()
+    if _flag_cache[0] != version:
+        _flag_cache[0] = version
+        _flag_cache[1] = {}
+    if (enabled := _flag_cache[1].get(flag_name)) is None:
+        enabled = _flag_cache[1][flag_name] = bool(_resolve_flag(flag_name))
+    return enabled
+
+
+def _resolve_flag(flag_name):
+    from bot.core.config_manager import Config
+
     # Clean the flag name by removing the leading dash
     clean_flag = flag_name.lstrip("-")
 
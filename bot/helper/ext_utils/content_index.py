@@ -0,0 +1,309 @@
+import json
+from base64 import b32decode
+from collections import OrderedDict
+from hashlib import sha1
+from os import path as ospath
+from re import search as re_search
+from typing import ClassVar
+
+from httpx import AsyncClient
+
+from bot import LOGGER
+from bot.core.config_manager import Config
+from bot.helper.ext_utils.bot_utils import sync_to_async
+from bot.helper.ext_utils.db_handler import database
+from bot.helper.ext_utils.links_utils import (
+    is_gdrive_id,
+    is_gdrive_link,
+    is_magnet,
+    is_url,
+)
+from bot.helper.ext_utils.metrics import Metrics
+
+# User settings that change what a leech uploads, part of the index key
+LEECH_VARIANT_KEYS = (
+    "LEECH_FILENAME_PREFIX",
+    "LEECH_SUFFIX",
+    "LEECH_FONT",
+    "LEECH_FILENAME",
+    "LEECH_FILENAME_CAPTION",
+)
+
+
+def _magnet_infohash(link):
+    if not (match := re_search(r"xt=urn:btih:([a-zA-Z0-9]+)", link)):
+        return None
+    infohash = match[1]
+    if len(infohash) == 32:
+        infohash = b32decode(infohash.upper()).hex()
+    return infohash.lower() if len(infohash) == 40 else None
+
+
+def _torrent_infohash(path):
+    """SHA-1 of the bencoded info dict of a .torrent file."""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    def value_end(i):
+        kind = data[i : i + 1]
+        if kind == b"i":
+            return data.index(b"e", i) + 1
+        if kind in (b"l", b"d"):
+            i += 1
+            while data[i : i + 1] != b"e":
+                i = value_end(i)
+            return i + 1
+        colon = data.index(b":", i)
+        return colon + 1 + int(data[i:colon])
+
+    if data[:1] != b"d":
+        return None
+    i = 1
+    while data[i : i + 1] not in (b"e", b""):
+        key_end = value_end(i)
+        key = data[data.index(b":", i) + 1 : key_end]
+        end = value_end(key_end)
+        if key == b"info":
+            return sha1(data[key_end:end]).hexdigest()
+        i = end
+    return None
+
+
+def _drive_file_id(link):
+    """Id of a Drive file link, None for folders and bare ids.
+
+    A folder keeps its id while its contents change, and a bare id may
+    be either, so only links that can only point at a file qualify.
+    """
+    match = re_search(r"(?:/file/d/|/uc\?(?:[^#]*&)?id=)([-\w]{20,})", link)
+    return match[1] if match else None
+
+
+async def _url_identity(url):
+    """ETag, or size and Last-Modified, of a direct link."""
+    try:
+        async with AsyncClient(follow_redirects=True, timeout=10) as client:
+            headers = (await client.head(url)).headers
+    except Exception:
+        return None
+    if etag := headers.get("ETag"):
+        return etag.removeprefix("W/")
+    size, modified = headers.get("Content-Length"), headers.get("Last-Modified")
+    if size and modified:
+        return f"{size}|{modified}"
+    return None
+
+
+async def source_identity(link, file_=None):
+    """Identify what a task downloads, None when it can't be told cheaply.
+
+    Telegram files by file_unique_id, torrents by infohash, Drive file
+    links by id and direct links by URL with ETag or size and
+    Last-Modified.
+    """
+    if file_ is not None:
+        return f"tg:{file_.file_unique_id}"
+    if not isinstance(link, str) or not link:
+        return None
+    if is_magnet(link):
+        infohash = _magnet_infohash(link)
+        return infohash and f"bt:{infohash}"
+    if link.endswith(".torrent") and await sync_to_async(ospath.isfile, link):
+        try:
+            infohash = await sync_to_async(_torrent_infohash, link)
+        except (OSError, ValueError, IndexError):
+            return None
+        return infohash and f"bt:{infohash}"
+    if is_gdrive_link(link) or is_gdrive_id(link):
+        drive_id = _drive_file_id(link)
+        return drive_id and f"gd:{drive_id}"
+    if is_url(link) and link.startswith(("http://", "https://")):
+        version = await _url_identity(link)
+        return version and f"url:{link}|{version}"
+    return None
+
+
+class ContentIndex:
+    """Results of earlier tasks by the content they downloaded.
+
+    The key is the source identity plus everything that changes the
+    output: the -n name, the user and the destination, which may resolve
+    to the user's own chat, remote or token, and for leeches the split
+    size and equal splits, document mode, thumbnail and its layout,
+    filename and caption settings. Only tasks uploading the downloaded
+    files untouched are indexed. A leech hit copies the indexed messages
+    to the task's destination, a mirror hit returns the indexed links,
+    both without transferring anything. Entries live in an in-memory LRU
+    and in the DB cache collection for CONTENT_INDEX_TTL.
+    """
+
+    max_entries = 512
+    hits = 0
+    misses = 0
+    _cache: ClassVar[OrderedDict] = OrderedDict()
+
+    @staticmethod
+    def _variant(listener):
+        target = [listener.name, listener.user_id, str(listener.up_dest)]
+        if not listener.is_leech:
+            return ["mirror", *target]
+        settings = [listener.settings.get(key, "") for key in LEECH_VARIANT_KEYS]
+        equal_splits = bool(listener.settings.get("EQUAL_SPLITS", False))
+        # -es t or -es f overrides the setting, as in proceed_split
+        flag = (getattr(listener, "args", None) or {}).get("-es")
+        if flag in ("t", "f"):
+            equal_splits = flag == "t"
+        # A custom thumbnail makes the uploads the user's own
+        thumb = listener.thumb or (
+            ospath.exists(f"thumbnails/{listener.user_id}.jpg") and listener.user_id
+        )
+        return [
+            "leech",
+            *target,
+            listener.split_size,
+            equal_splits,
+            bool(listener.as_doc),
+            sorted(listener.excluded_extensions),
+            settings,
+            thumb or "",
+            listener.thumbnail_layout or "",
+        ]
+
+    @classmethod
+    async def lookup(cls, listener, file_=None):
+        """Return the indexed result of the task's content, None on a miss.
+
+        Eligible tasks get their `content_key` set so the result is indexed
+        once they complete.
+        """
+        if not Config.CONTENT_INDEX or not listener.indexes_content():
+            return None
+        source = await source_identity(listener.link, file_)
+        if source is None:
+            return None
+        listener.content_key = sha1(
+            json.dumps([source, cls._variant(listener)], default=str).encode()
+        ).hexdigest()
+        if (entry := cls._cache.get(listener.content_key)) is None:
+            entry = await database.get_cache_entry("content", listener.content_key)
+        if entry is None:
+            cls.misses += 1
+            return None
+        cls._remember(listener.content_key, entry)
+        return entry
+
+    @classmethod
+    def _remember(cls, key, entry):
+        cls._cache[key] = entry
+        cls._cache.move_to_end(key)
+        while len(cls._cache) > cls.max_entries:
+            cls._cache.popitem(last=False)
+
+    @classmethod
+    async def _forget(cls, key):
+        cls._cache.pop(key, None)
+        await database.set_cache_entry("content", key, None, 0)
+
+    @classmethod
+    async def reuse(cls, listener, file_=None):
+        """Complete the task from the index, False if it has to run."""
+        if (entry := await cls.lookup(listener, file_)) is None:
+            return False
+        key = listener.content_key
+        if entry["leech"]:
+            files, copied = await cls._copy_messages(listener, entry["messages"])
+            if not copied:
+                await cls._forget(key)
+                cls.misses += 1
+                return False
+            args = (None, files, copied, len(entry["messages"]) - copied)
+        else:
+            args = (
+                entry["link"],
+                entry["files"],
+                entry["folders"],
+                entry["mime_type"],
+                entry["rclone_path"],
+                entry["dir_id"],
+            )
+        cls.hits += 1
+        LOGGER.info(f"Content index hit: {entry['name']}")
+        listener.content_key = None
+        listener.name = entry["name"]
+        listener.size = entry["size"]
+        await listener.on_upload_complete(*args)
+        return True
+
+    @staticmethod
+    async def _copy_messages(listener, messages):
+        dest = listener.up_dest or listener.message.chat.id
+        files = {}
+        copied = 0
+        for chat_id, message_id, name in messages:
+            try:
+                msg = await listener.client.copy_message(
+                    chat_id=dest,
+                    from_chat_id=chat_id,
+                    message_id=message_id,
+                    message_thread_id=listener.chat_thread_id,
+                    reply_to_message_id=None if listener.up_dest else listener.mid,
+                    disable_notification=True,
+                )
+            except Exception as e:
+                LOGGER.error(f"Content index can't copy {message_id}: {e}")
+                if not copied:
+                    # The indexed messages are gone, run the task
+                    return files, 0
+                continue
+            copied += 1
+            if (
+                listener.is_super_chat or listener.up_dest
+            ) and msg.chat.type.name != "PRIVATE":
+                files[msg.link] = name
+        return files, copied
+
+    @classmethod
+    async def record(
+        cls,
+        listener,
+        link,
+        files,
+        folders,
+        mime_type,
+        rclone_path="",
+        dir_id="",
+    ):
+        """Index the result of a completed task looked up by `lookup`."""
+        if (key := getattr(listener, "content_key", None)) is None:
+            return
+        listener.content_key = None
+        entry = {
+            "leech": listener.is_leech,
+            "name": listener.name,
+            "size": listener.size,
+        }
+        if listener.is_leech:
+            uploader = getattr(listener, "telegram_uploader", None)
+            messages = getattr(uploader, "sent_messages", None)
+            if mime_type or not messages:
+                # Corrupted files are not worth reusing
+                return
+            entry["messages"] = messages
+        else:
+            if not link and not rclone_path:
+                return
+            entry.update(
+                link=link,
+                files=files,
+                folders=folders,
+                mime_type=mime_type,
+                rclone_path=rclone_path,
+                dir_id=dir_id,
+            )
+        cls._remember(key, entry)
+        await database.set_cache_entry(
+            "content", key, entry, Config.CONTENT_INDEX_TTL
+        )
+
+
+Metrics.register_cache("content", ContentIndex)
@@ -1,6 +1,7 @@
 import asyncio
 import contextlib
 import inspect
+from datetime import UTC, datetime, timedelta
 from importlib import import_module
 from time import time as get_time
 
@@ -17,6 +18,11 @@ from bot import LOGGER, qbit_options, rss_dict, user_data
 from bot.core.aeon_client import TgClient
 from bot.core.config_manager import Config
 from bot.helper.ext_utils.aiofiles_compat import aiopath
+from bot.helper.ext_utils.effective_settings import (
+    invalidate_user,
+    invalidate_user_doc,
+)
+from bot.helper.ext_utils.metrics import DbCommandTimer
 
 try:
     from bot.helper.ext_utils.gc_utils import smart_garbage_collection
@@ -32,6 +38,7 @@ class DbManager:
         self._last_connection_check = 0
         self._reconnect_attempts = 0
         self._max_reconnect_attempts = 5
+        self._cache_indexes = set()
 
     async def connect(self):
         try:
@@ -55,6 +62,7 @@ class DbManager:
                 retryWrites=True,  # Enable retry for write operations
                 retryReads=True,  # Enable retry for read operations
                 waitQueueTimeoutMS=10000,  # Wait queue timeout
+                event_listeners=[DbCommandTimer()],  # Command latencies
             )
 
             # Verify connection is working with a ping
@@ -251,6 +259,8 @@ class DbManager:
         )
 
     async def update_user_data(self, user_id):
+        # Settings handlers edit user_data in place and then save it here
+        invalidate_user(user_id)
         if self._return:
             return
         data = user_data.get(user_id, {})
@@ -305,6 +315,7 @@ class DbManager:
             path: The path to the file to read (if binary_data is None)
             binary_data: Binary data to store directly (if provided, path is ignored)
         """
+        invalidate_user_doc(user_id)
         if self._return:
             return
 
@@ -550,6 +561,42 @@ class DbManager:
 
         return notifier_dict
 
+    async def get_cache_entry(self, name, key):
+        """Get an unexpired entry from the `cache.<name>` collection."""
+        if self._return:
+            return None
+        try:
+            doc = await self.db.cache[name].find_one({"_id": key})
+        except PyMongoError as e:
+            LOGGER.error(f"Error reading {name} cache: {e}")
+            return None
+        if not doc or doc["expire_at"] < datetime.now(UTC).replace(tzinfo=None):
+            return None
+        return doc["data"]
+
+    async def set_cache_entry(self, name, key, data, ttl):
+        """Store an entry in the `cache.<name>` collection for `ttl` seconds."""
+        if self._return:
+            return
+        try:
+            if name not in self._cache_indexes:
+                await self.db.cache[name].create_index(
+                    "expire_at",
+                    expireAfterSeconds=0,
+                )
+                self._cache_indexes.add(name)
+            await self.db.cache[name].replace_one(
+                {"_id": key},
+                {
+                    "data": data,
+                    "expire_at": datetime.now(UTC).replace(tzinfo=None)
+                    + timedelta(seconds=ttl),
+                },
+                upsert=True,
+            )
+        except PyMongoError as e:
+            LOGGER.error(f"Error updating {name} cache: {e}")
+
     async def trunc_table(self, name):
         if self._return:
             return
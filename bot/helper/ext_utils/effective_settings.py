@@ -0,0 +1,142 @@
+from types import MappingProxyType
+
+from bot import LOGGER, user_data
+from bot.core.config_manager import Config
+
+MEDIA_TOOLS = (
+    "watermark",
+    "merge",
+    "convert",
+    "compression",
+    "trim",
+    "extract",
+    "add",
+    "metadata",
+    "xtra",
+    "sample",
+    "screenshot",
+    "archive",
+)
+
+_user_versions = {}
+_settings_cache = {}
+_media_tools = [-1, frozenset()]  # [config version, enabled tools]
+_owner_docs = [0]  # Version of the owner's stored files, shown as global
+
+
+def invalidate_user(user_id):
+    """Drop the resolved settings of a user after their user_data changed."""
+    _user_versions[user_id] = _user_versions.get(user_id, 0) + 1
+    _settings_cache.pop(user_id, None)
+
+
+def invalidate_user_doc(user_id):
+    """Drop cached views after a file stored in a user's document changed.
+
+    Thumbnails, rclone configs, token pickles, cookies and watermark images
+    live next to user_data, the owner's also show up in everyone's menus.
+    """
+    if user_id == Config.OWNER_ID:
+        _owner_docs[0] += 1
+    invalidate_user(user_id)
+
+
+def settings_version(user_id):
+    """Return the (config version, user version, owner files version)."""
+    return Config.get_version(), _user_versions.get(user_id, 0), _owner_docs[0]
+
+
+def _parse_media_tools():
+    if not Config.ENABLE_EXTRA_MODULES or Config.MEDIA_TOOLS_ENABLED is False:
+        return frozenset()
+    value = Config.MEDIA_TOOLS_ENABLED
+    if value is True:
+        return frozenset(MEDIA_TOOLS)
+    if isinstance(value, list | tuple | set):
+        return frozenset(str(t).strip().lower() for t in value if t)
+    try:
+        value = str(value).strip().lower()
+    except Exception as e:
+        LOGGER.error(f"Error parsing MEDIA_TOOLS_ENABLED value: {e}")
+        return frozenset()
+    if not value:
+        return frozenset()
+    if "," in value:
+        return frozenset(t.strip() for t in value.split(",") if t.strip())
+    if value in MEDIA_TOOLS:
+        return frozenset((value,))
+    # Misspelled or decorated single value, keep the first tool it contains
+    for tool in MEDIA_TOOLS:
+        if tool in value:
+            return frozenset((tool,))
+    return frozenset()
+
+
+def enabled_media_tools():
+    """Return the enabled media tools, parsed once per config version."""
+    version = Config.get_version()
+    if _media_tools[0] != version:
+        _media_tools[1] = _parse_media_tools()
+        _media_tools[0] = version
+    return _media_tools[1]
+
+
+class EffectiveSettings:
+    """Immutable view of a user's settings resolved against Config.
+
+    A key set in the user's data wins over the owner's Config value, the
+    usual `user_dict.get(KEY, Config.KEY)` rule. Values are read as plain
+    attributes, e.g. `settings.LEECH_SPLIT_SIZE`.
+    """
+
+    __slots__ = ("_owner", "_user", "_values", "config_version", "user_id")
+
+    def __init__(self, user_id, config_version):
+        user = dict(user_data.get(user_id, {}))
+        owner = {key: getattr(Config, key) for key in Config.__annotations__}
+        values = {**owner, **user}
+        object.__setattr__(self, "user_id", user_id)
+        object.__setattr__(self, "config_version", config_version)
+        object.__setattr__(self, "_user", MappingProxyType(user))
+        object.__setattr__(self, "_owner", MappingProxyType(owner))
+        object.__setattr__(self, "_values", MappingProxyType(values))
+
+    def __getattr__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __setattr__(self, key, value):
+        raise AttributeError("EffectiveSettings is read-only")
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def user_has(self, key):
+        return key in self._user
+
+    def user(self, key, default=None):
+        return self._user.get(key, default)
+
+    def owner(self, key, default=None):
+        return self._owner.get(key, default)
+
+    @property
+    def owner_values(self):
+        return self._owner
+
+    @property
+    def user_values(self):
+        return self._user
+
+
+def get_effective_settings(user_id):
+    """Return the cached settings of `user_id`, rebuilding them when stale."""
+    version = settings_version(user_id)
+    cached = _settings_cache.get(user_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    settings = EffectiveSettings(user_id, version[0])
+    _settings_cache[user_id] = (version, settings)
+    return settings
@@ -0,0 +1,202 @@
+import contextlib
+from asyncio import Condition, Semaphore, create_task, gather
+from os import path as ospath
+from time import time
+from types import MethodType
+
+from bot import LOGGER, cpu_no
+from bot.core.config_manager import Config
+from bot.helper.ext_utils.aiofiles_compat import aiopath
+from bot.helper.ext_utils.media_utils import FFMpeg
+
+# Listener attributes a job writes through to the task, anything else a
+# job sets stays its own
+TASK_ATTRS = frozenset(("is_cancelled",))
+
+
+class MediaCpuBudget:
+    """Bot-wide cap on per-file media jobs running at once."""
+
+    _running = 0
+    _condition = None
+
+    @classmethod
+    def limit(cls):
+        return max(1, Config.MEDIA_CPU_BUDGET or cpu_no or 1)
+
+    @classmethod
+    async def acquire(cls):
+        if cls._condition is None:
+            cls._condition = Condition()
+        async with cls._condition:
+            await cls._condition.wait_for(lambda: cls._running < cls.limit())
+            cls._running += 1
+
+    @classmethod
+    async def release(cls):
+        async with cls._condition:
+            cls._running -= 1
+            cls._condition.notify_all()
+
+
+class _Job:
+    """The listener as seen by one file of a FileExecutor.
+
+    Attributes set on the job stay on it except for TASK_ATTRS, reading one
+    it never set falls back to the task's listener. The listener's methods
+    are bound to the job so they use its process and per-file state.
+    """
+
+    def __init__(self, listener, path, size):
+        object.__setattr__(self, "_listener", listener)
+        self.subproc = None
+        self.subsize = size
+        self.subname = ospath.basename(path)
+        self.ffmpeg = None
+
+    def __getattr__(self, name):
+        value = getattr(self._listener, name)
+        if isinstance(value, MethodType) and value.__self__ is self._listener:
+            return MethodType(value.__func__, self)
+        return value
+
+    def __setattr__(self, name, value):
+        if name in TASK_ATTRS:
+            setattr(self._listener, name, value)
+        else:
+            object.__setattr__(self, name, value)
+
+    async def set_task_status(self, _status):
+        # The executor's aggregate status stays in place
+        return
+
+
+class FileExecutor:
+    """Runs the per-file jobs of one media tool concurrently.
+
+    At most `width` files of the task are processed at once and every job
+    also holds a slot of MediaCpuBudget. Each job gets its own FFMpeg and a
+    view of the listener, see _Job. The executor stands in for the
+    listener's `subproc` so cancelling the task kills every running job,
+    and it is the progress object of the task's FFmpegStatus, aggregating
+    progress, speed and ETA over the files submitted so far.
+    """
+
+    def __init__(self, listener, width=None):
+        self._listener = listener
+        width = width or Config.MEDIA_FILE_WORKERS or 1
+        self._slots = Semaphore(max(1, width))
+        self._tasks = []
+        self._jobs = []
+        self._error = None
+        self._killed = False
+        self._total_bytes = 0
+        self._done_bytes = 0
+        self._done = 0
+        self._start_time = time()
+
+    async def submit(self, path, func, *args):
+        """Run `func(job, *args)` for `path` once a slot is free.
+
+        The job is a view of the listener with `job.ffmpeg` ready for the
+        file, returns as soon as the job started.
+        """
+        await self._slots.acquire()
+        try:
+            await MediaCpuBudget.acquire()
+        except BaseException:
+            self._slots.release()
+            raise
+        size = await aiopath.getsize(path) if await aiopath.exists(path) else 0
+        job = _Job(self._listener, path, size)
+        job.ffmpeg = FFMpeg(job)
+        self._total_bytes += size
+        self._jobs.append(job)
+        self._listener.subproc = self
+        self._show_running()
+        self._tasks.append(create_task(self._run(job, func, args)))
+
+    async def _run(self, job, func, args):
+        try:
+            return await func(job, *args)
+        except Exception as e:
+            LOGGER.error(f"Error processing {job.subname}: {e}")
+            if self._error is None:
+                self._error = e
+            return None
+        finally:
+            self._jobs.remove(job)
+            self._done += 1
+            self._done_bytes += job.subsize
+            self._show_running()
+            await MediaCpuBudget.release()
+            self._slots.release()
+
+    async def join(self):
+        """Wait for every job and return their results in submission order.
+
+        The first error of a job is raised once all jobs are done, a job
+        stopped by cancelling the task returns None.
+        """
+        results = await gather(*self._tasks, return_exceptions=True)
+        if self._error is not None:
+            raise self._error
+        return [None if isinstance(r, BaseException) else r for r in results]
+
+    async def cancel(self):
+        """Kill and cancel every job, return once all of them ended."""
+        self.kill()
+        for task in self._tasks:
+            task.cancel()
+        await gather(*self._tasks, return_exceptions=True)
+
+    def _show_running(self):
+        if not self._jobs:
+            return
+        names = [job.subname for job in self._jobs]
+        self._listener.subname = (
+            f"{names[0]} (+{len(names) - 1})" if len(names) > 1 else names[0]
+        )
+        self._listener.subsize = sum(job.subsize for job in self._jobs)
+
+    @property
+    def returncode(self):
+        if any(not task.done() for task in self._tasks):
+            return None
+        return -9 if self._killed else 0
+
+    def kill(self):
+        self._killed = True
+        for job in self._jobs:
+            if job.subproc is not None and job.subproc.returncode is None:
+                with contextlib.suppress(Exception):
+                    job.subproc.kill()
+
+    def file_counts(self):
+        """Return (done, running, submitted) file counts."""
+        return self._done, len(self._jobs), len(self._tasks)
+
+    @property
+    def processed_bytes(self):
+        running = sum(
+            job.subsize * min(job.ffmpeg.progress_raw, 100) / 100
+            for job in self._jobs
+        )
+        return int(self._done_bytes + running)
+
+    @property
+    def progress_raw(self):
+        if not self._total_bytes:
+            return 0
+        return min(self.processed_bytes / self._total_bytes * 100, 100)
+
+    @property
+    def speed_raw(self):
+        elapsed = time() - self._start_time
+        return self.processed_bytes / elapsed if elapsed > 0 else 0
+
+    @property
+    def eta_raw(self):
+        if not (speed := self.speed_raw):
+            return 0
+        return (self._total_bytes - self.processed_bytes) / speed
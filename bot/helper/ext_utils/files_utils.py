@@ -1,13 +1,17 @@
-import gc
 import math
-from asyncio import create_subprocess_exec, sleep, wait_for
+import os
+import struct
+import zlib
+from asyncio import create_subprocess_exec, gather, sleep, wait_for
 from asyncio.subprocess import PIPE
 from os import path as ospath
 from os import readlink, walk
 from re import IGNORECASE, escape
 from re import search as re_search
 from re import split as re_split
+from time import localtime, monotonic
 
+import aiofiles
 from aioshutil import rmtree as aiormtree
 from magic import Magic
 
@@ -21,6 +25,7 @@ from bot.helper.ext_utils.aiofiles_compat import readlink as aioreadlink
 from .bot_utils import cmd_exec, sync_to_async
 from .exceptions import NotSupportedExtractionArchive
 from .gc_utils import smart_garbage_collection
+from .metrics import Metrics
 
 ARCH_EXT = [
     ".tar.bz2",
@@ -95,6 +100,12 @@ FIRST_SPLIT_REGEX = (
 
 SPLIT_REGEX = r"\.r\d+$|\.7z\.\d+$|\.z\d+$|\.zip\.\d+$|\.part\d+\.rar$"
 
+# Streamed zip: read size, field value past which ZIP64 records are needed
+# and general purpose flags (data descriptor, UTF-8 names)
+ZIP_CHUNK_SIZE = 4 * 1024 * 1024
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_FLAGS = 0x0808
+
 
 def is_first_archive_split(file):
     return bool(re_search(FIRST_SPLIT_REGEX, file.lower(), IGNORECASE))
@@ -245,9 +256,6 @@ def get_mime_type_sync(file_path):
         # Explicitly delete the Magic object to free resources
         if mime:
             del mime
-        # Force garbage collection after handling large files
-        if ospath.getsize(file_path) > 100 * 1024 * 1024:  # 100MB
-            gc.collect()
 
 
 async def remove_excluded_files(fpath, ee):
@@ -374,6 +382,11 @@ async def split_file(f_path, split_size, listener):
             f"Final adjustment: split size set to {split_size_bytes / (1024 * 1024 * 1024):.2f} GiB"
         )
 
+    if listener.split_pipeline is not None:
+        return await _split_file_pipelined(
+            f_path, out_path, split_size_bytes, listener
+        )
+
     cmd = [
         "split",
         "--numeric-suffixes=1",
@@ -468,6 +481,48 @@ async def split_file(f_path, split_size, listener):
         return False
 
 
+async def _split_file_pipelined(f_path, out_path, split_size, listener):
+    """Cut the same parts as `split` one at a time, handing each one over.
+
+    `split` writes every part in one run, so the parts are copied out with a
+    `dd` process each and put in the listener's split pipeline once written.
+    """
+    pipeline = listener.split_pipeline
+    file_size = await aiopath.getsize(f_path)
+    parts = math.ceil(file_size / split_size)
+    for i in range(1, parts + 1):
+        part_path = f"{out_path}{i:03}"
+        pipeline.announce(part_path, f_path)
+        listener.subproc = await create_subprocess_exec(
+            "dd",
+            f"if={f_path}",
+            f"of={part_path}",
+            "bs=4M",
+            f"skip={(i - 1) * split_size}",
+            f"count={split_size}",
+            "iflag=skip_bytes,count_bytes",
+            "status=none",
+            stderr=PIPE,
+        )
+        _, stderr = await listener.subproc.communicate()
+        code = listener.subproc.returncode
+        if listener.is_cancelled:
+            return False
+        if code == -9:
+            listener.is_cancelled = True
+            return False
+        if code != 0:
+            try:
+                stderr = stderr.decode().strip()
+            except Exception:
+                stderr = "Unable to decode the error!"
+            LOGGER.error(f"Split error: {stderr}. File: {f_path}")
+            return False
+        await pipeline.put(part_path)
+    LOGGER.info(f"Successfully split {f_path} into {parts} parts")
+    return True
+
+
 class SevenZ:
     def __init__(self, listener):
         self._listener = listener
@@ -483,6 +538,7 @@ class SevenZ:
         return self._percentage
 
     async def _sevenz_progress(self):
+        start = monotonic()
         pattern = r"(\d+)\s+bytes|Total Physical Size\s*=\s*(\d+)"
         while not (
             self._listener.subproc.returncode is not None
@@ -524,8 +580,18 @@ class SevenZ:
 
         self._processed_bytes = 0
         self._percentage = "0%"
-
-    async def extract(self, f_path, t_path, pswd):
+        Metrics.observe("job_seconds", monotonic() - start, tool="7z")
+
+    async def extract(self, f_path, t_path, pswd, on_file=None):
+        """Extract `f_path` into `t_path` and return 7z's exit code.
+
+        With `on_file` the archive is listed first and every extracted file
+        is passed to it once 7z has moved on to the next one, while the
+        extraction goes on.
+        """
+        entries = []
+        if on_file is not None:
+            entries = await self._list_files(f_path, pswd)
         cmd = [
             "7z",
             "x",
@@ -549,7 +615,13 @@ class SevenZ:
             stdout=PIPE,
             stderr=PIPE,
         )
-        await self._sevenz_progress()
+        if entries:
+            await gather(
+                self._sevenz_progress(),
+                self._hand_over_files(entries, t_path, on_file),
+            )
+        else:
+            await self._sevenz_progress()
         _, stderr = await self._listener.subproc.communicate()
         code = self._listener.subproc.returncode
 
@@ -566,6 +638,54 @@ class SevenZ:
             LOGGER.error(f"{stderr}. Unable to extract archive!. Path: {f_path}")
         return code
 
+    async def _list_files(self, f_path, pswd):
+        """Return [(path, size)] of the archive's files in archive order."""
+        stdout, _, code = await cmd_exec(
+            ["7z", "l", "-slt", "-ba", f"-p{pswd}", f_path]
+        )
+        if code != 0:
+            return []
+        entries = []
+        for block in stdout.split("\n\n"):
+            fields = dict(
+                line.split(" = ", 1) for line in block.splitlines() if " = " in line
+            )
+            if "Path" not in fields or fields.get("Folder") == "+":
+                continue
+            # Excluded from the extraction with -xr!@PaxHeader
+            if ospath.basename(fields["Path"]) == "@PaxHeader":
+                continue
+            if fields.get("Attributes", "").startswith("D"):
+                continue
+            try:
+                size = int(fields.get("Size") or 0)
+            except ValueError:
+                continue
+            entries.append((fields["Path"], size))
+        return entries
+
+    async def _hand_over_files(self, entries, t_path, on_file):
+        proc = self._listener.subproc
+        paths = [ospath.join(t_path, path) for path, _ in entries]
+        done = 0
+        while done < len(paths) and not self._listener.is_cancelled:
+            if proc.returncode is None:
+                # 7z writes files in archive order, a file is complete once
+                # the next one exists
+                if done + 1 == len(paths) or not await aiopath.exists(
+                    paths[done + 1]
+                ):
+                    await sleep(1)
+                    continue
+            elif proc.returncode != 0:
+                break
+            path = paths[done]
+            if await aiopath.isfile(path) and (
+                await aiopath.getsize(path) == entries[done][1]
+            ):
+                await on_file(path)
+            done += 1
+
     async def zip(self, dl_path, up_path, pswd):
         size = await get_path_size(dl_path)
         split_size = self._listener.split_size
@@ -619,3 +739,232 @@ class SevenZ:
             stderr = "Unable to decode the error!"
         LOGGER.error(f"{stderr}. Unable to zip this path: {dl_path}")
         return dl_path
+
+
+class StreamZip:
+    """Writes a store-only ZIP64 archive of a tree straight into volumes.
+
+    Files are stored like 7z -mx=0 does and the archive is cut into volumes
+    of the listener's split size named like 7z's (`.zip.001`, ...). Every
+    volume goes to the listener's split pipeline once written, so uploads
+    start while later volumes are still being written. Like the 7z path,
+    the tree is only removed once the whole archive is written, a failed
+    or cancelled task still has its sources. An archive that fits one
+    volume is named `.zip`. Sizes are known up front, the CRC of each entry
+    follows its data in a data descriptor.
+    """
+
+    def __init__(self, listener):
+        self._listener = listener
+        self._volume = None
+        self._volume_path = None
+        self._volume_no = 0
+        self._volume_bytes = 0
+        self._offset = 0
+        self._up_path = None
+
+    async def zip(self, dl_path, up_path):
+        """Zip `dl_path` into volumes of `up_path`, False if it didn't finish."""
+        pipeline = self._listener.split_pipeline
+        root = ospath.dirname(dl_path)
+        dirs, files = await sync_to_async(self._list_tree, dl_path, root)
+        await pipeline.plan([path for path, _, _, _ in files])
+        self._up_path = up_path
+        LOGGER.info(f"Zip: orig_path: {dl_path}, zip_path: {up_path} (streamed)")
+        central = []
+        try:
+            for arcname, mtime in dirs:
+                central.append(await self._write_entry(None, arcname, 0, mtime))
+            for path, arcname, size, mtime in files:
+                entry = await self._write_entry(path, arcname, size, mtime)
+                if entry is None:
+                    return False
+                central.append(entry)
+            await self._write_central(central)
+            await self._close_volume(last=True)
+        finally:
+            if self._volume is not None:
+                await self._volume.close()
+        await clean_target(dl_path)
+        return True
+
+    @staticmethod
+    def _list_tree(dl_path, root):
+        """Return ([(arcname, mtime)], [(path, arcname, size, mtime)])."""
+        dirs, files = [], []
+        if ospath.isfile(dl_path):
+            stat = os.stat(dl_path)
+            files.append(
+                (dl_path, ospath.basename(dl_path), stat.st_size, stat.st_mtime)
+            )
+            return dirs, files
+        for dirpath, dirnames, filenames in walk(dl_path):
+            dirnames.sort()
+            arcdir = ospath.relpath(dirpath, root)
+            dirs.append((f"{arcdir}/", os.stat(dirpath).st_mtime))
+            for file_ in sorted(filenames):
+                path = ospath.join(dirpath, file_)
+                stat = os.stat(path)
+                files.append(
+                    (path, f"{arcdir}/{file_}", stat.st_size, stat.st_mtime)
+                )
+        return dirs, files
+
+    async def _write_entry(self, path, arcname, size, mtime):
+        """Write one local entry, return its central directory record."""
+        name = arcname.encode()
+        dos_time, dos_date = _dos_datetime(mtime)
+        zip64 = size >= ZIP64_LIMIT
+        offset = self._offset
+        # Directories have no data, nor a data descriptor
+        flags = ZIP_FLAGS if path is not None else ZIP_FLAGS & ~0x08
+        extra = struct.pack("<HHQQ", 1, 16, 0, 0) if zip64 else b""
+        await self._write(
+            struct.pack(
+                "<IHHHHHIIIHH",
+                0x04034B50,
+                45 if zip64 else 20,
+                flags,
+                0,  # stored
+                dos_time,
+                dos_date,
+                0,
+                ZIP64_LIMIT if zip64 else 0,
+                ZIP64_LIMIT if zip64 else 0,
+                len(name),
+                len(extra),
+            )
+            + name
+            + extra
+        )
+        crc = 0
+        if path is not None:
+            async with aiofiles.open(path, "rb") as f:
+                while chunk := await f.read(ZIP_CHUNK_SIZE):
+                    if self._listener.is_cancelled:
+                        return None
+                    crc = zlib.crc32(chunk, crc)
+                    await self._write(chunk)
+            await self._write(
+                struct.pack(
+                    "<IIQQ" if zip64 else "<IIII", 0x08074B50, crc, size, size
+                )
+            )
+        return name, flags, crc, size, offset, dos_time, dos_date, path is None
+
+    async def _write_central(self, central):
+        start = self._offset
+        for name, flags, crc, size, offset, dos_time, dos_date, is_dir in central:
+            zip64_fields = []
+            if size >= ZIP64_LIMIT:
+                zip64_fields.extend((size, size))
+            if offset >= ZIP64_LIMIT:
+                zip64_fields.append(offset)
+            extra = (
+                struct.pack(
+                    f"<HH{len(zip64_fields)}Q",
+                    1,
+                    8 * len(zip64_fields),
+                    *zip64_fields,
+                )
+                if zip64_fields
+                else b""
+            )
+            attrs = (0o40755 << 16) | 0x10 if is_dir else 0o100644 << 16
+            await self._write(
+                struct.pack(
+                    "<IHHHHHHIIIHHHHHII",
+                    0x02014B50,
+                    (3 << 8) | 45,  # made by unix
+                    45 if zip64_fields else 20,
+                    flags,
+                    0,
+                    dos_time,
+                    dos_date,
+                    crc,
+                    min(size, ZIP64_LIMIT),
+                    min(size, ZIP64_LIMIT),
+                    len(name),
+                    len(extra),
+                    0,
+                    0,
+                    0,
+                    attrs,
+                    min(offset, ZIP64_LIMIT),
+                )
+                + name
+                + extra
+            )
+        count = len(central)
+        cd_size = self._offset - start
+        if count >= 0xFFFF or cd_size >= ZIP64_LIMIT or start >= ZIP64_LIMIT:
+            eocd64 = self._offset
+            await self._write(
+                struct.pack(
+                    "<IQHHIIQQQQ",
+                    0x06064B50,
+                    44,
+                    (3 << 8) | 45,
+                    45,
+                    0,
+                    0,
+                    count,
+                    count,
+                    cd_size,
+                    start,
+                )
+                + struct.pack("<IIQI", 0x07064B50, 0, eocd64, 1)
+            )
+        await self._write(
+            struct.pack(
+                "<IHHHHIIH",
+                0x06054B50,
+                0,
+                0,
+                min(count, 0xFFFF),
+                min(count, 0xFFFF),
+                min(cd_size, ZIP64_LIMIT),
+                min(start, ZIP64_LIMIT),
+                0,
+            )
+        )
+
+    async def _write(self, data):
+        view = memoryview(data)
+        split_size = self._listener.split_size
+        while view:
+            if self._volume is None or self._volume_bytes >= split_size:
+                await self._next_volume()
+            count = min(len(view), split_size - self._volume_bytes)
+            await self._volume.write(view[:count])
+            self._volume_bytes += count
+            self._offset += count
+            view = view[count:]
+
+    async def _next_volume(self):
+        await self._close_volume()
+        self._volume_no += 1
+        self._volume_path = f"{self._up_path}.{self._volume_no:03}"
+        self._volume_bytes = 0
+        self._listener.split_pipeline.announce(self._volume_path)
+        self._volume = await aiofiles.open(self._volume_path, "wb")
+
+    async def _close_volume(self, last=False):
+        if self._volume is None:
+            return
+        await self._volume.close()
+        self._volume = None
+        path = self._volume_path
+        if last and self._volume_no == 1:
+            # Fits one volume, named like an unsplit 7z archive
+            await sync_to_async(os.rename, path, self._up_path)
+            path = self._up_path
+        await self._listener.split_pipeline.hand_over(path)
+
+
+def _dos_datetime(mtime):
+    t = localtime(max(mtime, 315532800))  # 1980, the first DOS date
+    return (
+        (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+        ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday,
+    )
@@ -1,10 +1,14 @@
+import asyncio
 import contextlib
+import ctypes
 import gc
 import logging
 import os
 import threading
 import time
 import tracemalloc
+from collections import deque
+from typing import ClassVar
 
 try:
     import psutil
@@ -16,6 +20,11 @@ try:
 except ImportError:
     resource = None
 
+try:
+    from .system_metrics import get_snapshot, is_sampler_running
+except ImportError:
+    get_snapshot = is_sampler_running = None
+
 LOGGER = logging.getLogger(__name__)
 
 # Track last garbage collection time to avoid too frequent collections
@@ -40,6 +49,9 @@ def force_garbage_collection(threshold_mb=100, log_stats=False, generation=None)
     """
     global _last_gc_time
 
+    if MemoryGovernor.is_running():
+        return MemoryGovernor.request()
+
     # Check if enough time has passed since last collection
     current_time = time.time()
     time_since_last_gc = current_time - _last_gc_time
@@ -266,6 +278,9 @@ def optimized_garbage_collection(aggressive=False, log_stats=False):
     Returns:
         bool: True if collection was performed successfully
     """
+    if MemoryGovernor.is_running():
+        return MemoryGovernor.request()
+
     try:
         global psutil
 
@@ -330,6 +345,10 @@ def cleanup_large_objects():
     This is a more aggressive approach for when memory usage is critical.
     Optimized to use less memory during the cleanup process.
     """
+    if MemoryGovernor.is_running():
+        MemoryGovernor.request()
+        return 1
+
     try:
         # Get memory before collection if psutil is available
         memory_before = None
@@ -387,25 +406,37 @@ def monitor_thread_usage():
     Returns True if thread usage is high, False otherwise.
     """
     try:
-        # Get current thread count
-        thread_count = threading.active_count()
+        sampler = None
+        if is_sampler_running is not None and is_sampler_running():
+            sampler = get_snapshot()
+
+        if sampler is not None:
+            # Reuse the figures published by the background sampler
+            thread_count = sampler.thread_count
+            usage_percent = sampler.thread_usage_percent
+            hard_limit = (
+                round(thread_count * 100 / usage_percent) if usage_percent else 0
+            )
+        else:
+            # Get current thread count
+            thread_count = threading.active_count()
 
-        # Get system thread limit (ulimit -u)
-        # This is a rough approximation and may not be accurate on all systems
-        hard_limit = 1000  # Default fallback value
+            # Get system thread limit (ulimit -u)
+            # This is a rough approximation and may not be accurate on all systems
+            hard_limit = 1000  # Default fallback value
 
-        try:
-            if resource:
-                _, hard_limit = resource.getrlimit(resource.RLIMIT_NPROC)
-                if hard_limit == resource.RLIM_INFINITY:
-                    # If unlimited, use a reasonable default based on system
-                    hard_limit = os.cpu_count() * 100
-        except (ImportError, AttributeError, OSError):
-            # Default to a reasonable value if we can't get the actual limit
-            hard_limit = 1000
-
-        # Calculate percentage of thread usage
-        usage_percent = (thread_count / hard_limit) * 100
+            try:
+                if resource:
+                    _, hard_limit = resource.getrlimit(resource.RLIMIT_NPROC)
+                    if hard_limit == resource.RLIM_INFINITY:
+                        # If unlimited, use a reasonable default based on system
+                        hard_limit = os.cpu_count() * 100
+            except (ImportError, AttributeError, OSError):
+                # Default to a reasonable value if we can't get the actual limit
+                hard_limit = 1000
+
+            # Calculate percentage of thread usage
+            usage_percent = (thread_count / hard_limit) * 100
 
         # Log warning if thread usage is high
         if usage_percent > 80:
@@ -441,6 +472,10 @@ def smart_garbage_collection(
     Returns:
         bool: True if collection was performed successfully
     """
+    if MemoryGovernor.is_running():
+        # Collections run from the governor loop, only memory errors are urgent
+        return MemoryGovernor.request(urgent=memory_error)
+
     try:
         # Check current memory usage if psutil is available
         memory_percent = 0
@@ -481,8 +516,6 @@ def smart_garbage_collection(
 
             # Try to reduce memory fragmentation
             try:
-                import ctypes
-
                 ctypes.CDLL("libc.so.6").malloc_trim(0)
                 LOGGER.info("Performed malloc_trim to reduce memory fragmentation")
             except Exception as e:
@@ -521,3 +554,180 @@ def smart_garbage_collection(
             return True
         except Exception:
             return False
+
+
+def _malloc_trim():
+    with contextlib.suppress(Exception):
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+
+
+class MemoryGovernor:
+    """Single owner of garbage collection in the bot process.
+
+    Startup objects are frozen out of the collector, thresholds are tuned
+    once, and full collections only run from the governor loop when RSS or
+    system memory pressure is measured. Callers of the legacy helpers above
+    just leave a hint. Every collection pause is recorded through gc.callbacks.
+    """
+
+    thresholds = (5000, 20, 20)
+    interval = 30  # seconds between pressure checks
+    min_gap = 60  # minimum seconds between governor collections
+    urgent_gap = 10  # minimum gap for memory-error requests
+    growth_limit = 256 * 1024 * 1024  # RSS growth since last full collection
+    memory_high = 85  # system memory percent treated as pressure
+    memory_moderate = 70
+
+    _task = None
+    _loop = None
+    _wakeup = None
+    _pending = 0  # 0 nothing, 1 hint, 2 urgent
+    _last_collect = 0.0
+    _rss_baseline = 0
+    _gc_start = 0.0
+
+    collections: ClassVar[list[int]] = [0, 0, 0]
+    pause_total: ClassVar[list[float]] = [0.0, 0.0, 0.0]
+    pause_max: ClassVar[list[float]] = [0.0, 0.0, 0.0]
+    # (time, generation, seconds, collected)
+    pauses: ClassVar[deque[tuple]] = deque(maxlen=200)
+    rss_history: ClassVar[deque[tuple]] = deque(maxlen=720)  # (time, rss bytes)
+    governor_runs = 0
+
+    @classmethod
+    def is_running(cls):
+        return cls._task is not None and not cls._task.done()
+
+    @classmethod
+    def _gc_callback(cls, phase, info):
+        if phase == "start":
+            cls._gc_start = time.perf_counter()
+            return
+        duration = time.perf_counter() - cls._gc_start
+        generation = info.get("generation", 2)
+        cls.collections[generation] += 1
+        cls.pause_total[generation] += duration
+        cls.pause_max[generation] = max(cls.pause_max[generation], duration)
+        cls.pauses.append(
+            (time.time(), generation, duration, info.get("collected", 0))
+        )
+
+    @classmethod
+    def _read_memory(cls):
+        if is_sampler_running is not None and is_sampler_running():
+            snapshot = get_snapshot()
+            return snapshot.process_rss, snapshot.memory_percent
+        if psutil is None:
+            return 0, 0
+        return psutil.Process().memory_info().rss, psutil.virtual_memory().percent
+
+    @classmethod
+    def request(cls, urgent=False):
+        """Ask for a collection, the governor decides if and when to run it.
+
+        Safe to call from worker threads.
+        """
+        cls._pending = max(cls._pending, 2 if urgent else 1)
+        if urgent and cls._loop is not None and cls._wakeup is not None:
+            with contextlib.suppress(RuntimeError):
+                cls._loop.call_soon_threadsafe(cls._wakeup.set)
+        return True
+
+    @classmethod
+    async def _collect(cls, generation, trim):
+        gc.collect(generation)
+        if gc.garbage:
+            gc.garbage.clear()
+        if trim:
+            await asyncio.to_thread(_malloc_trim)
+        cls._last_collect = time.time()
+        cls.governor_runs += 1
+
+    @classmethod
+    async def _check(cls):
+        rss, memory_percent = cls._read_memory()
+        now = time.time()
+        cls.rss_history.append((now, rss))
+        pending, cls._pending = cls._pending, 0
+        since_last = now - cls._last_collect
+
+        pressure = (
+            memory_percent >= cls.memory_high
+            or rss - cls._rss_baseline >= cls.growth_limit
+        )
+        if pending == 2 and since_last >= cls.urgent_gap:
+            await cls._collect(2, True)
+        elif pressure and since_last >= cls.min_gap:
+            await cls._collect(2, memory_percent >= cls.memory_high)
+        elif (
+            pending
+            and memory_percent >= cls.memory_moderate
+            and since_last >= cls.min_gap
+        ):
+            await cls._collect(1, False)
+        else:
+            if pending and pressure:
+                # Rate limited, keep the hint for the next check
+                cls._pending = max(cls._pending, pending)
+            return
+        if psutil is not None:
+            with contextlib.suppress(Exception):
+                cls._rss_baseline = psutil.Process().memory_info().rss
+
+    @classmethod
+    async def _run(cls):
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(cls._wakeup.wait(), cls.interval)
+            cls._wakeup.clear()
+            try:
+                await cls._check()
+            except Exception as e:
+                LOGGER.error(f"Memory governor error: {e}")
+
+    @classmethod
+    def start(cls):
+        """Tune the collector, freeze startup objects and start the loop.
+
+        Must be called from the running event loop once startup is done.
+        """
+        if cls.is_running():
+            return
+        gc.enable()
+        gc.set_threshold(*cls.thresholds)
+        gc.collect()
+        gc.freeze()
+        if cls._gc_callback not in gc.callbacks:
+            gc.callbacks.append(cls._gc_callback)
+        cls._rss_baseline = cls._read_memory()[0]
+        cls._last_collect = time.time()
+        cls._loop = asyncio.get_running_loop()
+        cls._wakeup = asyncio.Event()
+        cls._task = cls._loop.create_task(cls._run())
+        LOGGER.info(
+            f"Memory governor started, {gc.get_freeze_count()} objects frozen"
+        )
+
+    @classmethod
+    def stop(cls):
+        if cls._task is not None:
+            cls._task.cancel()
+            cls._task = None
+        with contextlib.suppress(ValueError):
+            gc.callbacks.remove(cls._gc_callback)
+
+    @classmethod
+    def stats(cls):
+        rss = cls.rss_history[-1][1] if cls.rss_history else cls._read_memory()[0]
+        peak = max((value for _, value in cls.rss_history), default=rss)
+        return {
+            "collections": list(cls.collections),
+            "pause_total": list(cls.pause_total),
+            "pause_max": list(cls.pause_max),
+            "recent_pauses": list(cls.pauses)[-10:],
+            "governor_runs": cls.governor_runs,
+            "frozen": gc.get_freeze_count(),
+            "rss": rss,
+            "rss_peak": peak,
+            "rss_baseline": cls._rss_baseline,
+        }
@@ -1832,6 +1832,7 @@ system_commands = f"""
 /{BotCommands.RestartCommand[0]} or /{BotCommands.RestartCommand[1]}: Restart and update the bot.
 /{BotCommands.LogCommand}: Get the bot log file.
 /{BotCommands.ShellCommand}: Execute shell commands.
+/{BotCommands.LoopStatsCommand}: Rank the code blocking the event loop, add reset to clear it.
 /{BotCommands.ExecCommand}: Execute sync functions.
 /{BotCommands.AExecCommand}: Execute async functions.
 /{BotCommands.ClearLocalsCommand}: Clear locals in exec functions.
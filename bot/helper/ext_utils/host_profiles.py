@@ -0,0 +1,161 @@
+from typing import ClassVar
+from urllib.parse import urlparse
+
+from bot import aria2_options
+from bot.core.config_manager import Config
+from bot.helper.ext_utils.db_handler import database
+
+PROFILE_TTL = 30 * 86400  # Seconds a learned host profile is kept
+CONNECTION_LEVELS = (1, 2, 4, 8, 16)  # aria2 allows 16 connections per server
+FILE_LEVELS = (1, 2, 4, 8, 16, 32)
+START_FILES = 4
+PIECE_MAX = 64 << 20
+# aria.sh defaults, used until aria2's global options are loaded
+ARIA2_SPLIT = 10
+ARIA2_MIN_SPLIT_SIZE = 10 << 20
+SIZE_UNITS = {"K": 1 << 10, "M": 1 << 20}
+# Smaller downloads finish before extra connections or files pay off
+SAMPLE_MIN = 32 << 20
+SPEED_WEIGHT = 0.3  # Weight of the latest throughput sample
+
+
+def _pick(speeds, levels, start):
+    """The level with the best throughput, trying its neighbours once."""
+    if not speeds:
+        return start
+    best = max(levels, key=lambda level: speeds.get(str(level), -1))
+    i = levels.index(best)
+    for j in (i + 1, i - 1):
+        if 0 <= j < len(levels) and str(levels[j]) not in speeds:
+            return levels[j]
+    return best
+
+
+def _aria2_size(value):
+    """Bytes of an aria2 size option such as `10M` or `10485760`."""
+    value = str(value).strip().upper()
+    if value[-1:] in SIZE_UNITS:
+        return int(value[:-1]) * SIZE_UNITS[value[-1]]
+    return int(value)
+
+
+def _aria2_defaults():
+    """aria2's own split, connections per server and min split size.
+
+    Learned settings only ever go above these, the owner's aria2 setup
+    stays the floor.
+    """
+    try:
+        split = int(aria2_options.get("split", ARIA2_SPLIT))
+        server = int(aria2_options.get("max-connection-per-server", split))
+        piece = _aria2_size(
+            aria2_options.get("min-split-size", ARIA2_MIN_SPLIT_SIZE)
+        )
+    except ValueError:
+        return ARIA2_SPLIT, ARIA2_SPLIT, ARIA2_MIN_SPLIT_SIZE
+    return split, server, piece
+
+
+def _learn(speeds, level, speed):
+    key = str(level)
+    if key in speeds:
+        speed = speeds[key] + SPEED_WEIGHT * (speed - speeds[key])
+    speeds[key] = speed
+
+
+class HostProfiles:
+    """Direct download settings per host, learned from observed throughput.
+
+    A profile holds the throughput seen per number of connections of one
+    file and per number of files downloaded at once. Each level climbs to
+    a neighbour until it stops paying off, later samples keep the best one
+    current. Connections start at aria2's configured split and never go
+    below it, a host without learned data keeps aria2's own settings.
+    Profiles only hold numbers, never headers or cookies of a
+    user's link, and live in memory and in the DB cache collection for
+    PROFILE_TTL.
+    """
+
+    _profiles: ClassVar[dict] = {}
+
+    @staticmethod
+    def host(url):
+        return urlparse(url).hostname or ""
+
+    @staticmethod
+    def _levels(levels, limit):
+        return tuple(level for level in levels if level <= max(1, limit)) or (1,)
+
+    @classmethod
+    async def _profile(cls, url):
+        host = cls.host(url)
+        if (profile := cls._profiles.get(host)) is None:
+            profile = await database.get_cache_entry("hosts", host) or {}
+            # Profiles saved before headers were dropped may still hold one
+            profile.pop("header", None)
+            profile.setdefault("connections", {})
+            profile.setdefault("files", {})
+            cls._profiles[host] = profile
+        return host, profile
+
+    @classmethod
+    async def _save(cls, host, profile):
+        if host:
+            await database.set_cache_entry("hosts", host, profile, PROFILE_TTL)
+
+    @classmethod
+    async def connections(cls, url):
+        """Connections of one file, None with host profiles disabled."""
+        if not Config.DIRECT_HOST_PROFILES:
+            return None
+        _, profile = await cls._profile(url)
+        split = _aria2_defaults()[0]
+        limit = max(split, Config.DIRECT_MAX_CONNECTIONS)
+        levels = (split, *(c for c in CONNECTION_LEVELS if split < c <= limit))
+        return _pick(profile["connections"], levels, split)
+
+    @classmethod
+    async def file_workers(cls, url):
+        """How many files of a listing on the host to download at once."""
+        if not Config.DIRECT_HOST_PROFILES:
+            return 1
+        _, profile = await cls._profile(url)
+        levels = cls._levels(FILE_LEVELS, Config.DIRECT_MAX_FILES)
+        return _pick(profile["files"], levels, min(START_FILES, levels[-1]))
+
+    @classmethod
+    async def aria2_options(cls, url, size=0):
+        """aria2 options for one file, {} while aria2's own settings apply.
+
+        `size` splits the file in one piece per connection when known.
+        """
+        connections = await cls.connections(url)
+        split, server, piece_min = _aria2_defaults()
+        if connections is None or connections <= split:
+            return {}
+        piece = piece_min
+        if size:
+            piece = min(max(int(size) // connections, piece_min), PIECE_MAX)
+        return {
+            "split": str(connections),
+            "max-connection-per-server": str(max(connections, server)),
+            "min-split-size": f"{-(-piece >> 20)}M",
+        }
+
+    @classmethod
+    async def record_file(cls, url, connections, size, seconds):
+        """Learn from a file downloaded with `connections` connections."""
+        if connections is None or size < SAMPLE_MIN or seconds <= 0:
+            return
+        host, profile = await cls._profile(url)
+        _learn(profile["connections"], connections, size / seconds)
+        await cls._save(host, profile)
+
+    @classmethod
+    async def record_listing(cls, url, files, size, seconds):
+        """Learn from a listing downloaded `files` files at a time."""
+        if not Config.DIRECT_HOST_PROFILES or size < SAMPLE_MIN or seconds <= 0:
+            return
+        host, profile = await cls._profile(url)
+        _learn(profile["files"], files, size / seconds)
+        await cls._save(host, profile)
@@ -1,12 +1,13 @@
 from asyncio import (
     CancelledError,
     Event,
-    TimeoutError,
+    Lock,
     create_task,
     gather,
     sleep,
     wait_for,
 )
+from collections import deque
 from datetime import datetime
 from math import ceil, floor
 from mimetypes import guess_extension
@@ -15,6 +16,7 @@ from pathlib import Path
 from re import sub
 from sys import argv
 from time import time
+from typing import Any, ClassVar
 
 from aiofiles import open as aiopen
 from aioshutil import move
@@ -62,6 +64,212 @@ from bot.core.aeon_client import TgClient
 from bot.core.config_manager import Config
 
 
+class MediaSessionPool:
+    """Process-wide MTProto media sessions shared by every HyperDL download.
+
+    Sessions are keyed by (helper index, dc_id) so the export/import
+    authorization handshake runs once per helper and DC instead of once per
+    download. Idle sessions are stopped by a single maintenance task which
+    also expires cached file references. Callers hold a session between
+    `get_session` and `release`, a session that failed for one of them is
+    replaced in the pool and only stopped once its last user released it.
+    """
+
+    sessions: ClassVar[dict[tuple, Any]] = {}
+    last_used: ClassVar[dict[tuple, float]] = {}
+    users: ClassVar[dict[int, int]] = {}
+    retired: ClassVar[dict[int, Any]] = {}
+    file_refs: ClassVar[dict[tuple, Any]] = {}
+    file_ref_access: ClassVar[dict[tuple, float]] = {}
+    idle_timeout = 10 * 60
+    file_ref_ttl = 45 * 60
+    max_file_refs = 500
+    _locks: ClassVar[dict[tuple, Lock]] = {}
+    _maintenance_task = None
+
+    @staticmethod
+    def _is_healthy(media_session):
+        is_started = getattr(media_session, "is_started", None)
+        return is_started is None or is_started.is_set()
+
+    @classmethod
+    def _ensure_maintenance(cls):
+        if cls._maintenance_task is None or cls._maintenance_task.done():
+            cls._maintenance_task = create_task(cls._maintenance())
+
+    @classmethod
+    async def get_session(cls, client, index, dc_id, max_retries=3):
+        cls._ensure_maintenance()
+        key = (index, dc_id)
+        media_session = cls.sessions.get(key)
+        if media_session is not None and cls._is_healthy(media_session):
+            return cls._use(key, media_session)
+
+        async with cls._locks.setdefault(key, Lock()):
+            media_session = cls.sessions.get(key)
+            if media_session is not None:
+                if cls._is_healthy(media_session):
+                    return cls._use(key, media_session)
+                await cls._retire(key, media_session)
+
+            retries = 0
+            while retries < max_retries:
+                try:
+                    media_session = await cls._create_session(client, dc_id)
+                    cls.sessions[key] = media_session
+                    return cls._use(key, media_session)
+                except Exception:
+                    retries += 1
+                    await sleep(1)
+
+        raise ValueError(
+            f"Failed to create media session after {max_retries} attempts"
+        )
+
+    @staticmethod
+    async def _create_session(client, dc_id):
+        if dc_id != await client.storage.dc_id():
+            media_session = Session(
+                client,
+                dc_id,
+                await Auth(client, dc_id, await client.storage.test_mode()).create(),
+                await client.storage.test_mode(),
+                is_media=True,
+            )
+            await media_session.start()
+
+            for _ in range(6):
+                exported_auth = await client.invoke(
+                    raw.functions.auth.ExportAuthorization(dc_id=dc_id)
+                )
+
+                try:
+                    await media_session.invoke(
+                        raw.functions.auth.ImportAuthorization(
+                            id=exported_auth.id, bytes=exported_auth.bytes
+                        )
+                    )
+                    break
+                except AuthBytesInvalid:
+                    await sleep(1)
+            else:
+                await media_session.stop()
+                raise AuthBytesInvalid
+        else:
+            media_session = Session(
+                client,
+                dc_id,
+                await client.storage.auth_key(),
+                await client.storage.test_mode(),
+                is_media=True,
+            )
+            await media_session.start()
+        return media_session
+
+    @classmethod
+    async def _stop_session(cls, key):
+        media_session = cls.sessions.pop(key, None)
+        cls.last_used.pop(key, None)
+        if media_session is not None:
+            await cls._stop(media_session)
+
+    @staticmethod
+    async def _stop(media_session):
+        try:
+            await media_session.stop()
+        except Exception as e:
+            LOGGER.error(f"Error stopping media session: {e}")
+
+    @classmethod
+    def _use(cls, key, media_session):
+        cls.last_used[key] = time()
+        cls.users[id(media_session)] = cls.users.get(id(media_session), 0) + 1
+        return media_session
+
+    @classmethod
+    async def release(cls, media_session):
+        """Stop using a session from `get_session`."""
+        session_id = id(media_session)
+        if (count := cls.users.get(session_id, 0) - 1) > 0:
+            cls.users[session_id] = count
+            return
+        cls.users.pop(session_id, None)
+        if cls.retired.pop(session_id, None) is not None:
+            await cls._stop(media_session)
+
+    @classmethod
+    async def _retire(cls, key, media_session):
+        """Take a session out of the pool, stopping it once it is unused."""
+        cls.sessions.pop(key, None)
+        cls.last_used.pop(key, None)
+        if cls.users.get(id(media_session)):
+            cls.retired[id(media_session)] = media_session
+        else:
+            await cls._stop(media_session)
+
+    @classmethod
+    async def invalidate(cls, index, dc_id, media_session):
+        """Replace a session that failed, the next request builds a fresh one.
+
+        Other downloads keep using it until they release it or fail too.
+        """
+        key = (index, dc_id)
+        async with cls._locks.setdefault(key, Lock()):
+            if cls.sessions.get(key) is media_session:
+                await cls._retire(key, media_session)
+
+    @classmethod
+    def get_file_ref(cls, key):
+        if (file_ref := cls.file_refs.get(key)) is not None:
+            cls.file_ref_access[key] = time()
+        return file_ref
+
+    @classmethod
+    def put_file_ref(cls, key, file_ref):
+        cls.file_refs[key] = file_ref
+        cls.file_ref_access[key] = time()
+        if len(cls.file_refs) > cls.max_file_refs:
+            oldest = min(cls.file_ref_access, key=cls.file_ref_access.get)
+            cls.file_refs.pop(oldest, None)
+            cls.file_ref_access.pop(oldest, None)
+
+    @classmethod
+    async def _maintenance(cls):
+        while True:
+            await sleep(60)
+            now = time()
+            for key in [
+                k for k, v in cls.last_used.items() if now - v > cls.idle_timeout
+            ]:
+                async with cls._locks.setdefault(key, Lock()):
+                    media_session = cls.sessions.get(key)
+                    if now - cls.last_used.get(
+                        key, now
+                    ) > cls.idle_timeout and not cls.users.get(id(media_session)):
+                        await cls._stop_session(key)
+            for key in [
+                k
+                for k, v in cls.file_ref_access.items()
+                if now - v > cls.file_ref_ttl
+            ]:
+                cls.file_refs.pop(key, None)
+                cls.file_ref_access.pop(key, None)
+
+    @classmethod
+    async def stop(cls):
+        if cls._maintenance_task is not None:
+            cls._maintenance_task.cancel()
+            cls._maintenance_task = None
+        await gather(*(cls._stop_session(key) for key in list(cls.sessions)))
+        await gather(*(cls._stop(session) for session in cls.retired.values()))
+        cls.retired.clear()
+        cls.users.clear()
+        cls.file_refs.clear()
+        cls.file_ref_access.clear()
+        cls._locks.clear()
+        LOGGER.info("HyperDL media sessions stopped")
+
+
 class HyperTGDownload:
     def __init__(self):
         self.clients = TgClient.helper_bots
@@ -74,20 +282,12 @@ class HyperTGDownload:
         self.download_dir = "downloads/"
         self.directory = None
         self.num_parts = Config.HYPER_THREADS or max(8, len(self.clients))
-        self.cache_file_ref = {}
-        self.cache_last_access = {}
-        self.cache_max_size = 100
+        self.pipeline_depth = max(1, Config.HYPER_PIPELINE_DEPTH)
         self._processed_bytes = 0
         self.file_size = 0
         self.chunk_size = 1024 * 1024
         self.file_name = ""
         self._cancel_event = Event()
-        self.session_pool = {}
-        self._clean_task = create_task(self._clean_cache())
-
-    def __del__(self):
-        if hasattr(self, "_clean_task") and not self._clean_task.done():
-            self._clean_task.cancel()
 
     @staticmethod
     async def get_media_type(message):
@@ -125,14 +325,10 @@ class HyperTGDownload:
         )
         raise ValueError("This message doesn't contain any downloadable media")
 
-    def _update_cache(self, index, file_ref):
-        self.cache_file_ref[index] = file_ref
-        self.cache_last_access[index] = time()
-
-        if len(self.cache_file_ref) > self.cache_max_size:
-            oldest = sorted(self.cache_last_access.items(), key=lambda x: x[1])[0][0]
-            del self.cache_file_ref[oldest]
-            del self.cache_last_access[oldest]
+    def bind_message(self, message, dump_chat=None):
+        """Use an already accessible message as source without copying it."""
+        self.message = message
+        self.dump_chat = dump_chat or message.chat.id
 
     async def get_specific_file_ref(self, mid, client, max_retries=3):
         retries = 0
@@ -178,89 +374,18 @@ class HyperTGDownload:
         )
 
     async def get_file_id(self, client, index) -> FileId:
-        if index not in self.cache_file_ref:
+        chat_id = (
+            self.dump_chat[0] if isinstance(self.dump_chat, list) else self.dump_chat
+        )
+        key = (index, chat_id, self.message.id)
+        if (file_ref := MediaSessionPool.get_file_ref(key)) is None:
             file_ref = await self.get_specific_file_ref(self.message.id, client)
-            self._update_cache(index, file_ref)
-        else:
-            self.cache_last_access[index] = time()
-        return self.cache_file_ref[index]
-
-    async def _clean_cache(self):
-        while True:
-            await sleep(15 * 60)
-            current_time = time()
-            expired_keys = [
-                k
-                for k, v in self.cache_last_access.items()
-                if current_time - v > 45 * 60
-            ]
-
-            for key in expired_keys:
-                if key in self.cache_file_ref:
-                    del self.cache_file_ref[key]
-                if key in self.cache_last_access:
-                    del self.cache_last_access[key]
-
-    async def generate_media_session(self, client, file_id, index, max_retries=3):
-        session_key = (index, file_id.dc_id)
-
-        if session_key in self.session_pool:
-            return self.session_pool[session_key]
+            MediaSessionPool.put_file_ref(key, file_ref)
+        return file_ref
 
-        retries = 0
-        while retries < max_retries:
-            try:
-                if file_id.dc_id != await client.storage.dc_id():
-                    media_session = Session(
-                        client,
-                        file_id.dc_id,
-                        await Auth(
-                            client, file_id.dc_id, await client.storage.test_mode()
-                        ).create(),
-                        await client.storage.test_mode(),
-                        is_media=True,
-                    )
-                    await media_session.start()
-
-                    for _ in range(6):
-                        exported_auth = await client.invoke(
-                            raw.functions.auth.ExportAuthorization(
-                                dc_id=file_id.dc_id
-                            )
-                        )
-
-                        try:
-                            await media_session.invoke(
-                                raw.functions.auth.ImportAuthorization(
-                                    id=exported_auth.id, bytes=exported_auth.bytes
-                                )
-                            )
-                            break
-                        except AuthBytesInvalid:
-                            await sleep(1)
-                    else:
-                        await media_session.stop()
-                        raise AuthBytesInvalid
-                else:
-                    media_session = Session(
-                        client,
-                        file_id.dc_id,
-                        await client.storage.auth_key(),
-                        await client.storage.test_mode(),
-                        is_media=True,
-                    )
-                    await media_session.start()
-
-                self.session_pool[session_key] = media_session
-                return media_session
-
-            except Exception:
-                retries += 1
-                await sleep(1)
-
-        raise ValueError(
-            f"Failed to create media session after {max_retries} attempts"
-        )
+    @staticmethod
+    async def generate_media_session(client, file_id, index):
+        return await MediaSessionPool.get_session(client, index, file_id.dc_id)
 
     @staticmethod
     async def get_location(file_id: FileId):
@@ -300,6 +425,18 @@ class HyperTGDownload:
             thumb_size=file_id.thumbnail_size,
         )
 
+    async def _request_chunk(self, media_session, location, offset):
+        return await wait_for(
+            media_session.invoke(
+                raw.functions.upload.GetFile(
+                    location=location,
+                    offset=offset,
+                    limit=self.chunk_size,
+                ),
+            ),
+            timeout=30,
+        )
+
     async def get_file(
         self,
         offset_bytes: int,
@@ -313,65 +450,85 @@ class HyperTGDownload:
 
         self.work_loads[index] += 1
         current_retry = 0
+        current_part = 1
+        current_offset = offset_bytes
+        # Up to pipeline_depth GetFile requests are kept in flight on the
+        # session and consumed in order, so chunk latency is overlapped.
+        pending = deque()
+
+        def reset_pipeline():
+            for task in pending:
+                task.cancel()
+            pending.clear()
 
         try:
             while current_retry < max_retries:
+                file_id = None
+                media_session = None
                 try:
                     if self._cancel_event.is_set():
                         raise CancelledError("Download cancelled")
 
                     file_id = await self.get_file_id(client, index)
-                    media_session, location = await gather(
-                        self.generate_media_session(client, file_id, index),
-                        self.get_location(file_id),
+                    location = await self.get_location(file_id)
+                    media_session = await self.generate_media_session(
+                        client, file_id, index
                     )
 
-                    current_part = 1
-                    current_offset = offset_bytes
+                    next_part = current_part
+                    next_offset = current_offset
 
                     while current_part <= part_count:
                         if self._cancel_event.is_set():
                             raise CancelledError("Download cancelled")
 
-                        try:
-                            r = await wait_for(
-                                media_session.invoke(
-                                    raw.functions.upload.GetFile(
-                                        location=location,
-                                        offset=current_offset,
-                                        limit=self.chunk_size,
-                                    ),
-                                ),
-                                timeout=30,
+                        while (
+                            len(pending) < self.pipeline_depth
+                            and next_part <= part_count
+                        ):
+                            pending.append(
+                                create_task(
+                                    self._request_chunk(
+                                        media_session, location, next_offset
+                                    )
+                                )
                             )
+                            next_part += 1
+                            next_offset += self.chunk_size
 
-                            if isinstance(r, raw.types.upload.File):
-                                chunk = r.bytes
-
-                                if not chunk:
-                                    break
-
-                                if part_count == 1:
-                                    yield chunk[first_part_cut:last_part_cut]
-                                elif current_part == 1:
-                                    yield chunk[first_part_cut:]
-                                elif current_part == part_count:
-                                    yield chunk[:last_part_cut]
-                                else:
-                                    yield chunk
-
-                                current_part += 1
-                                current_offset += self.chunk_size
-                                self._processed_bytes += len(chunk)
-                            else:
-                                raise ValueError(f"Unexpected response: {r}")
-
+                        try:
+                            r = await pending[0]
                         except FloodWait as e:
+                            reset_pipeline()
+                            next_part, next_offset = current_part, current_offset
                             await sleep(e.value + 1)
                             continue
-                        except (TimeoutError, ConnectionError):
+                        except TimeoutError:
+                            reset_pipeline()
+                            next_part, next_offset = current_part, current_offset
                             await sleep(1)
                             continue
+                        pending.popleft()
+
+                        if not isinstance(r, raw.types.upload.File):
+                            raise ValueError(f"Unexpected response: {r}")
+
+                        chunk = r.bytes
+                        if not chunk:
+                            break
+
+                        if part_count == 1:
+                            yield chunk[first_part_cut:last_part_cut]
+                        elif current_part == 1:
+                            yield chunk[first_part_cut:]
+                        elif current_part == part_count:
+                            yield chunk[:last_part_cut]
+                        else:
+                            yield chunk
+
+                        current_part += 1
+                        current_offset += self.chunk_size
+                        self._processed_bytes += len(chunk)
 
                     if current_part <= part_count:
                         raise ValueError(
@@ -380,12 +537,22 @@ class HyperTGDownload:
                     break
 
                 except (TimeoutError, ConnectionError, AttributeError):
+                    reset_pipeline()
+                    if media_session is not None:
+                        await MediaSessionPool.invalidate(
+                            index, file_id.dc_id, media_session
+                        )
                     current_retry += 1
                     if current_retry >= max_retries:
                         raise
                     await sleep(current_retry * 2)
+                finally:
+                    reset_pipeline()
+                    if media_session is not None:
+                        await MediaSessionPool.release(media_session)
 
         finally:
+            reset_pipeline()
             self.work_loads[index] -= 1
 
     async def progress_callback(self, progress, progress_args):
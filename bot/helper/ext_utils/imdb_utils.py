@@ -0,0 +1,246 @@
+from asyncio import Semaphore, create_task, shield
+from collections import OrderedDict
+from time import time
+from typing import ClassVar
+
+from imdb import Cinemagoer
+from pycountry import countries as conn
+
+from bot import LOGGER
+from bot.helper.ext_utils.bot_utils import sync_to_async
+from bot.helper.ext_utils.db_handler import database
+
+imdb = Cinemagoer()
+
+IMDB_GENRE_EMOJI = {
+    "Action": "🚀",
+    "Adult": "🔞",
+    "Adventure": "🌋",
+    "Animation": "🎠",
+    "Biography": "📜",
+    "Comedy": "🪗",
+    "Crime": "🔪",
+    "Documentary": "🎞",
+    "Drama": "🎭",
+    "Family": "👨‍👩‍👧‍👦",
+    "Fantasy": "🫧",
+    "Film Noir": "🎯",
+    "Game Show": "🎮",
+    "History": "🏛",
+    "Horror": "🧟",
+    "Musical": "🎻",
+    "Music": "🎸",
+    "Mystery": "🧳",
+    "News": "📰",
+    "Reality-TV": "🖥",
+    "Romance": "🥰",
+    "Sci-Fi": "🌠",
+    "Short": "📝",
+    "Sport": "⛳",
+    "Talk-Show": "👨‍🍳",
+    "Thriller": "🗡",
+    "War": "⚔",
+    "Western": "🪩",
+}
+LIST_ITEMS = 4
+
+
+def list_to_str(k):
+    """Convert list to string with proper formatting"""
+    if not k:
+        return "N/A"
+    if len(k) == 1:
+        return str(k[0])
+    # Limit items if needed
+    if LIST_ITEMS:
+        k = k[:LIST_ITEMS]
+    return ", ".join(f"{elem}" for elem in k)
+
+
+def list_to_hash(k, country=False, emoji=False):
+    """Convert list to hashtag string with proper formatting"""
+    if not k:
+        return "N/A"
+
+    # Handle single item case
+    if len(k) == 1:
+        if emoji and k[0] in IMDB_GENRE_EMOJI:
+            return f"{IMDB_GENRE_EMOJI[k[0]]} #{k[0].replace(' ', '_')}"
+        if country:
+            try:
+                return f"#{conn.get(name=k[0]).alpha_2}"
+            except (AttributeError, KeyError):
+                return f"#{k[0].replace(' ', '_')}"
+        return f"#{k[0].replace(' ', '_')}"
+
+    # Limit items if needed
+    if LIST_ITEMS:
+        k = k[:LIST_ITEMS]
+
+    # Format multiple items
+    if emoji:
+        return " ".join(
+            f"{IMDB_GENRE_EMOJI.get(elem, '')} #{elem.replace(' ', '_')}"
+            for elem in k
+        )
+    if country:
+        return " ".join(
+            f"#{conn.get(name=elem).alpha_2}"
+            if elem in [c.name for c in conn]
+            else f"#{elem.replace(' ', '_')}"
+            for elem in k
+        )
+    return " ".join(f"#{elem.replace(' ', '_')}" for elem in k)
+
+
+def _search_movies(title):
+    return [
+        {
+            "movieID": movie.movieID,
+            "title": movie.get("title"),
+            "year": movie.get("year"),
+            "kind": movie.get("kind"),
+        }
+        for movie in imdb.search_movie(title, results=10) or []
+    ]
+
+
+def _fetch_movie(movieid):
+    movie = imdb.get_movie(movieid)
+    if not movie:
+        return None
+
+    # Get release date
+    if movie.get("original air date"):
+        date = movie["original air date"]
+    elif movie.get("year"):
+        date = movie.get("year")
+    else:
+        date = "N/A"
+
+    # Get plot
+    plot = movie.get("plot")
+    plot = plot[0] if plot and len(plot) > 0 else movie.get("plot outline")
+    if plot and len(plot) > 300:
+        plot = f"{plot[:300]}..."
+
+    # Build URLs
+    imdb_id = movie.get("imdbID")
+    url = f"https://www.imdb.com/title/tt{imdb_id}"
+    url_cast = f"{url}/fullcredits#cast"
+    url_releaseinfo = f"{url}/releaseinfo"
+
+    # Only plain values are kept so the record can be stored in the DB
+    return {
+        "title": movie.get("title"),
+        "trailer": movie.get("videos"),
+        "votes": movie.get("votes"),
+        "aka": list_to_str(movie.get("akas")),
+        "seasons": movie.get("number of seasons"),
+        "box_office": movie.get("box office"),
+        "localized_title": movie.get("localized title"),
+        "kind": movie.get("kind"),
+        "imdb_id": f"tt{imdb_id}",
+        "cast": list_to_str(movie.get("cast")),
+        "runtime": list_to_str(movie.get("runtimes")),
+        "countries": list_to_hash(movie.get("countries"), True),
+        "certificates": list_to_str(movie.get("certificates")),
+        "languages": list_to_hash(movie.get("languages")),
+        "director": list_to_str(movie.get("director")),
+        "writer": list_to_str(movie.get("writer")),
+        "producer": list_to_str(movie.get("producer")),
+        "composer": list_to_str(movie.get("composer")),
+        "cinematographer": list_to_str(movie.get("cinematographer")),
+        "music_team": list_to_str(movie.get("music department")),
+        "distributors": list_to_str(movie.get("distributors")),
+        "release_date": str(date),
+        "year": movie.get("year"),
+        "genres": list_to_hash(movie.get("genres"), emoji=True),
+        "poster": movie.get("full-size cover url"),
+        "plot": plot,
+        "rating": str(movie.get("rating")) + " / 10",
+        "url": url,
+        "url_cast": url_cast,
+        "url_releaseinfo": url_releaseinfo,
+    }
+
+
+class IMDbService:
+    """Cinemagoer lookups run in the thread pool behind a shared cache.
+
+    Results live in an in-memory TTL+LRU and in the DB cache collection, and
+    concurrent lookups for the same key wait on a single fetch.
+    """
+
+    _semaphore = Semaphore(4)
+    _inflight: ClassVar[dict] = {}
+    _cache: ClassVar[OrderedDict] = OrderedDict()
+    max_entries = 512
+    search_ttl = 24 * 3600
+    movie_ttl = 7 * 24 * 3600
+
+    @classmethod
+    def _get_memory(cls, key):
+        entry = cls._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time():
+            del cls._cache[key]
+            return None
+        cls._cache.move_to_end(key)
+        return entry[1]
+
+    @classmethod
+    def _put_memory(cls, key, data, ttl):
+        cls._cache[key] = (time() + ttl, data)
+        cls._cache.move_to_end(key)
+        while len(cls._cache) > cls.max_entries:
+            cls._cache.popitem(last=False)
+
+    @classmethod
+    async def _load(cls, key, ttl, fetch, *args):
+        try:
+            data = await database.get_cache_entry("imdb", key)
+            if data is None:
+                async with cls._semaphore:
+                    data = await sync_to_async(fetch, *args)
+                if data is None:
+                    return None
+                await database.set_cache_entry("imdb", key, data, ttl)
+            cls._put_memory(key, data, ttl)
+            return data
+        except Exception as e:
+            LOGGER.error(f"IMDb lookup failed for {key}: {e}")
+            return None
+        finally:
+            cls._inflight.pop(key, None)
+
+    @classmethod
+    async def _get(cls, key, ttl, fetch, *args):
+        if (data := cls._get_memory(key)) is not None:
+            return data
+        if key not in cls._inflight:
+            cls._inflight[key] = create_task(cls._load(key, ttl, fetch, *args))
+        return await shield(cls._inflight[key])
+
+    @classmethod
+    async def search(cls, title):
+        title = title.strip().lower()
+        results = await cls._get(
+            f"search:{title}",
+            cls.search_ttl,
+            _search_movies,
+            title,
+        )
+        return [dict(item) for item in results or []]
+
+    @classmethod
+    async def get_movie(cls, movieid):
+        movieid = str(movieid).removeprefix("tt")
+        data = await cls._get(
+            f"movie:{movieid}",
+            cls.movie_ttl,
+            _fetch_movie,
+            movieid,
+        )
+        return dict(data) if data else None
@@ -0,0 +1,230 @@
+import re
+import sys
+import threading
+from asyncio import get_running_loop, sleep
+from html import escape
+from logging import Handler, getLogger
+from os import path as ospath
+from time import monotonic
+from traceback import extract_stack
+
+from bot import LOGGER
+from bot.core.config_manager import Config
+
+HEARTBEAT = 0.05  # seconds between loop heartbeats
+SAMPLE_INTERVAL = 0.02  # watchdog poll interval
+MAX_ENTRIES = 500  # distinct offenders kept per ranking
+BOT_ROOT = ospath.dirname(ospath.dirname(ospath.dirname(ospath.abspath(__file__))))
+
+# Logged by asyncio and uvloop for callbacks over slow_callback_duration
+SLOW_CALLBACK_RE = re.compile(r"Executing (.+) took ([\d.]+) seconds", re.DOTALL)
+CORO_RE = re.compile(r"coro=<(.+?\)) running at (.+?:\d+)>")
+ADDRESS_RE = re.compile(r"\s*at 0x[0-9a-f]+|name='[^']*' ")
+
+
+class _Ranking:
+    """Thread-safe (count, seconds, peak) totals per offender."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def add(self, key, seconds, peak=None):
+        peak = seconds if peak is None else peak
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                if len(self._entries) >= MAX_ENTRIES:
+                    # Drop the least costly offender to make room
+                    del self._entries[min(self._entries, key=self._cost)]
+                self._entries[key] = [1, seconds, peak]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], peak)
+
+    def _cost(self, key):
+        return self._entries[key][1]
+
+    def top(self, limit):
+        with self._lock:
+            items = [(key, *entry) for key, entry in self._entries.items()]
+        return sorted(items, key=lambda item: item[2], reverse=True)[:limit]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _callback_name(handle):
+    if match := CORO_RE.search(handle):
+        return f"{match[1]} at {_short_path(match[2])}"
+    return ADDRESS_RE.sub("", handle).strip()
+
+
+def _short_path(path):
+    if path.startswith(BOT_ROOT):
+        return f"bot{path[len(BOT_ROOT) :]}"
+    return ospath.basename(path)
+
+
+def _stack_signature(frame):
+    """Name the innermost bot frame and the frame that actually blocks."""
+    stack = extract_stack(frame)
+    leaf = stack[-1]
+    owner = next(
+        (f for f in reversed(stack) if f.filename.startswith(BOT_ROOT)),
+        None,
+    )
+    leaf_name = f"{leaf.name} ({_short_path(leaf.filename)}:{leaf.lineno})"
+    if owner is None or owner is leaf:
+        return leaf_name
+    return (
+        f"{owner.name} ({_short_path(owner.filename)}:{owner.lineno}) → {leaf_name}"
+    )
+
+
+class _SlowCallbackHandler(Handler):
+    def emit(self, record):
+        if match := SLOW_CALLBACK_RE.match(record.getMessage()):
+            LoopDiagnostics.slow_callbacks.add(
+                _callback_name(match[1]),
+                float(match[2]),
+            )
+
+
+class _Watchdog(threading.Thread):
+    """Samples the loop thread's stack while the heartbeat is overdue."""
+
+    def __init__(self, thread_id, threshold):
+        super().__init__(name="loop-watchdog", daemon=True)
+        self.thread_id = thread_id
+        self.threshold = threshold
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(SAMPLE_INTERVAL):
+            blocked = monotonic() - LoopDiagnostics.last_beat
+            if blocked < self.threshold:
+                continue
+            if (frame := sys._current_frames().get(self.thread_id)) is None:
+                continue
+            try:
+                signature = _stack_signature(frame)
+            finally:
+                del frame
+            LoopDiagnostics.stalls.add(signature, SAMPLE_INTERVAL, blocked)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class LoopDiagnostics:
+    """Opt-in profiler for work that blocks the event loop.
+
+    A heartbeat task measures loop lag, the loop's debug mode logs every
+    callback slower than SLOW_CALLBACK_THRESHOLD, and a watchdog thread
+    samples the loop thread's stack whenever the heartbeat is more than
+    LOOP_LAG_THRESHOLD late. Both rankings are kept in memory for the
+    owner's report.
+    """
+
+    stalls = _Ranking()
+    slow_callbacks = _Ranking()
+    last_beat = 0.0
+    started_at = 0.0
+    max_lag = 0.0
+    lag_events = 0
+    _loop = None
+    _task = None
+    _watchdog = None
+    _handler = None
+
+    @classmethod
+    def is_running(cls):
+        return cls._task is not None and not cls._task.done()
+
+    @classmethod
+    def start(cls):
+        cls.stop()
+        if not Config.LOOP_DIAGNOSTICS:
+            return
+        cls._loop = get_running_loop()
+        cls._loop.slow_callback_duration = Config.SLOW_CALLBACK_THRESHOLD
+        cls._loop.set_debug(True)
+        cls._handler = _SlowCallbackHandler()
+        getLogger("asyncio").addHandler(cls._handler)
+        threshold = max(Config.LOOP_LAG_THRESHOLD, HEARTBEAT * 2)
+        cls.started_at = cls.last_beat = monotonic()
+        cls._task = cls._loop.create_task(cls._heartbeat(threshold))
+        cls._watchdog = _Watchdog(threading.get_ident(), threshold)
+        cls._watchdog.start()
+        LOGGER.info(
+            f"Loop diagnostics started, lag threshold {threshold}s, "
+            f"slow callback threshold {Config.SLOW_CALLBACK_THRESHOLD}s"
+        )
+
+    @classmethod
+    def stop(cls):
+        if cls._task is not None:
+            cls._task.cancel()
+            cls._task = None
+        if cls._watchdog is not None:
+            cls._watchdog.stop()
+            cls._watchdog = None
+        if cls._handler is not None:
+            getLogger("asyncio").removeHandler(cls._handler)
+            cls._handler = None
+        if cls._loop is not None:
+            cls._loop.set_debug(False)
+            cls._loop = None
+
+    @classmethod
+    def reset(cls):
+        cls.stalls.clear()
+        cls.slow_callbacks.clear()
+        cls.max_lag = 0.0
+        cls.lag_events = 0
+        cls.started_at = monotonic()
+
+    @classmethod
+    async def _heartbeat(cls, threshold):
+        while True:
+            start = cls.last_beat = monotonic()
+            await sleep(HEARTBEAT)
+            lag = monotonic() - start - HEARTBEAT
+            cls.max_lag = max(cls.max_lag, lag)
+            if lag >= threshold:
+                cls.lag_events += 1
+
+    @classmethod
+    def report(cls, limit=10):
+        """Return the ranked offenders as an HTML message."""
+        if not cls.is_running():
+            return (
+                "Loop diagnostics are off, enable <code>LOOP_DIAGNOSTICS</code> "
+                "in bot settings to collect them."
+            )
+        lines = [
+            "<b>🩺 Event Loop Diagnostics</b>\n",
+            f"<b>Window:</b> {monotonic() - cls.started_at:.0f}s | "
+            f"<b>Max Lag:</b> {cls.max_lag * 1000:.0f}ms | "
+            f"<b>Lag Events:</b> {cls.lag_events}\n",
+            "<b>Blocked Stacks</b> (sampled time, peak stall)",
+        ]
+        stalls = cls.stalls.top(limit)
+        lines.extend(
+            f"{i}. <code>{escape(key)}</code>\n    {total:.2f}s | {peak:.2f}s"
+            for i, (key, _, total, peak) in enumerate(stalls, start=1)
+        )
+        if not stalls:
+            lines.append("None")
+        lines.append("\n<b>Slow Callbacks</b> (count, total, max)")
+        callbacks = cls.slow_callbacks.top(limit)
+        lines.extend(
+            f"{i}. <code>{escape(key)}</code>\n"
+            f"    {count} | {total:.2f}s | {peak:.2f}s"
+            for i, (key, count, total, peak) in enumerate(callbacks, start=1)
+        )
+        if not callbacks:
+            lines.append("None")
+        return "\n".join(lines)
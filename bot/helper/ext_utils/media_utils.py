@@ -6,11 +6,15 @@ import resource
 import shutil
 from asyncio import create_subprocess_exec, gather, sleep, wait_for
 from asyncio.subprocess import PIPE
+from bisect import bisect_left
+from hashlib import sha1
+from itertools import pairwise
 from os import path as ospath
 from pathlib import Path
-from re import compile, escape
+from re import compile
 from re import search as re_search
 from time import time
+from typing import ClassVar
 
 import aiofiles
 from aioshutil import rmtree
@@ -23,6 +27,7 @@ from bot.helper.ext_utils.aiofiles_compat import aiopath, makedirs, remove
 
 from .bot_utils import cmd_exec, sync_to_async
 from .files_utils import get_mime_type, get_path_size, is_archive, is_archive_split
+from .metrics import Metrics
 from .status_utils import time_to_seconds
 
 try:
@@ -30,6 +35,16 @@ try:
 except ImportError:
     smart_garbage_collection = None
 
+# Segment split: container overhead allowance and margin under the limit
+SEGMENT_OVERHEAD = 0.01
+SEGMENT_SAFETY_MARGIN = 20 * 1024 * 1024
+
+# Frame grabs: width of a grid thumbnail cell, bytes hashed from each end
+# of a file for its cache identity
+GRID_CELL_WIDTH = 320
+FRAME_CACHE_SAMPLE = 64 * 1024
+FRAME_CACHE_DIR = f"{DOWNLOAD_DIR}thumbnails/cache"
+
 # Media information cache
 # This cache stores information about media files to avoid repeated ffprobe calls
 # The key is the file path and modification time, and the value is the media information
@@ -566,54 +581,170 @@ async def get_media_type(file_path):
     return None
 
 
-async def take_ss(video_file, ss_nb) -> bool:
-    duration = (await get_media_info(video_file))[0]
-    if duration != 0:
-        dirpath, name = video_file.rsplit("/", 1)
-        name, _ = ospath.splitext(name)
-        dirpath = f"{dirpath}/{name}_ss"
-        await makedirs(dirpath, exist_ok=True)
-        interval = duration // (ss_nb + 1)
-        cap_time = interval
-        cmds = []
-        for i in range(ss_nb):
-            output = f"{dirpath}/SS.{name}_{i:02}.png"
-            cmd = [
-                "xtra",  # Using xtra instead of ffmpeg
-                "-hide_banner",
-                "-loglevel",
-                "error",
+class FrameCache:
+    """Screenshots and grid thumbnails already taken, by file identity.
+
+    The identity is the file size and a hash of its first and last bytes,
+    so the same file leeched again under another path or name still hits.
+    Entries are copied out, callers own and may remove what they get. The
+    least recently used entries go once either cap is exceeded. The index
+    only lives in memory, so the first put of a run clears the folder of
+    whatever an earlier run left behind.
+    """
+
+    max_entries = 64
+    max_bytes = 256 << 20
+    hits = 0
+    misses = 0
+    # key: (files, total size), least recently used first
+    _entries: ClassVar[dict] = {}
+    _bytes = 0
+    _swept = False
+
+    @staticmethod
+    async def identity(path):
+        def sample():
+            with open(path, "rb") as f:
+                head = f.read(FRAME_CACHE_SAMPLE)
+                f.seek(max(size - FRAME_CACHE_SAMPLE, 0))
+                return sha1(head + f.read(FRAME_CACHE_SAMPLE)).hexdigest()
+
+        try:
+            size = await aiopath.getsize(path)
+            return f"{size:x}-{await sync_to_async(sample)}"
+        except OSError:
+            return None
+
+    @classmethod
+    async def get(cls, key, outputs):
+        """Copy the frames cached for `key` to `outputs`, False on a miss."""
+        entry = cls._entries.pop(key, None) if key else None
+        if entry is None or not all(await gather(*map(aiopath.exists, entry[0]))):
+            if entry is not None:
+                await cls._drop(entry)
+            cls.misses += 1
+            return False
+        # Most recently used last
+        cls._entries[key] = entry
+        cls.hits += 1
+        for source, output in zip(entry[0], outputs, strict=False):
+            await sync_to_async(shutil.copyfile, source, output)
+        return True
+
+    @classmethod
+    async def put(cls, key, outputs):
+        """Keep copies of the `outputs` that were written."""
+        if not key:
+            return
+        if (entry := cls._entries.pop(key, None)) is not None:
+            await cls._drop(entry)
+        if not cls._swept:
+            cls._swept = True
+            await rmtree(FRAME_CACHE_DIR, ignore_errors=True)
+        await makedirs(FRAME_CACHE_DIR, exist_ok=True)
+        files = []
+        size = 0
+        for i, output in enumerate(outputs):
+            if not await aiopath.exists(output):
+                continue
+            cached = ospath.join(
+                FRAME_CACHE_DIR,
+                f"{key}_{i:02}{ospath.splitext(output)[1]}",
+            )
+            await sync_to_async(shutil.copyfile, output, cached)
+            files.append(cached)
+            size += await aiopath.getsize(cached)
+        if not files:
+            return
+        while cls._entries and (
+            len(cls._entries) >= cls.max_entries or cls._bytes + size > cls.max_bytes
+        ):
+            await cls._drop(cls._entries.pop(next(iter(cls._entries))))
+        cls._entries[key] = (files, size)
+        cls._bytes += size
+        if cls._bytes > cls.max_bytes:
+            # Larger than the whole cache on its own
+            await cls._drop(cls._entries.pop(key))
+
+    @classmethod
+    async def _drop(cls, entry):
+        files, size = entry
+        cls._bytes -= size
+        for old in files:
+            with contextlib.suppress(OSError):
+                await remove(old)
+
+
+Metrics.register_cache("frames", FrameCache)
+
+
+def _keyframe_inputs(video_file, duration, count):
+    """Inputs seeking to `count` evenly spaced keyframes of `video_file`.
+
+    Each input only decodes keyframes for about a second after its seek
+    point, so a single ffmpeg process grabs every frame cheaply. Map them
+    with `V`, which unlike `v` skips cover art and other attached pictures.
+    """
+    interval = duration / (count + 1)
+    inputs = []
+    for i in range(1, count + 1):
+        inputs.extend(
+            (
+                "-threads",
+                "1",
+                "-skip_frame",
+                "nokey",
+                "-noaccurate_seek",
                 "-ss",
-                f"{cap_time}",
+                f"{interval * i:.2f}",
+                "-t",
+                "1",
                 "-i",
                 video_file,
-                "-q:v",
-                "1",
-                "-frames:v",
-                "1",
-                "-threads",
-                f"{max(1, cpu_no // 2)}",
-                output,
-            ]
-            cap_time += interval
-            cmds.append(cmd_exec(cmd))
-        try:
-            resutls = await wait_for(gather(*cmds), timeout=60)
-            if resutls[0][2] != 0:
-                LOGGER.error(
-                    f"Error while creating sreenshots from video. Path: {video_file}. stderr: {resutls[0][1]}",
-                )
-                await rmtree(dirpath, ignore_errors=True)
-                return False
-        except Exception:
-            LOGGER.error(
-                f"Error while creating sreenshots from video. Path: {video_file}. Error: Timeout some issues with xtra (ffmpeg) with specific arch!",
             )
-            await rmtree(dirpath, ignore_errors=True)
-            return False
+        )
+    return inputs
+
+
+async def take_ss(video_file, ss_nb) -> bool:
+    duration = (await get_media_info(video_file))[0]
+    if duration == 0:
+        LOGGER.error("take_ss: Can't get the duration of video")
+        return False
+    dirpath, name = video_file.rsplit("/", 1)
+    name, _ = ospath.splitext(name)
+    dirpath = f"{dirpath}/{name}_ss"
+    await makedirs(dirpath, exist_ok=True)
+    outputs = [f"{dirpath}/SS.{name}_{i:02}.png" for i in range(ss_nb)]
+    identity = await FrameCache.identity(video_file)
+    key = identity and f"{identity}-ss{ss_nb}"
+    if await FrameCache.get(key, outputs):
         return dirpath
-    LOGGER.error("take_ss: Can't get the duration of video")
-    return False
+    cmd = [
+        "xtra",  # Using xtra instead of ffmpeg
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        *_keyframe_inputs(video_file, duration, ss_nb),
+    ]
+    for i, output in enumerate(outputs):
+        cmd.extend(("-map", f"{i}:V:0", "-frames:v", "1", output))
+    try:
+        _, stderr, code = await wait_for(cmd_exec(cmd), timeout=60)
+    except Exception:
+        LOGGER.error(
+            f"Error while creating sreenshots from video. Path: {video_file}. Error: Timeout some issues with xtra (ffmpeg) with specific arch!",
+        )
+        await rmtree(dirpath, ignore_errors=True)
+        return False
+    if code != 0:
+        LOGGER.error(
+            f"Error while creating sreenshots from video. Path: {video_file}. stderr: {stderr}",
+        )
+        await rmtree(dirpath, ignore_errors=True)
+        return False
+    await FrameCache.put(key, outputs)
+    return dirpath
 
 
 async def extract_album_art_with_pil(audio_file, output_path):
@@ -1480,6 +1611,7 @@ async def proceed_extract(
     subtitle_font_size: str | None = None,
     # Attachment settings
     attachment_filter: str | None = None,
+    listener=None,
 ) -> list[str]:
     """Process extraction of tracks from a media file using FFmpeg asynchronously.
 
@@ -1522,6 +1654,8 @@ async def proceed_extract(
         subtitle_font: Font for subtitles (for formats that support it)
         subtitle_font_size: Font size for subtitles
         attachment_filter: Filter for attachment extraction (e.g., *.ttf)
+        listener: Task or FileExecutor job that owns the ffmpeg processes,
+            so cancelling it kills them and its progress follows the tracks
 
     Returns:
         List of paths to extracted files
@@ -1531,6 +1665,20 @@ async def proceed_extract(
     from re import IGNORECASE
     from re import search as re_search
 
+    started = total_tracks = 0
+
+    async def spawn(cmd):
+        nonlocal started
+        if listener is not None and listener.is_cancelled:
+            raise asyncio.CancelledError
+        proc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
+        if listener is not None:
+            listener.subproc = proc
+            if ffmpeg := getattr(listener, "ffmpeg", None):
+                started += 1
+                ffmpeg.set_progress(started / max(total_tracks, 1) * 100)
+        return proc
+
     # Check if file exists
     if not os.path.exists(file_path):
         LOGGER.error(f"File not found for extraction: {file_path}")
@@ -1580,6 +1728,16 @@ async def proceed_extract(
 
     # Get track information
     tracks = await get_track_info(file_path)
+    total_tracks = sum(
+        len(tracks[kind])
+        for kind, enabled in (
+            ("video", extract_video),
+            ("audio", extract_audio),
+            ("subtitle", extract_subtitle),
+            ("attachment", extract_attachment),
+        )
+        if enabled
+    )
 
     # Check if we have any tracks to extract
     if not any(tracks.values()):
@@ -1746,9 +1904,7 @@ async def proceed_extract(
                     extraction_success = False
 
                     try:
-                        proc = await create_subprocess_exec(
-                            *cmd, stdout=PIPE, stderr=PIPE
-                        )
+                        proc = await spawn(cmd)
 
                         _, stderr = await proc.communicate()
 
@@ -1792,9 +1948,7 @@ async def proceed_extract(
                         ]
 
                         try:
-                            alt_proc = await create_subprocess_exec(
-                                *alt_cmd, stdout=PIPE, stderr=PIPE
-                            )
+                            alt_proc = await spawn(alt_cmd)
 
                             _, alt_stderr = await alt_proc.communicate()
 
@@ -1840,9 +1994,7 @@ async def proceed_extract(
                         ]
 
                         try:
-                            alt_proc = await create_subprocess_exec(
-                                *alt_cmd, stdout=PIPE, stderr=PIPE
-                            )
+                            alt_proc = await spawn(alt_cmd)
 
                             _, alt_stderr = await alt_proc.communicate()
 
@@ -1932,9 +2084,7 @@ async def proceed_extract(
                 extraction_success = False
 
                 try:
-                    proc = await create_subprocess_exec(
-                        *cmd, stdout=PIPE, stderr=PIPE
-                    )
+                    proc = await spawn(cmd)
 
                     _, stderr = await proc.communicate()
 
@@ -1976,9 +2126,7 @@ async def proceed_extract(
                     ]
 
                     try:
-                        alt_proc = await create_subprocess_exec(
-                            *alt_cmd, stdout=PIPE, stderr=PIPE
-                        )
+                        alt_proc = await spawn(alt_cmd)
 
                         _, alt_stderr = await alt_proc.communicate()
 
@@ -2024,9 +2172,7 @@ async def proceed_extract(
                     ]
 
                     try:
-                        alt_proc = await create_subprocess_exec(
-                            *alt_cmd, stdout=PIPE, stderr=PIPE
-                        )
+                        alt_proc = await spawn(alt_cmd)
 
                         _, alt_stderr = await alt_proc.communicate()
 
@@ -2209,11 +2355,7 @@ async def proceed_extract(
 
                     # Run the command
                     try:
-                        proc = await asyncio.create_subprocess_exec(
-                            *cmd,
-                            stdout=asyncio.subprocess.PIPE,
-                            stderr=asyncio.subprocess.PIPE,
-                        )
+                        proc = await spawn(cmd)
 
                         _, stderr = await proc.communicate()
 
@@ -2320,11 +2462,7 @@ async def proceed_extract(
 
                 # Run the command
                 try:
-                    proc = await asyncio.create_subprocess_exec(
-                        *cmd,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                    )
+                    proc = await spawn(cmd)
 
                     _, stderr = await proc.communicate()
 
@@ -2475,11 +2613,7 @@ async def proceed_extract(
 
                     # Run the command
                     try:
-                        proc = await asyncio.create_subprocess_exec(
-                            *cmd,
-                            stdout=asyncio.subprocess.PIPE,
-                            stderr=asyncio.subprocess.PIPE,
-                        )
+                        proc = await spawn(cmd)
 
                         _, stderr = await proc.communicate()
 
@@ -2573,11 +2707,7 @@ async def proceed_extract(
 
                 # Run the command
                 try:
-                    proc = await asyncio.create_subprocess_exec(
-                        *cmd,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                    )
+                    proc = await spawn(cmd)
 
                     _, stderr = await proc.communicate()
 
@@ -2829,11 +2959,7 @@ async def proceed_extract(
 
                     # Run the command
                     try:
-                        proc = await asyncio.create_subprocess_exec(
-                            *cmd,
-                            stdout=asyncio.subprocess.PIPE,
-                            stderr=asyncio.subprocess.PIPE,
-                        )
+                        proc = await spawn(cmd)
 
                         _, stderr = await proc.communicate()
 
@@ -2886,11 +3012,7 @@ async def proceed_extract(
 
                             # Skip logging the full command
 
-                            alt_proc = await asyncio.create_subprocess_exec(
-                                *alt_cmd,
-                                stdout=asyncio.subprocess.PIPE,
-                                stderr=asyncio.subprocess.PIPE,
-                            )
+                            alt_proc = await spawn(alt_cmd)
 
                             _, alt_stderr = await alt_proc.communicate()
 
@@ -2942,11 +3064,7 @@ async def proceed_extract(
                                         f"Second alternative FFmpeg command: {' '.join(alt_cmd2)}"
                                     )
 
-                                    alt_proc2 = await asyncio.create_subprocess_exec(
-                                        *alt_cmd2,
-                                        stdout=asyncio.subprocess.PIPE,
-                                        stderr=asyncio.subprocess.PIPE,
-                                    )
+                                    alt_proc2 = await spawn(alt_cmd2)
 
                                     _, alt_stderr2 = await alt_proc2.communicate()
 
@@ -3125,11 +3243,7 @@ async def proceed_extract(
 
                 # Run the command
                 try:
-                    proc = await asyncio.create_subprocess_exec(
-                        *cmd,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                    )
+                    proc = await spawn(cmd)
 
                     _, stderr = await proc.communicate()
 
@@ -3519,105 +3633,62 @@ async def create_default_image_thumbnail(output_dir, user_id=None):
     return None
 
 
-async def get_multiple_frames_thumbnail(video_file, layout, keep_screenshots):
-    ss_nb = layout.split("x")
-    ss_nb = int(ss_nb[0]) * int(ss_nb[1])
-    dirpath = await take_ss(video_file, ss_nb)
-    if not dirpath:
+async def get_multiple_frames_thumbnail(video_file, layout):
+    """Tile `layout` (columns x rows) keyframes into one JPEG thumbnail.
+
+    The frames are grabbed, scaled to GRID_CELL_WIDTH and tiled in a
+    single ffmpeg process, no screenshot is written on the way.
+    """
+    cols, rows = map(int, layout.split("x"))
+    ss_nb = cols * rows
+    duration = (await get_media_info(video_file))[0]
+    if duration == 0:
+        LOGGER.warning(f"Can't get the duration for grid thumbnail: {video_file}")
         return None
     output_dir = f"{DOWNLOAD_DIR}thumbnails"
     await makedirs(output_dir, exist_ok=True)
     output = ospath.join(output_dir, f"{time()}.jpg")
+    identity = await FrameCache.identity(video_file)
+    key = identity and f"{identity}-grid{cols}x{rows}"
+    if await FrameCache.get(key, [output]):
+        return output
+    cells = "".join(
+        f"[{i}:V:0]trim=end_frame=1,scale={GRID_CELL_WIDTH}:-2,setsar=1[f{i}];"
+        for i in range(ss_nb)
+    )
+    frames = "".join(f"[f{i}]" for i in range(ss_nb))
     cmd = [
         "xtra",  # Using xtra instead of ffmpeg
         "-hide_banner",
         "-loglevel",
         "error",
-        "-pattern_type",
-        "glob",
-        "-i",
-        f"{escape(dirpath)}/*.png",
-        "-vf",
-        f"tile={layout}, thumbnail",
-        "-q:v",
-        "1",
+        *_keyframe_inputs(video_file, duration, ss_nb),
+        "-filter_complex",
+        f"{cells}{frames}concat=n={ss_nb}:v=1:a=0,tile={cols}x{rows}[grid]",
+        "-map",
+        "[grid]",
         "-frames:v",
         "1",
+        "-q:v",
+        "2",
         "-f",
         "mjpeg",
-        "-threads",
-        f"{max(1, cpu_no // 2)}",
         output,
     ]
-    output_result = None  # Initialize result variable
-
     try:
         _, err, code = await wait_for(cmd_exec(cmd), timeout=60)
-        if code == 0 and await aiopath.exists(output):
-            # Check if the created thumbnail is valid and not empty
-            if await aiopath.getsize(output) > 0:
-                output_result = output
-            else:
-                await remove(output)
-                LOGGER.warning(
-                    f"Created empty grid thumbnail from video: {video_file}"
-                )
-        else:
-            LOGGER.warning(
-                f"Failed to create grid thumbnail: {video_file} stderr: {err}",
-            )
-
-        # If first method failed, try alternative method with PIL
-        if not output_result:
-            try:
-                alt_output = ospath.join(
-                    output_dir, f"grid_thumb_alt_{int(time())}.jpg"
-                )
-                # Check if we have screenshots
-                screenshots = list(Path(dirpath).glob("*.png"))
-                if screenshots:
-                    # Use PIL to create a grid
-                    from PIL import Image
-
-                    # Apply memory limits for PIL operations
-                    limit_memory_for_pil()
-
-                    # Determine grid dimensions
-                    cols, rows = map(int, layout.split("x"))
-                    # Get the first image to determine dimensions
-                    with Image.open(screenshots[0]) as img:
-                        img_width, img_height = img.size
-
-                    # Create a new image with the grid dimensions
-                    grid_width = cols * img_width
-                    grid_height = rows * img_height
-                    grid_img = Image.new("RGB", (grid_width, grid_height))
-
-                    # Place images in the grid
-                    for i, screenshot in enumerate(screenshots[:ss_nb]):
-                        if i >= ss_nb:
-                            break
-                        with Image.open(screenshot) as img:
-                            x = (i % cols) * img_width
-                            y = (i // cols) * img_height
-                            grid_img.paste(img, (x, y))
-
-                    # Save the grid
-                    grid_img.save(alt_output, quality=90)
-                    output_result = alt_output
-            except Exception as e:
-                LOGGER.error(f"Failed to create grid with PIL: {e}")
-
     except Exception:
         LOGGER.error(
-            f"Error while combining thumbnails from video. Name: {video_file}. Error: Timeout some issues with xtra with specific arch!",
+            f"Error while creating grid thumbnail from video. Name: {video_file}. Error: Timeout some issues with xtra with specific arch!",
         )
-    finally:
-        # Clean up screenshots if not keeping them
-        if not keep_screenshots and "dirpath" in locals() and dirpath:
-            await rmtree(dirpath, ignore_errors=True)
-
-    return output_result
+        code, err = -1, "timeout"
+    if code == 0 and await aiopath.exists(output) and await aiopath.getsize(output):
+        await FrameCache.put(key, [output])
+        return output
+    LOGGER.warning(f"Failed to create grid thumbnail: {video_file} stderr: {err}")
+    if await aiopath.exists(output):
+        await remove(output)
+    return None
 
 
 def is_mkv(file):
@@ -4120,6 +4191,10 @@ class FFMpeg:
     def eta_raw(self):
         return self._eta_raw
 
+    def set_progress(self, progress):
+        """Progress of a job that gives no ffmpeg progress output."""
+        self._progress_raw = min(progress, 99.9)
+
     def clear(self):
         self._start_time = time()
         self._processed_bytes = 0
@@ -4132,6 +4207,7 @@ class FFMpeg:
         self._last_processed_bytes = 0
 
     async def _ffmpeg_progress(self):
+        start = time()
         while not (
             self._listener.subproc.returncode is not None
             or self._listener.is_cancelled
@@ -4298,6 +4374,7 @@ class FFMpeg:
                             self._progress_raw = 0
                             self._eta_raw = 0
             await sleep(0.05)
+        Metrics.observe("job_seconds", time() - start, tool="ffmpeg")
 
     async def _get_stream_info(self, file_path, stream_type):
         """
@@ -7556,6 +7633,7 @@ class FFMpeg:
         multi_streams = True
         self._total_time = duration = (await get_media_info(f_path))[0]
         base_name, extension = ospath.splitext(file_)
+        pipeline = self._listener.split_pipeline
 
         # Check if equal splits is enabled by checking if parts is a reasonable number
         # When equal splits is enabled, parts will typically be a small number (2-20)
@@ -7570,8 +7648,21 @@ class FFMpeg:
         if not is_equal_splits:
             is_equal_splits = parts <= 20 and parts > 1
 
+        # One segment muxer pass, the per-part runs below resume after the
+        # parts it finished if it gives up
+        done, start_time = 0, 0
+        if Config.SEGMENT_SPLIT and duration > 0:
+            result = await self._segment_split(
+                f_path, file_, parts, split_size, is_equal_splits
+            )
+            if self._listener.is_cancelled:
+                return False
+            if result is True:
+                return True
+            done, start_time = result
+
         # For equal splits, calculate the exact duration for each part
-        if is_equal_splits and duration > 0:
+        if is_equal_splits and duration > 0 and not done:
             # Calculate duration per part (in seconds)
             duration_per_part = duration / parts
             # Reserve some buffer for each part (3 seconds)
@@ -7586,6 +7677,8 @@ class FFMpeg:
                 out_path = f_path.replace(
                     file_, f"{base_name}.part{i:03}{extension}"
                 )
+                if pipeline is not None:
+                    pipeline.announce(out_path, f_path)
 
                 # Use duration parameter instead of file size for equal splits
                 cmd = [
@@ -7648,6 +7741,8 @@ class FFMpeg:
                 # Update progress
                 self._last_processed_time += end_time - start_time
                 self._last_processed_bytes += await get_path_size(out_path)
+                if pipeline is not None:
+                    await pipeline.put(out_path)
 
             return True
         # Use traditional file size-based splitting for non-equal splits
@@ -7673,10 +7768,12 @@ class FFMpeg:
         if parts > 2:
             buffer_size = 5000000  # 5MB additional buffer for multi-part files
             split_size -= buffer_size
-        start_time = 0
-        i = 1
+        i = done + 1
+        self._last_processed_time = start_time
         while i <= parts or start_time < duration - 4:
             out_path = f_path.replace(file_, f"{base_name}.part{i:03}{extension}")
+            if pipeline is not None:
+                pipeline.announce(out_path, f_path)
             cmd = [
                 "xtra",  # Using xtra instead of ffmpeg
                 "-hide_banner",
@@ -7771,11 +7868,13 @@ class FFMpeg:
                     f"Something went wrong while splitting, mostly file is corrupted. Path: {f_path}",
                 )
                 break
-            if duration == lpd:
-                break
-            if lpd <= 3:
+            if lpd <= 3 and duration != lpd:
                 await remove(out_path)
                 break
+            if pipeline is not None:
+                await pipeline.put(out_path)
+            if duration == lpd:
+                break
             self._last_processed_time += lpd
             self._last_processed_bytes += out_size
             start_time += lpd - 3
@@ -7783,6 +7882,240 @@ class FFMpeg:
 
         return True
 
+    async def _segment_split(self, f_path, file_, parts, split_size, equal):
+        """Split with a single segment muxer run cut at planned keyframes.
+
+        Cut points come from the packet index so every part stays under the
+        upload limit. Returns True once every part is written, else the
+        number of parts kept and the time to resume from, (0, 0) when
+        nothing could be done this way.
+        """
+        from bot.core.aeon_client import TgClient
+
+        limit = min(
+            self._listener.max_split_size or TgClient.MAX_SPLIT_SIZE,
+            TgClient.MAX_SPLIT_SIZE,
+        )
+        budget = int(
+            min(split_size, limit - SEGMENT_SAFETY_MARGIN) * (1 - SEGMENT_OVERHEAD)
+        )
+        if (index := await self._packet_index(f_path)) is None:
+            return 0, 0
+        cuts = plan_segment_cuts(*index, budget, parts if equal else None)
+        if not cuts:
+            LOGGER.info(f"No segment plan under {budget} bytes, for: {f_path}")
+            return 0, 0
+
+        base_name, extension = ospath.splitext(file_)
+        # The segment muxer expands %d in the whole output path
+        pattern = ospath.join(
+            ospath.dirname(f_path).replace("%", "%%"),
+            f"{base_name.replace('%', '%%')}.part%03d{extension}",
+        )
+        out_paths = [
+            f_path.replace(file_, f"{base_name}.part{i:03}{extension}")
+            for i in range(1, len(cuts) + 2)
+        ]
+        pipeline = self._listener.split_pipeline
+        if pipeline is not None:
+            for out_path in out_paths:
+                pipeline.announce(out_path, f_path)
+        LOGGER.info(f"Segment split of {f_path} into {len(out_paths)} parts")
+        cmd = [
+            "xtra",  # Using xtra instead of ffmpeg
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-progress",
+            "pipe:1",
+            "-i",
+            f_path,
+            "-map",
+            "0",
+            "-map_chapters",
+            "-1",
+            "-strict",
+            "-2",
+            "-c",
+            "copy",
+            "-f",
+            "segment",
+            "-segment_times",
+            ",".join(f"{cut:.6f}" for cut in cuts),
+            "-segment_start_number",
+            "1",
+            "-reset_timestamps",
+            "1",
+            "-threads",
+            f"{max(1, cpu_no // 2)}",
+            pattern,
+        ]
+        self._listener.subproc = await create_subprocess_exec(
+            *cmd,
+            stdout=PIPE,
+            stderr=PIPE,
+        )
+
+        async def run():
+            await self._ffmpeg_progress()
+            return await self._listener.subproc.communicate()
+
+        done, (_, stderr) = await gather(
+            self._collect_segments(out_paths, limit, pipeline),
+            run(),
+        )
+        if self._listener.is_cancelled:
+            return False
+        if done == len(out_paths):
+            return True
+        if self._listener.subproc.returncode not in (0, -9):
+            try:
+                stderr = stderr.decode().strip()
+            except Exception:
+                stderr = "Unable to decode the error!"
+            LOGGER.error(f"Segment split failed: {stderr}. Path: {f_path}")
+        for out_path in out_paths[done:]:
+            with contextlib.suppress(Exception):
+                await remove(out_path)
+        resume = cuts[done - 1] if done else 0
+        self._last_processed_bytes = sum(
+            [await get_path_size(out_path) for out_path in out_paths[:done]]
+        )
+        return done, resume
+
+    async def _packet_index(self, f_path):
+        """Return (keyframes, total bytes) of the main video stream.
+
+        One ffprobe pass over every packet, keyframes being (time relative
+        to the first packet, bytes of the packets before it).
+        """
+        stdout, _, code = await cmd_exec(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-select_streams",
+                "V:0",
+                "-show_entries",
+                "stream=index",
+                "-of",
+                "csv=p=0",
+                f_path,
+            ]
+        )
+        if code != 0 or not stdout.isdigit():
+            return None
+        self._listener.subproc = await create_subprocess_exec(
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "packet=stream_index,pts_time,size,flags",
+            "-of",
+            "csv=p=0",
+            f_path,
+            stdout=PIPE,
+            stderr=PIPE,
+        )
+        output, _ = await self._listener.subproc.communicate()
+        if self._listener.subproc.returncode != 0 or self._listener.is_cancelled:
+            return None
+        return await sync_to_async(parse_packet_index, output, stdout.encode())
+
+    async def _collect_segments(self, out_paths, limit, pipeline):
+        """Check and hand over each segment once the muxer moved past it.
+
+        Returns the number of parts kept, the muxer is stopped at the first
+        part over `limit`.
+        """
+        proc = self._listener.subproc
+        done = 0
+        while done < len(out_paths) and not self._listener.is_cancelled:
+            running = proc.returncode is None
+            if running:
+                # A segment is closed once the muxer opened the next one
+                if done + 1 == len(out_paths) or not await aiopath.exists(
+                    out_paths[done + 1]
+                ):
+                    await sleep(1)
+                    continue
+            elif proc.returncode != 0 or not await aiopath.exists(out_paths[done]):
+                break
+            out_path = out_paths[done]
+            if await aiopath.getsize(out_path) > limit:
+                LOGGER.warning(f"Segment over the upload limit: {out_path}")
+                if running:
+                    with contextlib.suppress(ProcessLookupError):
+                        proc.kill()
+                break
+            if pipeline is not None:
+                await pipeline.hand_over(out_path, proc)
+            done += 1
+        return done
+
+
+def parse_packet_index(output, video):
+    """Parse `ffprobe -of csv=p=0` packet lines into the keyframe index.
+
+    Returns (keyframes of stream `video`, total bytes), see
+    FFMpeg._packet_index.
+    """
+    keyframes, total, start = [], 0, None
+    for line in output.splitlines():
+        fields = line.split(b",")
+        if len(fields) < 4:
+            continue
+        stream, pts, size, flags = fields[:4]
+        try:
+            size = int(size)
+        except ValueError:
+            continue
+        with contextlib.suppress(ValueError):
+            pts = float(pts)
+            start = pts if start is None else min(start, pts)
+            if stream == video and flags.startswith(b"K"):
+                keyframes.append((pts, total))
+        total += size
+    return [(pts - start, offset) for pts, offset in keyframes if pts > start], total
+
+
+def plan_segment_cuts(keyframes, total, budget, parts=None):
+    """Pick cut times among `keyframes` so every part fits in `budget`.
+
+    Without `parts` every part is filled up to `budget` bytes, with it the
+    cuts are the keyframes closest to equal byte shares. Returns None when
+    some part can't stay within `budget`.
+    """
+    if not keyframes:
+        return None
+    cuts = []
+    if parts:
+        offsets = [offset for _, offset in keyframes]
+        for k in range(1, parts):
+            target = total * k / parts
+            pos = bisect_left(offsets, target)
+            near = min(
+                (p for p in (pos - 1, pos) if 0 <= p < len(keyframes)),
+                key=lambda p: abs(offsets[p] - target),
+            )
+            if not cuts or keyframes[near][0] > cuts[-1][0]:
+                cuts.append(keyframes[near])
+    else:
+        part_start, last = 0, None
+        for cut in (*keyframes, (None, total)):
+            if cut[1] - part_start > budget:
+                if last is None:
+                    return None
+                cuts.append(last)
+                part_start, last = last[1], None
+                if cut[1] - part_start > budget:
+                    return None
+            last = cut
+    bounds = [0, *(offset for _, offset in cuts), total]
+    if any(end - begin > budget for begin, end in pairwise(bounds)):
+        return None
+    return [pts for pts, _ in cuts]
+
 
 async def apply_document_metadata(file_path, title=None, author=None, comment=None):
     """Apply metadata to document files like PDF using appropriate tools.
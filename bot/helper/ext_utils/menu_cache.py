@@ -0,0 +1,51 @@
+from collections import OrderedDict
+from typing import ClassVar
+
+from bot.helper.ext_utils.aiofiles_compat import aiopath
+from bot.helper.ext_utils.effective_settings import settings_version
+from bot.helper.ext_utils.metrics import Metrics
+
+
+async def _mtime(path):
+    try:
+        return await aiopath.getmtime(path)
+    except OSError:
+        return None
+
+
+class MenuCache:
+    """Rendered settings pages keyed by (menu, user, page, settings version).
+
+    A page is rebuilt only when Config or the user's data changed since it
+    was rendered, so navigating a menu costs a dict lookup plus one edit.
+    Pages showing files on disk pass them as `files`, their modification
+    times are part of the key. Stale versions are never looked up again
+    and age out of the LRU.
+    """
+
+    _pages: ClassVar[OrderedDict] = OrderedDict()
+    max_entries = 512
+    hits = 0
+    misses = 0
+
+    @classmethod
+    async def render(cls, menu, user_id, page, builder, *args, files=()):
+        stamps = [await _mtime(path) for path in files]
+        key = (menu, user_id, page, settings_version(user_id), *stamps)
+        if (result := cls._pages.get(key)) is not None:
+            cls._pages.move_to_end(key)
+            cls.hits += 1
+            return result
+        cls.misses += 1
+        result = await builder(*args)
+        cls._pages[key] = result
+        while len(cls._pages) > cls.max_entries:
+            cls._pages.popitem(last=False)
+        return result
+
+    @classmethod
+    def clear(cls):
+        cls._pages.clear()
+
+
+Metrics.register_cache("settings_menus", MenuCache)
@@ -0,0 +1,235 @@
+from asyncio import create_task, gather, sleep
+from collections import defaultdict
+from contextlib import contextmanager
+from time import monotonic
+from typing import ClassVar
+
+from aiohttp import web
+from pymongo import monitoring
+
+from bot import LOGGER, task_dict
+from bot.core.config_manager import Config
+
+# /metrics of web/wserver.py proxies to it
+METRICS_SERVER_HOST = "127.0.0.1"
+METRICS_SERVER_PORT = 8096
+PREFIX = "aeon_"
+LAG_INTERVAL = 0.5
+
+HELP = {
+    "transfer_bytes_total": "Bytes moved by finished transfers",
+    "job_seconds": "Duration of ffmpeg and 7z jobs",
+    "queue_wait_seconds": "Time tasks waited in the task queue",
+    "telegram_call_seconds": "Latency of Telegram API calls",
+    "telegram_upload_seconds": "Duration of Telegram file uploads",
+    "telegram_queue_seconds": "Time Telegram calls waited for a rate limit token",
+    "telegram_floodwait_seconds_total": "FloodWait seconds imposed by Telegram",
+    "db_command_seconds": "Latency of database commands",
+    "event_loop_lag_seconds": "Delay of the event loop heartbeat",
+    "cache_hits_total": "Cache lookups that found an entry",
+    "cache_misses_total": "Cache lookups that missed",
+}
+
+MetricsServer = []
+
+
+def _labels(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+class Metrics:
+    """In-process counters and summaries of the hot paths.
+
+    Summaries keep count, sum and max per label set, enough to tell where
+    time goes without per-sample storage. Caches register themselves and
+    are read on scrape through their `hits` and `misses` attributes.
+    """
+
+    _counters: ClassVar[defaultdict[tuple, float]] = defaultdict(float)
+    _summaries: ClassVar[dict[tuple, list]] = {}
+    _caches: ClassVar[dict[str, type]] = {}
+
+    @classmethod
+    def inc(cls, name, value=1, **labels):
+        cls._counters[(name, _labels(labels))] += value
+
+    @classmethod
+    def observe(cls, name, value, **labels):
+        key = (name, _labels(labels))
+        if (summary := cls._summaries.get(key)) is None:
+            cls._summaries[key] = [1, value, value]
+        else:
+            summary[0] += 1
+            summary[1] += value
+            summary[2] = max(summary[2], value)
+
+    @classmethod
+    @contextmanager
+    def timer(cls, name, **labels):
+        start = monotonic()
+        try:
+            yield
+        finally:
+            cls.observe(name, monotonic() - start, **labels)
+
+    @classmethod
+    def register_cache(cls, name, cache):
+        cls._caches[name] = cache
+
+    @classmethod
+    def counters(cls, name):
+        """Return {labels dict as tuple: value} of counter `name`."""
+        return {
+            labels: value
+            for (metric, labels), value in cls._counters.items()
+            if metric == name
+        }
+
+    @classmethod
+    def stats(cls, name, **match):
+        """Return (count, sum, max) of `name` over label sets matching `match`."""
+        wanted = set(_labels(match))
+        count = total = peak = 0
+        for (metric, labels), summary in cls._summaries.items():
+            if metric == name and wanted.issubset(labels):
+                count += summary[0]
+                total += summary[1]
+                peak = max(peak, summary[2])
+        return count, total, peak
+
+    @classmethod
+    def cache_rates(cls):
+        """Return {cache name: (hits, misses)}."""
+        return {
+            name: (getattr(cache, "hits", 0), getattr(cache, "misses", 0))
+            for name, cache in cls._caches.items()
+        }
+
+    @classmethod
+    def render(cls):
+        """Render every metric in the Prometheus text exposition format."""
+        counters = dict(cls._counters)
+        for name, (hits, misses) in cls.cache_rates().items():
+            counters[("cache_hits_total", (("cache", name),))] = hits
+            counters[("cache_misses_total", (("cache", name),))] = misses
+        lines = []
+        typed = set()
+
+        def header(name, kind, help_=None):
+            if name in typed:
+                return
+            typed.add(name)
+            help_ = HELP.get(name, help_ or name)
+            lines.append(f"# HELP {PREFIX}{name} {help_}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        for (name, labels), value in sorted(counters.items()):
+            header(name, "counter")
+            lines.append(f"{PREFIX}{name}{_format_labels(labels)} {value}")
+        for (name, labels), (count, total, _) in sorted(cls._summaries.items()):
+            header(name, "summary")
+            label_str = _format_labels(labels)
+            lines.append(f"{PREFIX}{name}_count{label_str} {count}")
+            lines.append(f"{PREFIX}{name}_sum{label_str} {total}")
+        for (name, labels), (_, _, peak) in sorted(cls._summaries.items()):
+            header(f"{name}_max", "gauge", f"Largest value of {PREFIX}{name}")
+            lines.append(f"{PREFIX}{name}_max{_format_labels(labels)} {peak}")
+        return "\n".join(lines) + "\n"
+
+
+class DbCommandTimer(monitoring.CommandListener):
+    """pymongo command listener feeding `db_command_seconds`."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        Metrics.observe(
+            "db_command_seconds",
+            event.duration_micros / 1e6,
+            command=event.command_name,
+        )
+
+    def failed(self, event):
+        Metrics.observe(
+            "db_command_seconds",
+            event.duration_micros / 1e6,
+            command=event.command_name,
+            failed=True,
+        )
+
+
+def record_transfer(listener, direction):
+    """Count `listener.size` for the engine of the task's current status."""
+    status = task_dict.get(listener.mid)
+    engine = getattr(status, "tool", "unknown")
+    if engine == "telegram":
+        if listener.hybrid_leech:
+            client = "hybrid"
+        elif listener.user_transmission:
+            client = "user"
+        else:
+            client = "bot"
+    else:
+        client = "default"
+    Metrics.inc(
+        "transfer_bytes_total",
+        listener.size or 0,
+        direction=direction,
+        engine=engine,
+        client=client,
+    )
+
+
+async def _loop_lag_heartbeat():
+    while True:
+        start = monotonic()
+        await sleep(LAG_INTERVAL)
+        Metrics.observe(
+            "event_loop_lag_seconds",
+            max(monotonic() - start - LAG_INTERVAL, 0),
+        )
+
+
+async def _metrics_handler(_):
+    return web.Response(
+        text=Metrics.render(),
+        content_type="text/plain",
+        charset="utf-8",
+    )
+
+
+async def metrics_server_booter():
+    await stop_metrics_server()
+
+    if not Config.METRICS_ENABLED:
+        return
+
+    metrics_app = web.Application()
+    metrics_app.router.add_get("/metrics", _metrics_handler)
+    runner = web.AppRunner(metrics_app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, METRICS_SERVER_HOST, METRICS_SERVER_PORT).start()
+    MetricsServer.extend((runner, create_task(_loop_lag_heartbeat())))
+    LOGGER.info(
+        f"Metrics server started on {METRICS_SERVER_HOST}:{METRICS_SERVER_PORT}"
+    )
+
+
+async def stop_metrics_server():
+    if not MetricsServer:
+        return
+    runner, heartbeat = MetricsServer
+    heartbeat.cancel()
+    await gather(runner.cleanup(), return_exceptions=True)
+    MetricsServer.clear()
@@ -4,6 +4,7 @@ import logging
 import psutil
 
 from bot.core.config_manager import Config
+from bot.helper.ext_utils.system_metrics import get_snapshot
 
 LOGGER = logging.getLogger(__name__)
 
@@ -22,14 +23,14 @@ active_ffmpeg_processes = {}
 async def update_system_load():
     """Update system resource usage information."""
     try:
-        # Get CPU usage
-        system_load["cpu_percent"] = psutil.cpu_percent(interval=1)
-
-        # Get memory usage
-        memory = psutil.virtual_memory()
-        system_load["memory_percent"] = memory.percent
-        system_load["available_memory_mb"] = memory.available // (1024 * 1024)
-        system_load["total_memory_mb"] = memory.total // (1024 * 1024)
+        # Read the sampler snapshot instead of blocking on cpu_percent
+        snapshot = get_snapshot()
+        system_load["cpu_percent"] = snapshot.cpu_percent
+        system_load["memory_percent"] = snapshot.memory_percent
+        system_load["available_memory_mb"] = snapshot.memory_available // (
+            1024 * 1024
+        )
+        system_load["total_memory_mb"] = snapshot.memory_total // (1024 * 1024)
     except Exception as e:
         LOGGER.error(f"Error updating system load: {e}")
 
@@ -0,0 +1,110 @@
+import contextlib
+from asyncio import Queue, QueueEmpty
+from signal import SIGCONT, SIGSTOP
+
+from bot.helper.ext_utils.aiofiles_compat import aiopath, remove
+
+# Queued once the producer knows which files it still works on, the
+# uploader then walks the tree for everything else
+WALK = object()
+
+
+class SplitPipeline:
+    """Hands files to the uploader as soon as each one is finalized.
+
+    The splitter announces a part before writing it and puts it once it is
+    final, a streamed extraction puts every extracted file once 7z moved on
+    to the next one. The bounded queue holds producers back when the
+    uploader falls behind so only a few files are on disk at a time.
+    The split plan queues WALK, on which the uploader walks the tree
+    skipping the files being split and everything announced, then it takes
+    files from the queue until the producer closes it. Files that end up
+    not being split are queued whole, a file whose split stopped after some
+    of its parts were queued is not, its unfinished parts are removed.
+    """
+
+    def __init__(self, depth):
+        self._queue = Queue(maxsize=max(1, depth))
+        self._planned = False
+        self._aborted = False
+        self.sources = set()
+        self.parts = set()
+        self._parts_of = {}
+        self._queued = set()
+
+    async def plan(self, sources):
+        self.sources.update(sources)
+        self._planned = True
+        await self.put(WALK)
+
+    def claims(self, path):
+        return path in self.sources or path in self.parts
+
+    def announce(self, path, source=None):
+        self.parts.add(path)
+        if source is not None:
+            self._parts_of.setdefault(source, set()).add(path)
+
+    def full(self):
+        return self._queue.full()
+
+    async def put(self, path):
+        if not self._aborted:
+            await self._queue.put(path)
+            self._queued.add(path)
+
+    async def hand_over(self, path, proc=None):
+        """Announce and put `path`, stopping `proc` while the queue is full.
+
+        Producers that write the next file in the same process pass it, so
+        no more than the queued files pile up on disk.
+        """
+        self.announce(path)
+        paused = proc is not None and proc.returncode is None and self.full()
+        if paused:
+            with contextlib.suppress(ProcessLookupError):
+                proc.send_signal(SIGSTOP)
+        try:
+            await self.put(path)
+        finally:
+            if paused:
+                with contextlib.suppress(ProcessLookupError):
+                    proc.send_signal(SIGCONT)
+
+    async def get(self):
+        """Return the next file or WALK, None once the producer is done."""
+        return await self._queue.get()
+
+    async def feed(self, coro):
+        """Run the producer coroutine and close the queue when it returns."""
+        try:
+            return await coro
+        finally:
+            if not self._planned:
+                await self.plan(())
+            # Files left whole, skipped or failed before their first part
+            # still need their upload, parts never finished are dropped
+            for source in sorted(self.sources):
+                parts = self._parts_of.get(source, ())
+                for part in parts - self._queued:
+                    with contextlib.suppress(OSError):
+                        await remove(part)
+                if parts & self._queued:
+                    continue
+                if await aiopath.exists(source):
+                    await self.put(source)
+            await self.put(None)
+
+    def abort(self):
+        """Stop accepting files, the uploader gave up on the queue."""
+        self._aborted = True
+        while True:
+            try:
+                self._queue.get_nowait()
+            except QueueEmpty:
+                break
+
+    def close(self):
+        """Abort from the producer side, releasing a waiting uploader."""
+        self.abort()
+        self._queue.put_nowait(None)
@@ -3,10 +3,9 @@ from asyncio import gather, iscoroutinefunction
 from html import escape
 from time import time
 
-from psutil import cpu_percent, disk_usage, virtual_memory
-
 from bot import DOWNLOAD_DIR, bot_start_time, status_dict, task_dict, task_dict_lock
 from bot.core.config_manager import Config
+from bot.helper.ext_utils.system_metrics import get_snapshot
 from bot.helper.telegram_helper.button_build import ButtonMaker
 
 SIZE_UNITS = ["B", "KB", "MB", "GB", "TB", "PB"]
@@ -285,6 +284,11 @@ async def get_readable_message(sid, is_user, page_no=1, status="All", page_step=
             task_msg += f"\n<b>Processed:</b> {task.processed_bytes()}{subsize}"
             if count:
                 task_msg += f"\n<b>Count:</b> {count}"
+            if hasattr(task, "file_counts") and (files := task.file_counts()):
+                done, running, submitted = files
+                task_msg += (
+                    f"\n<b>Files:</b> {done}/{submitted} | <b>Running:</b> {running}"
+                )
             task_msg += f"\n<b>Size:</b> {task.size()}"
             task_msg += f"\n<b>Speed:</b> {task.speed()}"
             task_msg += f"\n<b>Estimated:</b> {task.eta()}"
@@ -353,8 +357,9 @@ async def get_readable_message(sid, is_user, page_no=1, status="All", page_step=
             if status_value != status:
                 buttons.data_button(label, f"status {sid} st {status_value}")
     button = buttons.build_menu(8)
-    msg += f"<b>CPU:</b> {cpu_percent()}% | <b>FREE:</b> {get_readable_file_size(disk_usage(DOWNLOAD_DIR).free)}"
-    msg += f"\n<b>RAM:</b> {virtual_memory().percent}% | <b>UPTIME:</b> {get_readable_time(time() - bot_start_time)}"
+    snapshot = get_snapshot()
+    msg += f"<b>CPU:</b> {snapshot.cpu_percent}% | <b>FREE:</b> {get_readable_file_size(snapshot.disk_free(DOWNLOAD_DIR))}"
+    msg += f"\n<b>RAM:</b> {snapshot.memory_percent}% | <b>UPTIME:</b> {get_readable_time(time() - bot_start_time)}"
 
     # Add restart time if enabled
     if Config.AUTO_RESTART_ENABLED:
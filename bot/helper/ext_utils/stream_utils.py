@@ -0,0 +1,337 @@
+from asyncio import CancelledError, Lock, create_task, gather, sleep
+from collections import OrderedDict
+from mimetypes import guess_type
+from time import time
+from typing import ClassVar
+from urllib.parse import quote
+
+from aiohttp import web
+
+from bot import LOGGER
+from bot.core.aeon_client import TgClient
+from bot.core.config_manager import Config
+from bot.helper.ext_utils.hyperdl_utils import HyperTGDownload
+from bot.helper.ext_utils.metrics import Metrics
+
+# The bot side of the stream endpoint only listens on localhost, the public
+# /stream route of web/wserver.py proxies to it.
+STREAM_SERVER_HOST = "127.0.0.1"
+STREAM_SERVER_PORT = 8095
+CHUNK_SIZE = 1024 * 1024
+
+StreamServer = []
+
+
+class ChunkCache:
+    """Byte-bounded LRU of 1 MiB file chunks shared by every viewer."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._chunks = OrderedDict()
+
+    def get(self, key):
+        if (chunk := self._chunks.get(key)) is not None:
+            self._chunks.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return chunk
+
+    def put(self, key, chunk):
+        if self.max_bytes <= 0 or len(chunk) > self.max_bytes:
+            return
+        if key in self._chunks:
+            self.size -= len(self._chunks.pop(key))
+        self._chunks[key] = chunk
+        self.size += len(chunk)
+        while self.size > self.max_bytes:
+            _, old = self._chunks.popitem(last=False)
+            self.size -= len(old)
+
+    def clear(self):
+        self._chunks.clear()
+        self.size = 0
+
+
+chunk_cache = ChunkCache(Config.STREAM_CACHE_SIZE * 1024 * 1024)
+Metrics.register_cache("stream_chunks", chunk_cache)
+
+
+class TgFileStreamer:
+    def __init__(self, message, media):
+        self.message = message
+        self.file_unique_id = media.file_unique_id
+        self.file_size = getattr(media, "file_size", 0) or 0
+        self.file_name = (
+            getattr(media, "file_name", None)
+            or f"{self.file_unique_id}.{message.media.value}"
+        )
+        self.mime_type = (
+            getattr(media, "mime_type", None)
+            or guess_type(self.file_name)[0]
+            or "application/octet-stream"
+        )
+        self.last_access = time()
+        self._inflight = {}
+        self._hyper = None
+        if TgClient.are_helper_bots_available():
+            self._hyper = HyperTGDownload()
+            self._hyper.bind_message(message)
+
+    @property
+    def total_chunks(self):
+        return (self.file_size + CHUNK_SIZE - 1) // CHUNK_SIZE
+
+    async def _download_chunk(self, index):
+        if self._hyper is not None:
+            data = [
+                chunk
+                async for chunk in self._hyper.get_file(
+                    index * CHUNK_SIZE,
+                    0,
+                    CHUNK_SIZE,
+                    1,
+                )
+            ]
+        else:
+            data = [
+                chunk
+                async for chunk in TgClient.bot.stream_media(
+                    self.message,
+                    offset=index,
+                    limit=1,
+                )
+            ]
+        return b"".join(data)
+
+    def _start_fetch(self, index):
+        task = create_task(self._fetch_chunk(index))
+        task.add_done_callback(self._fetch_done)
+        self._inflight[index] = task
+        return task
+
+    def _fetch_done(self, task):
+        # Read-ahead fetches nobody awaits still have their errors retrieved
+        if not task.cancelled() and (error := task.exception()) is not None:
+            LOGGER.debug(f"Stream chunk of {self.file_name} failed: {error}")
+
+    async def _fetch_chunk(self, index):
+        key = (self.file_unique_id, index)
+        try:
+            chunk = await self._download_chunk(index)
+            chunk_cache.put(key, chunk)
+            return chunk
+        finally:
+            self._inflight.pop(index, None)
+
+    async def get_chunk(self, index):
+        """Return chunk `index`, sharing cache hits and in-flight fetches."""
+        self.last_access = time()
+        if (chunk := chunk_cache.get((self.file_unique_id, index))) is not None:
+            return chunk
+        if (task := self._inflight.get(index)) is None:
+            task = self._start_fetch(index)
+        return await task
+
+    def _read_ahead(self, index):
+        for ahead in range(index + 1, index + 1 + Config.STREAM_READ_AHEAD):
+            if ahead >= self.total_chunks:
+                break
+            if (
+                ahead in self._inflight
+                or chunk_cache.get((self.file_unique_id, ahead)) is not None
+            ):
+                continue
+            self._start_fetch(ahead)
+
+    async def iter_range(self, start, end):
+        """Yield the bytes `start..end` (inclusive) of the file."""
+        first, last = start // CHUNK_SIZE, end // CHUNK_SIZE
+        for index in range(first, last + 1):
+            self._read_ahead(index)
+            chunk = await self.get_chunk(index)
+            cut_start = start - index * CHUNK_SIZE if index == first else 0
+            cut_end = end - index * CHUNK_SIZE + 1 if index == last else None
+            yield chunk[cut_start:cut_end]
+
+    def cancel(self):
+        for task in self._inflight.values():
+            task.cancel()
+        self._inflight.clear()
+
+
+class StreamManager:
+    _lock = Lock()
+    _lookups: ClassVar[dict] = {}
+    streamers: ClassVar[OrderedDict] = OrderedDict()
+    max_streamers = 32
+    idle_timeout = 30 * 60
+
+    @classmethod
+    async def get_streamer(cls, chat_id, msg_id):
+        """Return the streamer of a message, one lookup per message at once.
+
+        The lock only guards the streamers, the message itself is fetched
+        outside of it so lookups of different messages run concurrently.
+        """
+        key = (chat_id, msg_id)
+        async with cls._lock:
+            if streamer := cls.streamers.get(key):
+                cls.streamers.move_to_end(key)
+                return streamer
+            if (lookup := cls._lookups.get(key)) is None:
+                lookup = cls._lookups[key] = create_task(cls._lookup(key))
+        return await lookup
+
+    @classmethod
+    async def _lookup(cls, key):
+        try:
+            message = await TgClient.bot.get_messages(*key)
+            if not message or message.empty or not message.media:
+                return None
+            media = getattr(message, message.media.value, None)
+            if not media or not getattr(media, "file_unique_id", None):
+                return None
+            streamer = TgFileStreamer(message, media)
+            async with cls._lock:
+                cls.streamers[key] = streamer
+                while len(cls.streamers) > cls.max_streamers:
+                    _, old = cls.streamers.popitem(last=False)
+                    old.cancel()
+            return streamer
+        finally:
+            cls._lookups.pop(key, None)
+
+    @classmethod
+    async def clean_idle(cls):
+        while True:
+            await sleep(5 * 60)
+            now = time()
+            async with cls._lock:
+                for key in [
+                    k
+                    for k, s in cls.streamers.items()
+                    if now - s.last_access > cls.idle_timeout
+                ]:
+                    cls.streamers.pop(key).cancel()
+
+
+def get_stream_link(chat_id, msg_id, file_unique_id):
+    if not Config.BASE_URL or not Config.STREAM_ENABLED:
+        return ""
+    return f"{Config.BASE_URL}/stream/{chat_id}/{msg_id}?hash={file_unique_id[:6]}"
+
+
+def parse_range(range_header, file_size):
+    """Return an inclusive (start, end) tuple or None if unsatisfiable."""
+    if not range_header or not range_header.startswith("bytes="):
+        return 0, file_size - 1
+    first_range = range_header[6:].split(",", 1)[0].strip()
+    start_str, _, end_str = first_range.partition("-")
+    try:
+        if not start_str:
+            suffix = int(end_str)
+            if suffix <= 0:
+                return None
+            start, end = max(file_size - suffix, 0), file_size - 1
+        else:
+            start = int(start_str)
+            end = int(end_str) if end_str else file_size - 1
+    except ValueError:
+        return None
+    end = min(end, file_size - 1)
+    if start > end or start >= file_size:
+        return None
+    return start, end
+
+
+async def stream_handler(request):
+    chat = request.match_info["chat"]
+    chat_id = int(chat) if chat.lstrip("-").isdigit() else chat
+    try:
+        msg_id = int(request.match_info["msg"])
+    except ValueError:
+        raise web.HTTPBadRequest(text="Invalid message id") from None
+
+    try:
+        streamer = await StreamManager.get_streamer(chat_id, msg_id)
+    except Exception as e:
+        LOGGER.error(f"Stream lookup failed for {chat_id}/{msg_id}: {e}")
+        raise web.HTTPNotFound(text="Message not accessible") from e
+    if streamer is None or not streamer.file_size:
+        raise web.HTTPNotFound(text="No streamable media in message")
+    if request.query.get("hash") != streamer.file_unique_id[:6]:
+        raise web.HTTPForbidden(text="Invalid hash")
+
+    byte_range = parse_range(request.headers.get("Range"), streamer.file_size)
+    if byte_range is None:
+        raise web.HTTPRequestRangeNotSatisfiable(
+            headers={"Content-Range": f"bytes */{streamer.file_size}"},
+        )
+    start, end = byte_range
+    partial = request.headers.get("Range", "").startswith("bytes=")
+
+    response = web.StreamResponse(
+        status=206 if partial else 200,
+        headers={
+            "Content-Type": streamer.mime_type,
+            "Content-Length": str(end - start + 1),
+            "Accept-Ranges": "bytes",
+            "Content-Disposition": f"inline; filename*=UTF-8''{quote(streamer.file_name)}",
+        },
+    )
+    if partial:
+        response.headers["Content-Range"] = (
+            f"bytes {start}-{end}/{streamer.file_size}"
+        )
+    await response.prepare(request)
+    if request.method == "HEAD":
+        return response
+    try:
+        async for data in streamer.iter_range(start, end):
+            await response.write(data)
+    except ConnectionResetError:
+        pass
+    except CancelledError:
+        # The viewer went away, the prefetched chunks stay in the cache
+        raise
+    except Exception as e:
+        LOGGER.error(f"Stream error for {chat_id}/{msg_id}: {e}")
+    return response
+
+
+async def stream_server_booter():
+    await stop_stream_server()
+
+    if not Config.STREAM_ENABLED:
+        LOGGER.info("Stream server is disabled (STREAM_ENABLED is False)")
+        return
+
+    chunk_cache.max_bytes = Config.STREAM_CACHE_SIZE * 1024 * 1024
+    stream_app = web.Application()
+    stream_app.router.add_route("GET", "/stream/{chat}/{msg}", stream_handler)
+    stream_app.router.add_route("HEAD", "/stream/{chat}/{msg}", stream_handler)
+    runner = web.AppRunner(stream_app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, STREAM_SERVER_HOST, STREAM_SERVER_PORT).start()
+    StreamServer.extend((runner, create_task(StreamManager.clean_idle())))
+    LOGGER.info(
+        f"Stream server started on {STREAM_SERVER_HOST}:{STREAM_SERVER_PORT}"
+    )
+
+
+async def stop_stream_server():
+    if not StreamServer:
+        return
+    runner, clean_task = StreamServer
+    clean_task.cancel()
+    async with StreamManager._lock:
+        for streamer in StreamManager.streamers.values():
+            streamer.cancel()
+        StreamManager.streamers.clear()
+    await gather(runner.cleanup(), return_exceptions=True)
+    StreamServer.clear()
+    chunk_cache.clear()
@@ -0,0 +1,227 @@
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from logging import getLogger
+from time import monotonic, time
+
+import psutil
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+LOGGER = getLogger(__name__)
+
+FFMPEG_NAMES = ("xtra", "ffmpeg")
+WINDOW_SIZE = 30  # samples kept for the rolling averages
+
+
+@dataclass(frozen=True, slots=True)
+class FfmpegUsage:
+    pid: int
+    cpu_percent: float
+    rss: int
+
+
+@dataclass(frozen=True, slots=True)
+class SystemSnapshot:
+    """Immutable view of the host published by the sampler thread."""
+
+    timestamp: float = 0.0
+    cpu_percent: float = 0.0
+    cpu_count: int = 1
+    memory_percent: float = 0.0
+    memory_total: int = 0
+    memory_available: int = 0
+    memory_used: int = 0
+    swap_total: int = 0
+    swap_percent: float = 0.0
+    disks: dict = field(default_factory=dict)
+    net_sent: int = 0
+    net_recv: int = 0
+    net_sent_rate: float = 0.0
+    net_recv_rate: float = 0.0
+    thread_count: int = 0
+    thread_usage_percent: float = 0.0
+    process_rss: int = 0
+    ffmpeg: tuple = ()
+    cpu_window: tuple = ()
+    memory_window: tuple = ()
+
+    @property
+    def cpu_avg(self):
+        if not self.cpu_window:
+            return self.cpu_percent
+        return sum(self.cpu_window) / len(self.cpu_window)
+
+    @property
+    def memory_avg(self):
+        if not self.memory_window:
+            return self.memory_percent
+        return sum(self.memory_window) / len(self.memory_window)
+
+    def disk_free(self, path):
+        if usage := self.disks.get(path):
+            return usage[0]
+        # Path not tracked by the sampler, a single statvfs is cheap
+        try:
+            return psutil.disk_usage(path).free
+        except OSError:
+            return 0
+
+
+_snapshot = SystemSnapshot()
+
+
+def get_snapshot():
+    """Return the latest snapshot without blocking or locking.
+
+    The sampler replaces the module-level reference atomically, so readers
+    always see a complete snapshot.
+    """
+    return _snapshot
+
+
+class SystemSampler(threading.Thread):
+    def __init__(self, interval, disk_paths):
+        super().__init__(name="system-sampler", daemon=True)
+        self.interval = interval
+        self.disk_paths = tuple(dict.fromkeys(disk_paths))
+        self._stop_event = threading.Event()
+        self._process = psutil.Process()
+        self._ffmpeg_procs = {}
+        self._cpu_window = deque(maxlen=WINDOW_SIZE)
+        self._memory_window = deque(maxlen=WINDOW_SIZE)
+        self._last_net = None
+        self._thread_limit = self._get_thread_limit()
+
+    @staticmethod
+    def _get_thread_limit():
+        try:
+            if resource:
+                _, hard_limit = resource.getrlimit(resource.RLIMIT_NPROC)
+                if hard_limit != resource.RLIM_INFINITY:
+                    return hard_limit
+                return (os.cpu_count() or 1) * 100
+        except (AttributeError, OSError):
+            pass
+        return 1000
+
+    def _sample_ffmpeg(self):
+        usage = []
+        seen = set()
+        try:
+            children = self._process.children(recursive=True)
+        except psutil.Error:
+            children = []
+        for child in children:
+            try:
+                if child.name() not in FFMPEG_NAMES:
+                    continue
+                proc = self._ffmpeg_procs.setdefault(child.pid, child)
+                seen.add(child.pid)
+                usage.append(
+                    FfmpegUsage(
+                        child.pid,
+                        proc.cpu_percent(interval=None),
+                        proc.memory_info().rss,
+                    )
+                )
+            except psutil.Error:
+                continue
+        for pid in set(self._ffmpeg_procs) - seen:
+            del self._ffmpeg_procs[pid]
+        return tuple(usage)
+
+    def _sample_disks(self):
+        disks = {}
+        for path in self.disk_paths:
+            try:
+                usage = psutil.disk_usage(path)
+                disks[path] = (usage.free, usage.total, usage.percent)
+            except OSError:
+                continue
+        return disks
+
+    def sample(self):
+        global _snapshot  # noqa: PLW0603
+        now = monotonic()
+        cpu = psutil.cpu_percent(interval=None)
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        net = psutil.net_io_counters()
+        sent_rate = recv_rate = 0.0
+        if self._last_net is not None:
+            last_time, last_sent, last_recv = self._last_net
+            elapsed = max(now - last_time, 1e-6)
+            sent_rate = max(net.bytes_sent - last_sent, 0) / elapsed
+            recv_rate = max(net.bytes_recv - last_recv, 0) / elapsed
+        self._last_net = (now, net.bytes_sent, net.bytes_recv)
+        self._cpu_window.append(cpu)
+        self._memory_window.append(memory.percent)
+        thread_count = threading.active_count()
+        try:
+            process_rss = self._process.memory_info().rss
+        except psutil.Error:
+            process_rss = 0
+
+        _snapshot = SystemSnapshot(
+            timestamp=time(),
+            cpu_percent=cpu,
+            cpu_count=psutil.cpu_count() or 1,
+            memory_percent=memory.percent,
+            memory_total=memory.total,
+            memory_available=memory.available,
+            memory_used=memory.used,
+            swap_total=swap.total,
+            swap_percent=swap.percent,
+            disks=self._sample_disks(),
+            net_sent=net.bytes_sent,
+            net_recv=net.bytes_recv,
+            net_sent_rate=sent_rate,
+            net_recv_rate=recv_rate,
+            thread_count=thread_count,
+            thread_usage_percent=thread_count / self._thread_limit * 100,
+            process_rss=process_rss,
+            ffmpeg=self._sample_ffmpeg(),
+            cpu_window=tuple(self._cpu_window),
+            memory_window=tuple(self._memory_window),
+        )
+
+    def run(self):
+        # Prime the non-blocking cpu_percent counters
+        psutil.cpu_percent(interval=None)
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                LOGGER.error(f"System sampler error: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_sampler = None
+
+
+def is_sampler_running():
+    return _sampler is not None and _sampler.is_alive()
+
+
+def start_sampler(interval=2, disk_paths=("/",)):
+    global _sampler  # noqa: PLW0603
+    if is_sampler_running():
+        return
+    _sampler = SystemSampler(interval, disk_paths)
+    _sampler.sample()
+    _sampler.start()
+    LOGGER.info("System metrics sampler started")
+
+
+def stop_sampler():
+    global _sampler  # noqa: PLW0603
+    if _sampler is not None:
+        _sampler.stop()
+        _sampler = None
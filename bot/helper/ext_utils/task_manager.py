@@ -1,4 +1,5 @@
 from asyncio import Event
+from time import monotonic
 
 from bot import (
     LOGGER,
@@ -14,6 +15,8 @@ from bot.helper.mirror_leech_utils.gdrive_utils.search import GoogleDriveSearch
 from .bot_utils import get_telegraph_list, sync_to_async
 from .files_utils import get_base_name
 from .links_utils import is_gdrive_id
+from .metrics import Metrics
+from .system_metrics import get_snapshot
 
 
 async def stop_duplicate_check(listener):
@@ -61,44 +64,50 @@ async def stop_duplicate_check(listener):
     return False, None
 
 
+def _queue_event():
+    event = Event()
+    event.queued_at = monotonic()
+    return event
+
+
 async def check_running_tasks(listener, state="dl"):
+    if state == "up" and listener.mid in non_queued_up:
+        # Took its upload slot while downloading, see take_upload_slot
+        async with queue_dict_lock:
+            if listener.mid in non_queued_dl:
+                non_queued_dl.remove(listener.mid)
+        return False, None
     all_limit = Config.QUEUE_ALL
     state_limit = Config.QUEUE_DOWNLOAD if state == "dl" else Config.QUEUE_UPLOAD
     event = None
     is_over_limit = False
 
     # Check system resources before allowing new tasks
-    try:
-        import psutil
-
-        memory_percent = psutil.virtual_memory().percent
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-
-        # If system resources are critically low, force queue regardless of limits
-        resource_critical = memory_percent > 90 or cpu_percent > 95
-
-        if resource_critical:
-            LOGGER.warning(
-                f"System resources critical: Memory {memory_percent}%, CPU {cpu_percent}%. "
-                f"Forcing task {listener.mid} to queue."
-            )
-            # Force garbage collection to try to free up resources
-            from bot.helper.ext_utils.gc_utils import smart_garbage_collection
+    # Uses the sampler snapshot, so this never blocks the event loop
+    snapshot = get_snapshot()
+    memory_percent = snapshot.memory_percent
+    cpu_percent = snapshot.cpu_percent
+
+    # If system resources are critically low, force queue regardless of limits
+    if memory_percent > 90 or cpu_percent > 95:
+        LOGGER.warning(
+            f"System resources critical: Memory {memory_percent}%, CPU {cpu_percent}%. "
+            f"Forcing task {listener.mid} to queue."
+        )
+        # Force garbage collection to try to free up resources
+        from bot.helper.ext_utils.gc_utils import smart_garbage_collection
 
-            smart_garbage_collection(aggressive=True)
+        smart_garbage_collection(aggressive=True)
 
-            # Create event for queuing
-            event = Event()
-            async with queue_dict_lock:
-                if state == "dl":
-                    queued_dl[listener.mid] = event
-                else:
-                    queued_up[listener.mid] = event
+        # Create event for queuing
+        event = _queue_event()
+        async with queue_dict_lock:
+            if state == "dl":
+                queued_dl[listener.mid] = event
+            else:
+                queued_up[listener.mid] = event
 
-            return True, event
-    except ImportError:
-        # If psutil is not available, continue with normal limit checks
-        pass
+        return True, event
 
     async with queue_dict_lock:
         if state == "up" and listener.mid in non_queued_dl:
@@ -118,7 +127,7 @@ async def check_running_tasks(listener, state="dl"):
                 and (not state_limit or t_count >= state_limit)
             ) or (state_limit and t_count >= state_limit)
             if is_over_limit:
-                event = Event()
+                event = _queue_event()
                 if state == "dl":
                     queued_dl[listener.mid] = event
                 else:
@@ -132,13 +141,49 @@ async def check_running_tasks(listener, state="dl"):
     return is_over_limit, event
 
 
+async def take_upload_slot(listener):
+    """Take an upload slot for a task that is still downloading.
+
+    Returns False without queueing when the upload limits are reached, the
+    task keeps its download slot until check_running_tasks moves it over.
+    """
+    all_limit = Config.QUEUE_ALL
+    up_limit = Config.QUEUE_UPLOAD
+    async with queue_dict_lock:
+        if listener.mid in non_queued_up:
+            return True
+        if (
+            (all_limit or up_limit)
+            and not listener.force_run
+            and not listener.force_upload
+        ):
+            dl_count = len(non_queued_dl - {listener.mid})
+            up_count = len(non_queued_up)
+            if (
+                all_limit
+                and dl_count + up_count >= all_limit
+                and (not up_limit or up_count >= up_limit)
+            ) or (up_limit and up_count >= up_limit):
+                return False
+        non_queued_up.add(listener.mid)
+    return True
+
+
+def _record_wait(event, state):
+    # Events queued by the task monitor carry no timestamp
+    if (queued_at := getattr(event, "queued_at", None)) is not None:
+        Metrics.observe("queue_wait_seconds", monotonic() - queued_at, state=state)
+
+
 async def start_dl_from_queued(mid: int):
+    _record_wait(queued_dl[mid], "dl")
     queued_dl[mid].set()
     del queued_dl[mid]
     non_queued_dl.add(mid)
 
 
 async def start_up_from_queued(mid: int):
+    _record_wait(queued_up[mid], "up")
     queued_up[mid].set()
     del queued_up[mid]
     non_queued_up.add(mid)
@@ -146,29 +191,24 @@ async def start_up_from_queued(mid: int):
 
 async def start_from_queued():
     # Check system resources before starting queued tasks
-    try:
-        import psutil
-
-        memory_percent = psutil.virtual_memory().percent
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-
-        # If system resources are critically low, don't start new tasks
-        if memory_percent > 85 or cpu_percent > 90:
-            LOGGER.warning(
-                f"System resources too high to start queued tasks: Memory {memory_percent}%, CPU {cpu_percent}%. "
-                f"Will try again later."
-            )
-            # Force garbage collection to try to free up resources
-            from bot.helper.ext_utils.gc_utils import smart_garbage_collection
-
-            smart_garbage_collection(aggressive=True)
-            return
-
-        # If resources are moderately high, start fewer tasks
-        resource_constraint = memory_percent > 75 or cpu_percent > 80
-    except ImportError:
-        # If psutil is not available, assume no resource constraints
-        resource_constraint = False
+    snapshot = get_snapshot()
+    memory_percent = snapshot.memory_percent
+    cpu_percent = snapshot.cpu_percent
+
+    # If system resources are critically low, don't start new tasks
+    if memory_percent > 85 or cpu_percent > 90:
+        LOGGER.warning(
+            f"System resources too high to start queued tasks: Memory {memory_percent}%, CPU {cpu_percent}%. "
+            f"Will try again later."
+        )
+        # Force garbage collection to try to free up resources
+        from bot.helper.ext_utils.gc_utils import smart_garbage_collection
+
+        smart_garbage_collection(aggressive=True)
+        return
+
+    # If resources are moderately high, start fewer tasks
+    resource_constraint = memory_percent > 75 or cpu_percent > 80
 
     if all_limit := Config.QUEUE_ALL:
         dl_limit = Config.QUEUE_DOWNLOAD
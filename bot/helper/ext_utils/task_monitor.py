@@ -4,14 +4,6 @@ import time
 from asyncio import create_task
 from collections import defaultdict, deque
 
-try:
-    import psutil
-except ImportError:
-    import pip
-
-    pip.main(["install", "psutil"])
-    import psutil
-
 # Resource manager removed
 from bot import (
     LOGGER,
@@ -33,6 +25,7 @@ from bot.helper.ext_utils.status_utils import (
     MirrorStatus,
     speed_string_to_bytes,
 )
+from bot.helper.ext_utils.system_metrics import get_snapshot
 from bot.helper.telegram_helper.message_utils import (
     auto_delete_message,
     send_message,
@@ -739,10 +732,11 @@ async def monitor_tasks():
                 + f"Monitor queued={len(queued_by_monitor)}"
             )
 
-        # Update system resource usage history
+        # Update system resource usage history from the sampler snapshot
         try:
-            cpu_usage_history.append(psutil.cpu_percent())
-            memory_usage_history.append(psutil.virtual_memory().percent)
+            snapshot = get_snapshot()
+            cpu_usage_history.append(snapshot.cpu_percent)
+            memory_usage_history.append(snapshot.memory_percent)
 
             # Check thread usage
             high_thread_usage = monitor_thread_usage()
@@ -1,9 +1,12 @@
-from asyncio import create_task, sleep
+import contextlib
+from asyncio import Semaphore, create_task, gather, sleep
+from time import time
 
 from aiohttp.client_exceptions import ClientError
 
 from bot import LOGGER
 from bot.core.torrent_manager import TorrentManager, aria2_name
+from bot.helper.ext_utils.host_profiles import HostProfiles
 from bot.helper.telegram_helper.message_utils import (
     auto_delete_message,
     send_message,
@@ -11,83 +14,137 @@ from bot.helper.telegram_helper.message_utils import (
 
 
 class DirectListener:
+    """Downloads the files of a direct link listing through aria2.
+
+    Up to HostProfiles.file_workers files run at once, each with the
+    connections and piece size of its host's profile. Their throughput is
+    fed back to the profiles once a file or the listing completes. A file
+    that raises is removed from aria2 and counts as failed, the others
+    carry on.
+    """
+
     def __init__(self, path, listener, a2c_opt):
         self.listener = listener
         self._path = path
         self._a2c_opt = a2c_opt
         self._proc_bytes = 0
         self._failed = 0
-        self.download_task = None
+        self._tasks = {}
         self.name = self.listener.name
 
+    @property
+    def download_task(self):
+        """The first running file, the status is queued while it waits."""
+        return next(iter(self._tasks.values()), None)
+
     @property
     def processed_bytes(self):
-        if self.download_task:
-            return self._proc_bytes + int(
-                self.download_task.get("completedLength", "0"),
-            )
-        return self._proc_bytes
+        return self._proc_bytes + sum(
+            int(task.get("completedLength", "0")) for task in self._tasks.values()
+        )
 
     @property
     def speed(self):
-        return (
-            int(self.download_task.get("downloadSpeed", "0"))
-            if self.download_task
-            else 0
+        return sum(
+            int(task.get("downloadSpeed", "0")) for task in self._tasks.values()
         )
 
     async def download(self, contents):
         self.is_downloading = True
-        for content in contents:
+        url = contents[0]["url"]
+        workers = await HostProfiles.file_workers(url)
+        slots = Semaphore(workers)
+        start_time = time()
+        results = await gather(
+            *(self._download_file(content, slots) for content in contents),
+            return_exceptions=True,
+        )
+        for content, result in zip(contents, results, strict=True):
+            if isinstance(result, Exception):
+                self._failed += 1
+                LOGGER.error(
+                    f"Unable to download {content['filename']} due to: {result}"
+                )
+        if self.listener.is_cancelled:
+            return
+        if self._failed == len(contents):
+            await self.listener.on_download_error(
+                "All files are failed to download!",
+            )
+            return
+        if len(contents) > workers and not self._failed:
+            await HostProfiles.record_listing(
+                url, workers, self._proc_bytes, time() - start_time
+            )
+        await self.listener.on_download_complete()
+        return
+
+    async def _download_file(self, content, slots):
+        async with slots:
             if self.listener.is_cancelled:
-                break
+                return
+            a2c_opt = dict(self._a2c_opt)
             if content["path"]:
-                self._a2c_opt["dir"] = f"{self._path}/{content['path']}"
+                a2c_opt["dir"] = f"{self._path}/{content['path']}"
             else:
-                self._a2c_opt["dir"] = self._path
+                a2c_opt["dir"] = self._path
             filename = content["filename"]
-            self._a2c_opt["out"] = filename
+            a2c_opt["out"] = filename
+            connections = await HostProfiles.connections(content["url"])
+            a2c_opt.update(
+                await HostProfiles.aria2_options(
+                    content["url"], content.get("size", 0)
+                )
+            )
             try:
                 gid = await TorrentManager.aria2.addUri(
                     uris=[content["url"]],
-                    options=self._a2c_opt,
+                    options=a2c_opt,
                     position=0,
                 )
             except (TimeoutError, ClientError, Exception) as e:
                 self._failed += 1
                 LOGGER.error(f"Unable to download {filename} due to: {e}")
-                continue
-            self.download_task = await TorrentManager.aria2.tellStatus(gid)
-            while True:
-                if self.listener.is_cancelled:
-                    if self.download_task:
-                        await TorrentManager.aria2_remove(self.download_task)
-                    break
-                self.download_task = await TorrentManager.aria2.tellStatus(gid)
-                if error_message := self.download_task.get("errorMessage"):
-                    self._failed += 1
-                    LOGGER.error(
-                        f"Unable to download {aria2_name(self.download_task)} due to: {error_message}",
-                    )
-                    await TorrentManager.aria2_remove(self.download_task)
-                    break
-                if self.download_task.get("status", "") == "complete":
-                    self._proc_bytes += int(
-                        self.download_task.get("totalLength", "0"),
-                    )
-                    await TorrentManager.aria2_remove(self.download_task)
-                    break
-                await sleep(1)
-            self.download_task = None
-        if self.listener.is_cancelled:
-            return
-        if self._failed == len(contents):
-            await self.listener.on_download_error(
-                "All files are failed to download!",
-            )
-            return
-        await self.listener.on_download_complete()
-        return
+                return
+            self._tasks[gid] = await TorrentManager.aria2.tellStatus(gid)
+            start_time = None
+            try:
+                while True:
+                    if self.listener.is_cancelled:
+                        await TorrentManager.aria2_remove(self._tasks[gid])
+                        break
+                    task = await TorrentManager.aria2.tellStatus(gid)
+                    self._tasks[gid] = task
+                    if error_message := task.get("errorMessage"):
+                        self._failed += 1
+                        LOGGER.error(
+                            f"Unable to download {aria2_name(task)} due to: {error_message}",
+                        )
+                        await TorrentManager.aria2_remove(task)
+                        break
+                    status = task.get("status", "")
+                    if status == "complete":
+                        size = int(task.get("totalLength", "0"))
+                        self._proc_bytes += size
+                        await TorrentManager.aria2_remove(task)
+                        if start_time is not None:
+                            await HostProfiles.record_file(
+                                content["url"],
+                                connections,
+                                size,
+                                time() - start_time,
+                            )
+                        break
+                    if start_time is None and status == "active":
+                        start_time = time()
+                    await sleep(1)
+            except Exception:
+                # Don't leave the file running in aria2 once it's given up
+                with contextlib.suppress(Exception):
+                    await TorrentManager.aria2_remove(self._tasks[gid])
+                raise
+            finally:
+                del self._tasks[gid]
 
     async def cancel_task(self):
         self.listener.is_cancelled = True
@@ -102,5 +159,5 @@ class DirectListener:
                 f"{self.listener.tag} Download Cancelled by User!",
             )
             create_task(auto_delete_message(error_msg, time=300))  # noqa: RUF006
-        if self.download_task:
-            await TorrentManager.aria2_remove(self.download_task)
+        for task in list(self._tasks.values()):
+            await TorrentManager.aria2_remove(task)
@@ -0,0 +1,153 @@
+import contextlib
+import os
+from asyncio import Event, create_task, current_task, gather, wait_for
+from os import path as ospath
+
+from bot import LOGGER
+from bot.core.config_manager import Config
+from bot.helper.ext_utils.aiofiles_compat import aiopath, makedirs, remove
+from bot.helper.ext_utils.bot_utils import sync_to_async
+from bot.helper.ext_utils.files_utils import clean_download
+from bot.helper.ext_utils.split_pipeline import SplitPipeline
+from bot.helper.ext_utils.task_manager import take_upload_slot
+from bot.helper.mirror_leech_utils.telegram_uploader import TelegramUploader
+
+POLL_INTERVAL = 5  # seconds between file progress checks
+STAGING_SUFFIX = "_incremental"
+
+
+class IncrementalLeech:
+    """Uploads the files of a torrent while the rest is still downloading.
+
+    Only used for qBittorrent, which downloads in sequential order, aria2
+    completes the files of a torrent in no particular order.
+
+    `list_files` returns the torrent's files in torrent order as (path,
+    size, complete, wanted) tuples. Once every wanted file before it is
+    complete, a file is hard linked into a staging folder next to the
+    download folder and handed to a TelegramUploader started on the first
+    one, the torrent keeps its own copy to seed from and verify against.
+    The uploader only starts once the task got an upload slot, which it
+    keeps for the regular upload after the download.
+    Files that would need splitting are left to the regular steps, which
+    run on the rest of the tree once the download completes and feed the
+    same uploader.
+    """
+
+    def __init__(self, listener, list_files):
+        self._listener = listener
+        self._list_files = list_files
+        self._stop = Event()
+        self._next = 0
+        self._task = None
+        self.staging = f"{listener.dir}{STAGING_SUFFIX}"
+        self.pipeline = None
+        self.uploader = None
+        self.upload_task = None
+        self.handed = []
+        self.handed_bytes = 0
+
+    @classmethod
+    def start(cls, listener, list_files):
+        if listener.incremental_leech is not None:
+            return
+        if not listener.leeches_incrementally():
+            return
+        listener.incremental_leech = leech = cls(listener, list_files)
+        leech._task = create_task(leech._watch())
+
+    async def _watch(self):
+        while not self._stop.is_set() and not self._listener.is_cancelled:
+            with contextlib.suppress(TimeoutError):
+                await wait_for(self._stop.wait(), POLL_INTERVAL)
+            if self._stop.is_set() or self._listener.is_cancelled:
+                break
+            try:
+                files = await self._list_files()
+            except Exception as e:
+                LOGGER.error(f"Incremental leech: {e}")
+                continue
+            if len(files) < 2:
+                # Nothing to gain on single file torrents
+                return
+            await self._hand_over_ready(files)
+        if self._listener.is_cancelled:
+            await self.stop()
+
+    async def _hand_over_ready(self, files):
+        while self._next < len(files) and not self._stop.is_set():
+            path, size, complete, wanted = files[self._next]
+            if wanted and not complete:
+                return
+            if not wanted or not await self._qualifies(path, size):
+                self._next += 1
+                continue
+            if self.uploader is None and not await take_upload_slot(self._listener):
+                # Tried again on the next poll, QUEUE_UPLOAD applies here too
+                return
+            self._next += 1
+            await self._hand_over(path, size)
+
+    async def _qualifies(self, path, size):
+        listener = self._listener
+        if not 0 < size <= listener.split_size:
+            return False
+        if path.strip().lower().endswith(tuple(listener.excluded_extensions)):
+            return False
+        return await aiopath.isfile(path)
+
+    async def _hand_over(self, path, size):
+        rel_path = await sync_to_async(ospath.relpath, path, self._listener.dir)
+        if rel_path.startswith(".."):
+            return
+        up_dir, name = ospath.split(ospath.join(self.staging, rel_path))
+        link = ospath.join(up_dir, self._listener.clean_www_prefix(name))
+        try:
+            await makedirs(up_dir, exist_ok=True)
+            await sync_to_async(os.link, path, link)
+        except OSError as e:
+            # Left for the regular upload after the download
+            LOGGER.error(f"Incremental leech can't link {path}: {e}")
+            return
+        if self.uploader is None:
+            self.pipeline = SplitPipeline(Config.LEECH_SPLIT_PIPELINE_DEPTH)
+            self.uploader = TelegramUploader(
+                self._listener,
+                self._listener.dir,
+                self.pipeline,
+            )
+            self._listener.telegram_uploader = self.uploader
+            self.upload_task = create_task(self.uploader.upload())
+            LOGGER.info(f"Incremental leech started: {self._listener.name}")
+        self.handed.append(path)
+        self.handed_bytes += size
+        await self.pipeline.hand_over(link)
+
+    async def finish(self):
+        """Stop watching once the download completed.
+
+        The originals of the handed over files are removed so the regular
+        steps only see the rest. Returns the uploader's pipeline, None when
+        no file was handed over.
+        """
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+        for path in self.handed:
+            with contextlib.suppress(Exception):
+                await remove(path)
+        return self.pipeline
+
+    async def stop(self):
+        """Give up on a failed or cancelled task."""
+        self._stop.set()
+        if self.uploader is not None:
+            # The uploader must not complete a task that failed
+            self._listener.is_cancelled = True
+            self.pipeline.close()
+        task = self.upload_task
+        if task is not None and task is not current_task():
+            # Staged files may still be open for upload
+            task.cancel()
+            await gather(task, return_exceptions=True)
+        await clean_download(self.staging)
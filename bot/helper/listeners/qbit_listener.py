@@ -1,5 +1,6 @@
 import contextlib
 from asyncio import create_task, sleep
+from os import path as ospath
 from time import time
 
 from aiohttp.client_exceptions import ClientError
@@ -20,6 +21,7 @@ from bot.helper.ext_utils.bot_utils import new_task
 from bot.helper.ext_utils.files_utils import clean_unwanted
 from bot.helper.ext_utils.status_utils import get_readable_time, get_task_by_gid
 from bot.helper.ext_utils.task_manager import stop_duplicate_check
+from bot.helper.listeners.incremental_leech import IncrementalLeech
 from bot.helper.mirror_leech_utils.status_utils.qbit_status import QbittorrentStatus
 from bot.helper.telegram_helper.message_utils import (
     auto_delete_message,
@@ -86,6 +88,21 @@ async def _stop_duplicate(tor):
             await _on_download_error(msg, tor, button)
 
 
+@new_task
+async def _start_incremental_leech(tor):
+    ext_hash, save_path = tor.hash, tor.save_path
+    if task := await get_task_by_gid(str(ext_hash)[:12]):
+
+        async def list_files():
+            files = await TorrentManager.qbittorrent.torrents.files(ext_hash)
+            return [
+                (ospath.join(save_path, f.name), f.size, f.progress >= 1, f.priority)
+                for f in files
+            ]
+
+        IncrementalLeech.start(task.listener, list_files)
+
+
 @new_task
 async def _on_download_complete(tor):
     ext_hash = tor.hash
@@ -177,6 +194,7 @@ async def _qb_listener():
                         if not qb_torrents[tag]["stop_dup_check"]:
                             qb_torrents[tag]["stop_dup_check"] = True
                             await _stop_duplicate(tor_info)
+                            await _start_incremental_leech(tor_info)
                     elif state == "stalledDL":
                         if (
                             not qb_torrents[tag]["rechecked"]
@@ -24,8 +24,10 @@ from bot.core.torrent_manager import TorrentManager
 from bot.helper.common import TaskConfig
 from bot.helper.ext_utils.aiofiles_compat import aiopath, listdir, makedirs, remove
 from bot.helper.ext_utils.bot_utils import encode_slink, sync_to_async
+from bot.helper.ext_utils.content_index import ContentIndex
 from bot.helper.ext_utils.db_handler import database
 from bot.helper.ext_utils.files_utils import (
+    StreamZip,
     clean_download,
     clean_target,
     create_recursive_symlink,
@@ -34,6 +36,8 @@ from bot.helper.ext_utils.files_utils import (
     remove_excluded_files,
 )
 from bot.helper.ext_utils.links_utils import is_gdrive_id, is_rclone_path
+from bot.helper.ext_utils.metrics import record_transfer
+from bot.helper.ext_utils.split_pipeline import SplitPipeline
 from bot.helper.ext_utils.status_utils import get_readable_file_size
 from bot.helper.ext_utils.task_manager import check_running_tasks, start_from_queued
 from bot.helper.mirror_leech_utils.gdrive_utils.upload import GoogleDriveUpload
@@ -55,6 +59,23 @@ from bot.helper.telegram_helper.message_utils import (
     update_status_message,
 )
 
+METADATA_ATTRS = (
+    "metadata",
+    "metadata_title",
+    "metadata_author",
+    "metadata_comment",
+    "metadata_all",
+    "metadata_video_title",
+    "metadata_video_author",
+    "metadata_video_comment",
+    "metadata_audio_title",
+    "metadata_audio_author",
+    "metadata_audio_comment",
+    "metadata_subtitle_title",
+    "metadata_subtitle_author",
+    "metadata_subtitle_comment",
+)
+
 
 class TaskListener(TaskConfig):
     def __init__(self):
@@ -77,6 +98,144 @@ class TaskListener(TaskConfig):
         self.proceed_count = 0
         self.progress = True
 
+    def _processes_files(self):
+        """Whether a step between extraction and split rewrites the files."""
+        return bool(
+            any(getattr(self, attr) for attr in METADATA_ATTRS)
+            or self.ffmpeg_cmds
+            or self.name_sub
+            or self.screen_shots
+            or self.convert_audio
+            or self.convert_video
+            or self.sample_video
+            or self.compress
+        )
+
+    def _streams_extraction(self):
+        """Whether extracted files can go to the uploader as they appear.
+
+        Only leech tasks whose files are not processed between extraction
+        and split qualify, every other step works on the whole tree.
+        """
+        return (
+            Config.STREAMING_EXTRACT
+            and self.is_leech
+            and not self._processes_files()
+        )
+
+    def leeches_incrementally(self):
+        """Whether torrent files can be uploaded as each one completes.
+
+        Files go to the uploader untouched, so tasks with any step working
+        on the downloaded tree, and seeding ones, wait for the download.
+        """
+        return bool(
+            Config.INCREMENTAL_LEECH
+            and self.is_leech
+            and not self.seed
+            and not self.extract
+            and not self.join
+            and not self.folder_name
+            and not self._processes_files()
+            and not self._media_tools()
+        )
+
+    def indexes_content(self):
+        """Whether the task's result can be indexed by what it downloads.
+
+        The downloaded files must be uploaded untouched, see ContentIndex.
+        """
+        return bool(
+            not self.extract
+            and not self.compress
+            and not self.join
+            and not self.select
+            and not self.folder_name
+            and not self._processes_files()
+            and not self._media_tools()
+        )
+
+    def _streams_zip(self):
+        """Whether the -z archive can be written while it is uploaded.
+
+        Only password-less leech tasks whose files are not handed over
+        already qualify, encrypted archives and mirrors go through 7z.
+        """
+        return bool(
+            Config.STREAMING_ZIP
+            and self.is_leech
+            and not (isinstance(self.compress, str) and self.compress)
+            and self.split_pipeline is None
+        )
+
+    def _media_tools(self):
+        """(priority, name, step) of the enabled media tools, in run order."""
+        media_tools = []
+
+        if self.merge_enabled:
+            media_tools.append((self.merge_priority, "merge", self.proceed_merge))
+
+        # Check if watermark is enabled AND watermark text is available
+        if self.watermark_enabled and self.watermark:
+            media_tools.append(
+                (self.watermark_priority, "watermark", self.proceed_watermark)
+            )
+
+        # Check if trim is enabled or trim parameters are provided
+        if self.trim_enabled or self.trim:
+            media_tools.append((self.trim_priority, "trim", self.proceed_trim))
+
+        # Check if compression is enabled
+        if self.compression_enabled:
+            media_tools.append(
+                (self.compression_priority, "compression", self.proceed_compress)
+            )
+
+        # Check if extract is enabled
+        if self.extract_enabled:
+            media_tools.append(
+                (self.extract_priority, "extract", self.proceed_extract_tracks)
+            )
+
+        # Check if add is enabled
+        if self.add_enabled:
+            media_tools.append((self.add_priority, "add", self.proceed_add))
+
+        # Sort media tools by priority (lower number = higher priority)
+        media_tools.sort(key=lambda x: x[0])
+        return media_tools
+
+    async def _stream_extract(self, up_path, gid):
+        """Extract, then split, feeding the upload pipeline throughout."""
+        up_dir = self.up_dir or self.dir
+        up_path = await self.proceed_extract(up_path, gid)
+        if self.is_cancelled:
+            return
+        if up_path is None:
+            self.is_cancelled = True
+            await self.on_upload_error(
+                "Extraction failed after some of its files were uploaded"
+            )
+            return
+        self.is_file = await aiopath.isfile(up_path)
+        self.name = up_path.replace(f"{up_dir}/", "").split("/", 1)[0]
+        self.clear()
+        await remove_excluded_files(up_dir, self.excluded_extensions)
+        up_path = await self.remove_www_prefix(up_path)
+        self.is_file = await aiopath.isfile(up_path)
+        self.name = up_path.replace(f"{up_dir}/", "").split("/", 1)[0]
+        await self.proceed_split(up_path, gid)
+
+    async def _stream_zip(self, dl_path, up_path):
+        """Zip into volumes, each handed to the upload pipeline once written."""
+        try:
+            if await StreamZip(self).zip(dl_path, up_path):
+                self.is_file = await aiopath.isfile(up_path)
+        except OSError as e:
+            LOGGER.error(f"{e}. Unable to zip this path: {dl_path}")
+            self.is_cancelled = True
+            await self.on_upload_error(f"Zip failed: {e}")
+
     async def remove_from_same_dir(self):
         async with task_dict_lock:
             if (
@@ -249,6 +408,7 @@ class TaskListener(TaskConfig):
 
         dl_path = f"{self.dir}/{self.name}"
         self.size = await get_path_size(dl_path)
+        record_transfer(self, "download")
         self.is_file = await aiopath.isfile(dl_path)
         if self.seed:
             up_dir = self.up_dir = f"{self.dir}10000"
@@ -271,53 +431,35 @@ class TaskListener(TaskConfig):
         if self.join and not self.is_file:
             await join_files(up_path)
 
+        if self.incremental_leech is not None:
+            # Files uploaded while downloading are dropped from the tree,
+            # the uploader already running takes the rest
+            self.split_pipeline = await self.incremental_leech.finish()
+
         # Check if archive flags are enabled in config
         from bot.helper.ext_utils.bot_utils import is_flag_enabled
 
-        if self.extract and not self.is_nzb and is_flag_enabled("-e"):
-            up_path = await self.proceed_extract(up_path, gid)
-            if self.is_cancelled:
-                return
-            self.is_file = await aiopath.isfile(up_path)
-            self.name = up_path.replace(f"{up_dir}/", "").split("/", 1)[0]
-            self.size = await get_path_size(up_dir)
-            self.clear()
-            await remove_excluded_files(up_dir, self.excluded_extensions)
-
         # Determine which media tool to run first based on priority
-        media_tools = []
-
-        if self.merge_enabled:
-            media_tools.append((self.merge_priority, "merge", self.proceed_merge))
-
-        # Check if watermark is enabled AND watermark text is available
-        if self.watermark_enabled and self.watermark:
-            media_tools.append(
-                (self.watermark_priority, "watermark", self.proceed_watermark)
-            )
-
-        # Check if trim is enabled or trim parameters are provided
-        if self.trim_enabled or self.trim:
-            media_tools.append((self.trim_priority, "trim", self.proceed_trim))
-
-        # Check if compression is enabled
-        if self.compression_enabled:
-            media_tools.append(
-                (self.compression_priority, "compression", self.proceed_compress)
-            )
+        media_tools = self._media_tools()
 
-        # Check if extract is enabled
-        if self.extract_enabled:
-            media_tools.append(
-                (self.extract_priority, "extract", self.proceed_extract_tracks)
-            )
-
-        # Check if add is enabled
-        if self.add_enabled:
-            media_tools.append((self.add_priority, "add", self.proceed_add))
-
-        # Sort media tools by priority (lower number = higher priority)
-        media_tools.sort(key=lambda x: x[0])
+        stream_extract = False
+        if self.extract and not self.is_nzb and is_flag_enabled("-e"):
+            if not media_tools and self._streams_extraction():
+                # Extracted files are uploaded while 7z extracts the next
+                # ones, see the leech branch below
+                stream_extract = True
+                self.split_pipeline = SplitPipeline(
+                    Config.LEECH_SPLIT_PIPELINE_DEPTH
+                )
+            else:
+                up_path = await self.proceed_extract(up_path, gid)
+                if self.is_cancelled:
+                    return
+                self.is_file = await aiopath.isfile(up_path)
+                self.name = up_path.replace(f"{up_dir}/", "").split("/", 1)[0]
+                self.size = await get_path_size(up_dir)
+                self.clear()
+                await remove_excluded_files(up_dir, self.excluded_extensions)
 
         # Run media tools in priority order
         for _, tool_name, tool_func in media_tools:
@@ -331,22 +473,7 @@ class TaskListener(TaskConfig):
             self.clear()
 
         # Check if any metadata settings are provided (legacy or new)
-        if (
-            self.metadata
-            or self.metadata_title
-            or self.metadata_author
-            or self.metadata_comment
-            or self.metadata_all
-            or self.metadata_video_title
-            or self.metadata_video_author
-            or self.metadata_video_comment
-            or self.metadata_audio_title
-            or self.metadata_audio_author
-            or self.metadata_audio_comment
-            or self.metadata_subtitle_title
-            or self.metadata_subtitle_author
-            or self.metadata_subtitle_comment
-        ):
+        if any(getattr(self, attr) for attr in METADATA_ATTRS):
             up_path = await self.proceed_metadata(
                 up_path,
                 gid,
@@ -416,27 +543,44 @@ class TaskListener(TaskConfig):
         # Add direct compression handling for -z flag if not already handled by media tools
         # Check if archive flags are enabled in config using is_flag_enabled
 
+        stream_zip = None
         if self.compress and not self.compression_enabled and is_flag_enabled("-z"):
             LOGGER.info(f"Direct compression triggered by -z flag for: {self.name}")
-            up_path = await self.compress_with_7z(up_path, gid)
-            if self.is_cancelled:
-                return
-            self.is_file = await aiopath.isfile(up_path)
-            self.name = up_path.replace(f"{up_dir}/", "").split("/", 1)[0]
-            self.size = await get_path_size(up_dir)
-            self.clear()
+            if self._streams_zip():
+                # The archive is written while uploading, see the leech
+                # branch below
+                stream_zip = up_path
+                up_path = f"{up_path}.zip"
+                self.split_pipeline = SplitPipeline(
+                    Config.LEECH_SPLIT_PIPELINE_DEPTH
+                )
+            else:
+                up_path = await self.compress_with_7z(up_path, gid)
+                if self.is_cancelled:
+                    return
+                self.is_file = await aiopath.isfile(up_path)
+                self.name = up_path.replace(f"{up_dir}/", "").split("/", 1)[0]
+                self.size = await get_path_size(up_dir)
+                self.clear()
 
         self.name = up_path.replace(f"{up_dir}/", "").split("/", 1)[0]
         self.size = await get_path_size(up_dir)
 
-        if self.is_leech:
-            await self.proceed_split(
-                up_path,
-                gid,
-            )
-            if self.is_cancelled:
-                return
-            self.clear()
+        # A streamed extraction or zip already set up the pipeline
+        if self.is_leech and self.split_pipeline is None:
+            if Config.LEECH_SPLIT_PIPELINE:
+                # Split while uploading, see the leech branch below
+                self.split_pipeline = SplitPipeline(
+                    Config.LEECH_SPLIT_PIPELINE_DEPTH
+                )
+            else:
+                await self.proceed_split(
+                    up_path,
+                    gid,
+                )
+                if self.is_cancelled:
+                    return
+                self.clear()
 
         self.subproc = None
 
@@ -455,6 +599,8 @@ class TaskListener(TaskConfig):
             LOGGER.info(f"Start from Queued/Upload: {self.name}")
 
         self.size = await get_path_size(up_dir)
+        if self.incremental_leech is not None:
+            self.size += self.incremental_leech.handed_bytes
 
         # For mirror tasks, send the command message to log chat ID if configured
         self.log_msg = None
@@ -474,15 +620,39 @@ class TaskListener(TaskConfig):
 
         if self.is_leech:
             LOGGER.info(f"Leech Name: {self.name}")
-            tg = TelegramUploader(self, up_dir)
+            pipeline = self.split_pipeline
+            incremental = self.incremental_leech
+            if incremental is not None and incremental.uploader is not None:
+                tg, upload = incremental.uploader, incremental.upload_task
+            else:
+                tg = TelegramUploader(self, up_dir, pipeline)
+                upload = tg.upload()
             # Store a reference to the telegram uploader for later use (e.g., during cancellation)
             self.telegram_uploader = tg
             async with task_dict_lock:
                 task_dict[self.mid] = TelegramStatus(self, tg, gid, "up")
-            await gather(
-                update_status_message(self.message.chat.id),
-                tg.upload(),
-            )
+            if pipeline is not None:
+                if stream_extract:
+                    producer = self._stream_extract(up_path, gid)
+                elif stream_zip is not None:
+                    producer = self._stream_zip(stream_zip, up_path)
+                else:
+                    producer = self.proceed_split(up_path, gid)
+                await gather(
+                    update_status_message(self.message.chat.id),
+                    pipeline.feed(producer),
+                    upload,
+                )
+                self.split_pipeline = None
+                self.subproc = None
+                self.clear()
+                if incremental is not None:
+                    await clean_download(incremental.staging)
+            else:
+                await gather(
+                    update_status_message(self.message.chat.id),
+                    tg.upload(),
+                )
             # We don't want to delete the command messages in dump chats anymore
             # This was causing the auto-deleted command messages issue
             # Instead, we'll keep them for reference
@@ -599,6 +769,10 @@ class TaskListener(TaskConfig):
         rclone_path="",
         dir_id="",
     ):
+        record_transfer(self, "upload")
+        await ContentIndex.record(
+            self, link, files, folders, mime_type, rclone_path, dir_id
+        )
         if (
             self.is_super_chat
             and Config.INCOMPLETE_TASK_NOTIFIER
@@ -1459,6 +1633,8 @@ class TaskListener(TaskConfig):
         await start_from_queued()
 
     async def on_download_error(self, error, button=None):
+        if self.incremental_leech is not None:
+            await self.incremental_leech.stop()
         async with task_dict_lock:
             if self.mid in task_dict:
                 del task_dict[self.mid]
@@ -1619,5 +1795,7 @@ class TaskListener(TaskConfig):
         await clean_download(self.dir)
         if self.up_dir:
             await clean_download(self.up_dir)
+        if self.incremental_leech is not None:
+            await clean_download(self.incremental_leech.staging)
         if self.thumb and await aiopath.exists(self.thumb):
             await remove(self.thumb)
@@ -8,6 +8,7 @@ from bot.core.config_manager import Config
 from bot.core.torrent_manager import TorrentManager, aria2_name, is_metadata
 from bot.helper.ext_utils.aiofiles_compat import aiopath, remove
 from bot.helper.ext_utils.bot_utils import bt_selection_buttons
+from bot.helper.ext_utils.host_profiles import HostProfiles
 from bot.helper.ext_utils.limit_checker import limit_checker
 from bot.helper.ext_utils.task_manager import check_running_tasks
 from bot.helper.mirror_leech_utils.status_utils.aria2_status import Aria2Status
@@ -39,6 +40,8 @@ async def add_aria2_download(listener, dpath, header, ratio, seed_time):
         a2c_opt["seed-time"] = seed_time
     if TORRENT_TIMEOUT := Config.TORRENT_TIMEOUT:
         a2c_opt["bt-stop-timeout"] = f"{TORRENT_TIMEOUT}"
+    if not is_torrent and listener.link.startswith(("http://", "https://")):
+        a2c_opt.update(await HostProfiles.aria2_options(listener.link))
 
     add_to_queue, event = await check_running_tasks(listener)
     if add_to_queue:
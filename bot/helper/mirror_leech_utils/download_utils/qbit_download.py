@@ -47,6 +47,9 @@ async def add_qb_torrent(listener, path, ratio, seed_time):
             form = form.ratio_limit(ratio)
         if seed_time:
             form = form.seeding_time_limit(int(seed_time))
+        if listener.leeches_incrementally():
+            # Files complete in upload order, see IncrementalLeech
+            form = form.sequential_download(True).first_last_piece_priority(True)
         try:
             # First check if the torrent is already added
             if listener.link.startswith("magnet:"):
@@ -2,6 +2,8 @@ from asyncio import gather
 from json import loads
 from secrets import token_hex
 
+from aiohttp import ClientError
+
 from bot import LOGGER, task_dict, task_dict_lock
 from bot.core.config_manager import Config
 from bot.helper.ext_utils.aiofiles_compat import remove
@@ -11,12 +13,31 @@ from bot.helper.ext_utils.task_manager import (
     check_running_tasks,
     stop_duplicate_check,
 )
+from bot.helper.mirror_leech_utils.rclone_utils.rcd import (
+    RcloneDaemon,
+    RcloneRcError,
+)
 from bot.helper.mirror_leech_utils.rclone_utils.transfer import RcloneTransferHelper
 from bot.helper.mirror_leech_utils.status_utils.queue_status import QueueStatus
 from bot.helper.mirror_leech_utils.status_utils.rclone_status import RcloneStatus
 from bot.helper.telegram_helper.message_utils import send_status_message
 
 
+async def _rc_stat_and_size(remote, rpath, files_from=None):
+    """`lsjson --stat` and `size` of the source through the rc daemon."""
+    size_params = {"fs": f"{remote}:{rpath}"}
+    if files_from:
+        size_params["_filter"] = {"FilesFrom": [files_from]}
+        return None, await RcloneDaemon.call("operations/size", **size_params)
+    stat, size = await gather(
+        RcloneDaemon.call("operations/stat", fs=f"{remote}:", remote=rpath),
+        RcloneDaemon.call("operations/size", **size_params),
+    )
+    if stat.get("item") is None:
+        raise RcloneRcError(f"{remote}:{rpath} not found")
+    return stat["item"], size
+
+
 async def add_rclone_download(listener, path):
     # Check if Rclone operations are enabled in the configuration
     if not Config.RCLONE_ENABLED:
@@ -64,7 +85,18 @@ async def add_rclone_download(listener, path):
         "-v",
         "--log-systemd",
     ]
-    if rclone_select:
+    if RcloneDaemon.serves(config_path):
+        try:
+            rstat, rsize = await _rc_stat_and_size(
+                remote,
+                rpath,
+                listener.link if rclone_select else None,
+            )
+        except (ClientError, RcloneRcError) as err:
+            msg = f"Error: While getting rclone stat/size. Path: {remote}:{listener.link}. Stderr: {str(err)[:4000]}"
+            await listener.on_download_error(msg)
+            return
+    elif rclone_select:
         cmd2.extend(("--files-from", listener.link))
         res = await cmd_exec(cmd2)
         if res[2] != 0:
@@ -73,13 +105,10 @@ async def add_rclone_download(listener, path):
                 await listener.on_download_error(msg)
             return
         try:
-            rsize = loads(res[0])
+            rstat, rsize = None, loads(res[0])
         except Exception as err:
             await listener.on_download_error(f"RcloneDownload JsonLoad: {err}")
             return
-        if not listener.name:
-            listener.name = listener.link
-        path += listener.name
     else:
         res1, res2 = await gather(cmd_exec(cmd1), cmd_exec(cmd2))
         if res1[2] != 0 or res2[2] != 0:
@@ -94,14 +123,18 @@ async def add_rclone_download(listener, path):
         except Exception as err:
             await listener.on_download_error(f"RcloneDownload JsonLoad: {err}")
             return
-        if rstat["IsDir"]:
-            if not listener.name:
-                listener.name = (
-                    listener.link.rsplit("/", 1)[-1] if listener.link else remote
-                )
-            path += listener.name
-        else:
-            listener.name = listener.link.rsplit("/", 1)[-1]
+    if rclone_select:
+        if not listener.name:
+            listener.name = listener.link
+        path += listener.name
+    elif rstat["IsDir"]:
+        if not listener.name:
+            listener.name = (
+                listener.link.rsplit("/", 1)[-1] if listener.link else remote
+            )
+        path += listener.name
+    else:
+        listener.name = listener.link.rsplit("/", 1)[-1]
     listener.size = rsize["bytes"]
     gid = token_hex(4)
 
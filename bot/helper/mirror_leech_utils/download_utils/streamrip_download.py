@@ -2394,11 +2394,6 @@ check_for_updates = false
             # Add a small delay to let any hanging processes clean up
             await asyncio.sleep(2)
 
-            # Force garbage collection to clean up any lingering objects
-            import gc
-
-            gc.collect()
-
             # Get the original URL for retry
             download_url = getattr(self, "_download_url", self.listener.url)
             converted_url = await self._convert_url_for_streamrip(download_url)
@@ -2,15 +2,20 @@
 import contextlib
 import gc
 from asyncio import create_task
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 from logging import getLogger
 from os import listdir
 from os import path as ospath
 from re import search as re_search
 from secrets import token_hex
+from threading import Lock
+from time import monotonic
 
 from yt_dlp import DownloadError, YoutubeDL
 
 from bot import task_dict, task_dict_lock
+from bot.core.config_manager import Config
 from bot.helper.ext_utils.bot_utils import async_to_sync, sync_to_async
 from bot.helper.ext_utils.limit_checker import limit_checker
 from bot.helper.ext_utils.task_manager import (
@@ -32,6 +37,9 @@ from bot.helper.telegram_helper.message_utils import (
 
 LOGGER = getLogger(__name__)
 
+# Signed media URLs in a cached info dict expire, re-extract after this long
+INFO_CACHE_TTL = 30 * 60
+
 
 class MyLogger:
     # Class variable to track title extraction warnings
@@ -86,8 +94,7 @@ class MyLogger:
 
 
 class YoutubeDLHelper:
-    def __init__(self, listener):
-        self._last_downloaded = 0
+    def __init__(self, listener, info=None):
         self._progress = 0
         self._downloaded_bytes = 0
         self._download_speed = 0
@@ -96,6 +103,14 @@ class YoutubeDLHelper:
         self._gid = ""
         self._ext = ""
         self.is_playlist = False
+        # Sanitized info dict extracted once per task and reused for download
+        self._info = info
+        self._info_time = monotonic() if info else 0
+        # Per-file progress of playlist entries downloading in parallel
+        self._progress_lock = Lock()
+        self._active_files = {}
+        self.playlist_count = 0
+        self.playlist_done = 0
 
         # Check for user-specific cookies
         user_id = listener.user_id
@@ -121,6 +136,9 @@ class YoutubeDLHelper:
             "trim_file_name": 220,
             "ffmpeg_location": "/usr/bin/xtra",
             "fragment_retries": 10,
+            "concurrent_fragment_downloads": max(
+                Config.YTDLP_CONCURRENT_FRAGMENTS, 1
+            ),
             "retries": 10,
             "extractor_retries": 5,
             "file_access_retries": 5,
@@ -149,10 +167,18 @@ class YoutubeDLHelper:
 
     @property
     def download_speed(self):
+        if self.is_playlist:
+            with self._progress_lock:
+                return sum(speed for _, speed in self._active_files.values())
         return self._download_speed
 
     @property
     def downloaded_bytes(self):
+        if self.is_playlist:
+            with self._progress_lock:
+                return self._downloaded_bytes + sum(
+                    done for done, _ in self._active_files.values()
+                )
         return self._downloaded_bytes
 
     @property
@@ -170,23 +196,33 @@ class YoutubeDLHelper:
     def _on_download_progress(self, d):
         if self._listener.is_cancelled:
             raise ValueError("Cancelling...")
-        if d["status"] == "finished":
-            if self.is_playlist:
-                self._last_downloaded = 0
-        elif d["status"] == "downloading":
+        if self.is_playlist:
+            # Entries may download concurrently, so progress is kept per file
+            # and aggregated by the properties above
+            key = d.get("filename") or d.get("tmpfilename")
+            with self._progress_lock:
+                if d["status"] == "finished":
+                    done, _ = self._active_files.pop(key, (0, 0))
+                    self._downloaded_bytes += d.get("downloaded_bytes") or done
+                elif d["status"] == "downloading":
+                    self._active_files[key] = (
+                        d.get("downloaded_bytes") or 0,
+                        d.get("speed") or 0,
+                    )
+                downloaded = self._downloaded_bytes + sum(
+                    done for done, _ in self._active_files.values()
+                )
+            with contextlib.suppress(Exception):
+                self._progress = (downloaded / self._listener.size) * 100
+            return
+        if d["status"] == "downloading":
             self._download_speed = d["speed"] or 0
-            if self.is_playlist:
-                downloadedBytes = d["downloaded_bytes"] or 0
-                chunk_size = downloadedBytes - self._last_downloaded
-                self._last_downloaded = downloadedBytes
-                self._downloaded_bytes += chunk_size
-            else:
-                if d.get("total_bytes"):
-                    self._listener.size = d["total_bytes"] or 0
-                elif d.get("total_bytes_estimate"):
-                    self._listener.size = d["total_bytes_estimate"] or 0
-                self._downloaded_bytes = d["downloaded_bytes"] or 0
-                self._eta = d.get("eta", "-") or "-"
+            if d.get("total_bytes"):
+                self._listener.size = d["total_bytes"] or 0
+            elif d.get("total_bytes_estimate"):
+                self._listener.size = d["total_bytes_estimate"] or 0
+            self._downloaded_bytes = d["downloaded_bytes"] or 0
+            self._eta = d.get("eta", "-") or "-"
             with contextlib.suppress(Exception):
                 self._progress = (self._downloaded_bytes / self._listener.size) * 100
 
@@ -305,7 +341,9 @@ class YoutubeDLHelper:
 
         with YoutubeDL(self.opts) as ydl:
             try:
-                result = ydl.extract_info(self._listener.link, download=False)
+                result = self._get_cached_info()
+                if result is None:
+                    result = ydl.extract_info(self._listener.link, download=False)
                 if result is None:
                     raise ValueError("Info result is None")
 
@@ -469,6 +507,8 @@ class YoutubeDLHelper:
 
             except Exception as e:
                 return self._on_download_error(str(e))
+            self._info = ydl.sanitize_info(result)
+            self._info_time = monotonic()
             if "entries" in result:
                 for entry in result["entries"]:
                     if not entry:
@@ -570,6 +610,52 @@ class YoutubeDLHelper:
                 return None
             return None
 
+    def _get_cached_info(self):
+        if self._info is None or monotonic() - self._info_time > INFO_CACHE_TTL:
+            self._info = None
+            return None
+        return deepcopy(self._info)
+
+    def _run_download(self, ydl):
+        info = self._get_cached_info()
+        if info is None:
+            ydl.download([self._listener.link])
+        elif self.is_playlist and Config.YTDLP_PLAYLIST_WORKERS > 1:
+            self._download_playlist(info)
+        else:
+            ydl.process_ie_result(info, download=True)
+
+    def _download_entry(self, entry):
+        if self._listener.is_cancelled:
+            return
+        try:
+            with YoutubeDL(self.opts) as ydl:
+                ydl.process_ie_result(entry, download=True)
+        except Exception as e:
+            # Same as ignoreerrors for a serial playlist download
+            LOGGER.error(f"Playlist entry {entry.get('id')} failed: {e}")
+        finally:
+            with self._progress_lock:
+                self.playlist_done += 1
+
+    def _download_playlist(self, info):
+        entries = [entry for entry in info.get("entries") or [] if entry]
+        for index, entry in enumerate(entries, start=1):
+            # Keep playlist fields available to the output template
+            entry.setdefault("playlist", info.get("title"))
+            entry.setdefault("playlist_title", info.get("title"))
+            entry.setdefault("playlist_id", info.get("id"))
+            entry.setdefault("playlist_index", index)
+            entry.setdefault("playlist_count", len(entries))
+        self.playlist_count = len(entries)
+        self.playlist_done = 0
+        workers = min(Config.YTDLP_PLAYLIST_WORKERS, len(entries)) or 1
+        with ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="ytdlp-playlist",
+        ) as pool:
+            list(pool.map(self._download_entry, entries))
+
     def _download(self, path):
         try:
             # Track which clients we've tried
@@ -593,11 +679,13 @@ class YoutubeDLHelper:
                                 LOGGER.info(f"YouTube client: {current_client}")
 
                             # Attempt download
-                            ydl.download([self._listener.link])
+                            self._run_download(ydl)
                             # If we get here, download was successful
                             break
 
                         except DownloadError as e:
+                            # Retries change the client or format, so extract again
+                            self._info = None
                             error_msg = str(e)
                             if not self._listener.is_cancelled:
                                 # Check for common YouTube errors and provide more helpful messages
@@ -735,6 +823,7 @@ class YoutubeDLHelper:
                     break
 
                 except Exception as inner_e:
+                    self._info = None
                     error_str = str(inner_e)
                     # Handle specific 'can_download' error
                     if (
@@ -12,7 +12,10 @@ from tenacity import (
 )
 
 from bot.helper.ext_utils.bot_utils import async_to_sync
-from bot.helper.mirror_leech_utils.gdrive_utils.helper import GoogleDriveHelper
+from bot.helper.mirror_leech_utils.gdrive_utils.helper import (
+    DriveListingCache,
+    GoogleDriveHelper,
+)
 
 LOGGER = getLogger(__name__)
 
@@ -141,6 +144,7 @@ class GoogleDriveClone(GoogleDriveHelper):
     )
     def _copy_file(self, file_id, dest_id):
         body = {"parents": [dest_id]}
+        DriveListingCache.discard(dest_id)
         try:
             return (
                 self.service.files()
@@ -3,6 +3,7 @@ from logging import getLogger
 from tenacity import RetryError
 
 from bot.helper.mirror_leech_utils.gdrive_utils.helper import GoogleDriveHelper
+from bot.helper.mirror_leech_utils.gdrive_utils.walker import DriveTreeWalker
 
 LOGGER = getLogger(__name__)
 
@@ -62,20 +63,9 @@ class GoogleDriveCount(GoogleDriveHelper):
         self.proc_bytes += size
 
     def _gdrive_directory(self, drive_folder):
-        files = self.get_files_by_folder_id(drive_folder["id"])
-        if len(files) == 0:
-            return
-        for filee in files:
-            shortcut_details = filee.get("shortcutDetails")
-            if shortcut_details is not None:
-                mime_type = shortcut_details["targetMimeType"]
-                file_id = shortcut_details["targetId"]
-                filee = self.get_file_metadata(file_id)
-            else:
-                mime_type = filee.get("mimeType")
-            if mime_type == self.G_DRIVE_DIR_MIME_TYPE:
+        for filee in DriveTreeWalker(self).walk(drive_folder["id"]):
+            if filee.get("mimeType") == self.G_DRIVE_DIR_MIME_TYPE:
                 self.total_folders += 1
-                self._gdrive_directory(filee)
             else:
                 self.total_files += 1
                 self._gdrive_file(filee)
@@ -2,7 +2,10 @@ from logging import getLogger
 
 from googleapiclient.errors import HttpError
 
-from bot.helper.mirror_leech_utils.gdrive_utils.helper import GoogleDriveHelper
+from bot.helper.mirror_leech_utils.gdrive_utils.helper import (
+    DriveListingCache,
+    GoogleDriveHelper,
+)
 
 LOGGER = getLogger(__name__)
 
@@ -23,6 +26,7 @@ class GoogleDriveDelete(GoogleDriveHelper):
                 fileId=file_id,
                 supportsAllDrives=True,
             ).execute()
+            DriveListingCache.discard_item(file_id)
             msg = "Successfully deleted"
             LOGGER.info(f"Delete Result: {msg}")
         except HttpError as err:
@@ -4,6 +4,9 @@ from os import path as ospath
 from pickle import load as pload
 from random import randrange
 from re import search as re_search
+from threading import Lock
+from time import monotonic
+from typing import ClassVar
 from urllib.parse import parse_qs, urlparse
 
 from google.oauth2 import service_account
@@ -19,11 +22,71 @@ from tenacity import (
 
 from bot.core.config_manager import Config
 from bot.helper.ext_utils.links_utils import is_gdrive_id
+from bot.helper.ext_utils.metrics import Metrics
 
 LOGGER = getLogger(__name__)
 getLogger("googleapiclient.discovery").setLevel(ERROR)
 
 
+class DriveListingCache:
+    """Short-lived folder listings shared by count, clone, download and
+    duplicate checks, so back-to-back operations on a tree list it once.
+
+    Listings are keyed by the credential they were fetched with as well, a
+    folder one token or service account can read answers no one else.
+    Writes through the bot drop the listing of the folder they touch.
+    """
+
+    ttl = 120
+    max_entries = 4096
+    hits = 0
+    misses = 0
+    _entries: ClassVar[dict[tuple, tuple]] = {}
+    _lock = Lock()
+
+    @classmethod
+    def get(cls, folder_id, credential):
+        key = (credential, folder_id)
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is not None and entry[0] < monotonic():
+                del cls._entries[key]
+                entry = None
+            if entry is None:
+                cls.misses += 1
+                return None
+            cls.hits += 1
+            return list(entry[1])
+
+    @classmethod
+    def put(cls, folder_id, credential, files):
+        now = monotonic()
+        with cls._lock:
+            if len(cls._entries) >= cls.max_entries:
+                for key in [k for k, v in cls._entries.items() if v[0] < now]:
+                    del cls._entries[key]
+                while len(cls._entries) >= cls.max_entries:
+                    del cls._entries[next(iter(cls._entries))]
+            cls._entries[(credential, folder_id)] = (now + cls.ttl, list(files))
+
+    @classmethod
+    def discard(cls, folder_id):
+        with cls._lock:
+            for key in [k for k in cls._entries if k[1] == folder_id]:
+                del cls._entries[key]
+
+    @classmethod
+    def discard_item(cls, item_id):
+        """Drop `item_id` and every cached listing that contains it."""
+        with cls._lock:
+            for key, (_, files) in list(cls._entries.items()):
+                if key[1] == item_id or any(f.get("id") == item_id for f in files):
+                    del cls._entries[key]
+
+
+Metrics.register_cache("gdrive_listing", DriveListingCache)
+
+
 class GoogleDriveHelper:
     def __init__(self):
         self._OAUTH_SCOPE = ["https://www.googleapis.com/auth/drive"]
@@ -63,6 +126,11 @@ class GoogleDriveHelper:
     def processed_bytes(self):
         return self.proc_bytes
 
+    @property
+    def credential(self):
+        """What the Drive calls are authorized with, keys shared listings."""
+        return "sa" if self.use_sa else self.token_path
+
     async def progress(self):
         if self.status is not None:
             chunk_size = (
@@ -162,9 +230,10 @@ class GoogleDriveHelper:
         stop=stop_after_attempt(5),
         retry=retry_if_exception_type(Exception),
     )
-    def get_file_metadata(self, file_id):
+    def get_file_metadata(self, file_id, service=None):
         return (
-            self.service.files()
+            (service or self.service)
+            .files()
             .get(
                 fileId=file_id,
                 supportsAllDrives=True,
@@ -178,7 +247,14 @@ class GoogleDriveHelper:
         stop=stop_after_attempt(5),
         retry=retry_if_exception_type(Exception),
     )
-    def get_files_by_folder_id(self, folder_id, item_type=""):
+    def get_files_by_folder_id(self, folder_id, item_type="", service=None):
+        if (
+            not item_type
+            and (files := DriveListingCache.get(folder_id, self.credential))
+            is not None
+        ):
+            return files
+        service = service or self.service
         page_token = None
         files = []
         if not item_type:
@@ -189,13 +265,13 @@ class GoogleDriveHelper:
             q = f"'{folder_id}' in parents and mimeType != '{self.G_DRIVE_DIR_MIME_TYPE}' and trashed = false"
         while True:
             response = (
-                self.service.files()
+                service.files()
                 .list(
                     supportsAllDrives=True,
                     includeItemsFromAllDrives=True,
                     q=q,
                     spaces="drive",
-                    pageSize=200,
+                    pageSize=1000,
                     fields="nextPageToken, files(id, name, mimeType, size, shortcutDetails)",
                     orderBy="folder, name",
                     pageToken=page_token,
@@ -206,6 +282,8 @@ class GoogleDriveHelper:
             page_token = response.get("nextPageToken")
             if page_token is None:
                 break
+        if not item_type:
+            DriveListingCache.put(folder_id, self.credential, files)
         return files
 
     @retry(
@@ -227,6 +305,7 @@ class GoogleDriveHelper:
             .execute()
         )
         file_id = file.get("id")
+        DriveListingCache.discard(dest_id)
         if not Config.IS_TEAM_DRIVE:
             self.set_permission(file_id)
         LOGGER.info(
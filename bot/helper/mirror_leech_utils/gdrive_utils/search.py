@@ -2,7 +2,10 @@ from logging import getLogger
 
 from bot import drives_ids, drives_names, index_urls, user_data
 from bot.helper.ext_utils.status_utils import get_readable_file_size
-from bot.helper.mirror_leech_utils.gdrive_utils.helper import GoogleDriveHelper
+from bot.helper.mirror_leech_utils.gdrive_utils.helper import (
+    DriveListingCache,
+    GoogleDriveHelper,
+)
 
 LOGGER = getLogger(__name__)
 
@@ -98,7 +101,8 @@ class GoogleDriveSearch(GoogleDriveHelper):
 
     def drive_list(self, file_name, target_id="", user_id=""):
         msg = ""
-        file_name = self.escapes(str(file_name))
+        raw_name = str(file_name)
+        file_name = self.escapes(raw_name)
         contents_no = 0
         telegraph_content = []
         Title = False
@@ -120,15 +124,28 @@ class GoogleDriveSearch(GoogleDriveHelper):
         ) or target_id.startswith("tp:"):
             self.use_sa = False
 
-        self.service = self.authorize()
-
         for drive_name, dir_id, index_url in drives:
             isRecur = (
                 False
                 if self._is_recursive and len(dir_id) > 23
                 else self._is_recursive
             )
-            response = self._drive_query(dir_id, file_name, isRecur)
+            # Only a folder's own listing can answer the check, drive wide
+            # checks stay a single name query rather than a walk
+            cached = (
+                DriveListingCache.get(dir_id, self.credential)
+                if self._stop_dup and not isRecur
+                else None
+            )
+            if cached is not None:
+                # A listing from a recent count or clone answers the check
+                response = {
+                    "files": [f for f in cached if f.get("name") == raw_name]
+                }
+            else:
+                if self.service is None:
+                    self.service = self.authorize()
+                response = self._drive_query(dir_id, file_name, isRecur)
             if not response["files"]:
                 if self._no_multi:
                     break
@@ -17,7 +17,10 @@ from tenacity import (
 from bot.core.config_manager import Config
 from bot.helper.ext_utils.bot_utils import SetInterval, async_to_sync
 from bot.helper.ext_utils.files_utils import get_mime_type_sync as get_mime_type
-from bot.helper.mirror_leech_utils.gdrive_utils.helper import GoogleDriveHelper
+from bot.helper.mirror_leech_utils.gdrive_utils.helper import (
+    DriveListingCache,
+    GoogleDriveHelper,
+)
 
 LOGGER = getLogger(__name__)
 
@@ -198,6 +201,7 @@ class GoogleDriveUpload(GoogleDriveHelper):
         }
         if dest_id is not None:
             file_metadata["parents"] = [dest_id]
+            DriveListingCache.discard(dest_id)
 
         if ospath.getsize(file_path) == 0:
             media_body = MediaFileUpload(
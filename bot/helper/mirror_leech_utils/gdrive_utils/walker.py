@@ -0,0 +1,55 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from threading import local
+
+from bot.core.config_manager import Config
+
+
+class DriveTreeWalker:
+    """Walks a Drive folder tree, listing folders with a bounded thread pool.
+
+    googleapiclient's http objects are not thread-safe, so every worker lists
+    through its own service built by the helper's `authorize()`. Items are
+    yielded as soon as their folder listing arrives, with shortcuts resolved
+    to their targets, so callers can aggregate while the walk goes on.
+    """
+
+    def __init__(self, helper, workers=None):
+        self._helper = helper
+        self._workers = max(1, workers or Config.GDRIVE_LIST_WORKERS)
+        self._local = local()
+
+    def _service(self):
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = self._local.service = self._helper.authorize()
+        return service
+
+    def _list(self, folder_id):
+        service = self._service()
+        items = []
+        for item in self._helper.get_files_by_folder_id(folder_id, service=service):
+            if (shortcut := item.get("shortcutDetails")) is not None:
+                item = self._helper.get_file_metadata(
+                    shortcut["targetId"],
+                    service=service,
+                )
+            items.append(item)
+        return items
+
+    def walk(self, folder_id):
+        """Yield every file and folder below `folder_id`, in no fixed order."""
+        pool = ThreadPoolExecutor(self._workers, thread_name_prefix="gdrive-walk")
+        pending = {pool.submit(self._list, folder_id)}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for item in future.result():
+                        if (
+                            item.get("mimeType")
+                            == self._helper.G_DRIVE_DIR_MIME_TYPE
+                        ):
+                            pending.add(pool.submit(self._list, item["id"]))
+                        yield item
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -5,6 +5,7 @@ from json import loads
 from time import time
 
 from aiofiles import open as aiopen
+from aiohttp import ClientError
 from pyrogram.errors.exceptions.bad_request_400 import QueryIdInvalid
 from pyrogram.filters import regex, user
 from pyrogram.handlers import CallbackQueryHandler
@@ -18,6 +19,10 @@ from bot.helper.ext_utils.status_utils import (
     get_readable_file_size,
     get_readable_time,
 )
+from bot.helper.mirror_leech_utils.rclone_utils.rcd import (
+    RcloneDaemon,
+    RcloneRcError,
+)
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.telegram_helper.message_utils import (
     auto_delete_message,
@@ -312,9 +317,24 @@ class RcloneList:
         ]
         if self.listener.is_cancelled:
             return
-        res, err, code = await cmd_exec(cmd)
+        if RcloneDaemon.serves(self.config_path):
+            # Warm listings from the daemon, no process or config reload
+            try:
+                result = await RcloneDaemon.list(
+                    f"{self.remote}{self.path}",
+                    noModTime=True,
+                    noMimeType=True,
+                    dirsOnly=self.item_type == "--dirs-only",
+                    filesOnly=self.item_type == "--files-only",
+                )
+                err, code = "", 0
+            except (ClientError, RcloneRcError) as e:
+                err, code = str(e), 1
+        else:
+            res, err, code = await cmd_exec(cmd)
+            if code in [0, -9]:
+                result = loads(res)
         if code in [0, -9]:
-            result = loads(res)
             if (
                 len(result) == 0
                 and itype != self.item_type
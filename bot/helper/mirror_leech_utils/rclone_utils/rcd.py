@@ -0,0 +1,241 @@
+import contextlib
+from asyncio import create_subprocess_exec, create_task, sleep
+from secrets import token_hex
+
+from aiohttp import BasicAuth, ClientError, ClientSession, ClientTimeout
+
+from bot import LOGGER
+from bot.core.config_manager import Config
+from bot.helper.ext_utils.aiofiles_compat import aiopath
+
+RCD_HOST = "127.0.0.1"
+RCD_CONFIG = "rclone.conf"
+# rc jobs skip the CLI's --retries loop, transfers retry them the same way
+RCD_RETRIES = 3
+RCD_RETRIES_SLEEP = 3
+
+# Flags every transfer command passes, given once to the daemon as defaults
+RCD_DEFAULT_FLAGS = (
+    "--fast-list",
+    "-L",
+    "--ignore-case",
+    "--retries-sleep",
+    "3s",
+    "--low-level-retries",
+    "1",
+    "-M",
+)
+# Per-command flags mapped onto rc `_config` options
+CONFIG_FLAGS = {
+    "--transfers": "Transfers",
+    "--tpslimit": "TPSLimit",
+    "--tpslimit-burst": "TPSLimitBurst",
+}
+# Drive flags mapped onto connection string options of the drive remote
+DRIVE_FLAGS = {
+    "--drive-chunk-size": "chunk_size",
+    "--drive-upload-cutoff": "upload_cutoff",
+}
+
+
+class RcloneRcError(Exception):
+    pass
+
+
+class RcloneDaemon:
+    """Long-lived `rclone rcd` driven through the rc HTTP API.
+
+    One daemon keeps remotes authenticated and directory caches warm across
+    transfers, listings and link lookups. It only serves the owner's
+    rclone.conf, operations on user or service account configs still run a
+    process each. A restart requested while transfers run waits for them,
+    meanwhile new operations spawn rclone.
+    """
+
+    _proc = None
+    _session = None
+    _transfers = 0
+    _restart = False
+
+    @classmethod
+    def is_running(cls):
+        return cls._proc is not None and cls._proc.returncode is None
+
+    @classmethod
+    def serves(cls, config_path):
+        return config_path == RCD_CONFIG and cls.is_running() and not cls._restart
+
+    @classmethod
+    @contextlib.contextmanager
+    def transfer(cls):
+        """Hold off restarts while a transfer runs jobs on the daemon."""
+        cls._transfers += 1
+        try:
+            yield
+        finally:
+            cls._transfers -= 1
+            if not cls._transfers and cls._restart:
+                create_task(cls.start())  # noqa: RUF006
+
+    @classmethod
+    async def start(cls):
+        """Start the daemon, restarting it once running transfers finish."""
+        if cls._transfers:
+            cls._restart = True
+            LOGGER.info("Rclone rc daemon restarts once running transfers finish")
+            return
+        cls._restart = False
+        await cls.stop()
+        if not Config.RCLONE_ENABLED or not Config.RCLONE_RCD_ENABLED:
+            return
+        if not await aiopath.exists(RCD_CONFIG):
+            return
+        # Fresh credentials per start, the API is only meant for this process
+        user, password = token_hex(8), token_hex(16)
+        cls._proc = await create_subprocess_exec(
+            "xone",
+            "rcd",
+            "--config",
+            RCD_CONFIG,
+            "--rc-addr",
+            f"{RCD_HOST}:{Config.RCLONE_RCD_PORT}",
+            "--rc-user",
+            user,
+            "--rc-pass",
+            password,
+            *RCD_DEFAULT_FLAGS,
+            "-v",
+            "--log-systemd",
+        )
+        cls._session = ClientSession(
+            f"http://{RCD_HOST}:{Config.RCLONE_RCD_PORT}",
+            auth=BasicAuth(user, password),
+            timeout=ClientTimeout(total=120),
+        )
+        for _ in range(40):
+            await sleep(0.25)
+            with contextlib.suppress(ClientError, RcloneRcError):
+                await cls.call("rc/noop")
+                LOGGER.info(
+                    f"Rclone rc daemon started on port {Config.RCLONE_RCD_PORT}"
+                )
+                return
+            if not cls.is_running():
+                break
+        LOGGER.error("Rclone rc daemon did not start, using rclone processes")
+        await cls.stop()
+
+    @classmethod
+    async def stop(cls):
+        if cls._session is not None:
+            await cls._session.close()
+            cls._session = None
+        if cls._proc is not None:
+            with contextlib.suppress(Exception):
+                cls._proc.kill()
+                await cls._proc.wait()
+            cls._proc = None
+
+    @classmethod
+    async def call(cls, method, **params):
+        if cls._session is None:
+            raise RcloneRcError("rclone rc daemon is not running")
+        async with cls._session.post(f"/{method}", json=params) as resp:
+            data = await resp.json(content_type=None) or {}
+        if resp.status != 200:
+            raise RcloneRcError(data.get("error") or f"HTTP {resp.status}")
+        return data
+
+    @classmethod
+    async def run_job(cls, method, params, on_start, on_stats):
+        """Run `method` as an async job and poll it until it finishes.
+
+        `on_start` receives the job id so the caller can stop it, `on_stats`
+        the job group's `core/stats` on every poll. Returns the job status.
+        """
+        job = await cls.call(method, _async=True, **params)
+        jobid = job["jobid"]
+        group = f"job/{jobid}"
+        on_start(jobid)
+        try:
+            while True:
+                await sleep(1)
+                status = await cls.call("job/status", jobid=jobid)
+                with contextlib.suppress(ClientError, RcloneRcError):
+                    on_stats(await cls.call("core/stats", group=group))
+                if status.get("finished"):
+                    return status
+        finally:
+            with contextlib.suppress(Exception):
+                await cls.call("core/stats-delete", group=group)
+
+    @classmethod
+    async def stop_job(cls, jobid):
+        with contextlib.suppress(ClientError, RcloneRcError):
+            await cls.call("job/stop", jobid=jobid)
+
+    @classmethod
+    async def list(cls, fs, **opt):
+        """`lsjson` of `fs` through the daemon, `opt` as in operations/list."""
+        data = await cls.call("operations/list", fs=fs, remote="", opt=opt)
+        return data.get("list") or []
+
+    @classmethod
+    async def is_file(cls, fs, remote):
+        data = await cls.call("operations/stat", fs=fs, remote=remote)
+        item = data.get("item")
+        return item is not None and not item.get("IsDir")
+
+    @classmethod
+    async def public_link(cls, destination):
+        fs, remote = split_fs(destination)
+        data = await cls.call("operations/publiclink", fs=fs, remote=remote)
+        return data.get("url", "")
+
+
+def split_fs(path):
+    """Split `remote:dir/name` or a local path into (parent fs, name)."""
+    if ":" in path and not path.startswith("/"):
+        remote, rpath = path.split(":", 1)
+        parent, _, name = rpath.rstrip("/").rpartition("/")
+        return f"{remote}:{parent}", name
+    parent, _, name = path.rstrip("/").rpartition("/")
+    return parent or ".", name
+
+
+def _with_options(fs, options):
+    if not options or ":" not in fs or fs.startswith("/"):
+        return fs
+    remote, rpath = fs.split(":", 1)
+    opts = ",".join(f"{key}={value}" for key, value in options.items())
+    return f"{remote},{opts}:{rpath}"
+
+
+def command_to_rc(source, destination, cmd):
+    """Translate the flags of a transfer command to rc params.
+
+    `source` and `destination` are the command's, returns them with the
+    drive options added along with the params of the rc call.
+    """
+    config, rc_filter, drive_opts = {}, {"IgnoreCase": True}, {}
+    args = iter(cmd)
+    for arg in args:
+        if arg in CONFIG_FLAGS:
+            config[CONFIG_FLAGS[arg]] = int(next(args))
+        elif arg in DRIVE_FLAGS:
+            drive_opts[DRIVE_FLAGS[arg]] = next(args)
+        elif arg == "--drive-acknowledge-abuse":
+            drive_opts["acknowledge_abuse"] = "true"
+        elif arg == "--exclude":
+            rc_filter.setdefault("ExcludeRule", []).append(next(args))
+        elif arg == "--files-from":
+            rc_filter["FilesFrom"] = [next(args)]
+    # Drive flags are only added for the remote end of a download or upload
+    if ":" in source and not source.startswith("/"):
+        source = _with_options(source, drive_opts)
+    else:
+        destination = _with_options(destination, drive_opts)
+    params = {"_filter": rc_filter}
+    if config:
+        params["_config"] = config
+    return source, destination, params
@@ -8,11 +8,24 @@ from random import randrange
 from re import findall as re_findall
 
 from aiofiles import open as aiopen
+from aiohttp import ClientError
 
 from bot.core.config_manager import Config
 from bot.helper.ext_utils.aiofiles_compat import aiopath, listdir, makedirs
 from bot.helper.ext_utils.bot_utils import cmd_exec
 from bot.helper.ext_utils.files_utils import count_files_and_folders, get_mime_type
+from bot.helper.ext_utils.status_utils import (
+    get_readable_file_size,
+    get_readable_time,
+)
+from bot.helper.mirror_leech_utils.rclone_utils.rcd import (
+    RCD_RETRIES,
+    RCD_RETRIES_SLEEP,
+    RcloneDaemon,
+    RcloneRcError,
+    command_to_rc,
+    split_fs,
+)
 
 LOGGER = getLogger(__name__)
 
@@ -21,6 +34,8 @@ class RcloneTransferHelper:
     def __init__(self, listener):
         self._listener = listener
         self._proc = None
+        self._rc_jobid = None
+        self._command = {}
         self._transferred_size = "0 B"
         self._eta = "-"
         self._percentage = "0%"
@@ -80,6 +95,114 @@ class RcloneTransferHelper:
                 ) = data[0]
             await sleep(0.05)
 
+    def _set_rc_job(self, jobid):
+        self._rc_jobid = jobid
+
+    def _update_rc_stats(self, stats):
+        transferred = stats.get("bytes", 0)
+        total = stats.get("totalBytes", 0)
+        self._transferred_size = get_readable_file_size(transferred)
+        self._size = get_readable_file_size(total)
+        self._percentage = f"{transferred / total * 100:.0f}%" if total else "0%"
+        self._speed = f"{get_readable_file_size(stats.get('speed', 0))}/s"
+        self._eta = get_readable_time(eta) if (eta := stats.get("eta")) else "-"
+
+    async def _is_file(self, source):
+        if ":" not in source or source.startswith("/"):
+            return await aiopath.isfile(source)
+        fs, name = split_fs(source)
+        return bool(name) and await RcloneDaemon.is_file(fs, name)
+
+    async def _run_rc(self, cmd):
+        """Run the command as rc jobs, None once the daemon stops serving."""
+        method = self._command["method"]
+        source, destination, params = command_to_rc(
+            self._command["source"],
+            self._command["destination"],
+            cmd,
+        )
+        with RcloneDaemon.transfer():
+            for attempt in range(1, RCD_RETRIES + 1):
+                code, error = await self._run_rc_job(
+                    method, source, destination, params
+                )
+                if (
+                    code != 1
+                    or self._listener.is_cancelled
+                    or attempt == RCD_RETRIES
+                ):
+                    return code, error
+                LOGGER.warning(
+                    f"rclone job failed, retry {attempt}/{RCD_RETRIES}: {error}"
+                )
+                await sleep(RCD_RETRIES_SLEEP)
+                if not RcloneDaemon.serves(self._command["config"]):
+                    # Stopped or waiting to restart, retry with rclone itself
+                    return None
+        return code, error
+
+    async def _run_rc_job(self, method, source, destination, params):
+        try:
+            if await self._is_file(source):
+                fs, name = split_fs(source)
+                rc_method = f"operations/{method}file"
+                params |= {
+                    "srcFs": fs,
+                    "srcRemote": name,
+                    "dstFs": destination,
+                    "dstRemote": name,
+                }
+            else:
+                rc_method = f"sync/{method}"
+                params |= {"srcFs": source, "dstFs": destination}
+            status = await RcloneDaemon.run_job(
+                rc_method,
+                params,
+                self._set_rc_job,
+                self._update_rc_stats,
+            )
+        except (ClientError, RcloneRcError) as e:
+            return 1, str(e)
+        finally:
+            self._rc_jobid = None
+        if self._listener.is_cancelled:
+            return -9, ""
+        if status.get("success"):
+            return 0, ""
+        return 1, status.get("error") or "rclone job failed"
+
+    async def _run(self, cmd):
+        """Run a transfer command, through the rc daemon when it serves the
+        command's config. Returns the exit code and the error output.
+        """
+        if (
+            RcloneDaemon.serves(self._command["config"])
+            and not self._listener.rc_flags
+            and (result := await self._run_rc(cmd)) is not None
+        ):
+            return result
+        self._proc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
+        await self._progress()
+        _, stderr = await self._proc.communicate()
+        return self._proc.returncode, stderr.decode().strip()
+
+    async def _get_link(self, config_path, destination):
+        if RcloneDaemon.serves(config_path):
+            try:
+                return await RcloneDaemon.public_link(destination), "", 0
+            except (ClientError, RcloneRcError) as e:
+                return "", str(e), 1
+        cmd = [
+            "xone",
+            "link",
+            "--config",
+            config_path,
+            destination,
+            "-v",
+            "--log-systemd",
+        ]
+        return await cmd_exec(cmd)
+
     def _switch_service_account(self):
         if self._sa_index == self._sa_number - 1:
             self._sa_index = 0
@@ -116,10 +239,7 @@ class RcloneTransferHelper:
         return sa_conf_file
 
     async def _start_download(self, cmd, remote_type):
-        self._proc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
-        await self._progress()
-        _, stderr = await self._proc.communicate()
-        return_code = self._proc.returncode
+        return_code, error = await self._run(cmd)
         if self._listener.is_cancelled:
             return None
 
@@ -127,7 +247,6 @@ class RcloneTransferHelper:
             await self._listener.on_download_complete()
             return None
         if return_code != -9:
-            error = stderr.decode().strip()
             if not error and remote_type == "drive" and self._use_service_accounts:
                 error = (
                     "Mostly your service accounts don't have access to this drive!"
@@ -278,22 +397,33 @@ class RcloneTransferHelper:
             destination.rsplit("/", 1)[0] if mime_type == "Folder" else destination
         )
 
-        cmd = [
-            "xone",
-            "lsjson",
-            "--fast-list",
-            "--no-mimetype",
-            "--no-modtime",
-            "--config",
-            config_path,
-            epath,
-            "-v",
-            "--log-systemd",
-        ]
-        res, err, code = await cmd_exec(cmd)
+        if RcloneDaemon.serves(config_path):
+            try:
+                result = await RcloneDaemon.list(
+                    epath,
+                    noModTime=True,
+                    noMimeType=True,
+                )
+                err, code = "", 0
+            except (ClientError, RcloneRcError) as e:
+                result, err, code = None, str(e), 1
+        else:
+            cmd = [
+                "xone",
+                "lsjson",
+                "--fast-list",
+                "--no-mimetype",
+                "--no-modtime",
+                "--config",
+                config_path,
+                epath,
+                "-v",
+                "--log-systemd",
+            ]
+            res, err, code = await cmd_exec(cmd)
+            result = loads(res) if code == 0 else None
 
         if code == 0:
-            result = loads(res)
             fid = next(
                 (r["ID"] for r in result if r["Path"] == self._listener.name),
                 "err",
@@ -311,10 +441,7 @@ class RcloneTransferHelper:
         return link
 
     async def _start_upload(self, cmd, remote_type):
-        self._proc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
-        await self._progress()
-        _, stderr = await self._proc.communicate()
-        return_code = self._proc.returncode
+        return_code, error = await self._run(cmd)
 
         if self._listener.is_cancelled:
             return False
@@ -322,7 +449,6 @@ class RcloneTransferHelper:
             return False
         if return_code == 0:
             return True
-        error = stderr.decode().strip()
         LOGGER.error(error)
 
         # Handle specific FTP stream errors
@@ -533,16 +659,7 @@ class RcloneTransferHelper:
         if remote_type == "drive":
             link = await self._get_gdrive_link(oconfig_path, destination, mime_type)
         else:
-            cmd = [
-                "xone",
-                "link",
-                "--config",
-                oconfig_path,
-                destination,
-                "-v",
-                "--log-systemd",
-            ]
-            res, err, code = await cmd_exec(cmd)
+            res, err, code = await self._get_link(oconfig_path, destination)
 
             if code == 0:
                 link = res
@@ -641,10 +758,7 @@ class RcloneTransferHelper:
                 ),
             )
 
-        self._proc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
-        await self._progress()
-        _, stderr = await self._proc.communicate()
-        return_code = self._proc.returncode
+        return_code, error = await self._run(cmd)
 
         if self._listener.is_cancelled:
             return None, None
@@ -667,16 +781,7 @@ class RcloneTransferHelper:
                     if self._listener.is_cancelled
                     else (link, destination)
                 )
-            cmd = [
-                "xone",
-                "link",
-                "--config",
-                config_path,
-                destination,
-                "-v",
-                "--log-systemd",
-            ]
-            res, err, code = await cmd_exec(cmd)
+            res, err, code = await self._get_link(config_path, destination)
 
             if self._listener.is_cancelled:
                 return None, None
@@ -731,7 +836,6 @@ class RcloneTransferHelper:
                 return None, destination
             return None
 
-        error = stderr.decode().strip()
         LOGGER.error(error)
 
         # Handle specific FTP stream errors
@@ -814,6 +918,12 @@ class RcloneTransferHelper:
             self._rclone_select = True
         else:
             ext = "*.{" + ",".join(self._listener.excluded_extensions) + "}"
+        self._command = {
+            "config": config_path,
+            "method": method,
+            "source": source,
+            "destination": destination,
+        }
         cmd = [
             "xone",
             method,
@@ -861,6 +971,8 @@ class RcloneTransferHelper:
         if self._proc is not None:
             with contextlib.suppress(Exception):
                 self._proc.kill()
+        if self._rc_jobid is not None:
+            await RcloneDaemon.stop_job(self._rc_jobid)
         if self._is_download:
             LOGGER.info(f"Cancelling Download: {self._listener.name}")
             await self._listener.on_download_error("Stopped by user!")
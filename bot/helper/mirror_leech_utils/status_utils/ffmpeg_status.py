@@ -31,6 +31,12 @@ class FFmpegStatus:
     def gid(self):
         return self._gid
 
+    def file_counts(self):
+        """(done, running, submitted) files of a FileExecutor, else None."""
+        if hasattr(self._obj, "file_counts"):
+            return self._obj.file_counts()
+        return None
+
     def name(self):
         return self.listener.name
 
@@ -25,6 +25,8 @@ class YtDlpStatus:
         return MirrorStatus.STATUS_DOWNLOAD
 
     def name(self):
+        if self._obj.is_playlist and self._obj.playlist_count:
+            return f"{self.listener.name} ({self._obj.playlist_done}/{self._obj.playlist_count})"
         return self.listener.name
 
     def progress(self):
@@ -1,7 +1,7 @@
 import contextlib
-import gc
 import re
 from asyncio import sleep
+from functools import partial
 from logging import getLogger
 from os import path as ospath
 from os import walk
@@ -38,6 +38,7 @@ from bot.helper.ext_utils.files_utils import (
     get_base_name,
     is_archive,
 )
+from bot.helper.ext_utils.gc_utils import MemoryGovernor
 from bot.helper.ext_utils.media_utils import (
     get_audio_thumbnail,
     get_document_type,
@@ -45,8 +46,11 @@ from bot.helper.ext_utils.media_utils import (
     get_multiple_frames_thumbnail,
     get_video_thumbnail,
 )
+from bot.helper.ext_utils.metrics import Metrics
+from bot.helper.ext_utils.split_pipeline import WALK
 from bot.helper.ext_utils.template_processor import extract_metadata_from_filename
 from bot.helper.telegram_helper.message_utils import delete_message
+from bot.helper.telegram_helper.rate_limiter import OutboundScheduler
 
 LOGGER = getLogger(__name__)
 
@@ -69,22 +73,25 @@ async def wait_for_memory_availability(max_memory_percent=80, max_wait_time=60):
         LOGGER.warning(
             f"Memory usage high ({memory_percent}%). Waiting for memory to free up..."
         )
-        gc.collect()
+        MemoryGovernor.request()
         await sleep(2)
     return False
 
 
 class TelegramUploader:
-    def __init__(self, listener, path):
+    def __init__(self, listener, path, pipeline=None):
         self._last_uploaded = 0
         self._processed_bytes = 0
         self._listener = listener
         self._user_id = listener.user_id
         self._path = path
+        self._pipeline = pipeline
         self._start_time = time()
         self._total_files = 0
         self._thumb = self._listener.thumb or f"thumbnails/{listener.user_id}.jpg"
         self._msgs_dict = {}
+        # (chat_id, message_id, name) of every uploaded file, see ContentIndex
+        self.sent_messages = []
         self._corrupted = 0
         self._is_corrupted = False
         self._media_dict = {"videos": {}, "documents": {}}
@@ -194,8 +201,6 @@ class TelegramUploader:
         return True
 
     async def _prepare_file(self, file_, dirpath):
-        import gc
-
         # re module is already imported at the top of the file
         # re_match and re_sub are already imported at the top of the file
         from bot.helper.ext_utils.font_utils import apply_font_style
@@ -293,8 +298,6 @@ class TelegramUploader:
                         LOGGER.error(f"Error applying font style: {e}")
                         # If font styling fails, use the display name with HTML formatting
                         cap_mono = f"<code>{display_name}</code>"
-                    # Force garbage collection after font styling
-                    gc.collect()
                 else:
                     # If no font style, just use the display name with HTML formatting
                     cap_mono = f"<code>{display_name}</code>"
@@ -823,6 +826,13 @@ class TelegramUploader:
                 LOGGER.error(f"Error cleaning up media dictionary: {e}")
 
     async def upload(self):
+        try:
+            await self._upload()
+        finally:
+            if self._pipeline is not None:
+                self._pipeline.abort()
+
+    async def _upload(self):
         await self._user_settings()
 
         # Log streamrip-specific information
@@ -834,118 +844,19 @@ class TelegramUploader:
         res = await self._msg_to_reply()
         if not res:
             return
-        for dirpath, _, files in natsorted(await sync_to_async(walk, self._path)):
-            if dirpath.strip().endswith("/yt-dlp-thumb"):
-                continue
-            if dirpath.strip().endswith("_ss"):
-                await self._send_screenshots(dirpath, files)
-                await rmtree(dirpath, ignore_errors=True)
-                continue
-            for file_ in natsorted(files):
-                self._error = ""
-                self._up_path = ospath.join(dirpath, file_)
-                if not await aiopath.exists(self._up_path):
-                    LOGGER.error(f"{self._up_path} not exists! Continue uploading!")
-                    continue
-                try:
-                    f_size = await aiopath.getsize(self._up_path)
-                    self._total_files += 1
-                    if f_size == 0:
-                        LOGGER.error(
-                            f"{self._up_path} size is zero, telegram don't upload zero size files",
-                        )
-                        self._corrupted += 1
-                        continue
-
-                    # Pre-check file size against Telegram's limit (based on premium status)
-                    from bot.core.aeon_client import TgClient
-
-                    # Use the MAX_SPLIT_SIZE from TgClient which is already set based on premium status
-                    telegram_limit = TgClient.MAX_SPLIT_SIZE
-                    limit_in_gb = telegram_limit / (1024 * 1024 * 1024)
-
-                    if f_size > telegram_limit:
-                        premium_status = (
-                            "premium" if TgClient.IS_PREMIUM_USER else "non-premium"
-                        )
-                        LOGGER.error(
-                            f"Can't upload files bigger than {limit_in_gb:.1f} GiB ({premium_status} account). Path: {self._up_path}",
-                        )
-                        self._error = f"File size exceeds Telegram's {limit_in_gb:.1f} GiB {premium_status} limit"
-                        self._corrupted += 1
-                        continue
-                    if self._listener.is_cancelled:
-                        return
-                    # Prepare the file (apply prefix, suffix, font style, etc.)
-                    cap_mono = await self._prepare_file(file_, dirpath)
-                    # Use the updated path after file preparation (in case file was renamed)
-                    actual_file_path = self._up_path
-                    if self._last_msg_in_group:
-                        group_lists = [
-                            x for v in self._media_dict.values() for x in v
-                        ]
-                        match = re_match(
-                            r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)",
-                            actual_file_path,
-                        )
-                        if not match or (
-                            match and match.group(0) not in group_lists
-                        ):
-                            for key, value in list(self._media_dict.items()):
-                                for subkey, msgs in list(value.items()):
-                                    if len(msgs) > 1:
-                                        await self._send_media_group(
-                                            subkey,
-                                            key,
-                                            msgs,
-                                        )
-                    if (
-                        self._listener.hybrid_leech
-                        and self._listener.user_transmission
-                    ):
-                        self._user_session = f_size > 2097152000
-                        if self._user_session:
-                            self._sent_msg = await TgClient.user.get_messages(
-                                chat_id=self._sent_msg.chat.id,
-                                message_ids=self._sent_msg.id,
-                            )
-                        else:
-                            self._sent_msg = (
-                                await self._listener.client.get_messages(
-                                    chat_id=self._sent_msg.chat.id,
-                                    message_ids=self._sent_msg.id,
-                                )
-                            )
-                    self._last_msg_in_group = False
-                    self._last_uploaded = 0
-
-                    await self._upload_file(cap_mono, file_, actual_file_path)
-                    if self._listener.is_cancelled:
-                        return
-                    # Store the actual filename (which may have been modified by leech filename)
-                    actual_filename = ospath.basename(self._up_path)
-                    if (
-                        not self._is_corrupted
-                        and (self._listener.is_super_chat or self._listener.up_dest)
-                        and not self._is_private
-                    ):
-                        self._msgs_dict[self._sent_msg.link] = actual_filename
-                    await sleep(1)
-                except Exception as err:
-                    if isinstance(err, RetryError):
-                        LOGGER.info(
-                            f"Total Attempts: {err.last_attempt.attempt_number}",
-                        )
-                        err = err.last_attempt.exception()
-                    LOGGER.error(f"{err}. Path: {self._up_path}")
-                    self._error = str(err)
-                    self._corrupted += 1
-                    if self._listener.is_cancelled:
-                        return
-                if not self._listener.is_cancelled and await aiopath.exists(
-                    self._up_path,
-                ):
-                    await remove(self._up_path)
+        if self._pipeline is None:
+            if not await self._upload_tree():
+                return
+        else:
+            # Files handed over as soon as they are written, the tree walk
+            # comes once the producer knows which files it still works on
+            while (item := await self._pipeline.get()) is not None:
+                if item is WALK:
+                    done = await self._upload_tree()
+                else:
+                    done = await self._upload_path(*ospath.split(item))
+                if not done:
+                    return
         # Process any remaining media groups at the end of the task
         try:
             for key, value in list(self._media_dict.items()):
@@ -989,6 +900,127 @@ class TelegramUploader:
         )
         return
 
+    async def _upload_tree(self):
+        """Upload every file of the task folder, False once cancelled."""
+        for dirpath, _, files in natsorted(await sync_to_async(walk, self._path)):
+            if dirpath.strip().endswith("/yt-dlp-thumb"):
+                continue
+            if dirpath.strip().endswith("_ss"):
+                await self._send_screenshots(dirpath, files)
+                await rmtree(dirpath, ignore_errors=True)
+                continue
+            for file_ in natsorted(files):
+                path = ospath.join(dirpath, file_)
+                if self._pipeline is not None and self._pipeline.claims(path):
+                    continue
+                if not await self._upload_path(dirpath, file_):
+                    return False
+        return True
+
+    async def _upload_path(self, dirpath, file_):
+        """Upload one file, False once the task is cancelled."""
+        self._error = ""
+        self._up_path = ospath.join(dirpath, file_)
+        if not await aiopath.exists(self._up_path):
+            LOGGER.error(f"{self._up_path} not exists! Continue uploading!")
+            return True
+        try:
+            f_size = await aiopath.getsize(self._up_path)
+            self._total_files += 1
+            if f_size == 0:
+                LOGGER.error(
+                    f"{self._up_path} size is zero, telegram don't upload zero size files",
+                )
+                self._corrupted += 1
+                return True
+
+            # Pre-check file size against Telegram's limit (based on premium status)
+            from bot.core.aeon_client import TgClient
+
+            # Use the MAX_SPLIT_SIZE from TgClient which is already set based on premium status
+            telegram_limit = TgClient.MAX_SPLIT_SIZE
+            limit_in_gb = telegram_limit / (1024 * 1024 * 1024)
+
+            if f_size > telegram_limit:
+                premium_status = (
+                    "premium" if TgClient.IS_PREMIUM_USER else "non-premium"
+                )
+                LOGGER.error(
+                    f"Can't upload files bigger than {limit_in_gb:.1f} GiB ({premium_status} account). Path: {self._up_path}",
+                )
+                self._error = f"File size exceeds Telegram's {limit_in_gb:.1f} GiB {premium_status} limit"
+                self._corrupted += 1
+                return True
+            if self._listener.is_cancelled:
+                return False
+            # Prepare the file (apply prefix, suffix, font style, etc.)
+            cap_mono = await self._prepare_file(file_, dirpath)
+            # Use the updated path after file preparation (in case file was renamed)
+            actual_file_path = self._up_path
+            if self._last_msg_in_group:
+                group_lists = [x for v in self._media_dict.values() for x in v]
+                match = re_match(
+                    r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)",
+                    actual_file_path,
+                )
+                if not match or (match and match.group(0) not in group_lists):
+                    for key, value in list(self._media_dict.items()):
+                        for subkey, msgs in list(value.items()):
+                            if len(msgs) > 1:
+                                await self._send_media_group(
+                                    subkey,
+                                    key,
+                                    msgs,
+                                )
+            if self._listener.hybrid_leech and self._listener.user_transmission:
+                self._user_session = f_size > 2097152000
+                if self._user_session:
+                    self._sent_msg = await TgClient.user.get_messages(
+                        chat_id=self._sent_msg.chat.id,
+                        message_ids=self._sent_msg.id,
+                    )
+                else:
+                    self._sent_msg = await self._listener.client.get_messages(
+                        chat_id=self._sent_msg.chat.id,
+                        message_ids=self._sent_msg.id,
+                    )
+            self._last_msg_in_group = False
+            self._last_uploaded = 0
+
+            await self._upload_file(cap_mono, file_, actual_file_path)
+            if self._listener.is_cancelled:
+                return False
+            # Store the actual filename (which may have been modified by leech filename)
+            actual_filename = ospath.basename(self._up_path)
+            if (
+                not self._is_corrupted
+                and (self._listener.is_super_chat or self._listener.up_dest)
+                and not self._is_private
+            ):
+                self._msgs_dict[self._sent_msg.link] = actual_filename
+            if not self._is_corrupted and not self._media_group:
+                # Grouped files are sent again as an album
+                self.sent_messages.append(
+                    (self._sent_msg.chat.id, self._sent_msg.id, actual_filename)
+                )
+            await sleep(1)
+        except Exception as err:
+            if isinstance(err, RetryError):
+                LOGGER.info(
+                    f"Total Attempts: {err.last_attempt.attempt_number}",
+                )
+                err = err.last_attempt.exception()
+            LOGGER.error(f"{err}. Path: {self._up_path}")
+            self._error = str(err)
+            self._corrupted += 1
+            if self._listener.is_cancelled:
+                return False
+        if not self._listener.is_cancelled and await aiopath.exists(
+            self._up_path,
+        ):
+            await remove(self._up_path)
+        return True
+
     @retry(
         wait=wait_exponential(multiplier=2, min=4, max=8),
         stop=stop_after_attempt(3),
@@ -1096,15 +1128,16 @@ class TelegramUploader:
                     return None
                 if thumb == "none":
                     thumb = None
-                self._sent_msg = await self._sent_msg.reply_document(
-                    document=self._up_path,
-                    quote=True,
-                    thumb=thumb,
-                    caption=cap_mono,
-                    force_document=True,
-                    disable_notification=True,
-                    progress=self._upload_progress,
-                )
+                with Metrics.timer("telegram_upload_seconds", media="document"):
+                    self._sent_msg = await self._sent_msg.reply_document(
+                        document=self._up_path,
+                        quote=True,
+                        thumb=thumb,
+                        caption=cap_mono,
+                        force_document=True,
+                        disable_notification=True,
+                        progress=self._upload_progress,
+                    )
             elif is_video:
                 key = "videos"
                 try:
@@ -1117,7 +1150,6 @@ class TelegramUploader:
                     thumb = await get_multiple_frames_thumbnail(
                         self._up_path,
                         self._listener.thumbnail_layout,
-                        self._listener.screen_shots,
                     )
                 if thumb is None:
                     thumb = await get_video_thumbnail(self._up_path, duration)
@@ -1132,18 +1164,19 @@ class TelegramUploader:
                     return None
                 if thumb == "none":
                     thumb = None
-                self._sent_msg = await self._sent_msg.reply_video(
-                    video=self._up_path,
-                    quote=True,
-                    caption=cap_mono,
-                    duration=duration,
-                    width=width,
-                    height=height,
-                    thumb=thumb,
-                    supports_streaming=True,
-                    disable_notification=True,
-                    progress=self._upload_progress,
-                )
+                with Metrics.timer("telegram_upload_seconds", media="video"):
+                    self._sent_msg = await self._sent_msg.reply_video(
+                        video=self._up_path,
+                        quote=True,
+                        caption=cap_mono,
+                        duration=duration,
+                        width=width,
+                        height=height,
+                        thumb=thumb,
+                        supports_streaming=True,
+                        disable_notification=True,
+                        progress=self._upload_progress,
+                    )
             elif is_audio:
                 key = "audios"
                 duration, artist, title = await get_media_info(self._up_path)
@@ -1177,17 +1210,18 @@ class TelegramUploader:
 
                 if self._listener.is_cancelled:
                     return None
-                self._sent_msg = await self._sent_msg.reply_audio(
-                    audio=self._up_path,
-                    quote=True,
-                    caption=cap_mono,
-                    duration=duration,
-                    performer=artist,
-                    title=title,
-                    thumb=thumb,
-                    disable_notification=True,
-                    progress=self._upload_progress,
-                )
+                with Metrics.timer("telegram_upload_seconds", media="audio"):
+                    self._sent_msg = await self._sent_msg.reply_audio(
+                        audio=self._up_path,
+                        quote=True,
+                        caption=cap_mono,
+                        duration=duration,
+                        performer=artist,
+                        title=title,
+                        thumb=thumb,
+                        disable_notification=True,
+                        progress=self._upload_progress,
+                    )
             else:
                 key = "photos"
                 if self._listener.is_cancelled:
@@ -1203,40 +1237,45 @@ class TelegramUploader:
                         f"File has image type but unsupported extension for Telegram photos: {file_ext}. Sending as document."
                     )
                     key = "documents"
-                    self._sent_msg = await self._sent_msg.reply_document(
-                        document=self._up_path,
-                        quote=True,
-                        thumb=thumb,
-                        caption=cap_mono,
-                        force_document=True,
-                        disable_notification=True,
-                        progress=self._upload_progress,
-                    )
-                else:
-                    # Try to send as photo, but be prepared to fall back to document
-                    try:
-                        self._sent_msg = await self._sent_msg.reply_photo(
-                            photo=self._up_path,
+                    with Metrics.timer("telegram_upload_seconds", media="document"):
+                        self._sent_msg = await self._sent_msg.reply_document(
+                            document=self._up_path,
                             quote=True,
+                            thumb=thumb,
                             caption=cap_mono,
+                            force_document=True,
                             disable_notification=True,
                             progress=self._upload_progress,
                         )
+                else:
+                    # Try to send as photo, but be prepared to fall back to document
+                    try:
+                        with Metrics.timer("telegram_upload_seconds", media="photo"):
+                            self._sent_msg = await self._sent_msg.reply_photo(
+                                photo=self._up_path,
+                                quote=True,
+                                caption=cap_mono,
+                                disable_notification=True,
+                                progress=self._upload_progress,
+                            )
                     except BadRequest as e:
                         if "PHOTO_EXT_INVALID" in str(e):
                             LOGGER.info(
                                 f"Failed to send as photo due to invalid extension. Sending as document: {self._up_path}"
                             )
                             key = "documents"
-                            self._sent_msg = await self._sent_msg.reply_document(
-                                document=self._up_path,
-                                quote=True,
-                                thumb=thumb,
-                                caption=cap_mono,
-                                force_document=True,
-                                disable_notification=True,
-                                progress=self._upload_progress,
-                            )
+                            with Metrics.timer(
+                                "telegram_upload_seconds", media="document"
+                            ):
+                                self._sent_msg = await self._sent_msg.reply_document(
+                                    document=self._up_path,
+                                    quote=True,
+                                    thumb=thumb,
+                                    caption=cap_mono,
+                                    force_document=True,
+                                    disable_notification=True,
+                                    progress=self._upload_progress,
+                                )
                         else:
                             raise
 
@@ -1304,8 +1343,8 @@ class TelegramUploader:
                     f"Memory error detected during upload. Path: {self._up_path}"
                 )
 
-                # Simple memory cleanup
-                gc.collect()
+                # Let the memory governor clean up before retrying
+                MemoryGovernor.request(urgent=True)
 
                 if not force_document:
                     LOGGER.info(
@@ -1597,7 +1636,7 @@ class TelegramUploader:
                         self._sent_msg.chat.id,
                         self._sent_msg.id,
                     )
-                    await msg.copy(target)
+                    await OutboundScheduler.submit(target, partial(msg.copy, target))
                     return
                 except Exception as e:
                     LOGGER.error(f"Attempt {attempt + 1} failed: {e}")
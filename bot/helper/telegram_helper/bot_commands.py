@@ -32,6 +32,7 @@ class BotCommands:
     PingCommand = f"ping{i}"
     RestartCommand = [f"restart{i}", "restartall"]
     StatsCommand = f"stats{i}"
+    LoopStatsCommand = f"loopstats{i}"
     HelpCommand = f"help{i}"
     LogCommand = f"log{i}"
     ShellCommand = f"shell{i}"
@@ -1,13 +1,13 @@
 import contextlib
 import re
-from asyncio import gather, sleep
+from asyncio import gather
+from functools import partial
 from re import match as re_match
 from time import time as get_time
 
 from cachetools import TTLCache
 from pyrogram import Client, enums
 from pyrogram.errors import (
-    FloodPremiumWait,
     FloodWait,
     MessageEmpty,
     MessageNotModified,
@@ -28,6 +28,12 @@ from bot.helper.ext_utils.bot_utils import SetInterval
 from bot.helper.ext_utils.db_handler import database
 from bot.helper.ext_utils.exceptions import TgLinkException
 from bot.helper.ext_utils.status_utils import get_readable_message
+from bot.helper.telegram_helper.rate_limiter import (
+    REPLY,
+    RSS,
+    STATUS,
+    OutboundScheduler,
+)
 
 session_cache = TTLCache(
     maxsize=100,
@@ -43,6 +49,7 @@ async def send_message(
     markdown=False,
     block=True,
     bot_client=None,
+    priority=REPLY,
 ):
     """Send a message using the specified bot client
 
@@ -52,8 +59,9 @@ async def send_message(
         buttons: Reply markup buttons
         photo: Photo to include with the message
         markdown: Whether to use Markdown formatting
-        block: Whether to block until the message is sent
+        block: Whether to wait out a FloodWait of the chat
         bot_client: Bot client to use for sending (default: main bot)
+        priority: Priority class in the outbound scheduler
     """
     parse_mode = enums.ParseMode.MARKDOWN if markdown else enums.ParseMode.HTML
 
@@ -85,32 +93,45 @@ async def send_message(
             if isinstance(message, str) and message.isdigit():
                 message = int(message)
 
-            return await client.send_message(
-                chat_id=message,
-                text=text,
-                disable_web_page_preview=True,
-                disable_notification=True,
-                reply_markup=buttons,
-                parse_mode=parse_mode,
+            return await OutboundScheduler.submit(
+                message,
+                partial(
+                    client.send_message,
+                    chat_id=message,
+                    text=text,
+                    disable_web_page_preview=True,
+                    disable_notification=True,
+                    reply_markup=buttons,
+                    parse_mode=parse_mode,
+                ),
+                priority,
+                block=block,
             )
 
         # Check if message has required attributes
         if not hasattr(message, "chat") or not hasattr(message.chat, "id"):
             # Try to send to chat directly if message has an id attribute
             if hasattr(message, "id"):
-                return await client.send_message(
-                    chat_id=message.id,
-                    text=text,
-                    disable_web_page_preview=True,
-                    disable_notification=True,
-                    reply_markup=buttons,
-                    parse_mode=parse_mode,
+                return await OutboundScheduler.submit(
+                    message.id,
+                    partial(
+                        client.send_message,
+                        chat_id=message.id,
+                        text=text,
+                        disable_web_page_preview=True,
+                        disable_notification=True,
+                        reply_markup=buttons,
+                        parse_mode=parse_mode,
+                    ),
+                    priority,
+                    block=block,
                 )
 
             return f"Invalid message object: {type(message)}"
 
         if photo:
-            return await message.reply_photo(
+            call = partial(
+                message.reply_photo,
                 photo=photo,
                 reply_to_message_id=message.id,
                 caption=text,
@@ -118,29 +139,26 @@ async def send_message(
                 disable_notification=True,
                 parse_mode=parse_mode,
             )
-
-        return await message.reply(
-            text=text,
-            quote=True,
-            disable_web_page_preview=True,
-            disable_notification=True,
-            reply_markup=buttons,
-            parse_mode=parse_mode,
+        else:
+            call = partial(
+                message.reply,
+                text=text,
+                quote=True,
+                disable_web_page_preview=True,
+                disable_notification=True,
+                reply_markup=buttons,
+                parse_mode=parse_mode,
+            )
+        return await OutboundScheduler.submit(
+            message.chat.id,
+            call,
+            priority,
+            block=block,
         )
 
-    except FloodWait as f:
-        if not block:
-            return message
-        await sleep(f.value * 1.2)
-        return await send_message(
-            message,
-            text,
-            buttons,
-            photo,
-            markdown,
-            block,
-            bot_client,
-        )
+    except FloodWait:
+        # Only raised for non-blocking sends, blocking ones are requeued
+        return message
     except Exception as e:
         LOGGER.error(str(e))
         return str(e)
@@ -153,6 +171,7 @@ async def edit_message(
     photo=None,
     markdown=False,
     block=True,
+    priority=REPLY,
 ):
     # Check if message is valid
     if not message or not hasattr(message, "chat") or not hasattr(message, "id"):
@@ -191,23 +210,38 @@ async def edit_message(
             if photo:
                 # Create InputMediaPhoto with the correct parse_mode
                 media = InputMediaPhoto(photo, caption=text, parse_mode=parse_mode)
-                return await message.edit_media(media=media, reply_markup=buttons)
-            return await message.edit_caption(
-                caption=text,
+                call = partial(message.edit_media, media=media, reply_markup=buttons)
+            else:
+                call = partial(
+                    message.edit_caption,
+                    caption=text,
+                    reply_markup=buttons,
+                    parse_mode=parse_mode,
+                )
+            return await OutboundScheduler.submit(
+                chat_id,
+                call,
+                priority,
+                key=(chat_id, message_id),
+                block=block,
+            )
+        # A queued edit of the same message is replaced by this one
+        await OutboundScheduler.submit(
+            chat_id,
+            partial(
+                message.edit,
+                text=text,
+                disable_web_page_preview=True,
                 reply_markup=buttons,
                 parse_mode=parse_mode,
-            )
-        await message.edit(
-            text=text,
-            disable_web_page_preview=True,
-            reply_markup=buttons,
-            parse_mode=parse_mode,
+            ),
+            priority,
+            key=(chat_id, message_id),
+            block=block,
         )
-    except FloodWait as f:
-        if not block:
-            return message
-        await sleep(f.value * 1.2)
-        return await edit_message(message, text, buttons, photo, markdown)
+    except FloodWait:
+        # Only raised for non-blocking edits, blocking ones are requeued
+        return message
     except (MessageNotModified, MessageEmpty):
         # Message content hasn't changed or is empty, not an error
         return message
@@ -220,19 +254,29 @@ async def edit_message(
             )
             # Try to send a notification about using expandable blockquotes
             with contextlib.suppress(Exception):
-                await message.reply(
-                    "The message is too long for Telegram. Please use expandable blockquotes for long content sections.",
-                    quote=True,
+                await OutboundScheduler.submit(
+                    message.chat.id,
+                    partial(
+                        message.reply,
+                        "The message is too long for Telegram. Please use expandable blockquotes for long content sections.",
+                        quote=True,
+                    ),
                 )
         # Handle REPLY_MARKUP_INVALID error
         elif "REPLY_MARKUP_INVALID" in error_str:
             LOGGER.error(f"Telegram says: {error_str}")
             # Try to edit the message without buttons
             try:
-                await message.edit(
-                    text=text,
-                    disable_web_page_preview=True,
-                    parse_mode=parse_mode,
+                await OutboundScheduler.submit(
+                    message.chat.id,
+                    partial(
+                        message.edit,
+                        text=text,
+                        disable_web_page_preview=True,
+                        parse_mode=parse_mode,
+                    ),
+                    priority,
+                    key=(message.chat.id, message.id),
                 )
                 return message
             except Exception as e2:
@@ -250,17 +294,18 @@ async def edit_message(
 
 async def send_file(message, file, caption="", buttons=None):
     try:
-        return await message.reply_document(
-            document=file,
-            quote=True,
-            caption=caption,
-            disable_notification=True,
-            reply_markup=buttons,
+        return await OutboundScheduler.submit(
+            message.chat.id,
+            partial(
+                message.reply_document,
+                document=file,
+                quote=True,
+                caption=caption,
+                disable_notification=True,
+                reply_markup=buttons,
+            ),
         )
 
-    except FloodWait as f:
-        await sleep(f.value * 1.2)
-        return await send_file(message, file, caption, buttons)
     except Exception as e:
         LOGGER.error(str(e))
         return str(e)
@@ -280,14 +325,19 @@ async def send_rss(text, chat_id, thread_id):
     text = text.replace("\u200b", "").replace("\u200c", "").replace("\u200d", "")
     text = "".join(c if ord(c) >= 32 or c == "\n" else " " for c in text)
 
+    app = TgClient.user or TgClient.bot
     try:
-        app = TgClient.user or TgClient.bot
-        return await app.send_message(
-            chat_id=chat_id,
-            text=text,
-            disable_web_page_preview=True,
-            message_thread_id=thread_id,
-            disable_notification=True,
+        return await OutboundScheduler.submit(
+            chat_id,
+            partial(
+                app.send_message,
+                chat_id=chat_id,
+                text=text,
+                disable_web_page_preview=True,
+                message_thread_id=thread_id,
+                disable_notification=True,
+            ),
+            RSS,
         )
 
     except MessageEmpty:
@@ -295,32 +345,39 @@ async def send_rss(text, chat_id, thread_id):
         # Try with a simplified message as a fallback
         try:
             simplified_text = "RSS Update: Unable to display full content due to formatting issues."
-            return await app.send_message(
-                chat_id=chat_id,
-                text=simplified_text,
-                disable_web_page_preview=True,
-                message_thread_id=thread_id,
-                disable_notification=True,
+            return await OutboundScheduler.submit(
+                chat_id,
+                partial(
+                    app.send_message,
+                    chat_id=chat_id,
+                    text=simplified_text,
+                    disable_web_page_preview=True,
+                    message_thread_id=thread_id,
+                    disable_notification=True,
+                ),
+                RSS,
             )
 
         except Exception as e2:
             LOGGER.error(f"Failed to send simplified message too: {e2}")
             return str(e2)
-    except (FloodWait, FloodPremiumWait) as f:
-        await sleep(f.value * 1.2)
-        return await send_rss(text, chat_id, thread_id)
     except Exception as e:
         LOGGER.error(f"Error sending RSS message: {e!s}")
         # Try with a simplified message as a fallback if it seems to be a formatting issue
         if "MESSAGE_EMPTY" in str(e) or "400" in str(e):
             try:
                 simplified_text = "RSS Update: Unable to display full content due to formatting issues."
-                return await app.send_message(
-                    chat_id=chat_id,
-                    text=simplified_text,
-                    disable_web_page_preview=True,
-                    message_thread_id=thread_id,
-                    disable_notification=True,
+                return await OutboundScheduler.submit(
+                    chat_id,
+                    partial(
+                        app.send_message,
+                        chat_id=chat_id,
+                        text=simplified_text,
+                        disable_web_page_preview=True,
+                        message_thread_id=thread_id,
+                        disable_notification=True,
+                    ),
+                    RSS,
                 )
 
             except Exception as e2:
@@ -328,7 +385,7 @@ async def send_rss(text, chat_id, thread_id):
         return str(e)
 
 
-async def delete_message(*args):
+async def delete_message(*args, priority=STATUS):
     msgs = []
     for msg in args:
         if msg:
@@ -348,7 +405,14 @@ async def delete_message(*args):
                         )
                 continue
 
-            msgs.append(msg.delete())
+            msgs.append(
+                OutboundScheduler.submit(
+                    msg.chat.id,
+                    msg.delete,
+                    priority,
+                    per_chat=False,
+                ),
+            )
             # Remove from database if it exists
             if hasattr(msg, "id") and hasattr(msg, "chat"):
                 try:
@@ -669,6 +733,7 @@ async def update_status_message(sid, force=False):
                 text,
                 buttons,
                 block=False,
+                priority=STATUS,
             )
             if isinstance(message, str):
                 # Check for common Telegram API errors that indicate the message is no longer valid
@@ -715,7 +780,13 @@ async def send_status_message(msg, user_id=0):
                     del intervals["status"][sid]
                 return
             old_message = status_dict[sid]["message"]
-            message = await send_message(msg, text, buttons, block=False)
+            message = await send_message(
+                msg,
+                text,
+                buttons,
+                block=False,
+                priority=STATUS,
+            )
             if isinstance(message, str):
                 LOGGER.error(
                     f"Status with id: {sid} haven't been sent. Error: {message}",
@@ -728,7 +799,13 @@ async def send_status_message(msg, user_id=0):
             text, buttons = await get_readable_message(sid, is_user)
             if text is None:
                 return
-            message = await send_message(msg, text, buttons, block=False)
+            message = await send_message(
+                msg,
+                text,
+                buttons,
+                block=False,
+                priority=STATUS,
+            )
             if isinstance(message, str):
                 LOGGER.error(
                     f"Status with id: {sid} haven't been sent. Error: {message}",
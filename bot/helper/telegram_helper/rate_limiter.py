@@ -0,0 +1,324 @@
+import contextlib
+from asyncio import Event, get_running_loop, wait_for
+from heapq import heappop, heappush
+from itertools import count
+from math import ceil
+from time import monotonic
+from typing import ClassVar
+
+from pyrogram.errors import FloodPremiumWait, FloodWait
+
+from bot import LOGGER
+from bot.helper.ext_utils.metrics import Metrics
+
+# Priority classes, lower is served first
+REPLY = 0
+STATUS = 1
+RSS = 2
+BROADCAST = 3
+CLASS_NAMES = ("reply", "status", "rss", "broadcast")
+
+# Telegram bot limits: ~30 messages per second overall, about one per
+# second in a private chat and 20 new messages per minute in a group or
+# channel, edits there are not counted against it
+GLOBAL_RATE, GLOBAL_BURST = 30.0, 30
+PRIVATE_RATE, PRIVATE_BURST = 1.0, 3
+GROUP_RATE, GROUP_BURST = 20 / 60, 10
+FLOOD_MARGIN = 1.2  # wait a bit longer than Telegram asks
+MAX_IDLE_BUCKETS = 4096
+
+
+class TokenBucket:
+    __slots__ = ("burst", "last", "rate", "tokens")
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last = monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+    def delay(self, now):
+        """Seconds until a token is available, 0 when one is."""
+        self._refill(now)
+        return 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+    def is_full(self, now):
+        self._refill(now)
+        return self.tokens >= self.burst
+
+
+class _Outbound:
+    __slots__ = (
+        "block",
+        "call",
+        "chat_id",
+        "futures",
+        "key",
+        "lane",
+        "priority",
+        "queued",
+        "queued_at",
+        "seq",
+    )
+
+    def __init__(self, priority, chat_id, key, call, future, block, per_chat):
+        self.priority = priority
+        self.chat_id = chat_id
+        # Requests exempt from the chat bucket queue apart from the others
+        self.lane = chat_id if per_chat else (chat_id, None)
+        self.key = key
+        self.call = call
+        self.futures = [future]
+        self.block = block
+        self.seq = None
+        self.queued = False
+        self.queued_at = monotonic()
+
+
+def _is_private(chat_id):
+    try:
+        return int(chat_id) > 0
+    except (TypeError, ValueError):
+        # Usernames belong to channels and groups as often as to users
+        return False
+
+
+class OutboundScheduler:
+    """Single queue for every outgoing Telegram request of message_utils.
+
+    A request is dispatched once both the global bucket and the bucket of
+    its chat have a token, the highest priority class first. A FloodWait
+    only pauses the chat it was raised for, the request is queued again
+    when `block` is set and raised to the caller otherwise. An edit
+    submitted while an older edit of the same message is still queued
+    replaces it, both callers get the result of the newer one.
+
+    Requests wait in a heap per lane, a chat or the chat bucket exempt
+    requests of a chat. The heads of lanes that may send sit in `_ready`,
+    lanes waiting for a token or a FloodWait in `_waiting` by the time they
+    may send again. Heap items left behind by a dispatch or a coalesced
+    edit are skipped when they surface.
+    """
+
+    _lanes: ClassVar[dict] = {}
+    _ready: ClassVar[list[tuple]] = []
+    _waiting: ClassVar[list[tuple]] = []
+    _count = 0
+    _edits: ClassVar[dict[tuple, _Outbound]] = {}
+    _buckets: ClassVar[dict] = {}
+    _paused: ClassVar[dict] = {}
+    _global = TokenBucket(GLOBAL_RATE, GLOBAL_BURST)
+    _seq = count()
+    _running: ClassVar[set] = set()
+    _wakeup = None
+    _task = None
+
+    @classmethod
+    async def submit(
+        cls,
+        chat_id,
+        call,
+        priority=REPLY,
+        key=None,
+        block=True,
+        per_chat=True,
+    ):
+        """Run `call()` once `chat_id` may be sent to and return its result.
+
+        `key` identifies the message an edit targets, (chat id, message id),
+        so queued edits of it coalesce. Without `per_chat` the request only
+        spends a global token, for calls Telegram does not count against
+        the chat such as deletes and edits in groups.
+        """
+        if key is not None and not _is_private(chat_id):
+            per_chat = False
+        remaining = cls._paused.get(chat_id, 0) - monotonic()
+        if not block and remaining > 0:
+            raise FloodWait(value=ceil(remaining))
+        future = get_running_loop().create_future()
+        cls._enqueue(
+            _Outbound(priority, chat_id, key, call, future, block, per_chat)
+        )
+        cls._ensure_running()
+        return await future
+
+    @classmethod
+    def pending(cls):
+        return cls._count
+
+    @classmethod
+    def _ensure_running(cls):
+        if cls._task is None or cls._task.done():
+            cls._wakeup = Event()
+            cls._task = get_running_loop().create_task(cls._dispatch())
+        cls._wakeup.set()
+
+    @classmethod
+    def _enqueue(cls, entry, newer=True):
+        if entry.key is not None and (queued := cls._edits.get(entry.key)):
+            # The queued request never reached Telegram, one edit serves both
+            if newer:
+                queued.call = entry.call
+            queued.block = queued.block or entry.block
+            queued.futures.extend(entry.futures)
+            if entry.priority >= queued.priority:
+                return
+            # The older heap item is skipped once its priority is stale
+            queued.priority = entry.priority
+            entry = queued
+        else:
+            if entry.seq is None:
+                entry.seq = next(cls._seq)
+            entry.queued = True
+            cls._count += 1
+            if entry.key is not None:
+                cls._edits[entry.key] = entry
+        heappush(
+            cls._lanes.setdefault(entry.lane, []),
+            (entry.priority, entry.seq, entry),
+        )
+        if cls._head(entry.lane) is entry:
+            cls._schedule(entry.lane)
+        if cls._wakeup is not None:
+            cls._wakeup.set()
+
+    @classmethod
+    def _head(cls, lane):
+        """The next entry of `lane` after dropping stale heap items."""
+        if not (heap := cls._lanes.get(lane)):
+            return None
+        while heap:
+            priority, _, entry = heap[0]
+            if entry.queued and priority == entry.priority:
+                return entry
+            heappop(heap)
+        del cls._lanes[lane]
+        return None
+
+    @classmethod
+    def _schedule(cls, lane):
+        if (head := cls._head(lane)) is not None:
+            heappush(cls._ready, (head.priority, head.seq, lane))
+
+    @classmethod
+    def _bucket(cls, chat_id):
+        if (bucket := cls._buckets.get(chat_id)) is None:
+            if len(cls._buckets) >= MAX_IDLE_BUCKETS:
+                cls._prune()
+            if _is_private(chat_id):
+                bucket = TokenBucket(PRIVATE_RATE, PRIVATE_BURST)
+            else:
+                bucket = TokenBucket(GROUP_RATE, GROUP_BURST)
+            cls._buckets[chat_id] = bucket
+        return bucket
+
+    @classmethod
+    def _prune(cls):
+        now = monotonic()
+        for chat_id, bucket in list(cls._buckets.items()):
+            if bucket.is_full(now):
+                del cls._buckets[chat_id]
+        for chat_id, until in list(cls._paused.items()):
+            if until <= now:
+                del cls._paused[chat_id]
+
+    @classmethod
+    def _lane_delay(cls, entry, now):
+        paused = cls._paused.get(entry.chat_id, 0) - now
+        if entry.lane != entry.chat_id:
+            return paused
+        return max(paused, cls._bucket(entry.chat_id).delay(now))
+
+    @classmethod
+    def _next_ready(cls, now):
+        """Return the first dispatchable entry, else None and the wait."""
+        while cls._waiting and cls._waiting[0][0] <= now:
+            cls._schedule(heappop(cls._waiting)[1])
+        while cls._ready:
+            priority, seq, lane = cls._ready[0]
+            head = cls._head(lane)
+            if head is None or (head.priority, head.seq) != (priority, seq):
+                heappop(cls._ready)
+                continue
+            if (delay := cls._lane_delay(head, now)) > 0:
+                heappop(cls._ready)
+                heappush(cls._waiting, (now + delay, lane))
+                continue
+            return head, 0
+        return None, cls._waiting[0][0] - now if cls._waiting else None
+
+    @classmethod
+    async def _dispatch(cls):
+        while True:
+            cls._wakeup.clear()
+            if not cls._count:
+                await cls._wakeup.wait()
+                continue
+            now = monotonic()
+            delay = cls._global.delay(now)
+            if delay <= 0:
+                entry, delay = cls._next_ready(now)
+                if entry is not None:
+                    cls._global.take(now)
+                    if entry.lane == entry.chat_id:
+                        cls._bucket(entry.chat_id).take(now)
+                    entry.queued = False
+                    cls._count -= 1
+                    if entry.key is not None:
+                        cls._edits.pop(entry.key, None)
+                    cls._schedule(entry.lane)
+                    task = get_running_loop().create_task(cls._run(entry))
+                    cls._running.add(task)
+                    task.add_done_callback(cls._running.discard)
+                    continue
+            with contextlib.suppress(TimeoutError):
+                await wait_for(cls._wakeup.wait(), delay)
+
+    @classmethod
+    async def _run(cls, entry):
+        priority = CLASS_NAMES[entry.priority]
+        start = monotonic()
+        Metrics.observe(
+            "telegram_queue_seconds",
+            start - entry.queued_at,
+            priority=priority,
+        )
+        try:
+            result = await entry.call()
+        except (FloodWait, FloodPremiumWait) as f:
+            Metrics.inc("telegram_floodwait_seconds_total", int(f.value))
+            wait = int(f.value) * FLOOD_MARGIN
+            cls._paused[entry.chat_id] = monotonic() + wait
+            LOGGER.warning(f"FloodWait of {f.value}s in chat {entry.chat_id}")
+            if entry.block:
+                cls._enqueue(entry, newer=False)
+                return
+            cls._resolve(entry, error=f)
+        except Exception as e:
+            cls._resolve(entry, error=e)
+        else:
+            cls._resolve(entry, result=result)
+        finally:
+            Metrics.observe(
+                "telegram_call_seconds",
+                monotonic() - start,
+                priority=priority,
+            )
+
+    @staticmethod
+    def _resolve(entry, result=None, error=None):
+        for future in entry.futures:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
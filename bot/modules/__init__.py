@@ -63,7 +63,7 @@ from .services import aeon_callback, log, login, ping, start
 from .shell import run_shell
 from .sox import spectrum_handler
 from .speedtest import speedtest
-from .stats import bot_stats, get_packages_version
+from .stats import bot_stats, get_packages_version, loop_stats
 from .status import status_pages, task_status
 from .truecaller import truecaller_lookup
 from .users_settings import (
@@ -129,6 +129,7 @@ __all__ = [
     "leech",
     "log",
     "login",
+    "loop_stats",
     "media_cancel_callback",
     "media_get_callback",
     "media_search",
@@ -1,8 +1,7 @@
-from asyncio import sleep as asyncio_sleep
 from logging import getLogger
 
 from pyrogram import filters
-from pyrogram.errors import FloodWait, InputUserDeactivated, UserIsBlocked
+from pyrogram.errors import InputUserDeactivated, UserIsBlocked
 from pyrogram.handlers import MessageHandler
 
 from bot.core.aeon_client import TgClient
@@ -10,6 +9,7 @@ from bot.core.config_manager import Config
 from bot.helper.ext_utils.bot_utils import new_task
 from bot.helper.ext_utils.db_handler import database
 from bot.helper.telegram_helper.message_utils import send_message
+from bot.helper.telegram_helper.rate_limiter import BROADCAST
 
 LOGGER = getLogger(__name__)
 
@@ -108,19 +108,8 @@ async def handle_ad_message(_, message):
 
     for uid in pm_users:
         try:
-            await send_message(uid, broadcast_text)
+            await send_message(uid, broadcast_text, priority=BROADCAST)
             successful += 1
-        except FloodWait as e:
-            LOGGER.warning(f"FloodWait: Sleeping for {e.value} seconds")
-            await asyncio_sleep(e.value)
-            try:
-                await send_message(uid, broadcast_text)
-                successful += 1
-            except Exception as retry_err:
-                LOGGER.error(
-                    f"Failed to send ad broadcast to {uid} after FloodWait: {retry_err}"
-                )
-                unsuccessful += 1
         except (UserIsBlocked, InputUserDeactivated) as user_err:
             LOGGER.info(f"Removing user {uid} from database: {user_err}")
             await database.rm_pm_user(uid)
@@ -47,8 +47,13 @@ from bot.core.torrent_manager import TorrentManager
 from bot.helper.ext_utils.aiofiles_compat import aiopath, makedirs, remove, rename
 from bot.helper.ext_utils.bot_utils import SetInterval, new_task
 from bot.helper.ext_utils.db_handler import database
+from bot.helper.ext_utils.effective_settings import invalidate_user
+from bot.helper.ext_utils.loop_diagnostics import LoopDiagnostics
+from bot.helper.ext_utils.menu_cache import MenuCache
+from bot.helper.ext_utils.metrics import metrics_server_booter
 from bot.helper.ext_utils.status_utils import get_readable_file_size
 from bot.helper.ext_utils.task_manager import start_from_queued
+from bot.helper.mirror_leech_utils.rclone_utils.rcd import RcloneDaemon
 from bot.helper.mirror_leech_utils.rclone_utils.serve import rclone_serve_booter
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.telegram_helper.message_utils import (
@@ -69,6 +74,24 @@ merge_config_page = 0  # Track current page for merge config menu
 watermark_text_page = 0  # Track current page for watermark text menu
 handler_dict = {}
 
+# Pages that read client options, usenet servers or the database, which the
+# settings version does not track, are always rebuilt
+UNCACHED_PAGES = {
+    "aria",
+    "qbit",
+    "nzb",
+    "nzbserver",
+    "mediatools",
+    "operations",
+    "mediatools_watermark",
+}
+
+LOOP_DIAGNOSTICS_KEYS = (
+    "LOOP_DIAGNOSTICS",
+    "LOOP_LAG_THRESHOLD",
+    "SLOW_CALLBACK_THRESHOLD",
+)
+
 
 def update_user_ldata(user_id, key, value):
     """Update user data with the provided key and value."""
@@ -76,6 +99,7 @@ def update_user_ldata(user_id, key, value):
         user_data[user_id][key] = value
     else:
         user_data[user_id] = {key: value}
+    invalidate_user(user_id)
 
 
 DEFAULT_VALUES = {
@@ -90,6 +114,19 @@ DEFAULT_VALUES = {
     "AUTO_RESTART_ENABLED": False,
     "AUTO_RESTART_INTERVAL": 24,
     "EQUAL_SPLITS": False,
+    "LEECH_SPLIT_PIPELINE": False,
+    "LEECH_SPLIT_PIPELINE_DEPTH": 2,
+    "SEGMENT_SPLIT": False,
+    "STREAMING_EXTRACT": False,
+    "MEDIA_FILE_WORKERS": 1,
+    "MEDIA_CPU_BUDGET": 0,
+    "INCREMENTAL_LEECH": False,
+    "STREAMING_ZIP": False,
+    "CONTENT_INDEX": False,
+    "CONTENT_INDEX_TTL": 7 * 86400,
+    "DIRECT_HOST_PROFILES": False,
+    "DIRECT_MAX_CONNECTIONS": 16,
+    "DIRECT_MAX_FILES": 8,
     "ENABLE_EXTRA_MODULES": True,
     "MEDIA_TOOLS_ENABLED": True,
     "BULK_ENABLED": True,
@@ -100,12 +137,22 @@ DEFAULT_VALUES = {
     "TORRENT_ENABLED": True,
     "TORRENT_SEARCH_ENABLED": True,
     "YTDLP_ENABLED": True,
+    "YTDLP_CONCURRENT_FRAGMENTS": 4,
+    "YTDLP_PLAYLIST_WORKERS": 2,
+    "GDRIVE_LIST_WORKERS": 8,
+    "RCLONE_RCD_ENABLED": False,
+    "RCLONE_RCD_PORT": 5572,
+    "METRICS_ENABLED": False,
+    "LOOP_DIAGNOSTICS": False,
+    "LOOP_LAG_THRESHOLD": 0.25,
+    "SLOW_CALLBACK_THRESHOLD": 0.1,
     "NZB_ENABLED": True,
     "NZB_SEARCH_ENABLED": True,
     "JD_ENABLED": True,
     "VT_ENABLED": False,
     "VT_API_TIMEOUT": 500,
     "VT_MAX_FILE_SIZE": 32 * 1024 * 1024,  # 32MB in bytes,
+    "VT_CACHE_TTL": 7 * 86400,
     "CORRECT_CMD_SUFFIX": "",
     "WRONG_CMD_WARNINGS_ENABLED": True,
     "HYPERDL_ENABLED": True,
@@ -495,6 +542,32 @@ async def get_image_watermark(user_id):
 
 
 async def get_buttons(key=None, edit_type=None, page=0, user_id=None):
+    if edit_type is not None or (
+        key is not None and (key in UNCACHED_PAGES or key.startswith("nzbser"))
+    ):
+        return await _build_buttons(key, edit_type, page, user_id)
+    # Module-level paging and edit state select the page as much as `key`
+    return await MenuCache.render(
+        "botset",
+        user_id,
+        (
+            key,
+            page,
+            state,
+            start,
+            merge_page,
+            merge_config_page,
+            watermark_text_page,
+        ),
+        _build_buttons,
+        key,
+        edit_type,
+        page,
+        user_id,
+    )
+
+
+async def _build_buttons(key=None, edit_type=None, page=0, user_id=None):
     buttons = ButtonMaker()
     msg = ""  # Initialize msg with a default value
     if key is None:
@@ -5948,6 +6021,11 @@ async def edit_variable(_, message, pre_message, key):
                 value = 75
             elif key == "TASK_MONITOR_MEMORY_LOW":
                 value = 60
+    elif key in {"LOOP_LAG_THRESHOLD", "SLOW_CALLBACK_THRESHOLD"}:
+        try:
+            value = max(0.01, float(value))
+        except ValueError:
+            value = DEFAULT_VALUES[key]
     elif key == "WATERMARK_OPACITY":
         try:
             value = float(value)
@@ -6342,6 +6420,12 @@ async def edit_variable(_, message, pre_message, key):
         "RCLONE_SERVE_PASS",
     ]:
         await rclone_serve_booter()
+    elif key in ["RCLONE_ENABLED", "RCLONE_RCD_ENABLED", "RCLONE_RCD_PORT"]:
+        await RcloneDaemon.start()
+    elif key == "METRICS_ENABLED":
+        await metrics_server_booter()
+    elif key in LOOP_DIAGNOSTICS_KEYS:
+        LoopDiagnostics.start()
     elif key in ["JD_EMAIL", "JD_PASS"]:
         await jdownloader.boot()
     elif key == "RSS_DELAY":
@@ -6904,7 +6988,7 @@ async def update_private_file(_, message, pre_message):
                     await remove(file_name)
         await delete_message(message)
     if file_name == "rclone.conf":
-        await rclone_serve_booter()
+        await gather(rclone_serve_booter(), RcloneDaemon.start())
 
     # Get the current state before updating the UI
     current_state = globals()["state"]
@@ -10054,6 +10138,12 @@ async def edit_bot_settings(client, query):
             "RCLONE_SERVE_PASS",
         ]:
             await rclone_serve_booter()
+        elif data[2] in ["RCLONE_RCD_ENABLED", "RCLONE_RCD_PORT"]:
+            await RcloneDaemon.start()
+        elif data[2] == "METRICS_ENABLED":
+            await metrics_server_booter()
+        elif data[2] in LOOP_DIAGNOSTICS_KEYS:
+            LoopDiagnostics.start()
     elif data[1] == "syncaria":
         await query.answer()
         # Get the current state before making changes
@@ -11880,5 +11970,11 @@ async def load_config():
         # Stop the heartbeat task if it's running
         await database.stop_heartbeat()
         await database.disconnect()
-    await gather(start_from_queued(), rclone_serve_booter())
+    await gather(
+        start_from_queued(),
+        rclone_serve_booter(),
+        RcloneDaemon.start(),
+        metrics_server_booter(),
+    )
+    LoopDiagnostics.start()
     add_job()
@@ -1,14 +1,15 @@
-import asyncio
 import traceback
+from functools import partial
 from logging import getLogger
 from time import time
 
-from pyrogram.errors import FloodWait, InputUserDeactivated, UserIsBlocked
+from pyrogram.errors import InputUserDeactivated, UserIsBlocked
 
 from bot.helper.ext_utils.bot_utils import new_task
 from bot.helper.ext_utils.db_handler import database
 from bot.helper.ext_utils.status_utils import get_readable_time
 from bot.helper.telegram_helper.message_utils import edit_message, send_message
+from bot.helper.telegram_helper.rate_limiter import BROADCAST, OutboundScheduler
 
 LOGGER = getLogger(__name__)
 
@@ -53,19 +54,14 @@ async def broadcast(_, message):
 
         for uid in pm_users:
             try:
-                # Use copy method which handles all media types automatically
-                await msg_to_broadcast.copy(uid)
+                # Use copy method which handles all media types automatically,
+                # FloodWaits are waited out by the outbound scheduler
+                await OutboundScheduler.submit(
+                    uid,
+                    partial(msg_to_broadcast.copy, uid),
+                    BROADCAST,
+                )
                 successful += 1
-            except FloodWait as e:
-                await asyncio.sleep(e.value)
-                try:
-                    await msg_to_broadcast.copy(uid)
-                    successful += 1
-                except Exception as retry_err:
-                    LOGGER.error(
-                        f"Failed to send broadcast to {uid} after FloodWait: {retry_err!s}"
-                    )
-                    unsuccessful += 1
             except (UserIsBlocked, InputUserDeactivated) as user_err:
                 LOGGER.info(f"Removing user {uid} from database: {user_err!s}")
                 await database.rm_pm_user(uid)
@@ -199,19 +195,16 @@ async def broadcast_media(client, message, options=None):
         for uid in pm_users:
             try:
                 # Use the copy method which handles all media types automatically
-                result = await message.copy(uid)
+                result = await OutboundScheduler.submit(
+                    uid,
+                    partial(message.copy, uid),
+                    BROADCAST,
+                )
 
                 if result:
                     successful += 1
                 else:
                     unsuccessful += 1
-            except FloodWait as e:
-                await asyncio.sleep(e.value)
-                try:
-                    await message.copy(uid)
-                    successful += 1
-                except Exception:
-                    unsuccessful += 1
             except (UserIsBlocked, InputUserDeactivated):
                 await database.rm_pm_user(uid)
                 blocked += 1
@@ -1,14 +1,13 @@
 from asyncio import create_task
 from re import IGNORECASE, findall, search
 
-from imdb import Cinemagoer
-from pycountry import countries as conn
 from pyrogram.errors import MediaEmpty, PhotoInvalidDimensions, WebpageMediaEmpty
 from pyrogram.types import Message
 
 from bot import LOGGER
 from bot.core.aeon_client import TgClient
 from bot.core.config_manager import Config
+from bot.helper.ext_utils.imdb_utils import IMDbService, list_to_str
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.telegram_helper.message_utils import (
     auto_delete_message,
@@ -17,88 +16,6 @@ from bot.helper.telegram_helper.message_utils import (
     send_message,
 )
 
-imdb = Cinemagoer()
-
-IMDB_GENRE_EMOJI = {
-    "Action": "🚀",
-    "Adult": "🔞",
-    "Adventure": "🌋",
-    "Animation": "🎠",
-    "Biography": "📜",
-    "Comedy": "🪗",
-    "Crime": "🔪",
-    "Documentary": "🎞",
-    "Drama": "🎭",
-    "Family": "👨‍👩‍👧‍👦",
-    "Fantasy": "🫧",
-    "Film Noir": "🎯",
-    "Game Show": "🎮",
-    "History": "🏛",
-    "Horror": "🧟",
-    "Musical": "🎻",
-    "Music": "🎸",
-    "Mystery": "🧳",
-    "News": "📰",
-    "Reality-TV": "🖥",
-    "Romance": "🥰",
-    "Sci-Fi": "🌠",
-    "Short": "📝",
-    "Sport": "⛳",
-    "Talk-Show": "👨‍🍳",
-    "Thriller": "🗡",
-    "War": "⚔",
-    "Western": "🪩",
-}
-LIST_ITEMS = 4
-
-
-def list_to_str(k):
-    """Convert list to string with proper formatting"""
-    if not k:
-        return "N/A"
-    if len(k) == 1:
-        return str(k[0])
-    # Limit items if needed
-    if LIST_ITEMS:
-        k = k[:LIST_ITEMS]
-    return ", ".join(f"{elem}" for elem in k)
-
-
-def list_to_hash(k, country=False, emoji=False):
-    """Convert list to hashtag string with proper formatting"""
-    if not k:
-        return "N/A"
-
-    # Handle single item case
-    if len(k) == 1:
-        if emoji and k[0] in IMDB_GENRE_EMOJI:
-            return f"{IMDB_GENRE_EMOJI[k[0]]} #{k[0].replace(' ', '_')}"
-        if country:
-            try:
-                return f"#{conn.get(name=k[0]).alpha_2}"
-            except (AttributeError, KeyError):
-                return f"#{k[0].replace(' ', '_')}"
-        return f"#{k[0].replace(' ', '_')}"
-
-    # Limit items if needed
-    if LIST_ITEMS:
-        k = k[:LIST_ITEMS]
-
-    # Format multiple items
-    if emoji:
-        return " ".join(
-            f"{IMDB_GENRE_EMOJI.get(elem, '')} #{elem.replace(' ', '_')}"
-            for elem in k
-        )
-    if country:
-        return " ".join(
-            f"#{conn.get(name=elem).alpha_2}"
-            if elem in [c.name for c in conn]
-            else f"#{elem.replace(' ', '_')}"
-            for elem in k
-        )
-    return " ".join(f"#{elem.replace(' ', '_')}" for elem in k)
-
 
 async def imdb_search(_, message: Message):
     """Handle IMDB search command"""
@@ -171,7 +88,7 @@ async def imdb_search(_, message: Message):
     # Check if it's an IMDB URL
     if result := search(r"imdb\.com/title/tt(\d+)", title, IGNORECASE):
         movieid = result.group(1)
-        if movie := imdb.get_movie(movieid):
+        if imdb_data := await get_poster(query=movieid, id=True):
             # Process direct IMDB link
             # Delete messages and show result directly
             if is_reply:
@@ -187,7 +104,6 @@ async def imdb_search(_, message: Message):
                 chat_id = message.chat.id
 
             # Process and show the movie directly
-            imdb_data = get_poster(query=movieid, id=True)
             buttons = ButtonMaker()
 
             # Add trailer button if available
@@ -262,7 +178,7 @@ async def imdb_search(_, message: Message):
         return
 
     # Search for movies by title
-    movies = get_poster(title, bulk=True)
+    movies = await get_poster(title, bulk=True)
     if not movies:
         # No results found - schedule for auto-deletion after 5 minutes
         error_msg = await edit_message(
@@ -290,7 +206,7 @@ async def imdb_search(_, message: Message):
         button_text = f"🎬 {title} ({year})" if year else f"🎬 {title}"
         buttons.data_button(
             button_text,
-            f"imdb {user_id} movie {movie.movieID}",
+            f"imdb {user_id} movie {movie['movieID']}",
         )
 
     buttons.data_button("🚫 Close 🚫", f"imdb {user_id} close")
@@ -314,7 +230,7 @@ async def imdb_search(_, message: Message):
     )
 
 
-def get_poster(query, bulk=False, id=False, file=None):
+async def get_poster(query, bulk=False, id=False, file=None):
     """Get movie/TV series information from IMDB"""
     if not id:
         query = (query.strip()).lower()
@@ -330,7 +246,7 @@ def get_poster(query, bulk=False, id=False, file=None):
         else:
             year = None
 
-        movieid = imdb.search_movie(title.lower(), results=10)
+        movieid = await IMDbService.search(title.lower())
         if not movieid:
             return None
 
@@ -350,65 +266,11 @@ def get_poster(query, bulk=False, id=False, file=None):
         if bulk:
             return movieid
 
-        movieid = movieid[0].movieID
+        movieid = movieid[0]["movieID"]
     else:
         movieid = query
 
-    movie = imdb.get_movie(movieid)
-
-    # Get release date
-    if movie.get("original air date"):
-        date = movie["original air date"]
-    elif movie.get("year"):
-        date = movie.get("year")
-    else:
-        date = "N/A"
-
-    # Get plot
-    plot = movie.get("plot")
-    plot = plot[0] if plot and len(plot) > 0 else movie.get("plot outline")
-    if plot and len(plot) > 300:
-        plot = f"{plot[:300]}..."
-
-    # Build URLs
-    imdb_id = movie.get("imdbID")
-    url = f"https://www.imdb.com/title/tt{imdb_id}"
-    url_cast = f"{url}/fullcredits#cast"
-    url_releaseinfo = f"{url}/releaseinfo"
-
-    # Return movie data
-    return {
-        "title": movie.get("title"),
-        "trailer": movie.get("videos"),
-        "votes": movie.get("votes"),
-        "aka": list_to_str(movie.get("akas")),
-        "seasons": movie.get("number of seasons"),
-        "box_office": movie.get("box office"),
-        "localized_title": movie.get("localized title"),
-        "kind": movie.get("kind"),
-        "imdb_id": f"tt{imdb_id}",
-        "cast": list_to_str(movie.get("cast")),
-        "runtime": list_to_str(movie.get("runtimes")),
-        "countries": list_to_hash(movie.get("countries"), True),
-        "certificates": list_to_str(movie.get("certificates")),
-        "languages": list_to_hash(movie.get("languages")),
-        "director": list_to_str(movie.get("director")),
-        "writer": list_to_str(movie.get("writer")),
-        "producer": list_to_str(movie.get("producer")),
-        "composer": list_to_str(movie.get("composer")),
-        "cinematographer": list_to_str(movie.get("cinematographer")),
-        "music_team": list_to_str(movie.get("music department")),
-        "distributors": list_to_str(movie.get("distributors")),
-        "release_date": date,
-        "year": movie.get("year"),
-        "genres": list_to_hash(movie.get("genres"), emoji=True),
-        "poster": movie.get("full-size cover url"),
-        "plot": plot,
-        "rating": str(movie.get("rating")) + " / 10",
-        "url": url,
-        "url_cast": url_cast,
-        "url_releaseinfo": url_releaseinfo,
-    }
+    return await IMDbService.get_movie(movieid)
 
 
 async def imdb_callback(_, query):
@@ -428,7 +290,10 @@ async def imdb_callback(_, query):
 
     if data[2] == "movie":
         await query.answer()
-        imdb_data = get_poster(query=data[3], id=True)
+        imdb_data = await get_poster(query=data[3], id=True)
+        if not imdb_data:
+            await edit_message(message, "<i>No Results Found</i>")
+            return
         buttons = ButtonMaker()
 
         # Add trailer button if available
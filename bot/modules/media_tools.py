@@ -33,6 +33,7 @@ from bot.helper.ext_utils.db_handler import database
 from bot.helper.ext_utils.help_messages import (
     media_tools_text,  # This imports the combined dictionary
 )
+from bot.helper.ext_utils.menu_cache import MenuCache
 from bot.helper.ext_utils.status_utils import get_readable_file_size
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.telegram_helper.message_utils import (
@@ -192,7 +193,19 @@ async def show_media_tools_for_task(client, message, task_instance):
 
 
 async def get_media_tools_settings(from_user, stype="main", page_no=0):
-    """Get media tools settings for a user."""
+    """Get media tools settings for a user, reusing the last rendered page."""
+    return await MenuCache.render(
+        "mediatools",
+        from_user.id,
+        (stype, page_no),
+        _build_media_tools_settings,
+        from_user,
+        stype,
+        page_no,
+    )
+
+
+async def _build_media_tools_settings(from_user, stype="main", page_no=0):
 
     user_id = from_user.id
     user_name = from_user.mention(style="html")
@@ -7864,7 +7877,11 @@ async def media_tools_settings(_, message):
                 {"_id": TgClient.ID},
                 {"MEDIA_TOOLS_ENABLED": 1, "_id": 0},
             )
-            if db_config and "MEDIA_TOOLS_ENABLED" in db_config:
+            if (
+                db_config
+                and "MEDIA_TOOLS_ENABLED" in db_config
+                and db_config["MEDIA_TOOLS_ENABLED"] != Config.MEDIA_TOOLS_ENABLED
+            ):
                 # Update Config with the latest value from database
                 Config.MEDIA_TOOLS_ENABLED = db_config["MEDIA_TOOLS_ENABLED"]
     except Exception:
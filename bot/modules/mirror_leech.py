@@ -14,6 +14,7 @@ from bot.helper.ext_utils.bot_utils import (
     get_content_type,
     sync_to_async,
 )
+from bot.helper.ext_utils.content_index import ContentIndex
 from bot.helper.ext_utils.exceptions import DirectDownloadLinkException
 from bot.helper.ext_utils.limit_checker import limit_checker
 from bot.helper.ext_utils.links_utils import (
@@ -881,6 +882,11 @@ class Mirror(TaskListener):
             if content_type and "x-bittorrent" in content_type:
                 self.is_qbit = True
 
+        # Content an earlier task already transferred is not transferred again
+        if await ContentIndex.reuse(self, file_):
+            await delete_links(self.message)
+            return None
+
         if file_ is not None:
             create_task(
                 TelegramDownloadHelper(self).add_download(
@@ -815,26 +815,16 @@ Timeout: 60 sec. Argument -c for command and arguments
 
 async def rss_monitor():
     # Add memory management
-    import gc
-
     import psutil
 
-    # Force garbage collection before starting
-    gc.collect()
-
     # Check memory usage
     memory_info = psutil.virtual_memory()
     if memory_info.percent > 90:  # If memory usage is above 90%
         return
 
     # Add memory management
-    import gc
-
     import psutil
 
-    # Force garbage collection before starting
-    gc.collect()
-
     # Check memory usage
     memory_info = psutil.virtual_memory()
     if memory_info.percent > 90:  # If memory usage is above 90%
@@ -1,6 +1,11 @@
-from asyncio import create_task
+from asyncio import Semaphore, create_task, gather, shield, sleep
+from base64 import b32decode
+from collections import OrderedDict
+from contextlib import suppress
 from html import escape
-from urllib.parse import quote
+from time import time
+from typing import ClassVar
+from urllib.parse import parse_qs, quote, urlparse
 
 from bot import LOGGER
 from bot.core.config_manager import Config
@@ -100,36 +105,204 @@ async def initiate_search_tools():
         names = [plugin.name for plugin in qb_plugins]
         await TorrentManager.qbittorrent.search.uninstall_plugin(names)
         PLUGINS.clear()
+    SearchAggregator._cache.clear()
     await TorrentManager.qbittorrent.search.install_plugin(SEARCH_PLUGINS)
 
 
+def _infohash(result):
+    """Return a site independent key so mirrors of one torrent collapse."""
+    link = result.fileUrl or ""
+    if link.startswith("magnet:"):
+        for part in parse_qs(urlparse(link).query).get("xt", []):
+            if part.lower().startswith("urn:btih:"):
+                btih = part[9:]
+                if len(btih) == 32:
+                    with suppress(ValueError):
+                        btih = b32decode(btih.upper()).hex()
+                return btih.lower()
+    return f"{result.fileName.strip().lower()}|{result.fileSize}"
+
+
+class SearchAggregator:
+    """Runs one qBittorrent search job per plugin concurrently.
+
+    Jobs are polled with backoff, partial results are merged as they arrive
+    and deduplicated by infohash, keeping the copy with the most seeders.
+    Searches where every plugin finished and something was found are cached
+    by (query, plugins) for `cache_ttl` seconds. Callers asking for a query
+    already running share it and all get its progress updates.
+    """
+
+    _cache: ClassVar[OrderedDict] = OrderedDict()
+    _inflight: ClassVar[dict] = {}
+    _listeners: ClassVar[dict[tuple, list]] = {}
+    _semaphore = Semaphore(8)
+    cache_ttl = 5 * 60
+    max_entries = 64
+    search_timeout = 60
+    poll_min = 0.5
+    poll_max = 3
+
+    @classmethod
+    def _get_cached(cls, key):
+        entry = cls._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time():
+            del cls._cache[key]
+            return None
+        cls._cache.move_to_end(key)
+        return entry[1]
+
+    @classmethod
+    def _put_cached(cls, key, results):
+        cls._cache[key] = (time() + cls.cache_ttl, results)
+        cls._cache.move_to_end(key)
+        while len(cls._cache) > cls.max_entries:
+            cls._cache.popitem(last=False)
+
+    @staticmethod
+    def _merge(merged, results):
+        for result in results:
+            key = _infohash(result)
+            current = merged.get(key)
+            if current is None or result.nbSeeders > current.nbSeeders:
+                merged[key] = result
+
+    @classmethod
+    async def _run_plugin(cls, key, plugin, limit, merged, progress):
+        qbit_search = TorrentManager.qbittorrent.search
+        async with cls._semaphore:
+            try:
+                job = await qbit_search.start(
+                    pattern=key,
+                    plugins=[plugin],
+                    category="all",
+                )
+            except Exception as e:
+                LOGGER.error(f"Search plugin {plugin} failed to start: {e}")
+                return False
+            offset = 0
+            delay = cls.poll_min
+            deadline = time() + cls.search_timeout
+            completed = False
+            try:
+                while True:
+                    response = await qbit_search.results(
+                        id=job.id,
+                        limit=limit,
+                        offset=offset,
+                    )
+                    if response.results:
+                        offset += len(response.results)
+                        cls._merge(merged, response.results)
+                        await progress()
+                    if response.status != "Running" or offset >= limit:
+                        completed = True
+                        break
+                    if time() > deadline:
+                        break
+                    await sleep(delay)
+                    delay = min(delay * 1.5, cls.poll_max)
+            except Exception as e:
+                LOGGER.error(f"Search plugin {plugin} failed: {e}")
+            finally:
+                with suppress(Exception):
+                    await qbit_search.stop(job.id)
+                with suppress(Exception):
+                    await qbit_search.delete(job.id)
+            return completed
+
+    @classmethod
+    async def _search(cls, cache_key, key, plugins, limit):
+        merged = {}
+        finished = [0]
+        last_update = [0.0]
+
+        async def progress():
+            now = time()
+            if now - last_update[0] < 3:
+                return
+            last_update[0] = now
+            for on_progress in list(cls._listeners.get(cache_key, ())):
+                with suppress(Exception):
+                    await on_progress(finished[0], len(plugins), len(merged))
+
+        async def run(plugin):
+            completed = await cls._run_plugin(key, plugin, limit, merged, progress)
+            finished[0] += 1
+            await progress()
+            return completed
+
+        try:
+            completed = await gather(*(run(plugin) for plugin in plugins))
+            results = sorted(
+                merged.values(),
+                key=lambda result: result.nbSeeders,
+                reverse=True,
+            )[:limit]
+            # Failed or timed out plugins may find something on the next try
+            if results and all(completed):
+                cls._put_cached(cache_key, results)
+            return results
+        finally:
+            cls._inflight.pop(cache_key, None)
+            cls._listeners.pop(cache_key, None)
+
+    @classmethod
+    async def search(cls, key, plugins, limit, on_progress=None):
+        cache_key = (key.strip().lower(), tuple(sorted(plugins)))
+        if (results := cls._get_cached(cache_key)) is not None:
+            return results[:limit]
+        listeners = cls._listeners.setdefault(cache_key, [])
+        if on_progress is not None:
+            listeners.append(on_progress)
+        if cache_key not in cls._inflight:
+            cls._inflight[cache_key] = create_task(
+                cls._search(cache_key, key, plugins, limit),
+            )
+        try:
+            return (await shield(cls._inflight[cache_key]))[:limit]
+        finally:
+            if on_progress in listeners:
+                listeners.remove(on_progress)
+
+
+async def get_plugins():
+    if not PLUGINS:
+        pl = await TorrentManager.qbittorrent.search.plugins()
+        PLUGINS.extend(i.name for i in pl if getattr(i, "enabled", True))
+    return PLUGINS
+
+
 async def search(key, site, message, user_tag=""):
     LOGGER.info(f"PLUGINS Searching: {key} from {site}")
-    search = await TorrentManager.qbittorrent.search.start(
-        pattern=key,
-        plugins=[site],
-        category="all",
-    )
-    search_id = search.id
-    while True:
-        result_status = await TorrentManager.qbittorrent.search.status(search_id)
-        status = result_status[0].status
-        if status != "Running":
-            break
+    plugins = await get_plugins() if site == "all" else [site]
+    site_name = "All Sites" if site == "all" else site.capitalize()
     # Use Config.SEARCH_LIMIT if it's set, otherwise use TELEGRAPH_LIMIT
     search_limit = (
         Config.SEARCH_LIMIT if Config.SEARCH_LIMIT > 0 else TELEGRAPH_LIMIT
     )
-    dict_search_results = await TorrentManager.qbittorrent.search.results(
-        id=search_id,
-        limit=search_limit,
+
+    async def on_progress(done, total, found):
+        await edit_message(
+            message,
+            f"<b><blockquote>{user_tag}, Searching for <i>{key}</i></blockquote>\n\n"
+            f"Torrent Site:- <i>{site_name}</i>\n"
+            f"Sites done: {done}/{total} | Results so far: {found}</b>",
+        )
+
+    search_results = await SearchAggregator.search(
+        key,
+        plugins,
+        search_limit,
+        on_progress if len(plugins) > 1 else None,
     )
-    search_results = dict_search_results.results
-    total_results = dict_search_results.total
+    total_results = len(search_results)
     if total_results == 0:
         error_msg = await edit_message(
             message,
-            f"No result found for <i>{key}</i>\nTorrent Site:- <i>{site.capitalize()}</i>",
+            f"No result found for <i>{key}</i>\nTorrent Site:- <i>{site_name}</i>",
         )
         create_task(  # noqa: RUF006
             auto_delete_message(error_msg, time=300),
@@ -137,13 +310,9 @@ async def search(key, site, message, user_tag=""):
         return
 
     # Format the message with user tag in a blockquote
-    search_limit = (
-        Config.SEARCH_LIMIT if Config.SEARCH_LIMIT > 0 else TELEGRAPH_LIMIT
-    )
-    msg = f"<b><blockquote>{user_tag}, Found {min(total_results, search_limit)}"
-    msg += f" result(s) for <i>{key}</i></blockquote></b>\n\n<b>Torrent Site:- <i>{site.capitalize()}</i></b>"
+    msg = f"<b><blockquote>{user_tag}, Found {total_results}"
+    msg += f" result(s) for <i>{key}</i></blockquote></b>\n\n<b>Torrent Site:- <i>{site_name}</i></b>"
 
-    await TorrentManager.qbittorrent.search.delete(search_id)
     link = await get_result(search_results, key, message)
     buttons = ButtonMaker()
     buttons.url_button("🔎 VIEW", link)
@@ -204,10 +373,7 @@ async def get_result(search_results, key, message):
 
 async def plugin_buttons(user_id):
     buttons = ButtonMaker()
-    if not PLUGINS:
-        pl = await TorrentManager.qbittorrent.search.plugins()
-        PLUGINS.extend(i.name for i in pl)
-    for siteName in PLUGINS:
+    for siteName in await get_plugins():
         buttons.data_button(
             siteName.capitalize(),
             f"torser {user_id} {siteName} plugin",
@@ -2,24 +2,20 @@ from asyncio import create_task, gather
 from re import search as research
 from time import time
 
-from psutil import (
-    boot_time,
-    cpu_count,
-    cpu_percent,
-    disk_usage,
-    net_io_counters,
-    swap_memory,
-    virtual_memory,
-)
+from psutil import boot_time, cpu_count
 
 from bot import bot_start_time
 from bot.core.config_manager import Config
 from bot.helper.ext_utils.aiofiles_compat import aiopath
 from bot.helper.ext_utils.bot_utils import cmd_exec, new_task
+from bot.helper.ext_utils.gc_utils import MemoryGovernor
+from bot.helper.ext_utils.loop_diagnostics import LoopDiagnostics
+from bot.helper.ext_utils.metrics import Metrics
 from bot.helper.ext_utils.status_utils import (
     get_readable_file_size,
     get_readable_time,
 )
+from bot.helper.ext_utils.system_metrics import get_snapshot
 from bot.helper.telegram_helper.message_utils import (
     auto_delete_message,
     delete_links,
@@ -42,11 +38,57 @@ commands = {
 }
 
 
+def _timing(name, **match):
+    count, total, peak = Metrics.stats(name, **match)
+    if not count:
+        return "-"
+    return f"{count} | avg {total / count * 1000:.0f}ms | max {peak * 1000:.0f}ms"
+
+
+def get_metrics_stats():
+    engines = {}
+    for labels, value in Metrics.counters("transfer_bytes_total").items():
+        labels = dict(labels)
+        arrow = "↓" if labels["direction"] == "download" else "↑"
+        key = f"{labels['engine']} {arrow}"
+        engines[key] = engines.get(key, 0) + value
+    transfers = (
+        " | ".join(
+            f"{key} {get_readable_file_size(value)}"
+            for key, value in sorted(engines.items())
+        )
+        or "-"
+    )
+    flood = sum(Metrics.counters("telegram_floodwait_seconds_total").values())
+    caches = (
+        " | ".join(
+            f"{name} {hits / (hits + misses) * 100:.0f}%"
+            for name, (hits, misses) in Metrics.cache_rates().items()
+            if hits + misses
+        )
+        or "-"
+    )
+    return f"""
+<b>⏱ HOT PATHS ⏱</b>
+
+<b>Transfers:</b> {transfers}
+<b>Telegram Calls:</b> {_timing("telegram_call_seconds")}
+<b>Telegram Uploads:</b> {_timing("telegram_upload_seconds")}
+<b>Telegram Queue:</b> {_timing("telegram_queue_seconds")} | <b>FloodWait:</b> {flood:.0f}s
+<b>DB Commands:</b> {_timing("db_command_seconds")}
+<b>Queue Wait:</b> {_timing("queue_wait_seconds")}
+<b>FFmpeg Jobs:</b> {_timing("job_seconds", tool="ffmpeg")}
+<b>7z Jobs:</b> {_timing("job_seconds", tool="7z")}
+<b>Loop Lag:</b> {_timing("event_loop_lag_seconds")}
+<b>Cache Hits:</b> {caches}
+"""
+
+
 @new_task
 async def bot_stats(_, message):
-    total, used, free, disk = disk_usage("/")
-    swap = swap_memory()
-    memory = virtual_memory()
+    snapshot = get_snapshot()
+    free, total, disk = snapshot.disks.get("/", (0, 0, 0))
+    used = total - free
 
     # Function to format limit values
     def format_limit(limit_value, unit="GB"):
@@ -66,22 +108,44 @@ async def bot_stats(_, message):
 <b>Total Disk Space:</b> {get_readable_file_size(total)}
 <b>Used:</b> {get_readable_file_size(used)} | <b>Free:</b> {get_readable_file_size(free)}
 
-<b>Upload:</b> {get_readable_file_size(net_io_counters().bytes_sent)}
-<b>Download:</b> {get_readable_file_size(net_io_counters().bytes_recv)}
+<b>Upload:</b> {get_readable_file_size(snapshot.net_sent)} | <b>Rate:</b> {get_readable_file_size(snapshot.net_sent_rate)}/s
+<b>Download:</b> {get_readable_file_size(snapshot.net_recv)} | <b>Rate:</b> {get_readable_file_size(snapshot.net_recv_rate)}/s
 
-<b>CPU:</b> {cpu_percent(interval=0.5)}%
-<b>RAM:</b> {memory.percent}%
+<b>CPU:</b> {snapshot.cpu_percent}% | <b>Avg:</b> {snapshot.cpu_avg:.1f}%
+<b>RAM:</b> {snapshot.memory_percent}% | <b>Avg:</b> {snapshot.memory_avg:.1f}%
 <b>DISK:</b> {disk}%
 
 <b>Physical Cores:</b> {cpu_count(logical=False)}
-<b>Total Cores:</b> {cpu_count()}
-<b>SWAP:</b> {get_readable_file_size(swap.total)} | <b>Used:</b> {swap.percent}%
-
-<b>Memory Total:</b> {get_readable_file_size(memory.total)}
-<b>Memory Free:</b> {get_readable_file_size(memory.available)}
-<b>Memory Used:</b> {get_readable_file_size(memory.used)}
+<b>Total Cores:</b> {snapshot.cpu_count}
+<b>SWAP:</b> {get_readable_file_size(snapshot.swap_total)} | <b>Used:</b> {snapshot.swap_percent}%
+
+<b>Memory Total:</b> {get_readable_file_size(snapshot.memory_total)}
+<b>Memory Free:</b> {get_readable_file_size(snapshot.memory_available)}
+<b>Memory Used:</b> {get_readable_file_size(snapshot.memory_used)}
+<b>Bot Memory:</b> {get_readable_file_size(snapshot.process_rss)}
+<b>Threads:</b> {snapshot.thread_count} ({snapshot.thread_usage_percent:.1f}%)
 """
 
+    if snapshot.ffmpeg:
+        ffmpeg_cpu = sum(proc.cpu_percent for proc in snapshot.ffmpeg)
+        ffmpeg_rss = sum(proc.rss for proc in snapshot.ffmpeg)
+        system_stats += (
+            f"<b>FFmpeg:</b> {len(snapshot.ffmpeg)} running | "
+            f"<b>CPU:</b> {ffmpeg_cpu:.1f}% | "
+            f"<b>RAM:</b> {get_readable_file_size(ffmpeg_rss)}\n"
+        )
+
+    gc_stats = MemoryGovernor.stats()
+    gc_pauses = " | ".join(
+        f"G{gen}: {count} ({gc_stats['pause_max'][gen] * 1000:.1f}ms max)"
+        for gen, count in enumerate(gc_stats["collections"])
+    )
+    system_stats += (
+        f"<b>GC:</b> {gc_pauses}\n"
+        f"<b>GC Frozen:</b> {gc_stats['frozen']} | "
+        f"<b>RSS Peak:</b> {get_readable_file_size(gc_stats['rss_peak'])}\n"
+    )
+
     # Limits stats section
     limits_stats = f"""
 <b>📊 LIMITS STATS 📊</b>
@@ -121,7 +185,7 @@ async def bot_stats(_, message):
 """
 
     # Combine all sections
-    stats = system_stats + limits_stats + versions_stats
+    stats = system_stats + get_metrics_stats() + limits_stats + versions_stats
 
     # Delete the /stats command message immediately
     await delete_links(message)
@@ -131,6 +195,19 @@ async def bot_stats(_, message):
     create_task(auto_delete_message(stats_msg, time=300))  # noqa: RUF006
 
 
+@new_task
+async def loop_stats(_, message):
+    args = message.text.split()
+    if len(args) > 1 and args[1].lower() == "reset":
+        LoopDiagnostics.reset()
+        report = "Loop diagnostics were reset."
+    else:
+        report = LoopDiagnostics.report()
+    await delete_links(message)
+    reply = await send_message(message, report)
+    create_task(auto_delete_message(reply, time=300))  # noqa: RUF006
+
+
 async def get_version_async(command, regex):
     try:
         out, err, code = await cmd_exec(command)
@@ -1,8 +1,6 @@
 from asyncio import create_task, gather, iscoroutinefunction
 from time import time
 
-from psutil import cpu_percent, disk_usage, virtual_memory
-
 from bot import (
     DOWNLOAD_DIR,
     bot_start_time,
@@ -21,6 +19,7 @@ from bot.helper.ext_utils.status_utils import (
     get_readable_time,
     speed_string_to_bytes,
 )
+from bot.helper.ext_utils.system_metrics import get_snapshot
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.telegram_helper.message_utils import (
     auto_delete_message,
@@ -61,11 +60,12 @@ async def task_status(_, message):
     if count == 0:
         # Send status message when no tasks
         currentTime = get_readable_time(time() - bot_start_time)
-        free = get_readable_file_size(disk_usage(DOWNLOAD_DIR).free)
+        snapshot = get_snapshot()
+        free = get_readable_file_size(snapshot.disk_free(DOWNLOAD_DIR))
         msg = "No Active Tasks!\n"
         msg += (
-            f"\n<b>CPU:</b> {cpu_percent()}% | <b>FREE:</b> {free}"
-            f"\n<b>RAM:</b> {virtual_memory().percent}% | <b>UPTIME:</b> {currentTime}"
+            f"\n<b>CPU:</b> {snapshot.cpu_percent}% | <b>FREE:</b> {free}"
+            f"\n<b>RAM:</b> {snapshot.memory_percent}% | <b>UPTIME:</b> {currentTime}"
         )
         reply_message = await send_message(message, msg)
         # Auto delete status message after 5 minutes when no tasks
@@ -19,8 +19,10 @@ from bot.helper.ext_utils.bot_utils import (
     update_user_ldata,
 )
 from bot.helper.ext_utils.db_handler import database
+from bot.helper.ext_utils.effective_settings import invalidate_user
 from bot.helper.ext_utils.help_messages import user_settings_text
 from bot.helper.ext_utils.media_utils import create_thumb
+from bot.helper.ext_utils.menu_cache import MenuCache
 from bot.helper.ext_utils.status_utils import get_readable_file_size
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.telegram_helper.message_utils import (
@@ -79,6 +81,23 @@ yt_dlp_options = ["YT_DLP_OPTIONS", "USER_COOKIES", "FFMPEG_CMDS"]
 
 
 async def get_user_settings(from_user, stype="main"):
+    return await MenuCache.render(
+        "userset",
+        from_user.id,
+        stype,
+        _build_user_settings,
+        from_user,
+        stype,
+        files=(
+            f"thumbnails/{from_user.id}.jpg",
+            f"rclone/{from_user.id}.conf",
+            f"tokens/{from_user.id}.pickle",
+            f"cookies/{from_user.id}.txt",
+        ),
+    )
+
+
+async def _build_user_settings(from_user, stype="main"):
     from bot.helper.ext_utils.bot_utils import is_media_tool_enabled
 
     user_id = from_user.id
@@ -617,7 +636,12 @@ Please use /mediatools command to configure convert settings.
                     {"_id": TgClient.ID},
                     {"MEDIA_TOOLS_ENABLED": 1, "_id": 0},
                 )
-                if db_config and "MEDIA_TOOLS_ENABLED" in db_config:
+                if (
+                    db_config
+                    and "MEDIA_TOOLS_ENABLED" in db_config
+                    and db_config["MEDIA_TOOLS_ENABLED"]
+                    != Config.MEDIA_TOOLS_ENABLED
+                ):
                     # Update Config with the latest value from database
                     Config.MEDIA_TOOLS_ENABLED = db_config["MEDIA_TOOLS_ENABLED"]
         except Exception:
@@ -1359,12 +1383,14 @@ You can provide your own cookies for YouTube and other yt-dlp downloads to acces
             for key in ai_options:
                 if key in user_dict:
                     user_dict.pop(key, None)
+            invalidate_user(user_id)
             await update_user_settings(query, "ai")
         elif data[3] == "metadata_all":
             # Reset all metadata settings
             for key in metadata_options:
                 if key in user_dict:
                     user_dict.pop(key, None)
+            invalidate_user(user_id)
             await update_user_settings(query, "metadata")
 
         # Convert settings have been moved to Media Tools settings
@@ -1372,6 +1398,7 @@ You can provide your own cookies for YouTube and other yt-dlp downloads to acces
             # Reset MediaInfo setting
             if "MEDIAINFO_ENABLED" in user_dict:
                 user_dict.pop("MEDIAINFO_ENABLED", None)
+            invalidate_user(user_id)
             await update_user_settings(query, "main")
         elif data[3] in user_dict:
             user_dict.pop(data[3], None)
@@ -1385,6 +1412,7 @@ You can provide your own cookies for YouTube and other yt-dlp downloads to acces
                     "TOKEN_PICKLE",
                 ]:
                     del user_dict[k]
+            invalidate_user(user_id)
             await update_user_settings(query)
         await database.update_user_data(user_id)
     elif data[2] == "view":
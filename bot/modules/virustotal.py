@@ -1,5 +1,6 @@
 import asyncio
 import base64
+import hashlib
 import html
 import os
 import time
@@ -11,7 +12,8 @@ from vt import Client as VTClient
 
 from bot import DOWNLOAD_DIR
 from bot.core.config_manager import Config
-from bot.helper.ext_utils.bot_utils import new_task
+from bot.helper.ext_utils.bot_utils import new_task, sync_to_async
+from bot.helper.ext_utils.db_handler import database
 from bot.helper.ext_utils.links_utils import is_url
 from bot.helper.ext_utils.status_utils import get_readable_file_size
 from bot.helper.telegram_helper.message_utils import (
@@ -53,6 +55,7 @@ class VirusTotalClient:
             result = analysis.to_dict()
             result.update(
                 {
+                    "stats": analysis.get("stats") or {},
                     "file_name": os.path.basename(file_path),
                     "file_size": os.path.getsize(file_path),
                     "link": self._get_analysis_url(analysis.id),
@@ -75,7 +78,13 @@ class VirusTotalClient:
                 url, wait_for_completion=True
             )
             result = analysis.to_dict()
-            result.update({"url": url, "link": self._get_analysis_url(analysis.id)})
+            result.update(
+                {
+                    "stats": analysis.get("stats") or {},
+                    "url": url,
+                    "link": self._get_analysis_url(analysis.id),
+                }
+            )
             # Extract relevant information
             return result
         except APIError as e:
@@ -85,6 +94,23 @@ class VirusTotalClient:
             LOGGER.error(f"Error analyzing URL: {e}")
             raise
 
+    async def get_file_report(self, sha256: str) -> dict | None:
+        """Get the existing VirusTotal report for a file hash, if any."""
+        try:
+            file_obj = await self.client.get_object_async(f"/files/{sha256}")
+        except APIError as e:
+            if e.code == "NotFoundError":
+                return None
+            await self._handle_api_error(e)
+            raise
+        stats = file_obj.get("last_analysis_stats")
+        if not stats:
+            return None
+        return {
+            "stats": stats,
+            "link": f"https://www.virustotal.com/gui/file/{sha256}",
+        }
+
     def _get_analysis_url(self, analysis_id: str) -> str:
         # URL analysis
         if analysis_id.startswith("u-"):
@@ -114,6 +140,61 @@ def create_vt_client():
     return None
 
 
+def _sha256_file(file_path):
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(4 * 1024 * 1024):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+async def _cache_verdict(verdict, *keys):
+    """Store a file verdict under its file_unique_id and SHA-256 keys."""
+    # vt-py returns stats as a WhistleBlowerDict, which BSON can't encode
+    data = {
+        "stats": dict(verdict.get("stats") or {}),
+        "link": verdict.get("link", ""),
+    }
+    for key in keys:
+        if key:
+            await database.set_cache_entry(
+                "virustotal", key, data, Config.VT_CACHE_TTL
+            )
+
+
+def _format_file_result(file_name, file_size, result, cached=False):
+    stats = result.get("stats", {})
+    malicious = stats.get("malicious", 0)
+    suspicious = stats.get("suspicious", 0)
+    harmless = stats.get("harmless", 0)
+    undetected = stats.get("undetected", 0)
+
+    # Determine threat level
+    if malicious >= 3:
+        threat_status = "❌ POTENTIALLY DANGEROUS"
+    elif malicious > 0 or suspicious > 0:
+        threat_status = "⚠️ SUSPICIOUS"
+    else:
+        threat_status = "✅ SAFE"
+
+    # Format response
+    response = "<b>VirusTotal Scan Results</b>\n\n"
+    response += f"<b>File:</b> {html.escape(file_name)}\n"
+    response += f"<b>Size:</b> {get_readable_file_size(file_size)}\n"
+    response += f"<b>Status:</b> {threat_status}\n\n"
+    response += "<b>Detection Summary:</b>\n"
+    response += f"- Malicious: {malicious}\n"
+    response += f"- Suspicious: {suspicious}\n"
+    response += f"- Harmless: {harmless}\n"
+    response += f"- Undetected: {undetected}\n\n"
+
+    # Add link to full report
+    response += f"<b>Full Report:</b> <a href='{result.get('link', '')}'>View on VirusTotal</a>"
+    if cached:
+        response += "\n\n<i>Result from a previous scan of this file.</i>"
+    return response
+
+
 async def scan_file(client, message, file_msg):
     """Scan a file for viruses using VirusTotal."""
     # Get file information
@@ -145,6 +226,16 @@ async def scan_file(client, message, file_msg):
         create_task(auto_delete_message(error_msg, time=300))
         return
 
+    media = file_msg.document or file_msg.video or file_msg.audio or file_msg.photo
+    fuid_key = f"fuid:{media.file_unique_id}"
+
+    # Reuse the verdict of an earlier scan of the same Telegram file
+    if cached := await database.get_cache_entry("virustotal", fuid_key):
+        await send_message(
+            message, _format_file_result(file_name, file_size, cached, True)
+        )
+        return
+
     # Check file size
     if file_size > Config.VT_MAX_FILE_SIZE:
         error_msg = await send_message(
@@ -178,43 +269,26 @@ async def scan_file(client, message, file_msg):
         file_path = os.path.join(DOWNLOAD_DIR, f"vt_{file_name}")
         await client.download_media(message=file_msg, file_name=file_path)
 
-        # Update status message
-        await edit_message(status_msg, "⏳ Analyzing file with VirusTotal...")
-
-        # Analyze the file
-        result = await vt_client.analyze_file(file_path)
-
-        # Process results
-        stats = result.get("stats", {})
-        malicious = stats.get("malicious", 0)
-        suspicious = stats.get("suspicious", 0)
-        harmless = stats.get("harmless", 0)
-        undetected = stats.get("undetected", 0)
-
-        # Determine threat level
-        if malicious >= 3:
-            threat_status = "❌ POTENTIALLY DANGEROUS"
-        elif malicious > 0 or suspicious > 0:
-            threat_status = "⚠️ SUSPICIOUS"
-        else:
-            threat_status = "✅ SAFE"
-
-        # Format response
-        response = "<b>VirusTotal Scan Results</b>\n\n"
-        response += f"<b>File:</b> {html.escape(file_name)}\n"
-        response += f"<b>Size:</b> {get_readable_file_size(file_size)}\n"
-        response += f"<b>Status:</b> {threat_status}\n\n"
-        response += "<b>Detection Summary:</b>\n"
-        response += f"- Malicious: {malicious}\n"
-        response += f"- Suspicious: {suspicious}\n"
-        response += f"- Harmless: {harmless}\n"
-        response += f"- Undetected: {undetected}\n\n"
-
-        # Add link to full report
-        response += f"<b>Full Report:</b> <a href='{result.get('link', '')}'>View on VirusTotal</a>"
+        # Look the file up by hash before uploading it
+        sha256 = await sync_to_async(_sha256_file, file_path)
+        sha_key = f"sha256:{sha256}"
+        cached = True
+        result = await database.get_cache_entry("virustotal", sha_key)
+        if result is None:
+            result = await vt_client.get_file_report(sha256)
+        if result is None:
+            cached = False
+            # Update status message
+            await edit_message(status_msg, "⏳ Analyzing file with VirusTotal...")
+
+            # Analyze the file
+            result = await vt_client.analyze_file(file_path)
+        await _cache_verdict(result, fuid_key, sha_key)
 
         # Send results
-        await edit_message(status_msg, response)
+        await edit_message(
+            status_msg, _format_file_result(file_name, file_size, result, cached)
+        )
 
     except Exception as e:
         LOGGER.error(f"Error in VirusTotal scan: {e}")
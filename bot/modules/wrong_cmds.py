@@ -99,6 +99,7 @@ async def handle_no_suffix_commands(client, message):
         "restart",
         "restartall",
         "stats",
+        "loopstats",
         "help",
         "log",
         "shell",
@@ -1292,7 +1292,12 @@ class YtDlp(TaskListener):
 
         LOGGER.info(f"Downloading with YT-DLP: {self.link}")
         playlist = "entries" in result
-        ydl = YoutubeDLHelper(self)
+        # Playlists were probed with playlist_items=0, only a single video's
+        # info is complete enough to be reused for the download
+        ydl = YoutubeDLHelper(
+            self,
+            None if playlist else YoutubeDL.sanitize_info(result),
+        )
         create_task(ydl.add_download(path, qual, playlist, opt))  # noqa: RUF006
         await delete_links(self.message)
         return
@@ -66,6 +66,8 @@ INSTADL_API = ""  # InstaDL API key for Instagram downloads
 MIRROR_ENABLED = True  # Enable/disable mirror feature
 LEECH_ENABLED = True  # Enable/disable leech feature
 YTDLP_ENABLED = True  # Enable/disable YT-DLP feature
+YTDLP_CONCURRENT_FRAGMENTS = 4  # Fragments downloaded in parallel for HLS/DASH
+YTDLP_PLAYLIST_WORKERS = 2  # Playlist entries downloaded in parallel
 TORRENT_ENABLED = True  # Enable/disable torrent feature
 TORRENT_SEARCH_ENABLED = True  # Enable/disable torrent search feature
 NZB_ENABLED = True  # Enable/disable NZB feature
@@ -124,6 +126,7 @@ IS_TEAM_DRIVE = False  # Whether the GDRIVE_ID is a TeamDrive
 STOP_DUPLICATE = False  # Skip uploading files that are already in the drive
 INDEX_URL = ""  # Index URL for Google Drive
 USE_SERVICE_ACCOUNTS = False  # Whether to use service accounts for Google Drive
+GDRIVE_LIST_WORKERS = 8  # Folders listed in parallel when counting or checking duplicates
 SHOW_CLOUD_LINK = True  # Show cloud links in upload completion message
 
 # Rclone
@@ -133,6 +136,8 @@ RCLONE_SERVE_URL = ""  # URL for rclone serve
 RCLONE_SERVE_PORT = 0  # Port for rclone serve (0 to disable)
 RCLONE_SERVE_USER = ""  # Username for rclone serve
 RCLONE_SERVE_PASS = ""  # Password for rclone serve
+RCLONE_RCD_ENABLED = False  # Run transfers, listings and links through one rclone rc daemon
+RCLONE_RCD_PORT = 5572  # Localhost port of the rclone rc daemon
 RCLONE_CONFIG = ""  # Rclone config as a string (alternative to RCLONE_PATH)
 
 # JDownloader
@@ -188,11 +193,36 @@ LEECH_FILENAME_CAPTION = (
 LEECH_DUMP_CHAT = []  # Chat IDs ["-100123456789", "b:@mychannel", "u:-100987654321", "h:@mygroup|123456"] where leeched files will be sent
 THUMBNAIL_LAYOUT = ""  # Layout for thumbnails: empty, top, bottom, or custom
 EQUAL_SPLITS = False  # Create equal-sized parts when splitting files
+LEECH_SPLIT_PIPELINE = False  # Upload each split part while the next one is being produced
+LEECH_SPLIT_PIPELINE_DEPTH = 2  # Finished parts allowed to wait for upload before splitting pauses
+SEGMENT_SPLIT = False  # Split videos in one ffmpeg pass, cutting at keyframes planned from the packet sizes
+STREAMING_EXTRACT = False  # Upload extracted files while the rest of the archive is extracted (leech without media tools)
+MEDIA_FILE_WORKERS = 1  # Files of one task processed at once by convert, compress, metadata, watermark, trim and track extraction
+MEDIA_CPU_BUDGET = 0  # Per-file media jobs allowed at once across all tasks, 0 = number of CPU cores
+INCREMENTAL_LEECH = False  # Leech each file of a multi-file qBittorrent torrent as soon as it completes (no seeding, extraction or media tools)
+STREAMING_ZIP = False  # Leech -z without password writes the zip volume by volume while uploading
+CONTENT_INDEX = False  # Reuse the messages or links of an earlier task that downloaded the same content
+CONTENT_INDEX_TTL = 604800  # Seconds an indexed task result is reused
+DIRECT_HOST_PROFILES = False  # Learn connections and concurrent files per host for direct links
+DIRECT_MAX_CONNECTIONS = 16  # Most connections per file of a direct link (1-16)
+DIRECT_MAX_FILES = 8  # Most files of a direct link folder downloaded at once
 
 # Hyper Download Settings
 HYPERDL_ENABLED = True  # Enable/disable hyper download feature
 HELPER_TOKENS = ""  # Bot tokens for helper bots, separated by space. Format: "token1 token2 token3"
 HYPER_THREADS = 0  # Number of threads for hyper download (0 = auto-detect based on number of helper bots)
+HYPER_PIPELINE_DEPTH = 4  # In-flight chunk requests per hyper download part
+
+# Stream Settings
+STREAM_ENABLED = False  # Serve Telegram files at BASE_URL/stream/<chat>/<msg>
+STREAM_CACHE_SIZE = 256  # Chunk cache shared by viewers in MB
+STREAM_READ_AHEAD = 4  # Number of 1MB chunks prefetched ahead
+
+# Metrics Settings
+METRICS_ENABLED = False  # Prometheus-style metrics at BASE_URL/metrics
+LOOP_DIAGNOSTICS = False  # Event loop lag profiler, runs the loop in debug mode. Report with /loopstats
+LOOP_LAG_THRESHOLD = 0.25  # Seconds the loop must be blocked before its stack is sampled
+SLOW_CALLBACK_THRESHOLD = 0.1  # Seconds a single callback may run before it is logged
 
 # qBittorrent/Aria2c
 TORRENT_TIMEOUT = 0  # Timeout for torrent downloads in seconds (0 = no timeout)
@@ -267,6 +297,9 @@ TASK_MONITOR_MEMORY_LOW = 60  # Low memory usage threshold percentage
 # Extra Modules Settings
 ENABLE_EXTRA_MODULES = True  # Enable additional modules and features
 
+# VirusTotal Settings
+VT_CACHE_TTL = 7 * 86400  # Seconds a file verdict is reused
+
 # Truecaller API Settings
 TRUECALLER_API_URL = ""  # Truecaller API URL for phone number lookup
 
@@ -13,7 +13,12 @@ from aiohttp.client_exceptions import ClientError
 from aioqbt.client import create_client  # type: ignore
 from aioqbt.exc import AQError
 from fastapi import FastAPI, HTTPException, Request  # type: ignore
-from fastapi.responses import HTMLResponse, JSONResponse  # type: ignore
+from fastapi.responses import (  # type: ignore
+    HTMLResponse,
+    JSONResponse,
+    PlainTextResponse,
+    StreamingResponse,
+)
 from fastapi.templating import Jinja2Templates  # type: ignore
 
 from sabnzbdapi import SabnzbdClient
@@ -45,6 +50,11 @@ SERVICES = {
     },
 }
 
+# Served by bot/helper/ext_utils/stream_utils.py inside the bot process
+STREAM_SERVER_URL = "http://127.0.0.1:8095"
+# Served by bot/helper/ext_utils/metrics.py inside the bot process
+METRICS_SERVER_URL = "http://127.0.0.1:8096"
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -431,6 +441,72 @@ async def qbittorrent_proxy(path: str = "", request: Request = None):
     return response
 
 
+@app.api_route("/stream/{chat}/{msg}", methods=["GET", "HEAD"])
+async def stream_media(chat: str, msg: int, request: Request):
+    headers = {}
+    if range_header := request.headers.get("Range"):
+        headers["Range"] = range_header
+    session = ClientSession()
+    try:
+        upstream = await session.request(
+            request.method,
+            f"{STREAM_SERVER_URL}/stream/{chat}/{msg}",
+            headers=headers,
+            params=dict(request.query_params),
+        )
+    except ClientError as e:
+        await session.close()
+        LOGGER.error(f"Stream server unreachable: {e}")
+        raise HTTPException(
+            status_code=503, detail="Stream server unavailable"
+        ) from e
+
+    resp_headers = {
+        k: v
+        for k, v in upstream.headers.items()
+        if k.lower()
+        in (
+            "content-type",
+            "content-length",
+            "content-range",
+            "accept-ranges",
+            "content-disposition",
+        )
+    }
+
+    async def body():
+        try:
+            async for data in upstream.content.iter_chunked(256 * 1024):
+                yield data
+        finally:
+            upstream.release()
+            await session.close()
+
+    return StreamingResponse(
+        body(),
+        status_code=upstream.status,
+        headers=resp_headers,
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    try:
+        async with (
+            ClientSession() as session,
+            session.get(f"{METRICS_SERVER_URL}/metrics") as upstream,
+        ):
+            return PlainTextResponse(
+                await upstream.text(),
+                status_code=upstream.status,
+                media_type="text/plain; version=0.0.4",
+            )
+    except ClientError as e:
+        raise HTTPException(
+            status_code=503, detail="Metrics server unavailable"
+        ) from e
+
+
 @app.get("/", response_class=HTMLResponse)
 async def homepage():
     return (